@@ -0,0 +1,336 @@
+"""
+DreamCourse 학년도별 입결 데이터 저장소
+
+학년도별 입결 CSV를 학년도·대학명으로 분할(hive partitioning)한 Parquet 데이터셋으로 저장합니다.
+조회는 요청한 학년도·대학의 파티션 디렉토리만 열고, 학과 조건은 학과 순으로 정렬해 기록한
+행 그룹의 통계로 걸러내므로(predicate pushdown) 학년도가 늘어나도 읽는 양은 요청 범위로 제한됩니다.
+벡터 인덱스도 학년도마다 별도 샤드(예: _admission_2024)로 게시되어, 새 학년도를 추가할 때
+이전 학년도를 다시 임베딩하지 않습니다.
+
+디렉토리 구조:
+    data/admission/
+    └── 학년도=2024/
+        └── 대학명=<URL 인코딩된 대학명>/
+            └── part-0.parquet    # 학과 순으로 정렬
+
+사용 예:
+    python -m admission_store ingest --year 2025 --csv 입결정보_2025.csv
+    python -m admission_store years
+"""
+
+import argparse
+import fcntl
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config import (
+    ADMISSION_ROW_GROUP_ROWS,
+    ADMISSION_SHARD_PREFIX,
+    ADMISSION_SOURCES,
+    ADMISSION_STORE_DIR,
+    ADMISSION_TREND_YEARS,
+    ENCODINGS,
+    INGEST_CHUNK_ROWS
+)
+
+# 파티션 키 (디렉토리 이름으로 저장되며 읽을 때 열로 복원됩니다)
+PARTITIONING = ds.partitioning(pa.schema([("학년도", pa.int16()), ("대학명", pa.string())]), flavor="hive")
+
+# 원본 CSV 열과 타입 (학년도는 수집 시 지정)
+SCHEMA = pa.schema([
+    ("대학명", pa.string()),
+    ("전형명", pa.string()),
+    ("학과", pa.string()),
+    ("인원", pa.int64()),
+    ("경쟁률", pa.float64()),
+    ("충원순위", pa.int64()),
+    ("50% 컷", pa.float64()),
+    ("70% 컷", pa.float64()),
+    ("학년도", pa.int16()),
+])
+
+
+def admission_shard(year: int) -> str:
+    """
+    학년도의 입결 인덱스 샤드 이름을 반환합니다.
+
+    Args:
+        year (int): 학년도
+
+    Returns:
+        str: 샤드 이름 (예: "_admission_2024")
+    """
+    return f"{ADMISSION_SHARD_PREFIX}{year}"
+
+
+def shard_year(shard: str) -> Optional[int]:
+    """
+    입결 샤드 이름에서 학년도를 꺼냅니다.
+
+    Args:
+        shard (str): 샤드 이름
+
+    Returns:
+        Optional[int]: 학년도 또는 None (입결 샤드가 아닌 경우)
+    """
+    suffix = shard[len(ADMISSION_SHARD_PREFIX):] if shard.startswith(ADMISSION_SHARD_PREFIX) else ""
+    return int(suffix) if suffix.isdigit() else None
+
+
+def format_years(years: Sequence[int]) -> str:
+    """
+    학년도 목록을 제목·질문용 문자열로 만듭니다.
+
+    Args:
+        years (Sequence[int]): 학년도 목록
+
+    Returns:
+        str: "2024" 또는 "2020~2024"
+    """
+    if not years:
+        return ""
+    return str(years[0]) if len(years) == 1 else f"{min(years)}~{max(years)}"
+
+
+class AdmissionStore:
+    """학년도·대학명으로 분할된 입결 Parquet 데이터셋의 수집과 조회를 담당하는 클래스"""
+
+    def __init__(self, root: Path = ADMISSION_STORE_DIR):
+        """
+        Args:
+            root (Path): 데이터셋 루트 디렉토리
+        """
+        self.root = Path(root)
+
+    def years(self) -> List[int]:
+        """
+        저장된 학년도 목록을 반환합니다.
+
+        Returns:
+            List[int]: 오름차순 학년도 목록
+        """
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            int(path.name.split("=", 1)[1])
+            for path in self.root.iterdir()
+            if path.is_dir() and path.name.startswith("학년도=")
+        )
+
+    def recent_years(self, count: int = ADMISSION_TREND_YEARS) -> List[int]:
+        """
+        최근 count개 학년도를 반환합니다.
+
+        Args:
+            count (int): 학년도 수
+
+        Returns:
+            List[int]: 오름차순 학년도 목록
+        """
+        return self.years()[-count:]
+
+    @contextmanager
+    def ingest_lock(self) -> Iterator[None]:
+        """여러 프로세스가 동시에 같은 학년도를 수집하지 않도록 파일 락을 잡습니다."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".ingest.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def ingest(
+        self,
+        csv_path: Path,
+        year: int,
+        encoding: str = ENCODINGS["admission"],
+        chunk_rows: int = INGEST_CHUNK_ROWS
+    ) -> int:
+        """
+        한 학년도의 입결 CSV를 파티션으로 기록합니다. 같은 학년도가 있으면 통째로 교체하고 다른 학년도는 건드리지 않습니다.
+
+        CSV는 청크 단위로 읽어 대학별 임시 파일로 나눈 뒤, 대학 파티션마다 학과 순으로 정렬해 하나의 파일로 합칩니다.
+
+        Args:
+            csv_path (Path): 원본 CSV 경로
+            year (int): 학년도
+            encoding (str): CSV 인코딩
+            chunk_rows (int): 청크당 행 수
+
+        Returns:
+            int: 기록한 행 수
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".staging-{uuid.uuid4().hex}"
+        rows = 0
+        try:
+            for number, chunk in enumerate(pd.read_csv(csv_path, encoding=encoding, chunksize=chunk_rows)):
+                chunk = chunk.assign(학년도=year)[SCHEMA.names]
+                ds.write_dataset(
+                    pa.Table.from_pandas(chunk, schema=SCHEMA, preserve_index=False),
+                    staging, format="parquet", partitioning=PARTITIONING,
+                    basename_template=f"chunk-{number}-{{i}}.parquet",
+                    existing_data_behavior="overwrite_or_ignore"
+                )
+                rows += len(chunk)
+
+            year_dir = staging / f"학년도={year}"
+            for partition in sorted(year_dir.iterdir()) if year_dir.is_dir() else []:
+                AdmissionStore._compact(partition)
+            if rows:
+                self._swap_year(year, year_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return rows
+
+    @staticmethod
+    def _compact(partition: Path):
+        """대학 파티션의 청크 파일들을 학과 순으로 정렬한 파일 하나로 합칩니다."""
+        chunk_files = sorted(partition.glob("chunk-*.parquet"))
+        table = pa.concat_tables(pq.read_table(path) for path in chunk_files)
+        table = table.sort_by([("학과", "ascending"), ("전형명", "ascending")])
+        pq.write_table(table, partition / "part-0.parquet", row_group_size=ADMISSION_ROW_GROUP_ROWS)
+        for path in chunk_files:
+            path.unlink()
+
+    def _swap_year(self, year: int, new_dir: Path):
+        """기록을 마친 학년도 디렉토리를 rename으로 교체합니다. (이전 학년도 데이터는 삭제)"""
+        target = self.root / f"학년도={year}"
+        retired = self.root / f".retired-{uuid.uuid4().hex}"
+        if target.exists():
+            os.rename(target, retired)
+        os.rename(new_dir, target)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def sync(self, sources: Dict[int, Path] = ADMISSION_SOURCES) -> List[int]:
+        """
+        설정에 등록된 학년도 중 아직 수집되지 않은 학년도를 수집합니다.
+
+        Args:
+            sources (Dict[int, Path]): 학년도별 원본 CSV
+
+        Returns:
+            List[int]: 새로 수집한 학년도 목록
+        """
+        missing = [year for year in sources if year not in self.years()]
+        if not missing:
+            return []
+        with self.ingest_lock():
+            ingested = []
+            for year in missing:
+                if year not in self.years():
+                    self.ingest(Path(sources[year]), year)
+                    ingested.append(year)
+            return ingested
+
+    def _dataset(self) -> ds.Dataset:
+        """파티션 디렉토리를 발견하여 데이터셋을 엽니다. (임시·잠금 파일은 '.' 접두사로 제외)"""
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING, schema=SCHEMA)
+
+    @staticmethod
+    def _filter(
+        years: Optional[Iterable[int]] = None,
+        universities: Optional[Iterable[str]] = None,
+        majors: Optional[Iterable[str]] = None
+    ) -> Optional[ds.Expression]:
+        """조회 조건을 데이터셋 필터 식으로 만듭니다. (파티션 키 조건은 디렉토리 단위로 걸러집니다)"""
+        expression = None
+        for column, values in (("학년도", years), ("대학명", universities), ("학과", majors)):
+            if values is None:
+                continue
+            condition = ds.field(column).isin(list(values))
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def query(
+        self,
+        years: Optional[Iterable[int]] = None,
+        universities: Optional[Iterable[str]] = None,
+        majors: Optional[Iterable[str]] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        조건에 맞는 입결 행만 읽습니다.
+
+        Args:
+            years (Optional[Iterable[int]]): 학년도 (기본값: 전체)
+            universities (Optional[Iterable[str]]): 대학명 (기본값: 전체)
+            majors (Optional[Iterable[str]]): 학과 (기본값: 전체)
+            columns (Optional[List[str]]): 읽을 열 (기본값: 전체)
+
+        Returns:
+            pd.DataFrame: 조회 결과 (저장된 학년도가 없으면 빈 데이터프레임)
+        """
+        if not self.years():
+            return pd.DataFrame(columns=columns or SCHEMA.names)
+        table = self._dataset().to_table(columns=columns, filter=AdmissionStore._filter(years, universities, majors))
+        return table.to_pandas()
+
+    def iter_chunks(self, year: int, chunk_rows: int = INGEST_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        한 학년도의 행을 대학 파티션 순서대로 청크 단위로 읽습니다. (대학 안에서는 학과 순)
+
+        Args:
+            year (int): 학년도
+            chunk_rows (int): 청크당 최대 행 수
+
+        Yields:
+            pd.DataFrame: 입결 행 청크
+        """
+        if year not in self.years():
+            return
+        dataset = self._dataset()
+        # 같은 데이터가 항상 같은 순서로 읽혀야 인덱스 버전 해시가 유지되므로 경로 순으로 정렬합니다
+        fragments = sorted(dataset.get_fragments(filter=ds.field("학년도") == year), key=lambda fragment: fragment.path)
+        for fragment in fragments:
+            for batch in fragment.to_batches(schema=dataset.schema, batch_size=chunk_rows):
+                yield batch.to_pandas()
+
+
+@lru_cache(maxsize=1)
+def get_admission_store() -> AdmissionStore:
+    """
+    설정된 학년도를 수집한 저장소를 프로세스당 한 번만 준비합니다.
+
+    Returns:
+        AdmissionStore: 입결 데이터 저장소
+    """
+    store = AdmissionStore()
+    store.sync()
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DreamCourse 학년도별 입결 데이터 관리")
+    parser.add_argument("command", choices=["ingest", "sync", "years"], help="실행할 작업")
+    parser.add_argument("--year", type=int, default=None, help="ingest할 학년도")
+    parser.add_argument("--csv", type=str, default=None, help="ingest할 입결 CSV 경로")
+    parser.add_argument("--encoding", type=str, default=ENCODINGS["admission"], help="CSV 인코딩")
+    args = parser.parse_args()
+
+    store = AdmissionStore()
+    if args.command == "ingest":
+        if args.year is None or args.csv is None:
+            parser.error("ingest에는 --year와 --csv가 필요합니다.")
+        with store.ingest_lock():
+            rows = store.ingest(Path(args.csv), args.year, encoding=args.encoding)
+        print(f"{args.year}학년도 {rows}행 수집 완료")
+        print(f"인덱스 게시: python -m index_store publish --shard {admission_shard(args.year)}")
+    elif args.command == "sync":
+        print(f"새로 수집한 학년도: {store.sync()}")
+    print(f"저장된 학년도: {store.years()}")
+
+
+if __name__ == "__main__":
+    main()
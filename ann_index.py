@@ -0,0 +1,266 @@
+"""
+DreamCourse 근사 최근접 이웃(ANN) 인덱스 팩토리
+
+config.VECTOR_INDEX_TYPE에 따라 Flat / IVF-Flat / HNSW / IVF-PQ 인덱스를 생성합니다.
+IVF 계열은 코퍼스 표본으로 학습하며, 구축 파라미터는 인덱스 매니페스트에 함께 저장되고
+검색 파라미터(nprobe, efSearch)는 로딩 시점에 설정값으로 조정할 수 있습니다.
+IncrementalIndexBuilder는 대용량 코퍼스를 배치 단위로 임베딩하면서 인덱스에 바로 추가할 때 사용합니다.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from config import VECTOR_INDEX_PARAMS, VECTOR_INDEX_TYPE
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+# FAISS는 클러스터당 최소 39개의 학습 벡터를 권장합니다
+MIN_POINTS_PER_CENTROID = 39
+
+logger = logging.getLogger(__name__)
+
+
+class AnnIndexFactory:
+    """ANN 인덱스 생성, 학습, 검색 파라미터 조정을 담당하는 클래스"""
+
+    @staticmethod
+    def resolve_params(index_type: str, count: int, dimension: int, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        코퍼스 크기에 맞게 구축 파라미터를 보정합니다.
+
+        Args:
+            index_type (str): 인덱스 종류
+            count (int): 벡터 수
+            dimension (int): 벡터 차원
+            params (Optional[Dict[str, Any]]): 기본 파라미터 (기본값: config.VECTOR_INDEX_PARAMS)
+
+        Returns:
+            Dict[str, Any]: 실제로 사용할 인덱스 종류와 파라미터 (대체한 경우 경고 로그를 남깁니다)
+        """
+        params = dict(VECTOR_INDEX_PARAMS if params is None else params)
+        requested = index_type
+
+        if index_type in ("ivf_flat", "ivf_pq"):
+            # 학습 표본이 부족하면 클러스터 수를 줄이고, 그래도 부족하면 Flat으로 대체합니다
+            params["ivf_nlist"] = min(params["ivf_nlist"], count // MIN_POINTS_PER_CENTROID)
+            if params["ivf_nlist"] < 1:
+                index_type = "flat"
+
+        if index_type == "ivf_pq":
+            if dimension % params["pq_m"] != 0 or count < MIN_POINTS_PER_CENTROID * (1 << params["pq_nbits"]):
+                index_type = "ivf_flat"
+
+        if index_type != requested:
+            logger.warning(
+                "%s 인덱스를 %s로 대체합니다 (벡터 %d개, 차원 %d, pq_m=%s, pq_nbits=%s)",
+                requested, index_type, count, dimension, params.get("pq_m"), params.get("pq_nbits")
+            )
+        params["index_type"] = index_type
+        return params
+
+    @staticmethod
+    def factory_string(params: Dict[str, Any]) -> str:
+        """
+        faiss.index_factory 문자열을 생성합니다.
+
+        Args:
+            params (Dict[str, Any]): resolve_params가 반환한 파라미터
+
+        Returns:
+            str: 팩토리 문자열 (예: "IVF256,PQ16x8")
+        """
+        index_type = params["index_type"]
+        if index_type == "ivf_flat":
+            return f"IVF{params['ivf_nlist']},Flat"
+        if index_type == "hnsw":
+            return f"HNSW{params['hnsw_m']},Flat"
+        if index_type == "ivf_pq":
+            return f"IVF{params['ivf_nlist']},PQ{params['pq_m']}x{params['pq_nbits']}"
+        return "Flat"
+
+    @staticmethod
+    def build(
+        vectors: np.ndarray,
+        index_type: str = VECTOR_INDEX_TYPE,
+        params: Optional[Dict[str, Any]] = None
+    ) -> faiss.Index:
+        """
+        벡터로 인덱스를 생성하고, 필요하면 표본으로 학습한 뒤 벡터를 추가합니다.
+
+        Args:
+            vectors (np.ndarray): (N, D) float32 벡터
+            index_type (str): 인덱스 종류 ('flat', 'ivf_flat', 'hnsw', 'ivf_pq')
+            params (Optional[Dict[str, Any]]): 파라미터 (기본값: config.VECTOR_INDEX_PARAMS)
+
+        Returns:
+            faiss.Index: 구축된 인덱스
+
+        Raises:
+            ValueError: 알 수 없는 인덱스 종류인 경우
+        """
+        builder = IncrementalIndexBuilder(index_type, params)
+        builder.add(vectors)
+        return builder.finish()
+
+    @staticmethod
+    def create_empty(dimension: int, params: Dict[str, Any]) -> faiss.Index:
+        """
+        학습 전의 빈 인덱스를 생성합니다.
+
+        Args:
+            dimension (int): 벡터 차원
+            params (Dict[str, Any]): resolve_params가 반환한 파라미터
+
+        Returns:
+            faiss.Index: 빈 인덱스
+        """
+        index = faiss.index_factory(dimension, AnnIndexFactory.factory_string(params), faiss.METRIC_L2)
+        if params["index_type"] == "hnsw":
+            index.hnsw.efConstruction = params["hnsw_ef_construction"]
+        return index
+
+    @staticmethod
+    def train(index: faiss.Index, vectors: np.ndarray, sample_size: int, seed: int = 0):
+        """
+        무작위 표본으로 인덱스를 학습합니다.
+
+        Args:
+            index (faiss.Index): 학습할 인덱스
+            vectors (np.ndarray): 전체 벡터
+            sample_size (int): 학습 표본 크기
+            seed (int): 표본 추출 시드
+        """
+        if len(vectors) > sample_size:
+            sample = np.random.default_rng(seed).choice(len(vectors), sample_size, replace=False)
+            vectors = vectors[np.sort(sample)]
+        index.train(vectors)
+
+    @staticmethod
+    def apply_search_params(index: faiss.Index, params: Optional[Dict[str, Any]] = None):
+        """
+        IVF의 nprobe, HNSW의 efSearch를 설정합니다. (다른 인덱스는 변경 없음)
+
+        Args:
+            index (faiss.Index): 대상 인덱스
+            params (Optional[Dict[str, Any]]): 파라미터 (기본값: config.VECTOR_INDEX_PARAMS)
+        """
+        params = VECTOR_INDEX_PARAMS if params is None else params
+
+        try:
+            faiss.extract_index_ivf(index).nprobe = params["ivf_nprobe"]
+        except RuntimeError:
+            pass  # IVF 인덱스가 아님
+
+        if hasattr(index, "hnsw"):
+            index.hnsw.efSearch = params["hnsw_ef_search"]
+
+    @staticmethod
+    def describe(index: faiss.Index) -> Dict[str, Any]:
+        """
+        매니페스트에 기록할 인덱스 정보를 반환합니다.
+
+        Args:
+            index (faiss.Index): 대상 인덱스
+
+        Returns:
+            Dict[str, Any]: 인덱스 클래스와 주요 파라미터
+        """
+        info: Dict[str, Any] = {"class": type(index).__name__, "ntotal": index.ntotal}
+        try:
+            ivf = faiss.extract_index_ivf(index)
+            info["ivf_nlist"] = ivf.nlist
+            info["ivf_nprobe"] = ivf.nprobe
+        except RuntimeError:
+            pass
+        if hasattr(index, "hnsw"):
+            info["hnsw_ef_search"] = index.hnsw.efSearch
+            info["hnsw_ef_construction"] = index.hnsw.efConstruction
+        return info
+
+
+class IncrementalIndexBuilder:
+    """
+    벡터를 배치 단위로 받아 인덱스를 점진적으로 구축하는 클래스
+
+    Flat / HNSW는 첫 배치에서 인덱스를 만들고 이후 배치를 바로 추가합니다.
+    IVF 계열은 처음 train_sample_size개의 벡터를 모아 학습한 뒤부터 배치를 바로 추가하므로,
+    구축 중 메모리에는 인덱스 자체와 학습 표본만 남습니다. (코퍼스 전체가 표본보다 작으면
+    전체로 학습하므로 AnnIndexFactory.build와 같은 인덱스가 만들어집니다)
+    """
+
+    def __init__(self, index_type: str = VECTOR_INDEX_TYPE, params: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            index_type (str): 인덱스 종류 ('flat', 'ivf_flat', 'hnsw', 'ivf_pq')
+            params (Optional[Dict[str, Any]]): 파라미터 (기본값: config.VECTOR_INDEX_PARAMS)
+
+        Raises:
+            ValueError: 알 수 없는 인덱스 종류인 경우
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {index_type}. Available types: {list(INDEX_TYPES)}")
+
+        self.index_type = index_type
+        self.params = dict(VECTOR_INDEX_PARAMS if params is None else params)
+        self.index: Optional[faiss.Index] = None
+        self._resolved: Optional[Dict[str, Any]] = None
+        self._pending: List[np.ndarray] = []
+        self._pending_count = 0
+
+    @property
+    def ntotal(self) -> int:
+        """지금까지 추가된 벡터 수 (학습 대기 중인 벡터 포함)"""
+        return (self.index.ntotal if self.index is not None else 0) + self._pending_count
+
+    def add(self, vectors: np.ndarray):
+        """
+        벡터 배치를 추가합니다.
+
+        Args:
+            vectors (np.ndarray): (N, D) float32 벡터
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.index is not None:
+            self.index.add(vectors)
+            return
+
+        self._pending.append(vectors)
+        self._pending_count += len(vectors)
+        if self.index_type not in ("ivf_flat", "ivf_pq") or self._pending_count >= self.params["train_sample_size"]:
+            self._create()
+
+    def _create(self):
+        """모아 둔 벡터로 인덱스 종류·파라미터를 정하고, 필요하면 학습한 뒤 추가합니다."""
+        pending, count = self._pending, self._pending_count
+        self._pending, self._pending_count = [], 0
+
+        dimension = pending[0].shape[1]
+        self._resolved = AnnIndexFactory.resolve_params(self.index_type, count, dimension, self.params)
+        index = AnnIndexFactory.create_empty(dimension, self._resolved)
+        if not index.is_trained:
+            AnnIndexFactory.train(index, pending[0] if len(pending) == 1 else np.concatenate(pending), self._resolved["train_sample_size"])
+        # IVF-PQ는 추가하는 벡터 수에 비례하는 임시 버퍼를 쓰므로 받은 배치 단위 그대로 추가합니다
+        for vectors in pending:
+            index.add(vectors)
+        self.index = index
+
+    def finish(self) -> faiss.Index:
+        """
+        구축을 마치고 검색 파라미터를 설정한 인덱스를 반환합니다.
+
+        Returns:
+            faiss.Index: 구축된 인덱스
+
+        Raises:
+            ValueError: 추가된 벡터가 없는 경우
+        """
+        if self.index is None:
+            if not self._pending_count:
+                raise ValueError("No vectors were added to the index.")
+            self._create()
+
+        AnnIndexFactory.apply_search_params(self.index, self._resolved)
+        return self.index
@@ -0,0 +1,119 @@
+"""
+DreamCourse 마지막 정상 답변 저장소
+
+질문별로 마지막으로 성공한(테이블 검증을 통과한) LLM 답변을 SQLite에 보관합니다.
+업스트림 회로가 열려 있거나 호출이 실패하면 RAGService가 이 답변을 "저장된 결과"로 대신 제공하고,
+정상 응답이 생성될 때마다 백그라운드에서 갱신합니다 (stale-while-revalidate).
+
+- 키는 (검색 범위, 프롬프트 타입, 질문)입니다. 검색 범위는 학교·학년도 샤드 이름이며, 인덱스 버전은
+  답변과 함께 기록만 하므로 새 버전이 게시되어도 장애 시에는 이전 버전의 답변을 제공할 수 있습니다.
+- WAL 모드로 열어 여러 레플리카 프로세스가 같은 파일을 동시에 읽고 쓸 수 있습니다.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from config import ANSWER_STORE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    scope TEXT NOT NULL,
+    prompt_type TEXT NOT NULL,
+    question TEXT NOT NULL,
+    version TEXT,
+    answer TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, prompt_type, question)
+)
+"""
+
+
+@dataclass
+class StoredAnswer:
+    """저장된 답변"""
+
+    answer: str
+    version: Optional[str]
+    updated_at: float
+
+
+def answer_scope(vectorstore) -> str:
+    """
+    벡터 스토어의 검색 범위 이름을 반환합니다.
+
+    Args:
+        vectorstore: 벡터 스토어 인스턴스 (ShardedVectorStore이면 샤드 이름 목록 사용)
+
+    Returns:
+        str: 검색 범위 (예: "경기고등학교+_shared+_admission_2024", 단일 인덱스는 "default")
+    """
+    shards = getattr(vectorstore, "shards", None)
+    if not shards:
+        return "default"
+    return "+".join(name for name, _ in shards)
+
+
+class AnswerStore:
+    """질문별 마지막 정상 답변을 보관하는 SQLite 저장소"""
+
+    def __init__(self, path: Optional[Path] = ANSWER_STORE_PATH):
+        """
+        Args:
+            path (Optional[Path]): SQLite 파일 경로 (None이면 메모리에만 보관)
+        """
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        # 쓰기는 서비스 루프의 스레드풀에서 실행하므로 스레드 간 공유를 허용하고 락으로 직렬화합니다
+        self._conn = sqlite3.connect(
+            ":memory:" if path is None else str(path),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=5.0
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            if path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(SCHEMA)
+
+    def get(self, scope: str, prompt_type: str, question: str) -> Optional[StoredAnswer]:
+        """
+        저장된 답변을 조회합니다.
+
+        Args:
+            scope (str): answer_scope()가 반환한 검색 범위
+            prompt_type (str): 프롬프트 타입
+            question (str): 질문
+
+        Returns:
+            Optional[StoredAnswer]: 저장된 답변 또는 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer, version, updated_at FROM answers WHERE scope = ? AND prompt_type = ? AND question = ?",
+                (scope, prompt_type, question.strip())
+            ).fetchone()
+        return StoredAnswer(*row) if row is not None else None
+
+    def put(self, scope: str, prompt_type: str, question: str, version: Optional[str], answer: str):
+        """
+        답변을 저장하거나 갱신합니다.
+
+        Args:
+            scope (str): answer_scope()가 반환한 검색 범위
+            prompt_type (str): 프롬프트 타입
+            question (str): 질문
+            version (Optional[str]): 답변을 생성한 인덱스 버전
+            answer (str): 답변
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (scope, prompt_type, question, version, answer, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, prompt_type, question.strip(), version, answer, time.time())
+            )
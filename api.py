@@ -0,0 +1,250 @@
+"""
+DreamCourse JSON API 서버
+
+Streamlit 세션 없이 학교 포털 등에서 직업·학과 추천, 커리큘럼, 입결 정보를 조회할 수 있는 HTTP API입니다.
+벡터 인덱스(학교 샤드 캐시)와 RAGService(이벤트 루프, LLM 커넥션 풀, 응답 캐시)는 프로세스 단일 인스턴스를
+페이지와 똑같이 재사용하며, 응답은 config.TABLE_COLUMNS 스키마의 행 목록으로 반환합니다.
+
+엔드포인트:
+    GET  /health
+    GET  /v1/jobs/complete?q=사회복&limit=8
+    POST /v1/majors      {"job": "의사", "school": "경기고등학교"}
+    POST /v1/curriculum  {"major": "의예과", "grade": "고2", "school": "경기고등학교"}
+    POST /v1/admission   {"major": "의예과", "years": [2023, 2024]}
+    GET  /v1/routes      프롬프트 타입별 모델 경로, 경로별 지연 시간·비용 집계, 프롬프트 버전
+
+사용 예:
+    OPENAI_API_KEY=... python -m api --port 8000
+"""
+
+import argparse
+import asyncio
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from admission_store import get_admission_store
+from circuit_breaker import CircuitOpenError
+from config import (
+    API_HOST,
+    API_PORT,
+    DEFAULT_SCHOOL,
+    GRADE_OPTIONS,
+    JOB_SUGGESTION_LIMIT,
+    SCHOOL_CURRICULUM_CSVS,
+    TABLE_COLUMNS
+)
+from job_index import get_job_index, resolve_job
+from prompts import PromptRegistry, QuestionBuilder
+from rag_service import RAGService
+from utils import TableParser, VectorStoreManager
+
+
+class APIError(Exception):
+    """HTTP 상태 코드와 함께 JSON 오류로 변환되는 예외"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+async def _read_fields(request: Request, required: tuple) -> Dict[str, str]:
+    """
+    요청 본문(JSON)을 읽고 필수 필드를 검증합니다.
+
+    Args:
+        request (Request): HTTP 요청
+        required (tuple): 필수 필드 이름
+
+    Returns:
+        Dict[str, str]: 앞뒤 공백을 제거한 필드 값 (school 기본값 포함)
+
+    Raises:
+        APIError: 본문이 JSON 객체가 아니거나 필수 필드가 비어 있는 경우 (422)
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        raise APIError(422, "요청 본문은 JSON 객체여야 합니다.")
+    if not isinstance(body, dict):
+        raise APIError(422, "요청 본문은 JSON 객체여야 합니다.")
+
+    fields = {key: str(value).strip() for key, value in body.items() if value is not None}
+    missing = [key for key in required if not fields.get(key)]
+    if missing:
+        raise APIError(422, f"필수 필드가 없습니다: {', '.join(missing)}")
+
+    fields["school"] = fields.get("school") or DEFAULT_SCHOOL
+    if fields["school"] not in SCHOOL_CURRICULUM_CSVS:
+        raise APIError(422, f"지원하지 않는 학교입니다: {fields['school']}")
+    return fields
+
+
+async def _query_table(
+    request: Request,
+    school: str,
+    prompt_type: str,
+    question: str,
+    table: str,
+    extra: Optional[Dict[str, Any]] = None,
+    years: Optional[List[int]] = None
+) -> JSONResponse:
+    """
+    학교 샤드에서 RAG 질의를 실행하고 결과 테이블을 JSON으로 반환합니다.
+
+    Args:
+        request (Request): HTTP 요청 (앱 상태의 API 키 사용)
+        school (str): 학교명
+        prompt_type (str): 프롬프트 타입
+        question (str): 질문
+        table (str): TABLE_COLUMNS 키
+        extra (Optional[Dict[str, Any]]): 응답에 함께 담을 값
+        years (Optional[List[int]]): 검색할 입결 학년도 (기본값: 최근 학년도)
+
+    Returns:
+        JSONResponse: {"school", "question", "columns", "rows", "cached", "cached_at", ...extra}
+            (cached가 true이면 업스트림 장애로 cached_at 시각에 저장된 결과를 대신 반환한 것)
+
+    Raises:
+        APIError: 인덱스를 열 수 없거나 회로가 열려 있고 저장된 결과가 없는 경우(503),
+            LLM 호출이 실패(502)·마감 시간을 넘긴 경우(504)
+    """
+    api_key = request.app.state.api_key
+
+    # 인덱스 게시·mmap 로딩은 블로킹 작업이므로 스레드풀에서 실행합니다 (이후에는 샤드 캐시 적중)
+    vectorstore = await run_in_threadpool(VectorStoreManager.get_school_vectorstore, api_key, school, years, prompt_type)
+    if vectorstore is None:
+        raise APIError(503, "벡터 인덱스를 열 수 없습니다.")
+
+    # 페이지와 같은 서비스 루프·응답 캐시를 사용하고, 결과만 서버 루프에서 기다립니다
+    service = RAGService.get_instance()
+    try:
+        answer = await asyncio.wrap_future(service.submit(service.aanswer(vectorstore, prompt_type, question, api_key)))
+    except CircuitOpenError as e:
+        raise APIError(503, str(e))
+    except TimeoutError as e:
+        raise APIError(504, str(e))
+    except Exception as e:
+        raise APIError(502, f"AI 응답 생성 중 오류 발생: {str(e)}")
+
+    columns = TABLE_COLUMNS[table]
+    df = TableParser.parse_table_response(answer.text, columns)
+    return JSONResponse({
+        "school": school,
+        "question": question,
+        "columns": columns,
+        "rows": df.to_dict(orient="records"),
+        "cached": answer.cached,
+        "cached_at": datetime.fromtimestamp(answer.cached_at).isoformat() if answer.cached else None,
+        **(extra or {}),
+    })
+
+
+async def majors(request: Request) -> JSONResponse:
+    """희망 직업의 관련 직업과 추천 학과를 반환합니다."""
+    fields = await _read_fields(request, ("job",))
+    job = resolve_job(fields["job"])
+    question = QuestionBuilder.job_question(job)
+    return await _query_table(request, fields["school"], "major_selection", question, "job", {"job": job})
+
+
+async def complete_jobs(request: Request) -> JSONResponse:
+    """입력 중인 직업명의 자동완성 후보를 반환합니다. (키 입력마다 호출해도 되도록 LLM을 쓰지 않음)"""
+    query = request.query_params.get("q", "")
+    try:
+        limit = min(int(request.query_params.get("limit", JOB_SUGGESTION_LIMIT)), 50)
+    except ValueError:
+        raise APIError(422, "limit은 정수여야 합니다.")
+    return JSONResponse({"query": query, "suggestions": get_job_index().complete(query, limit)})
+
+
+async def curriculum(request: Request) -> JSONResponse:
+    """학과와 학년에 맞는 학기별 추천 커리큘럼을 반환합니다."""
+    fields = await _read_fields(request, ("major", "grade"))
+    if fields["grade"] not in GRADE_OPTIONS:
+        raise APIError(422, f"grade는 {', '.join(GRADE_OPTIONS)} 중 하나여야 합니다.")
+    question = QuestionBuilder.curriculum_question(fields["major"], fields["grade"])
+    return await _query_table(request, fields["school"], "curriculum", question, "curriculum")
+
+
+async def admission(request: Request) -> JSONResponse:
+    """학과의 서울대/연대/고대 수시 입결 정보를 학년도별로 반환합니다. (years 생략 시 최근 학년도)"""
+    fields = await _read_fields(request, ("major",))
+    available = get_admission_store().years()
+    if fields.get("years"):
+        years = sorted({int(year) for year in re.findall(r"\d{4}", fields["years"])})
+        unknown = [year for year in years if year not in available]
+        if not years or unknown:
+            raise APIError(422, f"years는 {', '.join(map(str, available))} 중에서 선택해야 합니다.")
+    else:
+        years = get_admission_store().recent_years()
+
+    question = QuestionBuilder.admission_question(fields["major"], years)
+    return await _query_table(
+        request, fields["school"], "admission_table", question, "admission", {"years": years}, years
+    )
+
+
+async def routes(request: Request) -> JSONResponse:
+    """모델 경로 설정과 경로별 호출 수, p50/p95 지연 시간, 재호출 비율, 프롬프트 캐시 적중률, 비용, 프롬프트 버전을 반환합니다."""
+    router = RAGService.get_instance().router
+    shared_types = [route.prompt_type for route in router.routes.values() if router.prompt_cache(route)]
+    return JSONResponse({**router.describe(), "prompts": PromptRegistry.versions(shared_types)})
+
+
+async def health(request: Request) -> JSONResponse:
+    """프로세스 상태 확인용 엔드포인트"""
+    return JSONResponse({"status": "ok"})
+
+
+async def _handle_api_error(request: Request, exc: APIError) -> JSONResponse:
+    return JSONResponse({"error": exc.message}, status_code=exc.status_code)
+
+
+def create_app(api_key: Optional[str] = None) -> Starlette:
+    """
+    API 애플리케이션을 생성합니다.
+
+    Args:
+        api_key (Optional[str]): OpenAI API 키 (기본값: 환경 변수 OPENAI_API_KEY)
+
+    Returns:
+        Starlette: ASGI 애플리케이션
+    """
+    app = Starlette(
+        routes=[
+            Route("/health", health, methods=["GET"]),
+            Route("/v1/jobs/complete", complete_jobs, methods=["GET"]),
+            Route("/v1/majors", majors, methods=["POST"]),
+            Route("/v1/curriculum", curriculum, methods=["POST"]),
+            Route("/v1/admission", admission, methods=["POST"]),
+            Route("/v1/routes", routes, methods=["GET"]),
+        ],
+        exception_handlers={APIError: _handle_api_error},
+    )
+    app.state.api_key = os.getenv("OPENAI_API_KEY", "") if api_key is None else api_key
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="DreamCourse JSON API 서버")
+    parser.add_argument("--host", type=str, default=API_HOST, help="바인딩 주소")
+    parser.add_argument("--port", type=int, default=API_PORT, help="포트")
+    args = parser.parse_args()
+
+    # 워커 하나가 이벤트 루프에서 요청을 다중화합니다 (프로세스를 늘리면 인덱스는 mmap으로 공유)
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
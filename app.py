@@ -5,9 +5,17 @@ DreamCourse - 맞춤형 진로 설계 서비스
 """
 
 import streamlit as st
-from config import MESSAGES
+from config import DEFAULT_SCHOOL, TRACE_PANEL_ENABLED
+from metrics import record_script_run, start_metrics_server
+from tracing import tracer
 from utils import VectorStoreManager, SessionStateManager
-from pages import render_home_page, render_major_selection_page, render_curriculum_page
+from pages import (
+    render_home_page,
+    render_major_selection_page,
+    render_curriculum_page,
+    render_batch_page,
+    render_trace_panel
+)
 
 
 # ===============================
@@ -16,6 +24,12 @@ from pages import render_home_page, render_major_selection_page, render_curricul
 st.set_page_config(layout="wide", page_title="DreamCourse", page_icon="🎓")
 
 
+# ===============================
+# 메트릭 사이드카 서버 (프로세스당 1회)
+# ===============================
+start_metrics_server()
+
+
 # ===============================
 # API 키 로드
 # ===============================
@@ -30,42 +44,45 @@ except KeyError:
 # 세션 상태 초기화
 # ===============================
 SessionStateManager.initialize_session_state()
+SESSION_ID = SessionStateManager.get_session_id()
 
 
 # ===============================
-# 벡터 스토어 구축 (최초 1회)
+# 페이지 라우팅
 # ===============================
-if "vectorstore" not in st.session_state:
-    with st.spinner(MESSAGES["loading_vectordb"]):
-        vectorstore = VectorStoreManager.build_vectorstore(MASTER_API_KEY)
+def main():
+    """메인 함수 - 페이지 라우팅을 담당합니다."""
+    current_page = st.session_state.page
+    record_script_run(SESSION_ID, current_page)
+
+    with tracer.page_view(SESSION_ID, current_page):
+        # 학생의 학교 샤드 + 공통 샤드 (프로세스 간 공유되는 mmap 인덱스, 최초 1회 구축 후 재사용)
+        school = st.session_state.get("school", DEFAULT_SCHOOL)
+        vectorstore = VectorStoreManager.get_school_vectorstore(MASTER_API_KEY, school)
 
         if vectorstore is None:
             st.error("벡터 스토어 구축에 실패했습니다. 데이터 파일을 확인해주세요.")
             st.stop()
 
-        st.session_state.vectorstore = vectorstore
-
+        if current_page == "Home":
+            render_home_page()
 
-# ===============================
-# 페이지 라우팅
-# ===============================
-def main():
-    """메인 함수 - 페이지 라우팅을 담당합니다."""
-    current_page = st.session_state.page
-    vectorstore = st.session_state.vectorstore
+        elif current_page == "major_selection":
+            render_major_selection_page(vectorstore, MASTER_API_KEY)
 
-    if current_page == "Home":
-        render_home_page()
+        elif current_page == "curriculum":
+            render_curriculum_page(vectorstore, MASTER_API_KEY)
 
-    elif current_page == "major_selection":
-        render_major_selection_page(vectorstore, MASTER_API_KEY)
+        elif current_page == "batch":
+            render_batch_page(MASTER_API_KEY)
 
-    elif current_page == "curriculum":
-        render_curriculum_page(vectorstore, MASTER_API_KEY)
+        else:
+            st.error(f"알 수 없는 페이지: {current_page}")
+            SessionStateManager.navigate_to_page("Home")
 
-    else:
-        st.error(f"알 수 없는 페이지: {current_page}")
-        SessionStateManager.navigate_to_page("Home")
+    # 개발자 패널 (DREAMCOURSE_TRACE_PANEL=1)
+    if TRACE_PANEL_ENABLED:
+        render_trace_panel(SESSION_ID)
 
 
 # ===============================
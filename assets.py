@@ -0,0 +1,155 @@
+"""
+DreamCourse 정적 자산 파이프라인
+
+로고와 진로심리검사 안내 이미지를 표시 크기로 줄이고 AVIF / WebP / 대체 포맷(PNG 또는 JPEG)으로
+재압축하여 콘텐츠 해시가 붙은 파일명으로 static/ 에 기록합니다. 앱은 manifest.json을 읽어
+Streamlit 정적 서빙 경로(/app/static/)의 <picture> 태그로 이미지를 표시합니다.
+
+사용 예:
+    python -m assets
+"""
+
+import argparse
+import hashlib
+import io
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image
+
+from config import ASSET_MANIFEST, ASSET_SOURCES, STATIC_DIR, STATIC_URL_PREFIX
+
+# 포맷별 인코딩 옵션과 MIME 타입 (브라우저는 <source> 순서대로 지원하는 첫 포맷을 사용)
+ENCODERS = {
+    "avif": ({"format": "AVIF", "quality": 55}, "image/avif"),
+    "webp": ({"format": "WEBP", "quality": 80, "method": 6}, "image/webp"),
+    "png": ({"format": "PNG", "optimize": True}, "image/png"),
+    "jpeg": ({"format": "JPEG", "quality": 82, "optimize": True, "progressive": True}, "image/jpeg"),
+}
+
+
+class AssetPipeline:
+    """빌드 시점에 이미지 자산을 최적화하는 클래스"""
+
+    @staticmethod
+    def encode(image: Image.Image, fmt: str) -> bytes:
+        """
+        이미지를 지정한 포맷으로 인코딩합니다.
+
+        Args:
+            image (Image.Image): 원본 이미지
+            fmt (str): 포맷 이름 (ENCODERS의 키)
+
+        Returns:
+            bytes: 인코딩된 바이트열
+        """
+        options, _ = ENCODERS[fmt]
+        buffer = io.BytesIO()
+        image.save(buffer, **options)
+        return buffer.getvalue()
+
+    @staticmethod
+    def build(sources: Dict = ASSET_SOURCES, output_dir: Path = STATIC_DIR) -> Dict:
+        """
+        모든 자산을 빌드하고 manifest.json을 기록합니다.
+
+        Args:
+            sources (Dict): 자산 이름별 원본 경로와 표시 너비
+            output_dir (Path): 출력 디렉토리
+
+        Returns:
+            Dict: 자산 이름별 크기와 포맷별 파일명
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {}
+
+        for name, spec in sources.items():
+            with Image.open(spec["source"]) as source:
+                image = source.copy()
+            if image.width > spec["width"]:
+                height = round(image.height * spec["width"] / image.width)
+                image = image.resize((spec["width"], height), Image.LANCZOS)
+
+            # 투명도가 있으면 PNG, 사진이면 JPEG를 최종 대체 포맷으로 사용합니다
+            fallback = "png" if image.mode in ("RGBA", "LA", "P") else "jpeg"
+            if fallback == "jpeg" and image.mode != "RGB":
+                image = image.convert("RGB")
+
+            files = {}
+            for fmt in ("avif", "webp", fallback):
+                data = AssetPipeline.encode(image, fmt)
+                filename = f"{name}.{hashlib.sha256(data).hexdigest()[:10]}.{'jpg' if fmt == 'jpeg' else fmt}"
+                (output_dir / filename).write_bytes(data)
+                files[fmt] = filename
+
+            manifest[name] = {"width": image.width, "height": image.height, "files": files}
+
+        # 이전 빌드가 남긴 파일 정리
+        current = {filename for entry in manifest.values() for filename in entry["files"].values()}
+        for path in output_dir.iterdir():
+            if path.is_file() and path.name != ASSET_MANIFEST.name and path.name not in current:
+                path.unlink()
+
+        (output_dir / ASSET_MANIFEST.name).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        return manifest
+
+
+@lru_cache(maxsize=1)
+def load_manifest() -> Dict:
+    """
+    빌드된 자산 매니페스트를 프로세스당 한 번만 읽습니다.
+
+    Returns:
+        Dict: 자산 매니페스트 (빌드되지 않았으면 빈 딕셔너리)
+    """
+    try:
+        return json.loads(ASSET_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def get_asset(name: str) -> Optional[Dict]:
+    """
+    자산의 표시 크기와 포맷별 URL을 반환합니다.
+
+    Args:
+        name (str): 자산 이름
+
+    Returns:
+        Optional[Dict]: {"width", "height", "sources": [(url, mime), ...], "fallback": url} 또는 None
+    """
+    entry = load_manifest().get(name)
+    if entry is None:
+        return None
+
+    files = entry["files"]
+    fallback = "png" if "png" in files else "jpeg"
+    return {
+        "width": entry["width"],
+        "height": entry["height"],
+        "sources": [
+            (f"{STATIC_URL_PREFIX}/{files[fmt]}", ENCODERS[fmt][1])
+            for fmt in ("avif", "webp") if fmt in files
+        ],
+        "fallback": f"{STATIC_URL_PREFIX}/{files[fallback]}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DreamCourse 정적 자산 빌드")
+    parser.add_argument("--output", type=str, default=str(STATIC_DIR), help="출력 디렉토리")
+    args = parser.parse_args()
+
+    manifest = AssetPipeline.build(output_dir=Path(args.output))
+    for name, entry in manifest.items():
+        sizes = ", ".join(
+            f"{fmt} {(Path(args.output) / filename).stat().st_size / 1024:.1f}KB"
+            for fmt, filename in entry["files"].items()
+        )
+        print(f"{name} ({entry['width']}x{entry['height']}): {sizes}")
+
+
+if __name__ == "__main__":
+    main()
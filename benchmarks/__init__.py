@@ -0,0 +1,5 @@
+"""
+DreamCourse 벤치마크 모음
+
+저장소 루트에서 `python -m benchmarks.<모듈명>` 형태로 실행합니다.
+"""
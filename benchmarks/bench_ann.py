@@ -0,0 +1,126 @@
+"""
+ANN 인덱스 종류별 벤치마크
+
+군집 구조를 가진 합성 벡터로 Flat / IVF-Flat / HNSW / IVF-PQ 인덱스를 구축하고
+구축 시간, 인덱스 크기, 쿼리 지연 시간, Flat 대비 recall@k를 비교합니다.
+IVF는 nprobe, HNSW는 efSearch 값을 바꿔 가며 정확도-지연 시간 곡선을 함께 보고합니다.
+
+사용 예:
+    python -m benchmarks.bench_ann --size 200000 --dimension 256 --queries 500
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import faiss
+import numpy as np
+
+from ann_index import INDEX_TYPES, AnnIndexFactory
+from config import VECTOR_INDEX_PARAMS
+
+
+def make_synthetic_corpus(size: int, dimension: int, queries: int, clusters: int = 256, seed: int = 0):
+    """
+    실제 임베딩처럼 군집을 이루는 합성 벡터와 쿼리를 생성합니다.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (코퍼스 벡터, 쿼리 벡터)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension), dtype=np.float32)
+
+    def sample(count: int) -> np.ndarray:
+        points = centers[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, dimension), dtype=np.float32)
+        return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+    return sample(size), sample(queries)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """정답(Flat) 상위 k개 중 찾아낸 비율의 평균"""
+    k = truth.shape[1]
+    return float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+
+
+def measure_search(index: faiss.Index, queries: np.ndarray, truth: np.ndarray, k: int) -> Dict[str, float]:
+    """쿼리를 한 건씩 검색하여 지연 시간 분포와 recall@k를 측정합니다."""
+    latencies = []
+    found = np.empty((len(queries), k), dtype=np.int64)
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, ids = index.search(query[None, :], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found[i] = ids[0]
+
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        f"recall@{k}": round(recall_at_k(found, truth), 4),
+    }
+
+
+def run(size: int, dimension: int, queries: int, k: int, index_types: List[str]) -> Dict[str, Any]:
+    """인덱스 종류별로 구축·검색 지표를 측정합니다."""
+    # 벤치마크는 쿼리를 한 건씩 보내므로 OpenMP 스레드 오버헤드를 배제합니다
+    faiss.omp_set_num_threads(1)
+    corpus, query_vectors = make_synthetic_corpus(size, dimension, queries)
+
+    flat = faiss.IndexFlatL2(dimension)
+    flat.add(corpus)
+    _, truth = flat.search(query_vectors, k)
+
+    result: Dict[str, Any] = {"size": size, "dimension": dimension, "k": k, "indexes": {}}
+    for index_type in index_types:
+        start = time.perf_counter()
+        index = AnnIndexFactory.build(corpus, index_type)
+        build_seconds = time.perf_counter() - start
+
+        # 코퍼스가 작거나 차원이 pq_m으로 나누어지지 않으면 다른 종류로 대체되므로 (resolve_params가 경고 로그를 남김),
+        # 결과 키(요청한 종류)와 별도로 실제로 만들어진 인덱스 클래스(describe의 "class")를 기록합니다
+        entry: Dict[str, Any] = {
+            **AnnIndexFactory.describe(index),
+            "build_seconds": round(build_seconds, 2),
+            "index_mb": round(faiss.serialize_index(index).nbytes / 1024 / 1024, 1),
+            "search": {},
+        }
+
+        # 검색 파라미터 스윕 (해당 인덱스에 의미 있는 파라미터만)
+        if "ivf_nprobe" in entry:
+            sweep = [("ivf_nprobe", value) for value in (1, 4, 16, 64) if value <= entry["ivf_nlist"]]
+        elif "hnsw_ef_search" in entry:
+            sweep = [("hnsw_ef_search", value) for value in (16, 32, 64, 128, 256)]
+        else:
+            sweep = [(None, None)]
+
+        for name, value in sweep:
+            if name is not None:
+                AnnIndexFactory.apply_search_params(index, {**VECTOR_INDEX_PARAMS, name: value})
+            entry["search"][f"{name}={value}" if name else "exact"] = measure_search(index, query_vectors, truth, k)
+
+        result["indexes"][index_type] = entry
+        print(f"{index_type} ({type(index).__name__}): {json.dumps(entry, ensure_ascii=False)}")
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN 인덱스 종류별 벤치마크")
+    parser.add_argument("--size", type=int, default=200000, help="코퍼스 벡터 수")
+    parser.add_argument("--dimension", type=int, default=256, help="벡터 차원")
+    parser.add_argument("--queries", type=int, default=500, help="쿼리 수")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES, help="측정할 인덱스 종류")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    result = run(args.size, args.dimension, args.queries, args.k, args.types)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
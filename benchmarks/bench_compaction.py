@@ -0,0 +1,121 @@
+"""
+코퍼스 압축 벤치마크
+
+직업마다 추천 학과 행이 1~3개인 합성 학과 정보(일부 행은 같은 내용을 다시 내보낸 중복 행)를 만들고,
+압축하지 않은 코퍼스와 CorpusCompactor로 압축한 코퍼스를 스텁 임베딩 FAISS 인덱스로 구축하여
+문서 수, 본문 크기, 벡터 크기, 압축 시간과 질문별 상위 k개 문맥의 밀도(서로 다른 직업 수, 질문한 직업의 추천 학과 재현율)를 비교합니다.
+
+사용 예:
+    python -m benchmarks.bench_compaction --jobs 2000 --queries 300 --k 4
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from langchain.docstore.document import Document
+from langchain.vectorstores import FAISS
+
+from corpus_compactor import CorpusCompactor, split_values
+from stub_backends import StubEmbeddings
+from utils import DocumentProcessor
+
+FIELDS = ["방송", "IT", "보건", "복지", "교육", "공학", "예술", "경영"]
+MAJOR_SUFFIXES = ["학과", "교육과", "공학과", "상담과", "경영학과"]
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호"
+
+
+def make_majors(jobs: int, duplicate_rate: float, seed: int) -> pd.DataFrame:
+    """직업별 추천 학과 행을 연속해 둔 합성 학과 정보를 만듭니다."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(jobs):
+        job, field = "".join(rng.choices(SYLLABLES, k=4)) + f"{i}", rng.choice(FIELDS)
+        majors = rng.sample(MAJOR_SUFFIXES, rng.randint(1, 3))
+        for suffix in majors:
+            row = {"영역": field, "직업명": job, "추천학과": f"{field}{i % 97}{suffix}"}
+            rows.append(row)
+            if rng.random() < duplicate_rate:
+                rows.append(dict(row))
+    return pd.DataFrame(rows)
+
+
+def measure(documents: List[Document], truth: Dict[str, set], args: argparse.Namespace, seconds: float) -> Dict[str, Any]:
+    """
+    코퍼스 크기와 상위 k개 검색 문맥의 밀도를 측정합니다.
+
+    Args:
+        documents (List[Document]): 색인할 문서
+        truth (Dict[str, set]): 직업별 추천 학과 정답
+        args (argparse.Namespace): 벤치마크 설정
+        seconds (float): 코퍼스를 만드는 데 걸린 시간(초)
+
+    Returns:
+        Dict[str, Any]: 측정 결과
+    """
+    embeddings = StubEmbeddings(dimension=args.dimension)
+    vectorstore = FAISS.from_documents(documents, embeddings)
+
+    distinct, recall = [], []
+    for job in random.Random(args.seed).sample(sorted(truth), args.queries):
+        results = vectorstore.similarity_search(f"{job} 추천 학과", k=args.k)
+        distinct.append(len({document.metadata["직업"] for document in results}))
+        found = {major for document in results if document.metadata["직업"] == job
+                 for major in split_values(document.metadata["학과"])}
+        recall.append(len(found & truth[job]) / len(truth[job]))
+
+    return {
+        "documents": len(documents),
+        "text_kb": round(sum(len(document.page_content.encode("utf-8")) for document in documents) / 1024, 1),
+        "vectors_kb": round(vectorstore.index.ntotal * args.dimension * 4 / 1024, 1),
+        "build_seconds": round(seconds, 3),
+        "distinct_jobs_in_top_k": round(float(np.mean(distinct)), 2),
+        "major_recall_in_top_k": round(float(np.mean(recall)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="코퍼스 압축 벤치마크")
+    parser.add_argument("--jobs", type=int, default=2000, help="합성 직업 수")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="같은 행을 다시 내보낸 비율")
+    parser.add_argument("--queries", type=int, default=300, help="검색할 직업 수")
+    parser.add_argument("--k", type=int, default=4, help="질문별 검색 문서 수")
+    parser.add_argument("--dimension", type=int, default=256, help="스텁 임베딩 차원")
+    parser.add_argument("--seed", type=int, default=7, help="난수 시드")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    df = make_majors(args.jobs, args.duplicate_rate, args.seed)
+    truth: Dict[str, set] = {}
+    for row in df.to_dict("records"):
+        truth.setdefault(row["직업명"], set()).add(row["추천학과"])
+
+    start = time.perf_counter()
+    rows = list(DocumentProcessor.iter_major_documents([df]))
+    before = measure(rows, truth, args, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    compactor = CorpusCompactor(mergers={"job": DocumentProcessor.merge_job_documents})
+    compacted = list(compactor.compact(DocumentProcessor.iter_major_documents([df])))
+    after = measure(compacted, truth, args, time.perf_counter() - start)
+
+    result = {
+        "settings": vars(args),
+        "rows": len(df),
+        "before_per_row": before,
+        "after_compacted": {**after, "merged": compactor.stats.merged, "deduplicated": compactor.stats.deduplicated},
+    }
+
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+LLM 꼬리 지연 헤지 요청 벤치마크
+
+로그정규 지연 분포에 일정 확률의 업스트림 정체(tail)를 섞은 스텁 LLM으로 커리큘럼·학과 선택 질의를
+반복 실행하여, 헤지 요청을 끈 경우와 켠 경우의 종단 지연 p50/p95/p99와 헤지 비율(추가 호출 비용)을 비교합니다.
+각 요청은 서로 다른 질문이라 응답 캐시에 적중하지 않으며, 처음 warmup개 요청은 p95 관측용으로 측정에서 제외합니다.
+
+사용 예:
+    python -m benchmarks.bench_hedging --requests 2000 --latency 0.2 --tail-probability 0.03 --tail-latency 2.0
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from model_router import HedgeBudget, ModelRouter
+from rag_service import RAGService
+from stub_backends import StubChatModel, StubEmbeddings
+from utils import VectorStoreManager
+
+PROMPT_TYPES = ("major_selection", "curriculum")
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 지연 시간(ms)"""
+    p50, p95, p99 = np.percentile(np.asarray(latencies), [50, 95, 99]) * 1000
+    return {"p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1)}
+
+
+def run(vectorstore, args: argparse.Namespace, hedging: bool) -> Dict[str, Any]:
+    """
+    같은 지연 분포와 시드로 요청을 실행하고 프롬프트 타입별 종단 지연과 헤지 비율을 측정합니다.
+
+    Args:
+        vectorstore: 검색할 벡터 스토어
+        args (argparse.Namespace): 벤치마크 설정
+        hedging (bool): 헤지 요청 사용 여부
+
+    Returns:
+        Dict[str, Any]: 프롬프트 타입별 측정 결과
+    """
+    random.seed(args.seed)
+    llm = StubChatModel(
+        latency=args.latency,
+        jitter=args.sigma,
+        distribution="lognormal",
+        tail_probability=args.tail_probability,
+        tail_latency=args.tail_latency,
+    )
+    router = ModelRouter(hedging=hedging, hedge_budget=HedgeBudget(ratio=args.budget))
+    service = RAGService(llm_factory=lambda api_key, route: llm, semantic_cache=None, router=router)
+    latencies: Dict[str, List[float]] = {prompt_type: [] for prompt_type in PROMPT_TYPES}
+
+    async def drive():
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int):
+            prompt_type = PROMPT_TYPES[i % len(PROMPT_TYPES)]
+            async with semaphore:
+                start = time.perf_counter()
+                await service.aquery(vectorstore, prompt_type, f"{prompt_type} 질문 {i}", "stub")
+                if i >= args.warmup:
+                    latencies[prompt_type].append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in range(args.warmup + args.requests)))
+
+    service.submit(drive()).result()
+
+    results = {}
+    for row in router.stats.snapshot():
+        requests = len(latencies[row["prompt_type"]])
+        results[row["prompt_type"]] = {
+            **_percentiles(latencies[row["prompt_type"]]),
+            "requests": requests,
+            "hedges": row["hedges"],
+            "hedge_wins": row["hedge_wins"],
+            # 헤지 요청도 프롬프트 토큰을 쓰므로 추가 호출 비율이 곧 추가 비용 상한입니다
+            "hedge_rate": round(row["hedges"] / (requests + args.warmup // len(PROMPT_TYPES)), 4),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 꼬리 지연 헤지 요청 벤치마크")
+    parser.add_argument("--requests", type=int, default=2000, help="측정할 요청 수 (두 프롬프트 타입에 번갈아 배분)")
+    parser.add_argument("--warmup", type=int, default=200, help="측정에서 제외할 초기 요청 수 (p95 관측용)")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 요청 수")
+    parser.add_argument("--latency", type=float, default=0.2, help="스텁 LLM 지연 중앙값(초)")
+    parser.add_argument("--sigma", type=float, default=0.25, help="로그정규 분포의 로그 표준편차")
+    parser.add_argument("--tail-probability", type=float, default=0.03, help="업스트림 정체 확률")
+    parser.add_argument("--tail-latency", type=float, default=2.0, help="업스트림 정체 시 지연(초)")
+    parser.add_argument("--budget", type=float, default=0.1, help="헤지 요청 비율 상한")
+    parser.add_argument("--seed", type=int, default=0, help="지연 시간 난수 시드")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    vectorstore = VectorStoreManager.build_vectorstore("stub", embeddings=StubEmbeddings())
+    result = {
+        "settings": vars(args),
+        "before_no_hedge": run(vectorstore, args, hedging=False),
+        "after_hedge": run(vectorstore, args, hedging=True),
+    }
+
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+대용량 CSV 색인 메모리 벤치마크
+
+크기가 다른 합성 입결 CSV로 (1) CSV 전체를 읽어 모든 텍스트와 임베딩을 메모리에 모은 뒤
+인덱스를 만드는 방식과 (2) 청크 단위로 읽어 배치마다 임베딩·색인하는 스트리밍 방식의
+최대 RSS를 비교합니다. 각 구축은 새로 띄운(spawn) 프로세스에서 실행하여 서로 영향을 주지 않습니다.
+
+스트리밍 방식의 최대 메모리는 청크·배치 크기와 인덱스 자체의 크기로 정해지므로,
+벡터를 압축 저장하는 IVF-PQ에서는 입력 크기와 무관하게 거의 일정하고
+Flat에서는 인덱스가 보관하는 float32 벡터(문서당 4 x 차원 바이트)만큼만 늘어납니다.
+
+사용 예:
+    python -m benchmarks.bench_ingest --rows 25000 100000 400000 --types flat ivf_pq
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+DIMENSION = 256
+ADMISSION_TYPES = ["학생부교과", "학생부종합", "기회균형", "지역균형", "논술", "정시"]
+
+
+def write_admission_csv(path: Path, rows: int, seed: int = 0):
+    """
+    원본 입결 CSV와 같은 열을 가진 합성 CSV를 기록합니다. (학과마다 전형 행이 연속으로 배치)
+
+    Args:
+        path (Path): 기록할 경로
+        rows (int): 행 수
+        seed (int): 난수 시드
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("대학명,전형명,학과,인원,경쟁률,충원순위,50% 컷,70% 컷\n")
+        written, major = 0, 0
+        while written < rows:
+            university, department = f"합성대학교{major % 300}", f"합성학과{major}"
+            for admission in rng.sample(ADMISSION_TYPES, rng.randint(2, 5)):
+                if written == rows:
+                    break
+                f.write(
+                    f"{university},{admission},{department},{rng.randint(3, 40)},{rng.uniform(2, 30):.2f},"
+                    f"{rng.randint(0, 20)},{rng.uniform(1, 4):.2f},{rng.uniform(1, 5):.2f}\n"
+                )
+                written += 1
+            major += 1
+
+
+def read_rss_mb() -> float:
+    """/proc/self/status의 현재 RSS(MB)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_build(csv_path: str, root: str, mode: str, index_type: str, chunk_rows: int, batch_size: int) -> Dict[str, Any]:
+    """
+    새 프로세스에서 인덱스를 한 번 구축·게시하고 최대 RSS를 보고합니다.
+
+    Args:
+        csv_path (str): 입결 CSV 경로
+        root (str): IndexStore 루트 경로
+        mode (str): "in_memory" 또는 "stream"
+        index_type (str): 인덱스 종류
+        chunk_rows (int): 스트리밍 시 CSV 청크당 행 수
+        batch_size (int): 스트리밍 시 임베딩 배치 크기
+
+    Returns:
+        Dict[str, Any]: 문서 수, 소요 시간, RSS 측정값(MB)
+    """
+    import pandas as pd
+    from langchain.docstore.document import Document
+    from langchain.docstore.in_memory import InMemoryDocstore
+    from langchain.vectorstores import FAISS
+
+    from ann_index import AnnIndexFactory
+    from config import VECTOR_INDEX_PARAMS
+    from index_store import IndexStore
+    from stub_backends import StubEmbeddings
+    from utils import DataLoader, DocumentProcessor
+
+    # 어느 크기에서도 IVF가 학습되도록 학습 표본을 줄입니다 (표본 버퍼는 배치와 함께 고정 비용)
+    params = {**VECTOR_INDEX_PARAMS, "ivf_nlist": 256, "train_sample_size": 20_000}
+    embeddings = StubEmbeddings(DIMENSION)
+    store = IndexStore(Path(root))
+    baseline = read_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "stream":
+        chunks = DataLoader.iter_csv_chunks(Path(csv_path), "utf-8", chunk_rows)
+        version = store.publish_stream(
+            DocumentProcessor.iter_admission_texts(chunks), embeddings, batch_size, index_type, params
+        )
+    else:
+        texts = DocumentProcessor.create_admission_texts(pd.read_csv(csv_path, encoding="utf-8"))
+        vectors = np.array(embeddings.embed_documents(texts), dtype=np.float32)
+        vectorstore = FAISS(
+            embedding_function=embeddings,
+            index=AnnIndexFactory.build(vectors, index_type, params),
+            docstore=InMemoryDocstore({str(i): Document(page_content=text) for i, text in enumerate(texts)}),
+            index_to_docstore_id={i: str(i) for i in range(len(texts))}
+        )
+        version = store.publish(vectorstore)
+
+    manifest = json.loads((store.versions_dir / version / "manifest.json").read_text(encoding="utf-8"))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "documents": manifest["count"],
+        "index": manifest["index"]["class"],
+        "seconds": round(time.perf_counter() - start, 1),
+        "baseline_mb": round(baseline, 1),
+        "peak_mb": round(peak, 1),
+        "build_mb": round(peak - baseline, 1),
+    }
+
+
+def run(rows_list: List[int], index_types: List[str], modes: List[str], chunk_rows: int, batch_size: int) -> List[Dict[str, Any]]:
+    """입력 크기·인덱스 종류·방식별로 구축하여 최대 RSS를 측정합니다."""
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in rows_list:
+            csv_path = Path(workdir) / f"admission_{rows}.csv"
+            write_admission_csv(csv_path, rows)
+            for index_type in index_types:
+                for mode in modes:
+                    root = Path(workdir) / f"{rows}-{index_type}-{mode}"
+                    # 측정마다 새 프로세스를 띄워 이전 구축의 메모리가 섞이지 않게 합니다
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        result = pool.submit(
+                            run_build, str(csv_path), str(root), mode, index_type, chunk_rows, batch_size
+                        ).result()
+                    result = {"rows": rows, "csv_mb": round(csv_path.stat().st_size / 1024 / 1024, 1),
+                              "type": index_type, "mode": mode, **result}
+                    print(json.dumps(result, ensure_ascii=False))
+                    results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 CSV 색인 메모리 벤치마크")
+    parser.add_argument("--rows", nargs="+", type=int, default=[25000, 100000, 400000], help="CSV 행 수")
+    parser.add_argument("--types", nargs="+", default=["flat", "ivf_pq"], help="측정할 인덱스 종류")
+    parser.add_argument("--modes", nargs="+", default=["in_memory", "stream"], choices=["in_memory", "stream"])
+    parser.add_argument("--chunk-rows", type=int, default=20000, help="스트리밍 CSV 청크당 행 수")
+    parser.add_argument("--batch-size", type=int, default=256, help="스트리밍 임베딩 배치 크기")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.types, args.modes, args.chunk_rows, args.batch_size)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
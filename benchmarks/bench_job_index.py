@@ -0,0 +1,141 @@
+"""
+직업명 자동완성·교정 인덱스 벤치마크
+
+분야 × 세부 분야 × 직무를 조합한 합성 직업명으로 인덱스를 구축하고, 구축 시간과 메모리,
+키 입력마다 호출되는 자동완성 지연 시간, 오타가 섞인 입력의 교정 지연 시간과 정확도를 측정합니다.
+
+사용 예:
+    python -m benchmarks.bench_job_index --size 100000
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from job_index import JobNameIndex, decompose, edit_distance
+
+FIELDS = [
+    "데이터", "소프트웨어", "인공지능", "로봇", "반도체", "자동차", "항공", "우주", "해양", "환경", "에너지", "원자력",
+    "바이오", "의료", "제약", "식품", "농업", "축산", "건축", "토목", "도시", "교통", "물류", "무역", "금융", "보험",
+    "회계", "세무", "법률", "특허", "교육", "상담", "복지", "스포츠", "게임", "영상", "음악", "공연", "패션", "미용",
+    "관광", "호텔", "항만", "철도", "통신", "보안", "네트워크", "클라우드", "블록체인", "광고", "출판", "방송", "언론",
+    "문화재", "가구", "섬유", "화학", "재료", "기계", "전기",
+]
+SPECIALTIES = [
+    "시스템", "플랫폼", "서비스", "품질", "안전", "연구", "정책", "전략", "마케팅", "영업", "생산", "설비", "공정",
+    "콘텐츠", "디자인", "운영", "인프라", "진단", "분석", "기획", "감리", "검사", "인증", "교육", "정보", "자원",
+    "시험", "표준", "국제", "지역", "데이터", "기술", "환경", "위기", "고객", "인사", "구매", "재무", "홍보", "개발",
+]
+ROLES = [
+    "개발자", "연구원", "기술자", "관리자", "분석가", "설계사", "컨설턴트", "엔지니어", "전문가", "기획자", "디자이너",
+    "평가사", "감독관", "조정사", "상담사", "강사", "운영자", "관제사", "심사원", "측정원", "정비사", "편집자", "작가",
+    "코디네이터", "매니저", "검사원", "조사원", "중개인", "교사", "해설가", "트레이너", "감정사", "시험원", "설치원",
+    "수리원", "판매원", "관리원", "큐레이터", "기록사", "번역가", "사서", "통역사", "건축가", "조향사", "제도사",
+]
+
+SYLLABLES = "가나다라마바사아자차카타파하개내대래매배새애재채"
+
+
+def make_job_names(size: int, seed: int = 0) -> List[str]:
+    """분야·세부 분야·직무를 조합해 서로 다른 합성 직업명을 생성합니다."""
+    names = [f"{field}{specialty} {role}" for field in FIELDS for specialty in SPECIALTIES for role in ROLES]
+    random.Random(seed).shuffle(names)
+    return names[:size]
+
+
+def make_typo(name: str, rng: random.Random) -> str:
+    """음절 하나를 바꾸거나 빼거나 이웃 음절과 순서를 바꾼 오타를 만듭니다."""
+    chars = list(name.replace(" ", "" if rng.random() < 0.5 else " "))
+    position = rng.randrange(len(chars))
+    kind = rng.choice(("replace", "delete", "swap"))
+    if kind == "replace":
+        chars[position] = rng.choice(SYLLABLES)
+    elif kind == "delete" and len(chars) > 2:
+        del chars[position]
+    elif position + 1 < len(chars):
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    return "".join(chars)
+
+
+def measure(func: Callable[[str], Any], inputs: List[str]) -> Dict[str, float]:
+    """입력마다 호출하여 지연 시간 분포(ms)를 측정합니다."""
+    latencies = []
+    for text in inputs:
+        start = time.perf_counter()
+        func(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        "max_ms": round(float(np.max(latencies)), 3),
+    }
+
+
+def run(size: int, queries: int, seed: int = 0) -> Dict[str, Any]:
+    """인덱스 구축, 자동완성, 교정 지표를 측정합니다."""
+    names = make_job_names(size, seed)
+    rng = random.Random(seed)
+    targets = rng.sample(names, min(queries, len(names)))
+
+    start = time.perf_counter()
+    index = JobNameIndex(names)
+    build_seconds = time.perf_counter() - start
+
+    # 메모리는 추적 오버헤드가 큰 tracemalloc으로 따로 한 번 더 구축하여 측정합니다
+    tracemalloc.start()
+    JobNameIndex(names)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # 키 입력 시뮬레이션: 각 직업명의 모든 접두어 (글자 단위)
+    keystrokes = [target[:length] for target in targets for length in range(1, len(target) + 1)]
+    typos = [make_typo(target, rng) for target in targets]
+
+    resolved = [index.resolve(typo) for typo in typos]
+    correct = [result is not None and result[0] == target for result, target in zip(resolved, targets)]
+    # 다른 직업명이 정답과 같거나 더 가까운 오타는 어떤 교정기로도 구분할 수 없으므로 따로 집계합니다
+    ambiguous = [
+        not ok and result is not None
+        and edit_distance(decompose(typo), decompose(result[0])) <= edit_distance(decompose(typo), decompose(target))
+        for ok, result, typo, target in zip(correct, resolved, typos, targets)
+    ]
+    unresolved = np.mean([result is None for result in resolved])
+
+    return {
+        "size": len(index),
+        "build_seconds": round(build_seconds, 2),
+        "build_peak_mb": round(peak / 1024 / 1024, 1),
+        "complete": {"keystrokes": len(keystrokes), **measure(index.complete, keystrokes)},
+        "resolve_typo": {
+            "queries": len(typos),
+            **measure(index.resolve, typos),
+            "accuracy": round(float(np.mean(correct)), 4),
+            "ambiguous": round(float(np.mean(ambiguous)), 4),
+            "unresolved": round(float(unresolved), 4),
+        },
+        "resolve_exact": measure(index.resolve, targets),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="직업명 자동완성·교정 인덱스 벤치마크")
+    parser.add_argument("--size", type=int, default=100000, help="직업명 수 (최대 합성 가능 수까지)")
+    parser.add_argument("--queries", type=int, default=500, help="측정할 직업명 수")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    result = run(args.size, args.queries)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+학과 유사도 그래프 계산 벤치마크
+
+합성 학과명과 임베딩으로 학과 × 학과 유사도를 블록 크기별로 계산하여
+소요 시간과 최대 메모리 사용량을 비교하고, 블록 계산 결과가 한 번에 계산한 결과와 같은지 확인합니다.
+
+사용 예:
+    python -m benchmarks.bench_major_graph --majors 5000 --dimension 1536
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import numpy as np
+
+from major_graph import MajorGraph
+
+STEMS = [
+    "컴퓨터", "소프트웨어", "전자", "전기", "기계", "화학", "신소재", "건축", "토목", "환경", "생명", "식품", "간호",
+    "경영", "경제", "회계", "무역", "행정", "정치외교", "사회", "사회복지", "심리", "교육", "체육", "국어국문",
+    "영어영문", "중어중문", "사학", "철학", "미디어", "광고홍보", "디자인", "음악", "미술", "연극영화", "의예",
+    "약학", "수의예", "물리", "수학", "통계", "데이터", "인공지능", "항공우주", "조선해양", "원자력", "에너지", "도시",
+]
+QUALIFIERS = ["", "공학", "과학", "교육", "정보", "시스템", "융합", "응용", "산업", "문화", "복지", "상담", "경영", "디자인"]
+SUFFIXES = ["학과", "학부", "과", "전공"]
+
+
+def make_majors(count: int, dimension: int, seed: int = 0):
+    """이름이 겹치는 합성 학과명과 어간별로 군집을 이루는 임베딩을 생성합니다."""
+    rng = np.random.default_rng(seed)
+    names = list(dict.fromkeys(
+        f"{stem}{qualifier}{suffix}" for stem in STEMS for qualifier in QUALIFIERS for suffix in SUFFIXES
+    ))
+    random.Random(seed).shuffle(names)
+    names = names[:count]
+
+    centers = {stem: rng.standard_normal(dimension) for stem in STEMS}
+    embeddings = np.stack([
+        centers[next(stem for stem in sorted(STEMS, key=len, reverse=True) if name.startswith(stem))]
+        + 0.6 * rng.standard_normal(dimension)
+        for name in names
+    ]).astype(np.float32)
+    return names, embeddings
+
+
+def measure(names: List[str], embeddings: np.ndarray, block_size: int) -> Dict[str, Any]:
+    """블록 크기별 계산 시간과 최대 메모리를 측정합니다."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = MajorGraph.compute(names, embeddings, block_size=block_size)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"block_size": block_size, "seconds": round(seconds, 2), "peak_mb": round(peak / 1024 / 1024, 1), "graph": graph}
+
+
+def run(majors: int, dimension: int, block_sizes: List[int]) -> Dict[str, Any]:
+    """블록 크기별 측정 결과를 모읍니다."""
+    names, embeddings = make_majors(majors, dimension)
+    result: Dict[str, Any] = {"majors": len(names), "dimension": dimension, "runs": []}
+
+    reference = None
+    for block_size in block_sizes + [len(names)]:
+        entry = measure(names, embeddings, block_size)
+        graph = entry.pop("graph")
+        if reference is None:
+            reference = graph
+        entry["matches_first"] = graph.neighbors == reference.neighbors
+        entry["unblocked"] = block_size >= len(names)
+        result["runs"].append(entry)
+        print(json.dumps(entry, ensure_ascii=False))
+
+    sample = names[0]
+    result["example"] = {sample: reference.neighbors[sample]}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학과 유사도 그래프 계산 벤치마크")
+    parser.add_argument("--majors", type=int, default=2688, help="학과 수 (최대 합성 가능 수까지)")
+    parser.add_argument("--dimension", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[128, 512, 1024], help="비교할 블록 크기")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    result = run(args.majors, args.dimension, args.block_sizes)
+    print(json.dumps(result["example"], ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
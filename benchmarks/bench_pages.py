@@ -0,0 +1,337 @@
+"""
+페이지 파이프라인 헤드리스 벤치마크
+
+Streamlit AppTest로 홈 → 학과 선택 → 커리큘럼 페이지를 헤드리스로 구동합니다.
+지연 시간을 주입한 스텁 LLM/임베딩 백엔드를 사용하며, JOB_OPTIONS × GRADE_OPTIONS 조합으로
+N명의 학생을 동시에 시뮬레이션합니다. 결과는 JSON으로 저장하여 회귀 비교에 사용합니다.
+
+AppTest는 프로세스 전역 런타임을 사용하므로 동시 세션은 워커 프로세스 단위로 실행됩니다.
+학과 선택 클릭은 브라우저처럼 선택 프래그먼트만 재실행한 경우(select_major)와 전체 스크립트를
+재실행한 경우(select_major_full)를 함께 측정하여 처리 시간과 전송 페이로드 크기를 비교합니다.
+답변·진로 설계 저장소, 입결 데이터셋, 게시 인덱스는 임시 디렉터리에 만들어 운영 데이터를 건드리지 않고,
+이전 실행의 저장된 테이블이 측정에 섞이지 않게 합니다.
+
+사용 예:
+    python -m benchmarks.bench_pages --students 30 --concurrency 4 --output bench_pages.json
+    python -m benchmarks.bench_pages --baseline bench_pages.json
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import os
+import resource
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+PAGES = ["home", "major_selection", "curriculum"]
+CLICKS = ["select_major", "select_major_full"]
+
+# 다음 AppTest 실행을 특정 프래그먼트로 한정할 때 사용하는 요청값과 직전 실행의 계측값
+_RERUN_SCOPE: Dict[str, Optional[str]] = {"fragment_id": None}
+_LAST_RUN: Dict = {"payload_bytes": 0, "widget_fragments": {}}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    최근접 순위(nearest-rank) 방식으로 백분위수를 계산합니다.
+
+    Args:
+        values (List[float]): 측정값 리스트
+        pct (float): 백분위 (0~100)
+
+    Returns:
+        float: 백분위수 (값이 없으면 0.0)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def max_rss_mb() -> float:
+    """프로세스의 최대 RSS를 MB 단위로 반환합니다. (Linux 기준 ru_maxrss는 KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def instrument_app_test():
+    """
+    AppTest 스크립트 러너에 계측을 추가합니다.
+
+    - 실행마다 브라우저로 보낼 ForwardMsg 페이로드 크기와 위젯이 속한 프래그먼트를 기록합니다.
+    - _RERUN_SCOPE에 프래그먼트가 지정되면 브라우저처럼 해당 프래그먼트만 재실행합니다.
+      (AppTest.run()은 항상 전체 스크립트를 실행합니다)
+    """
+    from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequests
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    if getattr(LocalScriptRunner, "_bench_instrumented", False):
+        return
+
+    original_request_rerun = LocalScriptRunner.request_rerun
+    original_forward_msgs = LocalScriptRunner.forward_msgs
+
+    def request_rerun(self, rerun_data):
+        fragment_id = _RERUN_SCOPE["fragment_id"]
+        _RERUN_SCOPE["fragment_id"] = None
+        if fragment_id:
+            # 러너 생성 시 대기열에 들어간 전체 재실행 요청과 병합되지 않도록 대기열을 비웁니다
+            self._requests = ScriptRequests()
+            rerun_data = dataclasses.replace(rerun_data, fragment_id_queue=[fragment_id])
+        return original_request_rerun(self, rerun_data)
+
+    def forward_msgs(self):
+        messages = original_forward_msgs(self)
+        widget_fragments = {}
+        for message in messages:
+            if message.WhichOneof("type") != "delta" or not message.delta.fragment_id:
+                continue
+            element = message.delta.new_element
+            kind = element.WhichOneof("type")
+            widget_id = getattr(getattr(element, kind), "id", "") if kind else ""
+            if isinstance(widget_id, str) and widget_id:
+                widget_fragments[widget_id.rsplit("-", 1)[-1]] = message.delta.fragment_id
+        _LAST_RUN["payload_bytes"] = sum(message.ByteSize() for message in messages)
+        _LAST_RUN["widget_fragments"] = widget_fragments
+        return messages
+
+    LocalScriptRunner.request_rerun = request_rerun
+    LocalScriptRunner.forward_msgs = forward_msgs
+    LocalScriptRunner._bench_instrumented = True
+
+
+def simulate_student(index: int, name: str, job: str, grade: str, timeout: float) -> Dict:
+    """
+    학생 한 명의 세션을 홈부터 커리큘럼 페이지까지 진행합니다.
+
+    Args:
+        index (int): 학생 번호
+        name (str): 학생 이름
+        job (str): 희망 직업
+        grade (str): 학년
+        timeout (float): 스크립트 실행당 제한 시간(초)
+
+    Returns:
+        Dict: 페이지·클릭별 처리 시간(초)과 페이로드(바이트), 스텁 사용량, RSS 증가량(MB)
+    """
+    from streamlit.testing.v1 import AppTest
+    from stub_backends import STUB_USAGE
+
+    instrument_app_test()
+    STUB_USAGE.reset()
+    rss_before = max_rss_mb()
+    timings = {}
+    payloads = {}
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    at.secrets["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "stub")  # 카세트 녹화 시에만 실제 키 필요
+
+    start = time.perf_counter()
+    at.run()
+    timings["home"] = time.perf_counter() - start
+
+    at.sidebar.text_input[0].input(f"{name}{index}")
+    at.sidebar.selectbox[0].select(job)
+    at.sidebar.selectbox[1].select(grade)
+    at.sidebar.button[0].click()
+    start = time.perf_counter()
+    at.run()
+    timings["major_selection"] = time.perf_counter() - start
+
+    payloads["major_selection"] = _LAST_RUN["payload_bytes"]
+
+    # 학과 선택: 선택 프래그먼트만 재실행 (브라우저 동작)
+    selector = at.pills(key="major_choice")
+    selector.set_value(selector.options[0])
+    _RERUN_SCOPE["fragment_id"] = _LAST_RUN["widget_fragments"].get("major_choice")
+    start = time.perf_counter()
+    at.run()
+    timings["select_major"] = time.perf_counter() - start
+    payloads["select_major"] = _LAST_RUN["payload_bytes"]
+
+    # 같은 선택 상태로 전체 스크립트 재실행 (프래그먼트가 없을 때의 클릭 비용)
+    start = time.perf_counter()
+    at.run()
+    timings["select_major_full"] = time.perf_counter() - start
+    payloads["select_major_full"] = _LAST_RUN["payload_bytes"]
+
+    at.button(key="go_curriculum").click()
+    start = time.perf_counter()
+    at.run()
+    timings["curriculum"] = time.perf_counter() - start
+
+    if at.exception:
+        raise RuntimeError(f"학생 {index} 시뮬레이션 중 예외 발생: {at.exception[0].message}")
+    return {
+        "timings": timings,
+        "payloads": payloads,
+        "usage": STUB_USAGE.snapshot(),
+        "rss_growth_mb": max_rss_mb() - rss_before,
+    }
+
+
+def measure_index_build(repeat: int) -> float:
+    """벡터 인덱스 구축 시간의 중앙값(초)을 측정합니다."""
+    from utils import VectorStoreManager
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        VectorStoreManager.build_vectorstore(os.getenv("OPENAI_API_KEY", "stub"))
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def run_benchmark(students: int, concurrency: int, timeout: float) -> Dict:
+    """
+    벤치마크를 실행하고 결과를 집계합니다.
+
+    Args:
+        students (int): 시뮬레이션할 학생 수
+        concurrency (int): 동시에 진행할 세션 수
+        timeout (float): 스크립트 실행당 제한 시간(초)
+
+    Returns:
+        Dict: 집계된 벤치마크 결과
+    """
+    from config import GRADE_OPTIONS, JOB_OPTIONS
+
+    workload = [
+        (i, "학생", JOB_OPTIONS[i % len(JOB_OPTIONS)], GRADE_OPTIONS[(i // len(JOB_OPTIONS)) % len(GRADE_OPTIONS)], timeout)
+        for i in range(students)
+    ]
+
+    index_build_seconds = measure_index_build(repeat=3)
+    wall_start = time.perf_counter()
+
+    # AppTest가 워커의 __main__ 모듈을 앱 스크립트로 바꾸므로 모듈 경로로 함수를 참조합니다
+    from benchmarks.bench_pages import simulate_student as worker
+
+    with ProcessPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, *zip(*workload)))
+
+    wall = time.perf_counter() - wall_start
+    usage = {key: sum(result["usage"][key] for result in results) for key in results[0]["usage"]}
+    views = students * len(PAGES)
+
+    latency = {}
+    for page in PAGES:
+        values = [result["timings"][page] for result in results]
+        latency[page] = {
+            "p50": round(percentile(values, 50), 4),
+            "p95": round(percentile(values, 95), 4),
+            "p99": round(percentile(values, 99), 4),
+        }
+
+    clicks = {}
+    for click in CLICKS:
+        values = [result["timings"][click] for result in results]
+        clicks[click] = {
+            "p50": round(percentile(values, 50), 4),
+            "p95": round(percentile(values, 95), 4),
+            "payload_kb": round(statistics.mean(result["payloads"][click] for result in results) / 1024, 2),
+        }
+
+    return {
+        "students": students,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "index_build_seconds": round(index_build_seconds, 4),
+        "page_latency_seconds": latency,
+        "click_seconds": clicks,
+        "llm_calls_per_view": round(usage["llm_calls"] / views, 4),
+        "tokens_per_view": round((usage["prompt_tokens"] + usage["completion_tokens"]) / views, 2),
+        "embedding_calls_per_view": round(usage["embedding_calls"] / views, 4),
+        "rss_mb_per_session": round(sum(result["rss_growth_mb"] for result in results) / students, 3),
+    }
+
+
+def compare(result: Dict, baseline: Dict) -> Dict[str, Optional[float]]:
+    """
+    기준 결과 대비 주요 지표의 비율(현재/기준)을 계산합니다.
+
+    Args:
+        result (Dict): 현재 결과
+        baseline (Dict): 기준 결과
+
+    Returns:
+        Dict[str, Optional[float]]: 지표별 비율 (1.0보다 크면 회귀)
+    """
+    def ratio(current: float, previous: float) -> Optional[float]:
+        return round(current / previous, 3) if previous else None
+
+    ratios = {
+        f"{page}_p95": ratio(
+            result["page_latency_seconds"][page]["p95"],
+            baseline["page_latency_seconds"][page]["p95"]
+        )
+        for page in PAGES
+    }
+    for click in CLICKS:
+        if click in baseline.get("click_seconds", {}):
+            ratios[f"{click}_p95"] = ratio(result["click_seconds"][click]["p95"], baseline["click_seconds"][click]["p95"])
+            ratios[f"{click}_payload"] = ratio(
+                result["click_seconds"][click]["payload_kb"],
+                baseline["click_seconds"][click]["payload_kb"]
+            )
+    for key in ("llm_calls_per_view", "tokens_per_view", "rss_mb_per_session", "index_build_seconds"):
+        ratios[key] = ratio(result[key], baseline[key])
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DreamCourse 페이지 파이프라인 헤드리스 벤치마크")
+    parser.add_argument("--students", type=int, default=30, help="시뮬레이션할 학생 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 세션 수 (워커 프로세스 수)")
+    parser.add_argument(
+        "--backend",
+        choices=("stub", "cassette"),
+        default="stub",
+        help="스텁 응답 또는 카세트에 녹화된 OpenAI 응답 (DREAMCOURSE_CASSETTE=record로 먼저 녹화)"
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="스텁 LLM 지연 시간(초)")
+    parser.add_argument("--embedding-latency", type=float, default=0.02, help="스텁 임베딩 지연 시간(초)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="스크립트 실행당 제한 시간(초)")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", type=str, default=None, help="비교할 기준 결과 JSON 경로")
+    args = parser.parse_args()
+
+    # 설정 모듈이 로드되기 전에 백엔드를 선택해야 합니다
+    if args.backend == "cassette":
+        os.environ["DREAMCOURSE_BACKEND"] = "openai"
+        os.environ.setdefault("DREAMCOURSE_CASSETTE", "replay")
+    else:
+        os.environ["DREAMCOURSE_BACKEND"] = "stub"
+    os.environ["DREAMCOURSE_STUB_LLM_LATENCY"] = str(args.llm_latency)
+    os.environ["DREAMCOURSE_STUB_EMBEDDING_LATENCY"] = str(args.embedding_latency)
+
+    # 워커 프로세스도 환경 변수를 물려받아 같은 임시 저장소를 씁니다
+    with tempfile.TemporaryDirectory(prefix="bench_pages_") as workdir:
+        os.environ["DREAMCOURSE_ANSWER_STORE_PATH"] = str(Path(workdir) / "answers.sqlite3")
+        os.environ["DREAMCOURSE_PLAN_STORE_PATH"] = str(Path(workdir) / "plans.sqlite3")
+        os.environ["DREAMCOURSE_ADMISSION_STORE_DIR"] = str(Path(workdir) / "admission")
+        os.environ["DREAMCOURSE_INDEX_STORE_DIR"] = str(Path(workdir) / "vector_db")
+        result = run_benchmark(args.students, args.concurrency, args.timeout)
+    result["backend"] = args.backend
+    result["llm_latency"] = args.llm_latency
+    result["embedding_latency"] = args.embedding_latency
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            result["vs_baseline"] = compare(result, json.load(f))
+
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
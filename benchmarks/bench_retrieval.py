@@ -0,0 +1,93 @@
+"""
+검색 마이크로 배치 벤치마크
+
+교실 단위 접속처럼 여러 세션이 동시에 질문을 임베딩하고 FAISS를 검색하는 상황을 스텁 임베딩으로 재현하여,
+배치를 끈 경우와 켠 경우의 검색 처리량(질문/초), 코어당 처리량(질문/CPU초), 임베딩 요청 수, 지연 p50/p95를 비교합니다.
+각 질문은 서로 다르며 응답 캐시와 의미 기반 캐시는 사용하지 않습니다.
+
+사용 예:
+    python -m benchmarks.bench_retrieval --queries 2000 --concurrency 64 --embedding-latency 0.05 --window-ms 3
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from rag_service import RAGService
+from retrieval_batcher import RetrievalBatcher
+from stub_backends import STUB_USAGE, StubEmbeddings
+from utils import VectorStoreManager
+
+
+def run(vectorstore, args: argparse.Namespace, batcher: Optional[RetrievalBatcher]) -> Dict[str, Any]:
+    """
+    동시 세션 수만큼 질문을 검색하고 처리량과 지연 시간을 측정합니다.
+
+    Args:
+        vectorstore: 검색할 벡터 스토어
+        args (argparse.Namespace): 벤치마크 설정
+        batcher (Optional[RetrievalBatcher]): 검색 마이크로 배처 (None이면 질문마다 따로 검색)
+
+    Returns:
+        Dict[str, Any]: 측정 결과
+    """
+    service = RAGService(cache_size=0, semantic_cache=None, retrieval_batcher=batcher)
+    service.retrieval_batcher = batcher
+    latencies: List[float] = []
+
+    async def drive():
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                await service.aretrieve(vectorstore, f"학과 커리큘럼 질문 {i}")
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in range(args.queries)))
+
+    embedding_calls = STUB_USAGE.snapshot()["embedding_calls"]
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    service.submit(drive()).result()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    p50, p95 = np.percentile(np.asarray(latencies), [50, 95]) * 1000
+    return {
+        "queries_per_second": round(args.queries / wall, 1),
+        "queries_per_cpu_second": round(args.queries / cpu, 1),
+        "embedding_requests": STUB_USAGE.snapshot()["embedding_calls"] - embedding_calls,
+        "p50_ms": round(p50, 1),
+        "p95_ms": round(p95, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 마이크로 배치 벤치마크")
+    parser.add_argument("--queries", type=int, default=2000, help="검색할 질문 수")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 세션 수")
+    parser.add_argument("--embedding-latency", type=float, default=0.05, help="스텁 임베딩 요청당 지연(초)")
+    parser.add_argument("--window-ms", type=float, default=3.0, help="배치를 모으는 시간(ms)")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    vectorstore = VectorStoreManager.build_vectorstore("stub", embeddings=StubEmbeddings(latency=args.embedding_latency))
+    batcher = RetrievalBatcher(window_ms=args.window_ms)
+    result = {
+        "settings": {**vars(args), "faiss_omp_threads": batcher.omp_threads},
+        "before_unbatched": run(vectorstore, args, None),
+        "after_batched": run(vectorstore, args, batcher),
+    }
+
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
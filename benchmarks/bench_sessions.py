@@ -0,0 +1,191 @@
+"""
+세션 동시성 부하 테스트
+
+동기 qa_chain.run 방식(세션마다 스레드가 네트워크 I/O에 블로킹)과 RAGService 방식(하나의
+이벤트 루프 위에서 다중화)을 같은 스텁 백엔드로 비교하여 코어당 처리 세션 수를 보고합니다.
+RAGService는 검색 마이크로 배치를 끈 경우와 켠 경우를 따로 측정하므로, 코어당 처리량의 차이가
+이벤트 루프 자체에서 오는지 배치에서 오는지 구분할 수 있습니다. 회차마다 질문을 바꾸어 캐시 적중 없이 측정하고,
+답변 저장소는 임시 디렉터리에 만들어 data/answers.sqlite3를 건드리지 않습니다.
+
+사용 예:
+    python -m benchmarks.bench_sessions --sessions 200 --llm-latency 1.0 --repeats 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from langchain.chains import RetrievalQA
+
+from answer_store import AnswerStore
+from prompts import PromptRegistry
+from rag_service import RAGService
+from stub_backends import StubChatModel, StubEmbeddings
+from utils import VectorStoreManager
+
+
+class ThreadSampler:
+    """측정 구간 동안 활성 스레드 수의 최댓값을 기록합니다."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _measure(run: Callable[[int], None], sessions: int, repeats: int) -> Dict[str, float]:
+    """
+    실행 함수를 repeats회 실행하여 벽시계 시간, CPU 시간의 중앙값과 최대 스레드 수를 측정합니다.
+
+    측정 전에 한 회차를 먼저 실행하여 스레드·이벤트 루프 시작과 샤드·LLM 생성 비용은 측정에서 뺍니다.
+
+    Args:
+        run (Callable[[int], None]): 회차 번호를 받아 sessions개의 세션 요청을 끝까지 처리하는 함수
+        sessions (int): 회차당 세션 수
+        repeats (int): 반복 횟수
+
+    Returns:
+        Dict[str, float]: 측정 결과
+    """
+    # 스레드 수는 워밍업 전 기준으로 비교하여 서비스가 띄운 스레드도 포함합니다
+    baseline_threads = threading.active_count()
+    run(repeats)
+    walls: List[float] = []
+    cpus: List[float] = []
+    peak = 0
+
+    for repeat in range(repeats):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        with ThreadSampler() as sampler:
+            run(repeat)
+        walls.append(time.perf_counter() - wall_start)
+        cpus.append(max(time.process_time() - cpu_start, 1e-9))
+        peak = max(peak, sampler.peak - baseline_threads)
+
+    wall, cpu = statistics.median(walls), statistics.median(cpus)
+    return {
+        "sessions": sessions,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "peak_extra_threads": peak,
+        "sessions_per_second": round(sessions / wall, 2),
+        "sessions_per_core_second": round(sessions / cpu, 2),
+    }
+
+
+def run_sync(vectorstore, sessions: int, llm_latency: float, repeats: int) -> Dict[str, float]:
+    """기존 방식: 세션마다 스레드 하나가 qa_chain.run에서 블로킹됩니다."""
+    llm = StubChatModel(latency=llm_latency)
+    qa_chain = RetrievalQA.from_chain_type(
+        llm=llm,
+        chain_type="stuff",
+        retriever=vectorstore.as_retriever(),
+        chain_type_kwargs={"prompt": PromptRegistry.get("curriculum").template}
+    )
+
+    def run(repeat: int):
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            wait([pool.submit(qa_chain.run, f"{repeat}회차 세션 {i}의 커리큘럼 질문") for i in range(sessions)])
+
+    return _measure(run, sessions, repeats)
+
+
+def run_async(
+    vectorstore,
+    sessions: int,
+    llm_latency: float,
+    repeats: int,
+    answer_dir: Path,
+    batched: bool
+) -> Dict[str, float]:
+    """
+    RAGService 방식: 모든 세션 요청이 하나의 이벤트 루프에서 다중화됩니다.
+
+    Args:
+        vectorstore: 검색할 벡터 스토어
+        sessions (int): 회차당 세션 수
+        llm_latency (float): 스텁 LLM 지연 시간(초)
+        repeats (int): 반복 횟수
+        answer_dir (Path): 답변 저장소를 만들 임시 디렉터리
+        batched (bool): 검색 마이크로 배치 사용 여부
+
+    Returns:
+        Dict[str, float]: 측정 결과
+    """
+    service = RAGService(
+        llm_factory=lambda api_key, route: StubChatModel(latency=llm_latency),
+        answer_store=AnswerStore(answer_dir / f"answers_{'batched' if batched else 'unbatched'}.sqlite3")
+    )
+    if not batched:
+        service.retrieval_batcher = None
+
+    def run(repeat: int):
+        futures = [
+            service.submit(service.aquery(vectorstore, "curriculum", f"{repeat}회차 세션 {i}의 커리큘럼 질문", "stub"))
+            for i in range(sessions)
+        ]
+        wait(futures)
+
+    return _measure(run, sessions, repeats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DreamCourse 세션 동시성 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=100, help="동시 세션 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="스텁 LLM 지연 시간(초)")
+    parser.add_argument("--repeats", type=int, default=3, help="방식별 반복 횟수 (중앙값 보고)")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    vectorstore = VectorStoreManager.build_vectorstore("stub", embeddings=StubEmbeddings())
+
+    with tempfile.TemporaryDirectory() as answer_dir:
+        before = run_sync(vectorstore, args.sessions, args.llm_latency, args.repeats)
+        unbatched = run_async(vectorstore, args.sessions, args.llm_latency, args.repeats, Path(answer_dir), batched=False)
+        batched = run_async(vectorstore, args.sessions, args.llm_latency, args.repeats, Path(answer_dir), batched=True)
+
+    def gain(after: Dict[str, float]) -> float:
+        return round(after["sessions_per_core_second"] / before["sessions_per_core_second"], 2)
+
+    result = {
+        "cpu_count": os.cpu_count(),
+        "llm_latency": args.llm_latency,
+        "repeats": args.repeats,
+        "before_sync": before,
+        "after_async_unbatched": unbatched,
+        "after_async": batched,
+        # 1보다 작으면 해당 방식이 세션당 CPU를 더 씁니다 (스레드 수만 줄어든 것)
+        "per_core_gain_unbatched": gain(unbatched),
+        "per_core_gain": gain(batched),
+    }
+
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
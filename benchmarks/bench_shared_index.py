@@ -0,0 +1,129 @@
+"""
+공유 mmap 인덱스 메모리 벤치마크
+
+합성 코퍼스를 크기별로 IndexStore에 게시한 뒤, 여러 워커 프로세스가 이를
+(1) 메모리에 통째로 읽는 방식과 (2) 읽기 전용 mmap으로 여는 방식으로 검색할 때의
+워커당 RSS를 비교합니다. mmap 방식은 워커별 익명(private) 메모리가 코퍼스 크기와 무관하게
+일정하고, 파일 기반(shared) 메모리는 모든 워커가 같은 페이지 캐시를 공유합니다.
+
+사용 예:
+    python -m benchmarks.bench_shared_index --sizes 10000 50000 200000 --workers 4
+"""
+
+import argparse
+import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import faiss
+import numpy as np
+from langchain.docstore.document import Document
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.vectorstores import FAISS
+
+from index_store import IndexStore
+from stub_backends import StubEmbeddings
+
+DIMENSION = 256
+
+
+def read_rss_mb() -> Dict[str, float]:
+    """/proc/self/status에서 익명(private)·파일(shared) RSS를 MB 단위로 읽습니다."""
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                values[key] = int(rest.split()[0]) / 1024
+    return values
+
+
+def build_synthetic_store(size: int) -> FAISS:
+    """무작위 벡터와 합성 문서로 FAISS 벡터 스토어를 만듭니다."""
+    rng = np.random.default_rng(size)
+    index = faiss.IndexFlatL2(DIMENSION)
+    index.add(rng.random((size, DIMENSION), dtype=np.float32))
+
+    documents = {str(i): Document(page_content=f"합성 문서 {i}: " + "커리큘럼 " * 20) for i in range(size)}
+    return FAISS(
+        embedding_function=StubEmbeddings(DIMENSION),
+        index=index,
+        docstore=InMemoryDocstore(documents),
+        index_to_docstore_id={i: str(i) for i in range(size)}
+    )
+
+
+def run_worker(root: str, mode: str, queries: int) -> Dict[str, float]:
+    """
+    워커 프로세스에서 인덱스를 열고 검색한 뒤 RSS를 보고합니다.
+
+    Args:
+        root (str): IndexStore 루트 경로
+        mode (str): "mmap" 또는 "in_memory"
+        queries (int): 실행할 검색 수
+
+    Returns:
+        Dict[str, float]: RSS 측정값(MB)
+    """
+    store = IndexStore(Path(root))
+    before = read_rss_mb()
+
+    if mode == "mmap":
+        vectorstore = store.load(StubEmbeddings(DIMENSION))
+    else:
+        directory = store.versions_dir / store.current_version()
+        vectorstore = store.load(StubEmbeddings(DIMENSION))
+        vectorstore.index = faiss.read_index(str(directory / "index.faiss"))
+        texts = [vectorstore.docstore.search(str(i)).page_content for i in range(vectorstore.index.ntotal)]
+        vectorstore.docstore = InMemoryDocstore({str(i): Document(page_content=t) for i, t in enumerate(texts)})
+
+    rng = np.random.default_rng(0)
+    for _ in range(queries):
+        vectorstore.similarity_search_by_vector(rng.random(DIMENSION).tolist(), k=4)
+
+    after = read_rss_mb()
+    return {
+        "rss_anon_mb": round(after["RssAnon"] - before["RssAnon"], 1),
+        "rss_file_mb": round(after["RssFile"] - before["RssFile"], 1),
+    }
+
+
+def measure(size: int, workers: int, queries: int) -> Dict[str, Dict[str, float]]:
+    """코퍼스 크기 하나에 대해 두 방식의 워커당 평균 RSS 증가량을 측정합니다."""
+    result = {}
+    with tempfile.TemporaryDirectory() as root:
+        IndexStore(Path(root)).publish(build_synthetic_store(size))
+
+        for mode in ("in_memory", "mmap"):
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                reports: List[Dict[str, float]] = list(
+                    pool.map(run_worker, [root] * workers, [mode] * workers, [queries] * workers)
+                )
+            result[mode] = {
+                key: round(sum(report[key] for report in reports) / workers, 1)
+                for key in ("rss_anon_mb", "rss_file_mb")
+            }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 mmap 인덱스 메모리 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000], help="코퍼스 문서 수")
+    parser.add_argument("--workers", type=int, default=4, help="워커 프로세스 수")
+    parser.add_argument("--queries", type=int, default=200, help="워커당 검색 수")
+    parser.add_argument("--output", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    result = {str(size): measure(size, args.workers, args.queries) for size in args.sizes}
+
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+DreamCourse OpenAI 호출 녹화/재생 (카세트)
+
+API 할당량이나 네트워크 없이 전체 파이프라인을 프로파일링·벤치마크할 수 있도록, OpenAI SDK의 HTTP 전송 계층에서
+요청과 응답을 gzip 압축 JSONL 카세트 파일에 기록하고 그대로 재생합니다. ChatOpenAI와 OpenAIEmbeddings 모두
+같은 카세트를 사용하므로 인덱스 구축, 검색, 테이블 파싱, 렌더링의 회귀를 CI에서 실제 응답으로 측정할 수 있습니다.
+
+- 요청 지문은 HTTP 메서드, 경로와 쿼리, 키를 정렬한 JSON 본문의 SHA-256입니다.
+  API 키, User-Agent, 재시도 횟수 같은 헤더는 지문에 넣지 않으므로 다른 키로 기록한 카세트도 재생할 수 있습니다.
+- record: 실제로 호출하고 성공한(4xx/5xx가 아닌) 응답을 카세트 끝에 추가합니다 (gzip 멤버 단위로 추가).
+- replay: 카세트의 응답만 돌려주며, CASSETTE_LATENCY_SCALE만큼 기록 당시의 응답 시간을 재현합니다.
+  기록에 없는 요청은 404로 응답하므로 SDK가 재시도 없이 NotFoundError를 일으킵니다.
+
+사용 예:
+    DREAMCOURSE_CASSETTE=record OPENAI_API_KEY=... streamlit run app.py
+    DREAMCOURSE_CASSETTE=record OPENAI_API_KEY=... python -m benchmarks.bench_pages --backend cassette
+    DREAMCOURSE_CASSETTE_LATENCY_SCALE=1 python -m benchmarks.bench_pages --backend cassette
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import httpx
+import openai
+
+from config import CASSETTE_LATENCY_SCALE, CASSETTE_MODE, CASSETTE_PATH
+
+# 본문을 디코딩해 저장하므로 재생 응답에 그대로 붙이면 안 되는 헤더
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class Cassette:
+    """요청 지문별 응답을 보관하는 gzip JSONL 카세트 파일"""
+
+    def __init__(self, path: Path = CASSETTE_PATH):
+        """
+        Args:
+            path (Path): 카세트 파일 경로 (없으면 빈 카세트, 기록 시 생성)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        if path.exists():
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self._entries[entry["fingerprint"]] = entry  # 같은 지문은 나중 기록이 우선
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def fingerprint(request: httpx.Request) -> str:
+        """
+        요청 지문을 계산합니다.
+
+        Args:
+            request (httpx.Request): 본문을 읽은 요청
+
+        Returns:
+            str: SHA-256 16진 문자열
+        """
+        body = request.content
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode("utf-8")
+        except ValueError:
+            pass  # JSON이 아닌 본문은 원본 그대로 사용
+        digest = hashlib.sha256(f"{request.method} {request.url.raw_path.decode('ascii')}\n".encode("utf-8"))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def lookup(self, request: httpx.Request) -> Optional[dict]:
+        """기록된 응답을 찾습니다. (없으면 None)"""
+        return self._entries.get(Cassette.fingerprint(request))
+
+    def record(self, request: httpx.Request, response: httpx.Response, elapsed: float):
+        """
+        응답을 카세트 끝에 추가합니다.
+
+        Args:
+            request (httpx.Request): 요청
+            response (httpx.Response): 본문을 읽은 응답
+            elapsed (float): 응답 시간(초)
+        """
+        entry = {
+            "fingerprint": Cassette.fingerprint(request),
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "body": response.text,
+            "elapsed": round(elapsed, 4),
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._entries[entry["fingerprint"]] = entry
+
+    def replay(self, request: httpx.Request) -> Tuple[httpx.Response, float]:
+        """
+        기록된 응답을 재생합니다.
+
+        Args:
+            request (httpx.Request): 요청
+
+        Returns:
+            Tuple[httpx.Response, float]: (응답, 기록된 응답 시간) — 기록에 없으면 (404 응답, 0)
+        """
+        entry = self.lookup(request)
+        if entry is None:
+            error = {
+                "message": f"카세트에 기록되지 않은 요청입니다: {request.method} {request.url.path} ({self.path})",
+                "type": "cassette_miss",
+            }
+            return httpx.Response(404, json={"error": error}, request=request), 0.0
+        response = httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"].encode("utf-8"),
+            request=request
+        )
+        return response, entry["elapsed"]
+
+
+def _detach(response: httpx.Response, request: httpx.Request) -> httpx.Response:
+    """본문을 읽은 응답을 연결과 무관한 새 응답으로 복사합니다."""
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+    return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """동기 OpenAI 클라이언트용 녹화/재생 전송 계층"""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = CASSETTE_MODE,
+        latency_scale: float = CASSETTE_LATENCY_SCALE,
+        inner: Optional[httpx.BaseTransport] = None
+    ):
+        """
+        Args:
+            cassette (Cassette): 사용할 카세트
+            mode (str): "record" 또는 "replay"
+            latency_scale (float): 재생 시 기록된 응답 시간에 곱할 배율
+            inner (Optional[httpx.BaseTransport]): 녹화 시 실제 요청을 보낼 전송 계층 (기본값: httpx.HTTPTransport)
+        """
+        self.cassette = cassette
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        if self.mode == "replay":
+            response, elapsed = self.cassette.replay(request)
+            if elapsed * self.latency_scale > 0:
+                time.sleep(elapsed * self.latency_scale)
+            return response
+
+        start = time.perf_counter()
+        response = self._inner.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        elapsed = time.perf_counter() - start
+        if response.status_code < 400:
+            self.cassette.record(request, response, elapsed)
+        return _detach(response, request)
+
+    def close(self):
+        self._inner.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """비동기 OpenAI 클라이언트용 녹화/재생 전송 계층"""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = CASSETTE_MODE,
+        latency_scale: float = CASSETTE_LATENCY_SCALE,
+        inner: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            cassette (Cassette): 사용할 카세트
+            mode (str): "record" 또는 "replay"
+            latency_scale (float): 재생 시 기록된 응답 시간에 곱할 배율
+            inner (Optional[httpx.AsyncBaseTransport]): 녹화 시 실제 요청을 보낼 전송 계층 (기본값: httpx.AsyncHTTPTransport)
+        """
+        self.cassette = cassette
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        if self.mode == "replay":
+            response, elapsed = self.cassette.replay(request)
+            if elapsed * self.latency_scale > 0:
+                await asyncio.sleep(elapsed * self.latency_scale)
+            return response
+
+        start = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.perf_counter() - start
+        if response.status_code < 400:
+            # 카세트 파일 쓰기는 짧은 추가 쓰기이므로 루프에서 바로 실행합니다
+            self.cassette.record(request, response, elapsed)
+        return _detach(response, request)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """프로세스 공용 카세트 (CASSETTE_PATH)를 반환합니다."""
+    global _cassette
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette()
+        return _cassette
+
+
+def openai_clients(
+    api_key: str,
+    timeout: Optional[float] = None,
+    cassette: Optional[Cassette] = None,
+    mode: str = CASSETTE_MODE
+) -> Tuple[openai.OpenAI, openai.AsyncOpenAI]:
+    """
+    카세트 전송 계층을 쓰는 동기·비동기 OpenAI 클라이언트를 생성합니다.
+
+    Args:
+        api_key (str): OpenAI API 키 (재생 시에는 사용하지 않음)
+        timeout (Optional[float]): 요청 타임아웃(초) (기본값: SDK 기본값)
+        cassette (Optional[Cassette]): 사용할 카세트 (기본값: 프로세스 공용 카세트)
+        mode (str): "record" 또는 "replay"
+
+    Returns:
+        Tuple[openai.OpenAI, openai.AsyncOpenAI]: (동기 클라이언트, 비동기 클라이언트)
+    """
+    cassette = cassette or get_cassette()
+    options = {"api_key": api_key} if timeout is None else {"api_key": api_key, "timeout": timeout}
+    sync_client = openai.OpenAI(http_client=httpx.Client(transport=CassetteTransport(cassette, mode)), **options)
+    async_client = openai.AsyncOpenAI(
+        http_client=httpx.AsyncClient(transport=AsyncCassetteTransport(cassette, mode)),
+        **options
+    )
+    return sync_client, async_client
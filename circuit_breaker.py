@@ -0,0 +1,137 @@
+"""
+DreamCourse 업스트림 회로 차단기
+
+OpenAI가 느리거나 오류를 돌려줄 때 모든 세션이 마감 시간까지 기다리며 쌓이지 않도록,
+LLM·임베딩 호출이 연속으로 실패하면 회로를 열어 일정 시간 동안 호출 자체를 보내지 않습니다.
+
+- closed: 정상 호출. 연속 실패가 failure_threshold회에 이르면 open
+- open: 호출하지 않고 CircuitOpenError. reset_seconds가 지나면 half_open
+- half_open: 한 요청만 시험 호출하여 성공하면 closed, 실패하면 다시 open
+
+상태 전환은 dreamcourse_circuit_transitions_total과 dreamcourse_circuit_state로 내보냅니다.
+RAGService의 이벤트 루프 스레드에서만 사용하므로 별도의 락이 없습니다.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+from metrics import CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# dreamcourse_circuit_state 게이지 값
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 업스트림을 호출하지 않은 경우"""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"AI 서버 응답이 원활하지 않아 잠시 요청을 보내지 않고 있습니다. ({name}) 잠시 후 다시 시도해주세요.")
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 회로 차단기"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            name (str): 메트릭 레이블로 쓸 이름 ('llm', 'embedding')
+            failure_threshold (int): 회로를 여는 연속 실패 횟수
+            reset_seconds (float): 회로를 연 뒤 시험 호출까지 기다리는 시간(초)
+            clock (Callable[[], float]): 단조 시계 (테스트용)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        CIRCUIT_STATE.labels(breaker=name).set(STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (열린 뒤 reset_seconds가 지났으면 half_open)"""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        지금 업스트림을 호출해도 되는지 확인합니다. half_open이면 한 요청만 시험 호출로 허용합니다.
+
+        Returns:
+            bool: 호출해도 되면 True
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._transition(HALF_OPEN)
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        """호출 성공을 기록하고 회로를 닫습니다."""
+        self._failures = 0
+        self._probing = False
+        self._transition(CLOSED)
+
+    def record_failure(self):
+        """호출 실패를 기록하고, 시험 호출이 실패했거나 연속 실패가 기준에 이르면 회로를 엽니다."""
+        self._probing = False
+        self._failures += 1
+        if self._state != CLOSED or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            self._transition(OPEN)
+
+    async def call(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        회로가 허용하면 factory의 코루틴을 실행하고 결과에 따라 상태를 갱신합니다.
+
+        Args:
+            factory (Callable[[], Awaitable[T]]): 업스트림 호출 코루틴 팩토리
+
+        Returns:
+            T: 호출 결과
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있는 경우
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            # 호출자가 취소한 시험 호출은 실패로 보지 않고 다음 요청이 다시 시험하게 합니다
+            self._probing = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def _transition(self, state: str):
+        """상태를 바꾸고 전환을 메트릭에 기록합니다."""
+        if state == self._state:
+            return
+        self._state = state
+        CIRCUIT_TRANSITIONS.labels(breaker=self.name, state=state).inc()
+        CIRCUIT_STATE.labels(breaker=self.name).set(STATE_VALUES[state])
@@ -22,6 +22,17 @@ ADMISSION_CSV = BASE_DIR / "입결정보_수정.csv"
 LOGO_IMAGE = BASE_DIR / "logo.png"
 CAREER_TEST_IMAGE = BASE_DIR / "test.jpg"
 
+# 정적 자산 경로 (python -m assets 로 빌드, Streamlit 정적 서빙으로 /app/static/ 아래에 제공)
+STATIC_DIR = BASE_DIR / "static"
+STATIC_URL_PREFIX = "app/static"
+ASSET_MANIFEST = STATIC_DIR / "manifest.json"
+
+# 자산별 원본 이미지와 표시 너비(px, 고해상도 화면을 고려한 최대 너비)
+ASSET_SOURCES = {
+    "logo": {"source": LOGO_IMAGE, "width": 600},
+    "career_test": {"source": CAREER_TEST_IMAGE, "width": 1280},
+}
+
 # 벡터 DB 경로
 VECTOR_DB_DIR = BASE_DIR / "vector_db"
 
@@ -40,6 +51,205 @@ ENCODINGS = {
 OPENAI_MODEL = "gpt-3.5-turbo"
 OPENAI_TEMPERATURE = 0.0
 
+# LLM/임베딩 백엔드 선택 ("openai" 또는 네트워크 없이 동작하는 "stub")
+LLM_BACKEND = os.getenv("DREAMCOURSE_BACKEND", "openai")
+STUB_LLM_LATENCY = float(os.getenv("DREAMCOURSE_STUB_LLM_LATENCY", "0"))  # 초 (lognormal 분포에서는 중앙값)
+# 스텁 LLM 지연 분포: "normal"(jitter = 표준편차, 초) 또는 "lognormal"(jitter = 로그 표준편차)
+STUB_LLM_DISTRIBUTION = os.getenv("DREAMCOURSE_STUB_LLM_DISTRIBUTION", "normal")
+STUB_LLM_JITTER = float(os.getenv("DREAMCOURSE_STUB_LLM_JITTER", "0"))
+# 업스트림 정체 주입: 호출 중 이 확률만큼 STUB_LLM_TAIL_LATENCY초 동안 응답하지 않음
+STUB_LLM_TAIL_PROBABILITY = float(os.getenv("DREAMCOURSE_STUB_LLM_TAIL_PROBABILITY", "0"))
+STUB_LLM_TAIL_LATENCY = float(os.getenv("DREAMCOURSE_STUB_LLM_TAIL_LATENCY", "0"))
+STUB_EMBEDDING_LATENCY = float(os.getenv("DREAMCOURSE_STUB_EMBEDDING_LATENCY", "0"))  # 초
+# 스텁 LLM이 제공자 측 프롬프트 캐시 적중으로 보고할 최소 시스템 메시지 길이 (토큰, OpenAI는 1,024)
+STUB_LLM_PROMPT_CACHE_MIN_TOKENS = int(os.getenv("DREAMCOURSE_STUB_LLM_PROMPT_CACHE_MIN_TOKENS", "1024"))
+
+# OpenAI 호출 녹화/재생 (LLM_BACKEND가 "openai"일 때만 적용): "off", "record"(실제 호출을 카세트에 기록),
+# "replay"(네트워크 없이 카세트의 응답만 사용, 기록에 없는 요청은 404)
+CASSETTE_MODE = os.getenv("DREAMCOURSE_CASSETTE", "off")
+CASSETTE_PATH = Path(os.getenv("DREAMCOURSE_CASSETTE_PATH", str(DATA_DIR / "cassettes" / "openai.jsonl.gz")))
+# 재생 시 기록된 응답 시간에 곱할 배율 (0이면 즉시 응답, 1이면 기록 당시의 지연을 그대로 재현)
+CASSETTE_LATENCY_SCALE = float(os.getenv("DREAMCOURSE_CASSETTE_LATENCY_SCALE", "0"))
+
+# 프롬프트 타입별 모델 라우팅: 모델, 최대 응답 토큰 수, 호출 마감 시간(초, 재시도 포함), 응답을 검증할 테이블
+# (TABLE_COLUMNS 키), 헤지 요청 사용 여부
+# 직업 테이블은 짧고 쉬운 생성이고, 커리큘럼 테이블(6학기 x 6열)은 응답이 가장 깁니다
+MODEL_ROUTES = {
+    "major_selection": {"model": OPENAI_MODEL, "max_tokens": 512, "timeout": 20, "table": "job", "hedge": True},
+    "curriculum": {"model": OPENAI_MODEL, "max_tokens": 1536, "timeout": 60, "table": "curriculum", "hedge": True},
+    "admission_table": {"model": OPENAI_MODEL, "max_tokens": 1024, "timeout": 45, "table": "admission"},
+}
+# 응답 테이블이 비었거나 열 수가 맞지 않을 때 한 번 더 호출할 상위 모델 (모델을 빈 문자열로 두면 재호출하지 않음)
+MODEL_ESCALATION = {
+    "model": os.getenv("DREAMCOURSE_ESCALATION_MODEL", "gpt-4o"),
+    "max_tokens": 2048,
+    "timeout": 90,
+}
+# 모델별 100만 토큰당 요금(USD): (프롬프트, 응답) — 경로별 비용 집계용
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+}
+# 제공자 측 프롬프트 캐시에 적중한 프롬프트 토큰의 요금 배율 (OpenAI는 입력 요금의 50%)
+MODEL_CACHED_PROMPT_PRICE_RATIO = 0.5
+# 제공자 측 프롬프트 캐시를 지원하는 모델 (날짜가 붙은 스냅숏 포함). 이 모델로 라우팅된 프롬프트 타입만
+# 세 작업을 모두 담은 공유 고정 부분(약 1,200토큰)을 쓰고, 나머지는 자기 작업만 담은 고정 부분(약 320~570토큰)을 씁니다
+PROMPT_CACHE_MODELS = ("gpt-4o", "gpt-4o-mini", "gpt-4.1", "gpt-4.1-mini", "gpt-4.1-nano", "o1", "o3-mini")
+MODEL_ROUTE_STATS_WINDOW = 512  # 경로별 지연 시간 분위수를 계산할 최근 호출 수
+
+# 헤지 요청: 응답이 경로의 최근 p95 지연 시간 안에 오지 않으면 같은 요청을 한 번 더 보내 먼저 온 응답을 사용
+LLM_HEDGE_ENABLED = os.getenv("DREAMCOURSE_LLM_HEDGE", "1") == "1"
+LLM_HEDGE_QUANTILE = 95  # 헤지 요청을 보낼 지연 시간 분위수
+LLM_HEDGE_MIN_SAMPLES = 20  # 경로별 최소 관측 호출 수 (그 전에는 헤지하지 않음)
+LLM_HEDGE_BUDGET = float(os.getenv("DREAMCOURSE_LLM_HEDGE_BUDGET", "0.1"))  # 헤지 요청 수 상한 (일반 호출 수 대비 비율)
+LLM_HEDGE_BURST = 10  # 적립해 둘 수 있는 최대 헤지 요청 수
+
+# 벡터 인덱스 종류: "flat"(정확 검색), "ivf_flat", "hnsw", "ivf_pq"
+VECTOR_INDEX_TYPE = os.getenv("DREAMCOURSE_INDEX_TYPE", "flat")
+VECTOR_INDEX_PARAMS = {
+    "ivf_nlist": 1024,  # IVF 클러스터 수 (코퍼스가 작으면 자동으로 줄어듦)
+    "ivf_nprobe": int(os.getenv("DREAMCOURSE_IVF_NPROBE", "16")),  # 검색 시 탐색할 클러스터 수
+    "hnsw_m": 32,  # HNSW 노드당 이웃 수
+    "hnsw_ef_construction": 200,
+    "hnsw_ef_search": int(os.getenv("DREAMCOURSE_HNSW_EF_SEARCH", "64")),  # 검색 후보 수
+    "pq_m": 16,  # PQ 서브벡터 수 (임베딩 차원의 약수)
+    "pq_nbits": 8,  # 서브벡터당 코드 비트 수
+    "train_sample_size": 100_000,  # IVF 학습 표본 크기
+}
+
+# 스트리밍 색인: 한 번에 읽을 CSV 행 수와 한 번에 임베딩·색인할 문서 수 (구축 시 최대 메모리를 결정)
+INGEST_CHUNK_ROWS = int(os.getenv("DREAMCOURSE_INGEST_CHUNK_ROWS", "20000"))
+INGEST_EMBED_BATCH_SIZE = int(os.getenv("DREAMCOURSE_INGEST_EMBED_BATCH_SIZE", "256"))
+
+# 코퍼스 압축: 색인 전에 같은 엔터티(직업, 학교·학과, 학년도·학과)의 연속된 문서를 하나로 합치고,
+# 문자 shingle MinHash로 추정한 Jaccard 유사도가 기준 이상인 같은 종류의 문서는 거의 같은 문서로 보고 제거합니다
+CORPUS_COMPACTION_ENABLED = os.getenv("DREAMCOURSE_CORPUS_COMPACTION", "1") == "1"
+CORPUS_DEDUP_THRESHOLD = float(os.getenv("DREAMCOURSE_CORPUS_DEDUP_THRESHOLD", "0.9"))
+CORPUS_MINHASH_PERMUTATIONS = 64  # 문서당 MinHash 서명 길이 (LSH 밴드 수 x 밴드당 행 수)
+CORPUS_MINHASH_BANDS = 8  # 밴드당 8행: 유사도 0.9인 쌍은 99.9%, 0.6인 쌍은 약 13%만 후보가 됨
+CORPUS_SHINGLE_SIZE = 5  # 문자 shingle 길이 (띄어쓰기가 일정하지 않은 한국어 문서용)
+
+# 게시된 공유 인덱스 위치 (임베딩 차원이 다르므로 백엔드별로 분리, 벤치마크는 임시 디렉터리로 바꿈)
+INDEX_STORE_DIR = Path(os.getenv("DREAMCOURSE_INDEX_STORE_DIR", str(VECTOR_DB_DIR / LLM_BACKEND)))
+
+# 학교별 커리큘럼 CSV (학교마다 별도 샤드로 색인)
+SCHOOL_CURRICULUM_CSVS = {
+    "경기고등학교": CURRICULUM_CSV,
+}
+
+# 학교와 무관한 학과 정보를 담는 공통 샤드 이름 (입결 정보는 학년도별 샤드)
+SHARED_SHARD = "_shared"
+
+# 프로세스당 메모리에 유지할 최대 샤드 수와 유휴 샤드 해제 시간(초)
+SHARD_CACHE_SIZE = int(os.getenv("DREAMCOURSE_SHARD_CACHE_SIZE", "16"))
+SHARD_IDLE_SECONDS = 1800
+
+# ===============================
+# 학과 유사도 그래프 설정
+# ===============================
+# python -m major_graph 로 미리 계산한 학과별 유사 학과 목록 (임베딩 백엔드별로 분리)
+MAJOR_GRAPH_PATH = INDEX_STORE_DIR / "major_graph.json"
+MAJOR_GRAPH_TOP_K = 5  # 학과당 저장할 유사 학과 수
+MAJOR_GRAPH_EMBEDDING_WEIGHT = 0.7  # 임베딩 코사인 유사도의 가중치 (나머지는 한글 토큰 겹침)
+MAJOR_GRAPH_MIN_SCORE = 0.35  # 이 점수 미만의 학과는 유사 학과로 저장하지 않음
+MAJOR_GRAPH_BLOCK_SIZE = 1024  # 유사도 행렬을 한 번에 계산할 행 수 (메모리 상한)
+MAJOR_EXPANSION_COUNT = 3  # 커리큘럼·입결 질문에 덧붙일 유사 학과 수
+
+# ===============================
+# 입결 데이터 저장소 설정
+# ===============================
+# 학년도별 원본 입결 CSV (등록된 학년도는 처음 사용할 때 수집, 그 밖의 학년도는 python -m admission_store ingest)
+ADMISSION_SOURCES = {
+    2024: ADMISSION_CSV,
+}
+
+# 학년도·대학명으로 분할한 Parquet 데이터셋 위치와 행 그룹 크기 (학과 조건 pushdown 단위)
+ADMISSION_STORE_DIR = Path(os.getenv("DREAMCOURSE_ADMISSION_STORE_DIR", str(DATA_DIR / "admission")))
+ADMISSION_ROW_GROUP_ROWS = 4096
+
+# 학년도별 입결 인덱스 샤드 이름 접두사 (예: _admission_2024)
+ADMISSION_SHARD_PREFIX = "_admission_"
+
+# 입결 질문에서 검색·표시할 최근 학년도 수 (추이 비교)
+ADMISSION_TREND_YEARS = 5
+
+# 학년도별 입결 샤드까지 검색하는 프롬프트 타입 (그 밖의 질문은 학교·공통 샤드만 검색)
+ADMISSION_PROMPT_TYPES = ("admission_table",)
+
+# ===============================
+# RAG 서비스 설정
+# ===============================
+RAG_RETRIEVER_K = 4  # 질문당 검색할 문서 수 (LangChain 기본값과 동일)
+RAG_CACHE_SIZE = 256  # 프로세스 공용 응답 캐시의 최대 항목 수
+
+# 의미 기반 응답 캐시: 질문 임베딩의 코사인 유사도가 프롬프트 타입별 임계값 이상이면 캐시된 답변을 재사용
+SEMANTIC_CACHE_ENABLED = os.getenv("DREAMCOURSE_SEMANTIC_CACHE", "1") == "1"
+# 임계값은 임베딩 모델마다 다르므로 `python -m semantic_cache calibrate --write`로 백엔드별로 측정해 저장합니다
+# (측정값이 없는 백엔드는 의미 기반 캐시를 쓰지 않음)
+SEMANTIC_CACHE_THRESHOLDS_PATH = BASE_DIR / "semantic_cache_thresholds.json"
+SEMANTIC_CACHE_CALIBRATION_MARGIN = 0.01  # 서로 다른 직업·학과 쌍의 최대 유사도에 더하는 여유
+SEMANTIC_CACHE_SIZE = 1024  # 프로세스당 최대 항목 수 (초과 시 LRU 해제)
+SEMANTIC_CACHE_TTL_SECONDS = 24 * 3600  # 항목 유효 시간(초)
+# 의미 기반 적중 중 이 비율만큼 실제 답변을 생성해 비교하고, 일치도가 기준 미만이면 오적중으로 기록합니다
+SEMANTIC_CACHE_AUDIT_RATE = float(os.getenv("DREAMCOURSE_SEMANTIC_AUDIT_RATE", "0.05"))
+SEMANTIC_CACHE_AUDIT_AGREEMENT = 0.6  # 두 답변 테이블 셀의 Jaccard 유사도 기준
+SEMANTIC_CACHE_AUDIT_PATH = BASE_DIR / "semantic_cache_audit.jsonl"
+
+# 검색 마이크로 배치: 이 시간(ms) 안에 여러 세션에서 도착한 질문을 임베딩 요청 한 번과 FAISS 검색 한 번으로 묶습니다
+RETRIEVAL_BATCH_ENABLED = os.getenv("DREAMCOURSE_RETRIEVAL_BATCH", "1") == "1"
+RETRIEVAL_BATCH_WINDOW_MS = float(os.getenv("DREAMCOURSE_RETRIEVAL_BATCH_WINDOW_MS", "3"))
+RETRIEVAL_BATCH_MAX_SIZE = 64  # 창이 끝나기 전이라도 이 수만큼 모이면 바로 실행
+# FAISS 검색 전용 스레드 수와 검색당 OpenMP 스레드 수 (0이면 CPU 코어 수 / 검색 스레드 수)
+# 여러 세션의 검색이 각자 모든 코어에 OpenMP 스레드를 띄우지 않도록 검색은 전용 스레드에서만 실행합니다
+RETRIEVAL_SEARCH_WORKERS = int(os.getenv("DREAMCOURSE_RETRIEVAL_SEARCH_WORKERS", "1"))
+FAISS_OMP_THREADS = int(os.getenv("DREAMCOURSE_FAISS_OMP_THREADS", "0"))
+
+# ===============================
+# 업스트림 장애 대응 설정
+# ===============================
+# LLM·임베딩 호출이 연속으로 이 횟수만큼 실패(마감 시간 초과 포함)하면 회로를 열고 CIRCUIT_RESET_SECONDS 동안
+# 호출하지 않습니다. 그 뒤에는 한 요청만 시험 호출(half-open)하여 성공하면 회로를 닫습니다.
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("DREAMCOURSE_CIRCUIT_FAILURES", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("DREAMCOURSE_CIRCUIT_RESET_SECONDS", "30"))
+
+# 질문별로 마지막으로 성공한 테이블 답변을 보관하는 SQLite 저장소 (여러 레플리카가 함께 사용, WAL 모드)
+# 회로가 열려 있거나 호출이 실패하면 이 답변을 "저장된 결과"로 표시하여 대신 제공합니다
+ANSWER_STORE_PATH = Path(os.getenv("DREAMCOURSE_ANSWER_STORE_PATH", str(DATA_DIR / "answers.sqlite3")))
+
+# ===============================
+# 학생별 진로 설계 저장소 설정
+# ===============================
+# 생성한 직업·커리큘럼·입결 테이블과 입력값을 학생 토큰별로 보관하는 SQLite 저장소 (WAL 모드)
+# 새로 고침, 재접속, 뒤로가기 후에도 입력 지문과 인덱스 버전이 같으면 LLM을 다시 호출하지 않고 복원합니다
+PLAN_STORE_PATH = Path(os.getenv("DREAMCOURSE_PLAN_STORE_PATH", str(DATA_DIR / "plans.sqlite3")))
+# 학생 토큰을 담는 URL 쿼리 파라미터 (예: ?student=...)
+STUDENT_TOKEN_PARAM = "student"
+# 새로 고침 시 복원할 세션 입력값
+PLAN_PROFILE_KEYS = ("page", "name", "school", "job", "grade", "selected_major")
+
+# ===============================
+# 추적(tracing) 설정
+# ===============================
+TRACE_PANEL_ENABLED = os.getenv("DREAMCOURSE_TRACE_PANEL", "0") == "1"  # 개발자 워터폴 패널 표시
+TRACING_ENABLED = os.getenv("DREAMCOURSE_TRACING", "0") == "1" or TRACE_PANEL_ENABLED
+# span을 내보낼 JSONL 경로 (빈 문자열이면 파일로 내보내지 않음)
+TRACE_EXPORT_FILE = os.getenv("DREAMCOURSE_TRACE_PATH", str(BASE_DIR / "traces.jsonl"))
+TRACE_EXPORT_PATH = Path(TRACE_EXPORT_FILE) if TRACE_EXPORT_FILE else None
+TRACE_MAX_SESSIONS = 256  # 마지막 페이지 뷰를 메모리에 보관할 최대 세션 수
+
+# ===============================
+# 메트릭 설정
+# ===============================
+METRICS_ENABLED = os.getenv("DREAMCOURSE_METRICS", "1") == "1"
+METRICS_ADDR = os.getenv("DREAMCOURSE_METRICS_ADDR", "0.0.0.0")
+METRICS_PORT = int(os.getenv("DREAMCOURSE_METRICS_PORT", "9464"))  # 사이드카 /metrics 포트
+METRICS_PORT_SPAN = int(os.getenv("DREAMCOURSE_METRICS_PORT_SPAN", "8"))  # 포트가 사용 중이면 다음 포트를 차례로 시도할 개수
+# 설정하면 prometheus_client 멀티프로세스 모드로 같은 호스트의 모든 프로세스 메트릭을 한 포트에서 합쳐 노출
+# (prometheus_client가 import 시점에 읽으므로 프로세스 시작 전에 환경 변수로 지정하고, 배포 시작 시 디렉터리를 비워야 함)
+METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+SESSION_IDLE_SECONDS = 300  # 이 시간 동안 활동이 없는 세션은 활성 세션에서 제외
+
 # ===============================
 # UI 설정
 # ===============================
@@ -64,14 +274,43 @@ JOB_OPTIONS = [
     "건축가"
 ]
 
+# 직업명 자동완성·교정 인덱스 (JOB_OPTIONS + 학과정보 CSV의 직업명)
+JOB_INDEX_NGRAM = 3  # 역색인 자모 n-gram 길이
+JOB_FUZZY_CANDIDATES = 64  # 편집 거리를 계산할 최대 후보 수
+JOB_RESOLVE_MAX_DISTANCE = 1  # 이 자모 편집 거리 이내일 때만 표준 직업명으로 교정
+JOB_RESOLVE_MIN_SYLLABLES = 3  # 교정 대상 직업명의 최소 글자 수 ("교수"→"교사"처럼 짧은 이름은 한 자모 차이도 다른 직업)
+JOB_SUGGESTION_LIMIT = 8  # 자동완성 최대 추천 수
+
 # 기본 학교명
 DEFAULT_SCHOOL = "경기고등학교"
 
+# ===============================
+# 학급 일괄 생성 설정
+# ===============================
+# 명단 CSV 컬럼 (영문 키 또는 한글 헤더 모두 허용, 희망학과·학교는 생략 가능)
+ROSTER_COLUMNS = {
+    "name": "이름",
+    "grade": "학년",
+    "job": "희망직업",
+    "major": "희망학과",
+    "school": "학교",
+}
+
+# 동시에 실행할 RAG 질의 수와 CLI 기본 출력 디렉토리
+BATCH_CONCURRENCY = int(os.getenv("DREAMCOURSE_BATCH_CONCURRENCY", "8"))
+BATCH_OUTPUT_DIR = BASE_DIR / "batch_output"
+
+# ===============================
+# API 서버 설정
+# ===============================
+# 브라우저 세션 없이 추천을 제공하는 JSON API (python -m api)
+API_HOST = os.getenv("DREAMCOURSE_API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("DREAMCOURSE_API_PORT", "8000"))
+
 # ===============================
 # 외부 링크
 # ===============================
 CAREER_TEST_URL = "https://www.career.go.kr/cloud/w/inspect/itrstk/intro"
-CAREER_TEST_IMAGE_URL = "https://raw.githubusercontent.com/blockchainMania/DreamCourse/main/test.jpg"
 
 # ===============================
 # 테이블 컬럼 정의
@@ -79,7 +318,7 @@ CAREER_TEST_IMAGE_URL = "https://raw.githubusercontent.com/blockchainMania/Dream
 TABLE_COLUMNS = {
     "job": ["관련 직업명", "직업 설명", "추천 학과"],
     "curriculum": ["학기정보", "공통과목", "기본선택과목", "일반선택과목", "진로선택과목", "융합과목"],
-    "admission": ["대학명", "학과명", "전형명", "모집인원", "경쟁률", "50% 컷", "70% 컷"]
+    "admission": ["학년도", "대학명", "학과명", "전형명", "모집인원", "경쟁률", "50% 컷", "70% 컷"]
 }
 
 # ===============================
@@ -90,8 +329,11 @@ MESSAGES = {
     "loading_job_info": "DreamCourse의 AI 모델이 {name}님의 맞춤형 직업 정보를 생성 중입니다...",
     "loading_curriculum": "{major}에 필요한 과목 정보를 불러오는 중입니다...",
     "loading_admission": "{major}의 입결 정보를 불러오는 중입니다...",
-    "input_required": "이름과 고등학교를 입력해주세요!",
-    "major_selected": "**{major}**를 선택하셨습니다"
+    "input_required": "이름, 희망 직업, 고등학교를 입력해주세요!",
+    "major_selected": "**{major}**를 선택하셨습니다",
+    "cached_answer": "⚠️ AI 서버 응답이 원활하지 않아 {time}에 저장된 결과를 표시합니다.",
+    "batch_help": "이름, 학년, 희망직업 열이 있는 명단 CSV를 올리면 학생별 진로 설계를 한 번에 생성합니다. "
+                  "희망학과 열이 비어 있으면 추천 학과 중 첫 번째 학과로 설계합니다."
 }
 
 # ===============================
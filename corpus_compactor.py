@@ -0,0 +1,239 @@
+"""
+DreamCourse 코퍼스 압축
+
+DocumentProcessor는 CSV 행마다 문서를 만들기 때문에 추천 학과가 두 개인 직업(예: 스포츠해설가 → 체육학과, 체육교육과)은
+거의 같은 문서 두 개가 되어 상위 k개 검색 결과를 차지하고 같은 문맥을 두 번 LLM에 보냅니다.
+CorpusCompactor는 문서 생성과 색인 사이에서 다음 두 단계를 스트리밍으로 실행합니다.
+
+1. 합치기: 엔터티 키가 같은 연속된 문서를 하나로 합칩니다. (job → 직업, curriculum → 학교·학과, admission → 학년도·학과)
+   문서 종류별 합치기 함수가 있으면 구조화된 메타데이터로 본문을 다시 만들고, 없으면 서로 다른 본문을 이어 붙입니다.
+   여러 값을 갖는 메타데이터(학과, 대학)는 순서를 유지한 합집합이 됩니다.
+2. 중복 제거: 문자 shingle의 MinHash 서명을 LSH 밴드로 나누어 후보를 찾고,
+   추정 Jaccard 유사도가 CORPUS_DEDUP_THRESHOLD 이상이면 나중 문서를 제거합니다. (같은 엔터티 안에서만 비교 —
+   체육학과와 체육교육과 커리큘럼처럼 본문 대부분이 같아도 다른 엔터티의 문서는 서로 다른 정보이므로 남깁니다)
+
+멀리 떨어져 있는 같은 엔터티의 문서는 합치지 않으므로(DocumentProcessor._iter_groups와 같은 규칙) 메모리는
+문서당 MinHash 서명(CORPUS_MINHASH_PERMUTATIONS x 4바이트)에 비례합니다.
+"""
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from config import (
+    CORPUS_DEDUP_THRESHOLD,
+    CORPUS_MINHASH_BANDS,
+    CORPUS_MINHASH_PERMUTATIONS,
+    CORPUS_SHINGLE_SIZE
+)
+from metrics import CORPUS_COMPACTION
+
+# 문서 종류별 엔터티 키를 이루는 메타데이터 키
+ENTITY_KEYS = {
+    "job": ("직업",),
+    "curriculum": ("school", "학과"),
+    "admission": ("year", "학과"),
+}
+
+# 엔터티 키가 없는 문서끼리 거의 같은 문서를 찾는 범위 (엔터티 키가 있으면 같은 엔터티 안에서만 비교합니다)
+DEDUP_SCOPE_KEYS = ("type", "school", "year")
+
+# 쉼표로 구분된 여러 값을 갖는 메타데이터 키 (합칠 때 합집합)
+MULTI_VALUE_KEYS = ("학과", "대학")
+
+# MinHash 해시 함수 (a * x + b, 2^64로 나눈 나머지)의 계수 — 버전 해시가 재현되도록 고정 시드를 씁니다
+_RNG = np.random.default_rng(20240601)
+_MINHASH_A = _RNG.integers(1, 2 ** 63, size=CORPUS_MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_MINHASH_B = _RNG.integers(0, 2 ** 63, size=CORPUS_MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def split_values(value: Any) -> List[str]:
+    """쉼표로 구분된 메타데이터 값을 목록으로 나눕니다."""
+    if value is None or value == "":
+        return []
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def merge_metadata(documents: List[Document]) -> Dict[str, Any]:
+    """
+    같은 엔터티 문서들의 메타데이터를 합칩니다.
+
+    Args:
+        documents (List[Document]): 합칠 문서 (첫 문서의 값이 기본값)
+
+    Returns:
+        Dict[str, Any]: 여러 값을 갖는 키는 순서를 유지한 합집합 ("체육학과, 체육교육과")
+    """
+    metadata = dict(documents[0].metadata)
+    for key in MULTI_VALUE_KEYS:
+        values = dict.fromkeys(value for document in documents for value in split_values(document.metadata.get(key)))
+        if values:
+            metadata[key] = ", ".join(values)
+    return metadata
+
+
+@dataclass
+class CompactionStats:
+    """압축 결과 집계"""
+
+    input_documents: int = 0
+    output_documents: int = 0
+    merged: int = 0
+    deduplicated: int = 0
+    input_chars: int = 0
+    output_chars: int = 0
+
+
+class CorpusCompactor:
+    """같은 엔터티 문서를 합치고 거의 같은 문서를 제거하는 코퍼스 압축기"""
+
+    def __init__(
+        self,
+        mergers: Optional[Dict[str, Callable[[List[Document]], Document]]] = None,
+        threshold: float = CORPUS_DEDUP_THRESHOLD,
+        bands: int = CORPUS_MINHASH_BANDS,
+        shingle_size: int = CORPUS_SHINGLE_SIZE
+    ):
+        """
+        Args:
+            mergers (Optional[Dict[str, Callable[[List[Document]], Document]]]): 문서 종류별 합치기 함수
+                (예: DocumentProcessor.merge_job_documents, 없으면 서로 다른 본문을 이어 붙임)
+            threshold (float): 거의 같은 문서로 볼 추정 Jaccard 유사도 (1보다 크면 중복 제거 안 함)
+            bands (int): LSH 밴드 수 (CORPUS_MINHASH_PERMUTATIONS의 약수)
+            shingle_size (int): 문자 shingle 길이
+        """
+        self.mergers = mergers or {}
+        self.threshold = threshold
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.stats = CompactionStats()
+        # (엔터티 키 또는 종류·학교·학년도, 밴드 번호, 밴드 해시) -> 그 밴드를 가진 문서 번호
+        self._buckets: Dict[Hashable, List[int]] = defaultdict(list)
+        self._signatures: List[np.ndarray] = []
+
+    @staticmethod
+    def entity_key(document: Document) -> Optional[Tuple]:
+        """
+        문서의 엔터티 키를 반환합니다.
+
+        Args:
+            document (Document): 문서
+
+        Returns:
+            Optional[Tuple]: (종류, 키 값...) 또는 None (종류를 모르거나 키 값이 없는 문서는 합치지 않음)
+        """
+        doc_type = document.metadata.get("type")
+        keys = ENTITY_KEYS.get(doc_type)
+        if keys is None:
+            return None
+        values = tuple(document.metadata.get(key) for key in keys)
+        return None if any(value in (None, "") for value in values) else (doc_type, *values)
+
+    def compact(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        문서를 합치고 거의 같은 문서를 제거하면서 차례로 내보냅니다.
+
+        Args:
+            documents (Iterable[Document]): DocumentProcessor.iter_*_documents가 만든 문서
+
+        Yields:
+            Document: 색인할 문서
+        """
+        group_key, group = None, []
+        for document in documents:
+            self.stats.input_documents += 1
+            self.stats.input_chars += len(document.page_content)
+            key = self.entity_key(document)
+            if group and key is not None and key == group_key:
+                group.append(document)
+                continue
+            if group:
+                yield from self._emit(group)
+            group_key, group = key, [document]
+        if group:
+            yield from self._emit(group)
+
+    def _emit(self, group: List[Document]) -> Iterator[Document]:
+        """같은 엔터티 문서 묶음을 하나로 합친 뒤, 거의 같은 문서가 이미 나왔으면 버립니다."""
+        doc_type = group[0].metadata.get("type") or "unknown"
+        if len(group) > 1:
+            CORPUS_COMPACTION.labels(type=doc_type, result="merged").inc(len(group) - 1)
+            self.stats.merged += len(group) - 1
+        document = self._merge(group)
+
+        if self._is_near_duplicate(document):
+            CORPUS_COMPACTION.labels(type=doc_type, result="deduplicated").inc()
+            self.stats.deduplicated += 1
+            return
+
+        CORPUS_COMPACTION.labels(type=doc_type, result="kept").inc()
+        self.stats.output_documents += 1
+        self.stats.output_chars += len(document.page_content)
+        yield document
+
+    def _merge(self, group: List[Document]) -> Document:
+        """문서 종류별 합치기 함수로 묶음을 하나의 문서로 만듭니다."""
+        if len(group) == 1:
+            return group[0]
+        merger = self.mergers.get(group[0].metadata.get("type"))
+        if merger is not None:
+            return merger(group)
+        texts = dict.fromkeys(document.page_content for document in group)
+        return Document(page_content=" ".join(texts), metadata=merge_metadata(group))
+
+    def _is_near_duplicate(self, document: Document) -> bool:
+        """
+        LSH 후보 중 추정 유사도가 기준 이상인 문서가 있는지 확인하고, 없으면 문서의 서명을 등록합니다.
+
+        Args:
+            document (Document): 합친 문서
+
+        Returns:
+            bool: 이미 나온 문서와 거의 같으면 True
+        """
+        if self.threshold > 1:
+            return False
+        signature = self.signature(document.page_content)
+        scope = self.entity_key(document) or tuple(document.metadata.get(key) for key in DEDUP_SCOPE_KEYS)
+        bands = [
+            (*scope, band, hashlib.blake2b(rows.tobytes(), digest_size=8).digest())
+            for band, rows in enumerate(np.split(signature, self.bands))
+        ]
+
+        candidates = {i for bucket in bands for i in self._buckets.get(bucket, ())}
+        if candidates:
+            matches = np.stack([self._signatures[i] for i in candidates]) == signature
+            if (matches.mean(axis=1) >= self.threshold).any():
+                return True
+
+        for bucket in bands:
+            self._buckets[bucket].append(len(self._signatures))
+        self._signatures.append(signature)
+        return False
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        문자 shingle 집합의 MinHash 서명을 계산합니다.
+
+        Args:
+            text (str): 문서 본문
+
+        Returns:
+            np.ndarray: (CORPUS_MINHASH_PERMUTATIONS,) uint32 서명 — 두 서명의 일치 비율이 Jaccard 유사도의 추정치
+        """
+        normalized = " ".join(text.split())
+        size = self.shingle_size
+        shingles = {normalized[i:i + size] for i in range(max(1, len(normalized) - size + 1))}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # uint64 곱셈은 2^64로 나눈 나머지로 감싸지므로 오버플로 경고 없이 해시 함수 군을 만듭니다
+        with np.errstate(over="ignore"):
+            permuted = hashes[:, None] * _MINHASH_A[None, :] + _MINHASH_B[None, :]
+        return (permuted.min(axis=0) >> np.uint64(32)).astype(np.uint32)
@@ -0,0 +1,681 @@
+"""
+DreamCourse 공유 벡터 인덱스 저장소
+
+FAISS 인덱스와 문서 저장소를 메모리 매핑 가능한 형식으로 디스크에 버전별로 저장합니다.
+같은 호스트의 여러 Streamlit 워커 프로세스는 읽기 전용 mmap으로 하나의 페이지 캐시 사본을
+공유하며, 새 버전은 `current` 심볼릭 링크를 원자적으로 교체하여 반영합니다.
+
+디렉토리 구조 (임베딩 백엔드·샤드별):
+    vector_db/<backend>/shards/<shard>/
+    ├── current -> versions/<version>
+    └── versions/<version>/
+        ├── index.faiss      # faiss.write_index 출력
+        ├── texts.bin        # 문서 본문을 이어 붙인 UTF-8 바이트열
+        ├── offsets.npy      # 문서 i의 본문 = texts.bin[offsets[i]:offsets[i + 1]]
+        ├── metadata.json    # 문자열 메타데이터 열의 값 사전 (type, 학과, school)
+        ├── metadata_*.npy   # 열 단위 메타데이터 (문자열 열은 사전 코드, year는 학년도)
+        └── manifest.json    # 버전, 차원, 문서 수, 인덱스 종류·파라미터, 생성 시각
+
+문서 저장소는 Document 객체나 pickle 없이 본문 바이트열, 오프셋 배열, 메타데이터 열만 보관하고,
+검색 결과 상위 k개를 조회할 때만 Document를 만듭니다. 열기는 파일 크기와 무관하게 mmap만 하므로 O(1)입니다.
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import time
+import uuid
+from array import array
+from collections.abc import Mapping
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import faiss
+import numpy as np
+from langchain.docstore.base import Docstore
+from langchain.docstore.document import Document
+from langchain.embeddings.base import Embeddings
+from langchain.vectorstores import FAISS
+
+from admission_store import admission_shard, get_admission_store
+from ann_index import AnnIndexFactory, IncrementalIndexBuilder
+from config import (
+    INDEX_STORE_DIR,
+    INGEST_EMBED_BATCH_SIZE,
+    SCHOOL_CURRICULUM_CSVS,
+    SHARED_SHARD,
+    VECTOR_INDEX_TYPE
+)
+
+# 플랫 인덱스의 벡터 데이터까지 mmap하는 플래그 (구버전 FAISS는 IO_FLAG_MMAP으로 대체)
+MMAP_READ_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+# 열 단위로 보관하는 문서 메타데이터: Document.metadata 키 -> 파일 이름 (metadata_<이름>.npy)
+# 문자열 열은 값 사전의 int32 코드(-1 = 없음), year는 학년도 값(0 = 없음)으로 저장하며 그 밖의 키는 보관하지 않습니다
+METADATA_COLUMNS = {
+    "type": "type", "직업": "job", "학과": "major", "대학": "university", "school": "school", "year": "year"
+}
+NUMERIC_METADATA = {"year"}
+
+# 버전 구분에서 제외하는 검색 전용 파라미터 (load가 설정값으로 다시 맞춤)
+SEARCH_PARAM_KEYS = ("ivf_nprobe", "hnsw_ef_search")
+
+
+class MetadataColumns:
+    """문서 메타데이터를 열 단위 배열로 보관하고 문서 하나의 메타데이터를 필요할 때 복원하는 클래스"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], dictionaries: Dict[str, List[str]]):
+        """
+        Args:
+            columns (Dict[str, np.ndarray]): 메타데이터 키별 int32 배열 (문서 순서)
+            dictionaries (Dict[str, List[str]]): 문자열 열의 값 사전 (코드 -> 값)
+        """
+        self.columns = columns
+        self.dictionaries = dictionaries
+
+    @classmethod
+    def open(cls, directory: Path) -> "MetadataColumns":
+        """
+        디렉토리의 메타데이터 열을 읽기 전용 mmap으로 엽니다.
+
+        Args:
+            directory (Path): metadata.json, metadata_*.npy가 있는 디렉토리
+
+        Returns:
+            MetadataColumns: 메타데이터 열 (메타데이터가 없는 이전 버전이면 빈 열)
+        """
+        path = directory / "metadata.json"
+        if not path.exists():
+            return cls({}, {})
+        dictionaries = json.loads(path.read_text(encoding="utf-8"))
+        columns = {
+            key: np.load(directory / f"metadata_{name}.npy", mmap_mode="r")
+            for key, name in METADATA_COLUMNS.items()
+        }
+        return cls(columns, dictionaries)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """
+        문서 하나의 메타데이터를 복원합니다.
+
+        Args:
+            i (int): 문서 행 번호
+
+        Returns:
+            Dict[str, Any]: 값이 있는 열만 담은 메타데이터
+        """
+        metadata: Dict[str, Any] = {}
+        for key, column in self.columns.items():
+            value = int(column[i])
+            if key in NUMERIC_METADATA:
+                if value:
+                    metadata[key] = value
+            elif value >= 0:
+                metadata[key] = self.dictionaries[key][value]
+        return metadata
+
+
+class MetadataColumnsWriter:
+    """문서 메타데이터를 열 단위 배열과 값 사전으로 부호화하는 작성기"""
+
+    def __init__(self):
+        # 문서당 열마다 4바이트만 쓰도록 파이썬 int 리스트 대신 array를 사용합니다
+        self._columns = {key: array("i") for key in METADATA_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {key: {} for key in METADATA_COLUMNS if key not in NUMERIC_METADATA}
+
+    @staticmethod
+    def digest_key(metadata: Dict[str, Any]) -> bytes:
+        """
+        버전 해시에 넣을 메타데이터 바이트열을 만듭니다. (보관하는 열만 사용)
+
+        Args:
+            metadata (Dict[str, Any]): 문서 메타데이터
+
+        Returns:
+            bytes: 보관하는 열이 없으면 빈 바이트열
+        """
+        stored = {key: metadata[key] for key in METADATA_COLUMNS if metadata.get(key) not in (None, "")}
+        return json.dumps(stored, ensure_ascii=False, sort_keys=True).encode("utf-8") if stored else b""
+
+    def add(self, metadata: Dict[str, Any]):
+        """
+        문서 하나의 메타데이터를 추가합니다.
+
+        Args:
+            metadata (Dict[str, Any]): 문서 메타데이터
+        """
+        for key, column in self._columns.items():
+            value = metadata.get(key)
+            if key in NUMERIC_METADATA:
+                column.append(int(value) if value else 0)
+            elif value is None or value == "":
+                column.append(-1)
+            else:
+                codes = self._codes[key]
+                column.append(codes.setdefault(str(value), len(codes)))
+
+    def finish(self) -> MetadataColumns:
+        """부호화한 열을 메모리의 MetadataColumns로 반환합니다."""
+        columns = {key: np.frombuffer(column, dtype=np.int32) for key, column in self._columns.items()}
+        return MetadataColumns(columns, {key: list(codes) for key, codes in self._codes.items()})
+
+    def write(self, directory: Path):
+        """
+        부호화한 열을 metadata_*.npy와 metadata.json으로 기록합니다.
+
+        Args:
+            directory (Path): 기록할 디렉토리
+        """
+        metadata = self.finish()
+        for key, name in METADATA_COLUMNS.items():
+            np.save(directory / f"metadata_{name}.npy", metadata.columns[key])
+        (directory / "metadata.json").write_text(json.dumps(metadata.dictionaries, ensure_ascii=False), encoding="utf-8")
+
+
+class CompactDocstore(Docstore):
+    """
+    이어 붙인 UTF-8 본문, 오프셋 배열, 열 단위 메타데이터로 문서를 보관하는 읽기 전용 문서 저장소
+
+    InMemoryDocstore처럼 문서마다 Document 객체를 유지하지 않고, search()로 조회한 문서만 만듭니다.
+    """
+
+    def __init__(self, blob: Union[bytes, mmap.mmap], offsets: np.ndarray, metadata: MetadataColumns):
+        """
+        Args:
+            blob (Union[bytes, mmap.mmap]): 문서 본문을 이어 붙인 UTF-8 바이트열
+            offsets (np.ndarray): 문서 i의 본문 = blob[offsets[i]:offsets[i + 1]]
+            metadata (MetadataColumns): 열 단위 메타데이터
+        """
+        self._blob = blob
+        self._offsets = offsets
+        self.metadata = metadata
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Document]) -> "CompactDocstore":
+        """
+        문서를 메모리의 압축 저장소로 변환합니다.
+
+        Args:
+            documents (Iterable[Document]): 문서 (인덱스 행 순서)
+
+        Returns:
+            CompactDocstore: 문서 저장소
+        """
+        blob = bytearray()
+        offsets = array("q", [0])
+        metadata = MetadataColumnsWriter()
+        for document in documents:
+            blob += document.page_content.encode("utf-8")
+            offsets.append(len(blob))
+            metadata.add(document.metadata)
+        return cls(bytes(blob), np.frombuffer(offsets, dtype=np.int64), metadata.finish())
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def search(self, search: str) -> Union[str, Document]:
+        """
+        문서 ID(행 번호 문자열)로 문서를 조회합니다.
+
+        Args:
+            search (str): 문서 ID
+
+        Returns:
+            Union[str, Document]: 문서 또는 찾지 못했다는 메시지
+        """
+        i = int(search)
+        if not 0 <= i < len(self):
+            return f"ID {search} not found."
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return Document(page_content=self._blob[start:end].decode("utf-8"), metadata=self.metadata.row(i))
+
+    def add(self, texts: Dict[str, Document]):
+        """
+        읽기 전용이므로 문서를 추가할 수 없습니다.
+
+        Raises:
+            TypeError: 항상 (문서를 바꾸려면 IndexStore.publish_stream으로 새 버전을 게시)
+        """
+        raise TypeError(
+            f"{type(self).__name__}는 읽기 전용 문서 저장소라 문서 {len(texts)}개를 추가할 수 없습니다. "
+            "게시된 버전은 바꾸지 않으므로 IndexStore.publish_stream(MmapDocstoreWriter로 기록)으로 새 버전을 게시하세요."
+        )
+
+    def delete(self, ids: List):
+        """
+        읽기 전용이므로 문서를 삭제할 수 없습니다.
+
+        Raises:
+            TypeError: 항상 (문서를 바꾸려면 새 버전을 게시)
+        """
+        raise TypeError(
+            f"{type(self).__name__}는 읽기 전용 문서 저장소라 문서 {len(ids)}개를 삭제할 수 없습니다. "
+            "문서를 뺀 코퍼스로 IndexStore.publish_stream을 실행해 새 버전을 게시하세요."
+        )
+
+
+class MmapDocstore(CompactDocstore):
+    """texts.bin, offsets.npy, 메타데이터 열을 읽기 전용 mmap으로 여는 문서 저장소"""
+
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory (Path): texts.bin, offsets.npy가 있는 디렉토리 (metadata_*.npy는 없어도 됨)
+        """
+        offsets = np.load(directory / "offsets.npy", mmap_mode="r")
+        with open(directory / "texts.bin", "rb") as f:
+            # 빈 파일은 mmap할 수 없으므로 빈 바이트열로 대체합니다
+            blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        super().__init__(blob, offsets, MetadataColumns.open(directory))
+
+    @staticmethod
+    def write(directory: Path, documents: Iterable[Document]):
+        """
+        문서를 texts.bin, offsets.npy, 메타데이터 열로 기록합니다.
+
+        Args:
+            directory (Path): 기록할 디렉토리
+            documents (Iterable[Document]): 문서 (인덱스 행 순서)
+        """
+        with MmapDocstoreWriter(directory) as writer:
+            for document in documents:
+                writer.add(document.page_content, document.metadata)
+
+
+class MmapDocstoreWriter:
+    """문서 본문을 texts.bin에 이어 쓰고, 닫을 때 offsets.npy와 메타데이터 열을 기록하는 스트리밍 작성기"""
+
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory (Path): 기록할 디렉토리
+        """
+        self.directory = directory
+        self._file = open(directory / "texts.bin", "wb")
+        # 문서당 8바이트만 쓰도록 파이썬 int 리스트 대신 array를 사용합니다
+        self._offsets = array("q", [0])
+        self._metadata = MetadataColumnsWriter()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __enter__(self) -> "MmapDocstoreWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        문서 하나를 추가합니다.
+
+        Args:
+            text (str): 문서 본문
+            metadata (Optional[Dict[str, Any]]): 문서 메타데이터 (type, 학과, school, year)
+
+        Returns:
+            bytes: 기록된 UTF-8 바이트열
+        """
+        encoded = text.encode("utf-8")
+        self._file.write(encoded)
+        self._offsets.append(self._offsets[-1] + len(encoded))
+        self._metadata.add(metadata or {})
+        return encoded
+
+    def close(self):
+        """texts.bin을 닫고 offsets.npy와 메타데이터 열을 기록합니다."""
+        if self._file.closed:
+            return
+        self._file.close()
+        np.save(self.directory / "offsets.npy", np.frombuffer(self._offsets, dtype=np.int64))
+        self._metadata.write(self.directory)
+
+
+class RowIdMapping(Mapping):
+    """인덱스 행 번호 i를 문서 ID str(i)로 대응시키는 O(1) 메모리 매핑"""
+
+    def __init__(self, size: int):
+        self._size = size
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self._size:
+            raise KeyError(i)
+        return str(i)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._size))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class IndexStore:
+    """버전별 인덱스 게시(publish)와 mmap 로딩을 담당하는 클래스"""
+
+    def __init__(self, root: Path = INDEX_STORE_DIR):
+        """
+        Args:
+            root (Path): 인덱스 저장소 루트 디렉토리
+        """
+        self.root = Path(root)
+        self.versions_dir = self.root / "versions"
+        self.current_link = self.root / "current"
+
+    @classmethod
+    def for_shard(cls, shard: str) -> "IndexStore":
+        """
+        샤드별 인덱스 저장소를 반환합니다.
+
+        Args:
+            shard (str): 학교 이름 또는 SHARED_SHARD
+
+        Returns:
+            IndexStore: 샤드 디렉토리를 루트로 하는 저장소
+        """
+        return cls(INDEX_STORE_DIR / "shards" / shard)
+
+    def current_version(self) -> Optional[str]:
+        """
+        현재 게시된 버전 이름을 반환합니다.
+
+        Returns:
+            Optional[str]: 버전 이름 또는 None (게시된 버전이 없을 때)
+        """
+        try:
+            return Path(os.readlink(self.current_link)).name
+        except OSError:
+            return None
+
+    @contextmanager
+    def build_lock(self) -> Iterator[None]:
+        """여러 워커가 동시에 같은 인덱스를 구축하지 않도록 파일 락을 잡습니다."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".build.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def publish(self, vectorstore: FAISS) -> str:
+        """
+        벡터 스토어를 새 버전으로 기록하고 current 링크를 원자적으로 교체합니다.
+
+        Args:
+            vectorstore (FAISS): 게시할 벡터 스토어
+
+        Returns:
+            str: 게시된 버전 이름 (같은 내용·인덱스 구성의 버전이 이미 있으면 그 버전)
+        """
+        documents = [
+            vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+            for i in range(vectorstore.index.ntotal)
+        ]
+        digest = hashlib.sha256()
+        digest.update(str(vectorstore.index.d).encode())
+        for document in documents:
+            digest.update(document.page_content.encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(MetadataColumnsWriter.digest_key(document.metadata))
+
+        # 같은 내용을 다시 게시하면 기존 버전을 그대로 써서 워커의 버전별 캐시가 무효화되지 않게 합니다
+        version = self._find_version(digest.hexdigest(), self._version_key(digest.hexdigest(), vectorstore.index))
+        if version is None:
+            staging = self._create_staging()
+            try:
+                MmapDocstore.write(staging, documents)
+                version = self._commit_staging(staging, digest.hexdigest(), vectorstore.index)
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+        self._flip_current(version)
+        return version
+
+    def publish_stream(
+        self,
+        documents: Iterable[Union[str, Document]],
+        embeddings: Embeddings,
+        batch_size: int = INGEST_EMBED_BATCH_SIZE,
+        index_type: str = VECTOR_INDEX_TYPE,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        문서를 배치 단위로 임베딩·색인하면서 새 버전으로 기록하고 current 링크를 교체합니다.
+
+        전체 텍스트나 임베딩을 메모리에 모으지 않고 배치마다 texts.bin에 이어 쓰고 인덱스에 추가하므로,
+        구축 중 메모리는 배치 크기와 인덱스 자체의 크기로 제한됩니다. 같은 텍스트에 대해
+        publish와 같은 버전 해시를 만들며, 해시는 모두 읽은 뒤에야 알 수 있으므로 같은 버전이 이미 있으면
+        기록한 임시 디렉토리를 버리고 기존 버전을 씁니다.
+
+        Args:
+            documents (Iterable[Union[str, Document]]): 문서 또는 메타데이터 없는 본문 (인덱스 행 순서, 제너레이터 가능)
+            embeddings (Embeddings): 문서 임베딩에 사용할 백엔드
+            batch_size (int): 한 번에 임베딩·색인할 문서 수
+            index_type (str): 인덱스 종류 (기본값: config.VECTOR_INDEX_TYPE)
+            params (Optional[Dict[str, Any]]): 인덱스 파라미터 (기본값: config.VECTOR_INDEX_PARAMS)
+
+        Returns:
+            str: 게시된 버전 이름 (같은 내용·인덱스 구성의 버전이 이미 있으면 그 버전)
+
+        Raises:
+            ValueError: 문서가 하나도 없는 경우
+        """
+        staging = self._create_staging()
+        try:
+            digest = hashlib.sha256()
+            builder = IncrementalIndexBuilder(index_type, params)
+            iterator = (doc if isinstance(doc, Document) else Document(page_content=doc) for doc in documents)
+            with MmapDocstoreWriter(staging) as writer:
+                while batch := list(islice(iterator, batch_size)):
+                    vectors = np.asarray(
+                        embeddings.embed_documents([document.page_content for document in batch]),
+                        dtype=np.float32
+                    )
+                    if not len(writer):
+                        digest.update(str(vectors.shape[1]).encode())
+                    for document in batch:
+                        digest.update(writer.add(document.page_content, document.metadata))
+                        digest.update(b"\0")
+                        digest.update(MetadataColumnsWriter.digest_key(document.metadata))
+                    builder.add(vectors)
+            version = self._commit_staging(staging, digest.hexdigest(), builder.finish())
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._flip_current(version)
+        return version
+
+    def _create_staging(self) -> Path:
+        """
+        새 버전을 기록할 임시 디렉토리를 만듭니다.
+
+        모두 기록한 뒤 rename하므로 반쯤 쓰인 버전은 보이지 않습니다.
+        """
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.versions_dir / f".staging-{uuid.uuid4().hex}"
+        staging.mkdir()
+        return staging
+
+    @staticmethod
+    def _version_key(digest: str, index: faiss.Index) -> str:
+        """
+        문서 해시와 인덱스 구성으로 버전 키를 만듭니다.
+
+        같은 문서라도 인덱스 종류나 구축 파라미터가 다르면 다른 버전이 되어야 하므로 AnnIndexFactory.describe를 함께 해시합니다.
+        디스크에서 읽은 IndexFlat은 IndexFlatL2/IndexFlatIP로 복원되므로 클래스 이름의 거리 함수 접미사는 떼고 metric을 따로 넣습니다.
+
+        Args:
+            digest (str): 차원과 문서 본문의 SHA-256 해시(16진수)
+            index (faiss.Index): 게시할 인덱스
+
+        Returns:
+            str: 버전 키 (SHA-256 16진수)
+        """
+        structure = {key: value for key, value in AnnIndexFactory.describe(index).items() if key not in SEARCH_PARAM_KEYS}
+        structure["class"] = re.sub(r"(L2|IP)$", "", structure["class"])
+        structure["metric"] = int(index.metric_type)
+        description = json.dumps(structure, sort_keys=True)
+        return hashlib.sha256(f"{digest}:{description}".encode("utf-8")).hexdigest()
+
+    def _find_version(self, digest: str, key: str) -> Optional[str]:
+        """
+        같은 문서와 인덱스 구성으로 이미 게시된 버전을 찾습니다.
+
+        Args:
+            digest (str): 차원과 문서 본문의 SHA-256 해시(16진수)
+            key (str): _version_key로 만든 버전 키
+
+        Returns:
+            Optional[str]: 버전 이름 또는 None (없을 때)
+        """
+        if not self.versions_dir.is_dir():
+            return None
+        # 임시 디렉토리는 매니페스트까지 기록한 뒤 rename되므로 버전 디렉토리는 항상 완성본입니다
+        for path in sorted(self.versions_dir.glob(f"*-{digest[:12]}*"), reverse=True):
+            try:
+                manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if manifest.get("key") == key:
+                return path.name
+        return None
+
+    def _commit_staging(self, staging: Path, digest: str, index: faiss.Index) -> str:
+        """
+        인덱스와 매니페스트를 기록하고 임시 디렉토리를 버전 디렉토리로 rename합니다.
+
+        같은 버전이 이미 있거나 다른 프로세스가 같은 버전을 먼저 rename했으면 임시 디렉토리를 지우고 그 버전을 씁니다.
+
+        Args:
+            staging (Path): 문서 저장소가 기록된 임시 디렉토리
+            digest (str): 차원과 문서 본문의 SHA-256 해시(16진수)
+            index (faiss.Index): 게시할 인덱스
+
+        Returns:
+            str: 버전 이름
+        """
+        key = self._version_key(digest, index)
+        existing = self._find_version(digest, key)
+        if existing is not None:
+            shutil.rmtree(staging, ignore_errors=True)
+            return existing
+
+        version = f"{time.strftime('%Y%m%d%H%M%S')}-{digest[:12]}"
+        faiss.write_index(index, str(staging / "index.faiss"))
+        manifest = {
+            "version": version,
+            "key": key,
+            "dimension": index.d,
+            "count": index.ntotal,
+            "index": AnnIndexFactory.describe(index),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+        (staging / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        try:
+            os.rename(staging, self.versions_dir / version)
+        except OSError:
+            # 비어 있지 않은 디렉토리로는 rename되지 않습니다 (ENOTEMPTY/EEXIST)
+            existing = self._find_version(digest, key)
+            if existing is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+                return existing
+            # 같은 초에 같은 문서를 다른 인덱스 구성으로 게시한 경우 버전 키로 이름을 구분합니다
+            version = manifest["version"] = f"{version}-{key[:8]}"
+            (staging / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.rename(staging, self.versions_dir / version)
+        return version
+
+    def _flip_current(self, version: str):
+        """임시 링크를 만든 뒤 os.replace로 current 링크를 원자적으로 교체합니다."""
+        temp_link = self.root / f".current-{uuid.uuid4().hex}"
+        os.symlink(Path("versions") / version, temp_link)
+        os.replace(temp_link, self.current_link)
+
+    def load(self, embeddings: Embeddings, version: Optional[str] = None) -> Optional[FAISS]:
+        """
+        게시된 버전을 읽기 전용 mmap으로 엽니다.
+
+        IVF의 nprobe, HNSW의 efSearch는 config.VECTOR_INDEX_PARAMS 값으로 다시 설정합니다.
+
+        Args:
+            embeddings (Embeddings): 쿼리 임베딩에 사용할 백엔드
+            version (Optional[str]): 불러올 버전 (기본값: current)
+
+        Returns:
+            Optional[FAISS]: mmap 기반 벡터 스토어 또는 None (게시된 버전이 없을 때)
+        """
+        version = version or self.current_version()
+        if version is None:
+            return None
+
+        directory = self.versions_dir / version
+        index = faiss.read_index(str(directory / "index.faiss"), MMAP_READ_FLAGS)
+        # 검색 파라미터는 재구축 없이 설정값으로 조정합니다
+        AnnIndexFactory.apply_search_params(index)
+        docstore = MmapDocstore(directory)
+
+        vectorstore = FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=RowIdMapping(index.ntotal)
+        )
+        vectorstore.version = version
+        return vectorstore
+
+    def prune(self, keep: int = 2):
+        """
+        current를 제외한 오래된 버전을 정리합니다.
+
+        이미 mmap으로 열려 있는 파일은 삭제되어도 매핑이 유지되므로 실행 중인 워커에 영향이 없습니다.
+
+        Args:
+            keep (int): 유지할 최신 버전 수 (current 포함)
+        """
+        current = self.current_version()
+        versions = sorted(
+            (path for path in self.versions_dir.iterdir() if path.is_dir() and not path.name.startswith(".")),
+            key=lambda path: path.name,
+            reverse=True
+        )
+        for path in versions[keep:]:
+            if path.name != current:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def main():
+    """원본 CSV로 샤드 인덱스를 새로 구축해 게시하거나 오래된 버전을 정리합니다."""
+    parser = argparse.ArgumentParser(description="DreamCourse 공유 벡터 인덱스 관리")
+    parser.add_argument("command", choices=["publish", "prune", "current"], help="실행할 작업")
+    parser.add_argument("--shard", type=str, default=None, help="대상 샤드 (학교 이름, 공통 샤드 또는 _admission_<학년도>, 기본값: 전체)")
+    parser.add_argument("--keep", type=int, default=2, help="prune 시 유지할 버전 수")
+    args = parser.parse_args()
+
+    admission_shards = [admission_shard(year) for year in get_admission_store().years()]
+    shards = [args.shard] if args.shard else [*SCHOOL_CURRICULUM_CSVS, SHARED_SHARD, *admission_shards]
+    for shard in shards:
+        store = IndexStore.for_shard(shard)
+        if args.command == "publish":
+            from utils import VectorStoreManager
+
+            with store.build_lock():
+                version = VectorStoreManager.publish_shard(os.getenv("OPENAI_API_KEY", ""), shard)
+                if version is None:
+                    raise SystemExit(f"{shard} 샤드 구축에 실패했습니다.")
+                print(f"{shard} 게시 완료: {version}")
+        elif args.command == "prune":
+            store.prune(keep=args.keep)
+        print(f"{shard} current: {store.current_version()}")
+
+
+if __name__ == "__main__":
+    main()
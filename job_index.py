@@ -0,0 +1,318 @@
+"""
+DreamCourse 직업명 자동완성·교정 인덱스
+
+학생이 직업명을 자유롭게 입력해도 오타 해석에 LLM을 쓰지 않도록, 알려진 모든 직업명(JOB_OPTIONS와
+학과정보 CSV의 직업명)을 메모리 인덱스로 만들어 RAG 호출 전에 표준 직업명으로 교정합니다.
+
+- 한글은 자모 단위로 분해하여 "개발ㅈ"처럼 조합 중인 입력이나 한 글자 안의 오타도 부분 일치로 다룹니다.
+- 정렬된 자모 키에서 이분 탐색으로 접두어(트라이와 같은 순서)를, 초성 키로 "ㅅㅎㅂㅈㅅ" 같은 초성 검색을 처리합니다.
+- 자모 n-gram 역색인으로 후보를 좁힌 뒤 편집 거리로 순위를 매겨 중간 일치와 오타를 처리합니다.
+
+사용 예:
+    python -m job_index 사회복지
+"""
+
+import argparse
+import bisect
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    ENCODINGS,
+    JOB_FUZZY_CANDIDATES,
+    JOB_INDEX_NGRAM,
+    JOB_OPTIONS,
+    JOB_RESOLVE_MAX_DISTANCE,
+    JOB_RESOLVE_MIN_SYLLABLES,
+    JOB_SUGGESTION_LIMIT,
+    MAJOR_INFO_CSV
+)
+
+# 한글 음절(가~힣) 분해에 쓰는 호환용 자모 (입력 중인 낱자와 같은 코드포인트)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+HANGUL_BASE, HANGUL_END = 0xAC00, 0xD7A3
+
+# 비교에서 무시할 문자 (공백, 구두점 등)
+_IGNORED = re.compile(r"[^0-9a-zㄱ-ㆎ가-힣]")
+
+
+def normalize(text: str) -> str:
+    """소문자로 바꾸고 공백과 구두점을 제거합니다."""
+    return _IGNORED.sub("", text.lower())
+
+
+def decompose(text: str) -> str:
+    """
+    정규화한 텍스트의 한글 음절을 자모로 분해합니다.
+
+    Args:
+        text (str): 원본 텍스트
+
+    Returns:
+        str: 자모 문자열 (예: "교사" -> "ㄱㅛㅅㅏ")
+    """
+    jamo = []
+    for char in normalize(text):
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            offset = code - HANGUL_BASE
+            jamo.append(CHOSEONG[offset // 588] + JUNGSEONG[offset % 588 // 28] + JONGSEONG[offset % 28])
+        else:
+            jamo.append(char)
+    return "".join(jamo)
+
+
+def choseong(text: str) -> str:
+    """
+    한글 음절을 초성으로 바꿉니다.
+
+    Args:
+        text (str): 원본 텍스트
+
+    Returns:
+        str: 초성 문자열 (예: "사회복지사" -> "ㅅㅎㅂㅈㅅ")
+    """
+    return "".join(
+        CHOSEONG[(ord(char) - HANGUL_BASE) // 588] if HANGUL_BASE <= ord(char) <= HANGUL_END else char
+        for char in normalize(text)
+    )
+
+
+def edit_distance(source: str, target: str, prefix: bool = False, max_distance: Optional[int] = None) -> int:
+    """
+    두 문자열의 레벤슈타인 편집 거리를 계산합니다.
+
+    Args:
+        source (str): 입력 문자열
+        target (str): 비교 대상 문자열
+        prefix (bool): True이면 target의 접두어 중 가장 가까운 것과의 거리 (입력 중인 문자열 비교용)
+        max_distance (Optional[int]): 이 값을 넘는 것이 확실해지면 계산을 멈추고 max_distance + 1 반환
+
+    Returns:
+        int: 편집 거리
+    """
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (source_char != target_char)
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous) if prefix else previous[-1]
+
+
+class JobNameIndex:
+    """직업명 자동완성과 오타 교정을 위한 메모리 인덱스"""
+
+    def __init__(self, names: Iterable[str], ngram: int = JOB_INDEX_NGRAM):
+        """
+        Args:
+            names (Iterable[str]): 표준 직업명 목록 (중복과 빈 값은 제거)
+            ngram (int): 역색인에 쓸 자모 n-gram 길이
+        """
+        self.ngram = ngram
+        self.names: List[str] = []
+        self._exact: Dict[str, int] = {}
+        for name in names:
+            name = str(name).strip()
+            key = decompose(name)
+            if key and key not in self._exact:
+                self._exact[key] = len(self.names)
+                self.names.append(name)
+
+        self._keys = [decompose(name) for name in self.names]
+
+        # 접두어 검색용 정렬 키 (자모, 초성)
+        self._sorted_keys = sorted((key, i) for i, key in enumerate(self._keys))
+        self._sorted_key_strings = [key for key, _ in self._sorted_keys]
+        self._sorted_choseong = sorted((choseong(name), i) for i, name in enumerate(self.names))
+        self._sorted_choseong_strings = [key for key, _ in self._sorted_choseong]
+
+        # 자모 n-gram -> 직업 ID 배열
+        postings: Dict[str, List[int]] = {}
+        for i, key in enumerate(self._keys):
+            for gram in set(self._grams(key)):
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _grams(self, key: str) -> List[str]:
+        """경계 표시를 붙인 자모 n-gram 목록 (짧은 입력도 최소 1개의 n-gram을 가짐)"""
+        padded = f"^{key}$"
+        if len(padded) <= self.ngram:
+            return [padded]
+        return [padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1)]
+
+    @staticmethod
+    def _prefix_ids(sorted_strings: List[str], sorted_pairs: List[Tuple[str, int]], prefix: str, limit: int) -> List[int]:
+        """정렬된 키에서 접두어가 일치하는 ID를 짧은 키 순으로 최대 limit개 반환합니다."""
+        start = bisect.bisect_left(sorted_strings, prefix)
+        end = bisect.bisect_left(sorted_strings, prefix + "\U0010ffff", lo=start)
+        # 접두어가 짧으면 일치 항목이 많으므로 앞에서부터 일부만 보고 짧은 이름을 우선합니다
+        matches = sorted_pairs[start:min(end, start + limit * 8)]
+        return [i for _, i in sorted(matches, key=lambda pair: (len(pair[0]), pair[0]))[:limit]]
+
+    def _candidates(self, key: str, count: int) -> np.ndarray:
+        """공유하는 n-gram이 많은 순으로 후보 ID를 최대 count개 반환합니다."""
+        lists = [self._postings[gram] for gram in set(self._grams(key)) if gram in self._postings]
+        if not lists:
+            return np.empty(0, dtype=np.int32)
+        ids, counts = np.unique(np.concatenate(lists), return_counts=True)
+        if len(ids) > count:
+            top = np.argpartition(-counts, count - 1)[:count]
+            ids, counts = ids[top], counts[top]
+        return ids[np.argsort(-counts, kind="stable")]
+
+    def _ranked(self, key: str, limit: int, prefix: bool) -> List[Tuple[int, float]]:
+        """n-gram 후보를 편집 거리 기반 유사도(0~1)로 정렬하여 반환합니다."""
+        scored = []
+        for i in self._candidates(key, JOB_FUZZY_CANDIDATES).tolist():
+            target = self._keys[i]
+            if prefix and key in target:
+                scored.append((i, 1.0, len(target)))
+                continue
+            # 제안용으로 자모의 절반까지 다른 이름은 허용합니다 (교정은 resolve에서 JOB_RESOLVE_MAX_DISTANCE로 거름)
+            max_distance = max(2, len(key) // 2)
+            distance = edit_distance(key, target, prefix=prefix, max_distance=max_distance)
+            if distance <= max_distance:
+                length = len(key) if prefix else max(len(key), len(target))
+                scored.append((i, 1 - distance / length, len(target)))
+        scored.sort(key=lambda item: (-item[1], item[2]))
+        return [(i, score) for i, score, _ in scored[:limit]]
+
+    def complete(self, text: str, limit: int = JOB_SUGGESTION_LIMIT) -> List[str]:
+        """
+        입력 중인 텍스트에 맞는 직업명을 추천합니다.
+
+        접두어 일치 → 초성 일치 → 중간 일치·오타 허용 순으로 채웁니다.
+
+        Args:
+            text (str): 지금까지 입력한 텍스트
+            limit (int): 최대 추천 수
+
+        Returns:
+            List[str]: 추천 직업명 목록
+        """
+        key = decompose(text)
+        if not key:
+            return []
+
+        ids = self._prefix_ids(self._sorted_key_strings, self._sorted_keys, key, limit)
+        initials = normalize(text)
+        if len(ids) < limit and initials and all(char in CHOSEONG for char in initials):
+            ids += [i for i in self._prefix_ids(self._sorted_choseong_strings, self._sorted_choseong, initials, limit) if i not in ids]
+        if len(ids) < limit:
+            ids += [i for i, _ in self._ranked(key, limit * 2, prefix=True) if i not in ids]
+        return [self.names[i] for i in ids[:limit]]
+
+    def resolve(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        입력을 표준 직업명으로 교정합니다.
+
+        오타 교정은 가장 가까운 직업명이 JOB_RESOLVE_MIN_SYLLABLES 글자 이상이고 자모 편집 거리가
+        JOB_RESOLVE_MAX_DISTANCE 이내일 때만 합니다. 짧은 이름은 한 자모 차이로도 다른 직업이 되므로
+        ("교수"와 "교사") 교정하지 않고 suggest()의 제안에 맡깁니다.
+
+        Args:
+            text (str): 학생이 입력한 직업명
+
+        Returns:
+            Optional[Tuple[str, float]]: (표준 직업명, 유사도) 또는 None (교정할 수 없음)
+        """
+        key = decompose(text)
+        if not key:
+            return None
+        if key in self._exact:
+            return self.names[self._exact[key]], 1.0
+
+        ranked = self._ranked(key, 1, prefix=False)
+        if not ranked:
+            return None
+        i, score = ranked[0]
+        if len(normalize(self.names[i])) < JOB_RESOLVE_MIN_SYLLABLES:
+            return None
+        if edit_distance(key, self._keys[i], max_distance=JOB_RESOLVE_MAX_DISTANCE) > JOB_RESOLVE_MAX_DISTANCE:
+            return None
+        return self.names[i], score
+
+    def suggest(self, text: str, limit: int = 3) -> List[str]:
+        """
+        교정에 실패한 입력에 대해 비슷한 직업명을 제안합니다.
+
+        Args:
+            text (str): 학생이 입력한 직업명
+            limit (int): 최대 제안 수
+
+        Returns:
+            List[str]: 비슷한 직업명 목록
+        """
+        key = decompose(text)
+        return [self.names[i] for i, _ in self._ranked(key, limit, prefix=False)] if key else []
+
+
+def load_job_names() -> List[str]:
+    """
+    알려진 직업명을 모읍니다. (JOB_OPTIONS 순서를 먼저, 이어서 학과정보 CSV의 직업명)
+
+    Returns:
+        List[str]: 직업명 목록
+    """
+    from utils import DataLoader
+
+    names = list(JOB_OPTIONS)
+    major_df = DataLoader.load_csv_safely(MAJOR_INFO_CSV, ENCODINGS["major_info"])
+    if major_df is not None and "직업명" in major_df.columns:
+        names += major_df["직업명"].dropna().astype(str).str.strip().drop_duplicates().tolist()
+    return names
+
+
+@lru_cache(maxsize=1)
+def get_job_index() -> JobNameIndex:
+    """
+    프로세스 공용 직업명 인덱스를 반환합니다. (최초 호출 시 한 번만 구축)
+
+    Returns:
+        JobNameIndex: 직업명 인덱스
+    """
+    return JobNameIndex(load_job_names())
+
+
+def resolve_job(text: str) -> str:
+    """
+    직업명을 표준 직업명으로 교정하고, 교정할 수 없으면 입력을 그대로 반환합니다.
+
+    Args:
+        text (str): 입력한 직업명
+
+    Returns:
+        str: 표준 직업명 또는 공백을 정리한 입력
+    """
+    resolved = get_job_index().resolve(text)
+    return resolved[0] if resolved else text.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DreamCourse 직업명 자동완성·교정")
+    parser.add_argument("text", type=str, help="입력 텍스트")
+    args = parser.parse_args()
+
+    index = get_job_index()
+    print(f"자동완성: {index.complete(args.text)}")
+    print(f"교정: {index.resolve(args.text)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+DreamCourse 학과 유사도 그래프
+
+커리큘럼·입결 질문마다 LLM이 "비슷한 학과"를 찾게 하지 않도록, 모든 학과 쌍의 유사도를 오프라인에서 계산하여
+학과별 상위 k개 유사 학과를 JSON으로 저장합니다. 요청 시에는 딕셔너리 조회만으로 학과를 확장합니다.
+
+유사도 = w × 학과명 임베딩 코사인 유사도 + (1 - w) × 한글 토큰(음절 바이그램) Jaccard 유사도
+
+학과 × 학과 행렬은 MAJOR_GRAPH_BLOCK_SIZE 행씩 나눠 계산하므로 학과가 수천 개여도 메모리는
+블록 크기 × 학과 수에 비례합니다.
+
+사용 예:
+    OPENAI_API_KEY=... python -m major_graph
+"""
+
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from admission_store import get_admission_store
+from config import (
+    CURRICULUM_CSV,
+    ENCODINGS,
+    MAJOR_EXPANSION_COUNT,
+    MAJOR_GRAPH_BLOCK_SIZE,
+    MAJOR_GRAPH_EMBEDDING_WEIGHT,
+    MAJOR_GRAPH_MIN_SCORE,
+    MAJOR_GRAPH_PATH,
+    MAJOR_GRAPH_TOP_K,
+    MAJOR_INFO_CSV
+)
+
+# 학과명 끝의 단위 명칭은 토큰 비교에서 제외합니다 (예: "컴퓨터공학과" -> "컴퓨터공학")
+_MAJOR_SUFFIX = re.compile(r"(과|부|전공|계열)$")
+
+
+def major_tokens(major: str) -> Set[str]:
+    """
+    학과명을 음절 바이그램 토큰 집합으로 바꿉니다.
+
+    Args:
+        major (str): 학과명
+
+    Returns:
+        Set[str]: 토큰 집합 (예: "컴퓨터공학과" -> {"컴퓨", "퓨터", "터공", "공학"})
+    """
+    stem = _MAJOR_SUFFIX.sub("", re.sub(r"\s+", "", major)) or major.strip()
+    if len(stem) < 2:
+        return {stem}
+    return {stem[i:i + 2] for i in range(len(stem) - 1)}
+
+
+class MajorGraph:
+    """학과별 유사 학과 목록"""
+
+    def __init__(self, neighbors: Dict[str, List[Tuple[str, float]]]):
+        """
+        Args:
+            neighbors (Dict[str, List[Tuple[str, float]]]): 학과 -> [(유사 학과, 점수), ...] (점수 내림차순)
+        """
+        self.neighbors = neighbors
+
+    def __len__(self) -> int:
+        return len(self.neighbors)
+
+    def similar(self, major: str, k: int = MAJOR_EXPANSION_COUNT) -> List[str]:
+        """
+        학과의 유사 학과를 반환합니다.
+
+        Args:
+            major (str): 학과명
+            k (int): 최대 개수
+
+        Returns:
+            List[str]: 유사 학과 목록 (그래프에 없는 학과면 빈 리스트)
+        """
+        return [name for name, _ in self.neighbors.get(major.strip(), [])[:k]]
+
+    @staticmethod
+    def compute(
+        majors: Sequence[str],
+        embeddings: np.ndarray,
+        top_k: int = MAJOR_GRAPH_TOP_K,
+        embedding_weight: float = MAJOR_GRAPH_EMBEDDING_WEIGHT,
+        min_score: float = MAJOR_GRAPH_MIN_SCORE,
+        block_size: int = MAJOR_GRAPH_BLOCK_SIZE
+    ) -> "MajorGraph":
+        """
+        학과 × 학과 유사도를 블록 단위로 계산하여 학과별 상위 k개를 구합니다.
+
+        Args:
+            majors (Sequence[str]): 학과명 목록
+            embeddings (np.ndarray): (N, D) 학과명 임베딩
+            top_k (int): 학과당 유사 학과 수
+            embedding_weight (float): 임베딩 코사인 유사도의 가중치
+            min_score (float): 최소 유사도
+            block_size (int): 한 번에 계산할 행 수
+
+        Returns:
+            MajorGraph: 유사도 그래프
+        """
+        count = len(majors)
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        # 두 개 이상의 학과에 나오는 토큰만 겹침 계산에 쓰고, 집합 크기는 전체 토큰으로 셉니다
+        token_sets = [major_tokens(major) for major in majors]
+        frequency: Dict[str, int] = {}
+        for tokens in token_sets:
+            for token in tokens:
+                frequency[token] = frequency.get(token, 0) + 1
+        vocabulary = {token: i for i, token in enumerate(t for t, n in frequency.items() if n > 1)}
+        token_matrix = np.zeros((count, len(vocabulary)), dtype=np.float32)
+        for row, tokens in enumerate(token_sets):
+            token_matrix[row, [vocabulary[t] for t in tokens if t in vocabulary]] = 1.0
+        token_counts = np.array([len(tokens) for tokens in token_sets], dtype=np.float32)
+
+        k = min(top_k, count - 1)
+        neighbors: Dict[str, List[Tuple[str, float]]] = {}
+        for start in range(0, count, block_size):
+            end = min(start + block_size, count)
+            cosine = vectors[start:end] @ vectors.T
+            overlap = token_matrix[start:end] @ token_matrix.T
+            jaccard = overlap / (token_counts[start:end, None] + token_counts[None, :] - overlap)
+            scores = embedding_weight * cosine + (1 - embedding_weight) * jaccard
+            scores[np.arange(end - start), np.arange(start, end)] = -np.inf  # 자기 자신 제외
+
+            if k <= 0:
+                top = np.empty((end - start, 0), dtype=np.int64)
+            else:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, candidates in enumerate(top):
+                ordered = candidates[np.argsort(-scores[row, candidates])]
+                neighbors[majors[start + row]] = [
+                    (majors[j], round(float(scores[row, j]), 4)) for j in ordered if scores[row, j] >= min_score
+                ]
+
+        return MajorGraph(neighbors)
+
+    def save(self, path: Path = MAJOR_GRAPH_PATH):
+        """
+        그래프를 JSON으로 저장합니다. (임시 파일에 쓴 뒤 교체)
+
+        Args:
+            path (Path): 저장 경로
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.neighbors, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(temporary, path)
+
+    @staticmethod
+    def load(path: Path = MAJOR_GRAPH_PATH) -> Optional["MajorGraph"]:
+        """
+        저장된 그래프를 읽습니다.
+
+        Args:
+            path (Path): 저장 경로
+
+        Returns:
+            Optional[MajorGraph]: 그래프 또는 None (아직 계산하지 않은 경우)
+        """
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return MajorGraph({major: [tuple(pair) for pair in pairs] for major, pairs in data.items()})
+
+
+def collect_majors() -> List[str]:
+    """
+    학과정보(추천학과), 커리큘럼, 전체 학년도 입결 정보에 나오는 모든 학과명을 모읍니다.
+
+    Returns:
+        List[str]: 중복 없는 학과명 목록
+    """
+    from utils import DataLoader
+
+    major_df = DataLoader.load_csv_safely(MAJOR_INFO_CSV, ENCODINGS["major_info"])
+    curriculum_df = DataLoader.load_csv_safely(CURRICULUM_CSV, ENCODINGS["curriculum"])
+    # 입결 정보는 학과 열만 읽습니다
+    admission_df = get_admission_store().query(columns=["학과"])
+    names: List[str] = []
+    if major_df is not None:
+        for value in major_df["추천학과"].dropna().astype(str):
+            names += [name.strip() for name in value.split(",")]
+    for df in (curriculum_df, admission_df):
+        if df is not None:
+            names += df["학과"].dropna().astype(str).str.strip().tolist()
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def build_major_graph(api_key: str) -> MajorGraph:
+    """
+    학과명을 임베딩하여 유사도 그래프를 계산합니다.
+
+    Args:
+        api_key (str): OpenAI API 키
+
+    Returns:
+        MajorGraph: 유사도 그래프
+    """
+    from utils import VectorStoreManager
+
+    majors = collect_majors()
+    embeddings = VectorStoreManager.create_embeddings(api_key).embed_documents(majors)
+    return MajorGraph.compute(majors, np.array(embeddings, dtype=np.float32))
+
+
+_cache: Dict[str, object] = {"mtime": None, "graph": None}
+
+
+def get_major_graph(path: Path = MAJOR_GRAPH_PATH) -> Optional[MajorGraph]:
+    """
+    저장된 그래프를 반환합니다. 파일이 다시 계산되면 다음 호출에서 새로 읽습니다.
+
+    Args:
+        path (Path): 저장 경로
+
+    Returns:
+        Optional[MajorGraph]: 그래프 또는 None (아직 계산하지 않은 경우)
+    """
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    if _cache["mtime"] != mtime:
+        _cache["graph"], _cache["mtime"] = MajorGraph.load(path), mtime
+    return _cache["graph"]
+
+
+def similar_majors(major: str, k: int = MAJOR_EXPANSION_COUNT) -> List[str]:
+    """
+    학과의 유사 학과를 딕셔너리 조회로 반환합니다.
+
+    Args:
+        major (str): 학과명
+        k (int): 최대 개수
+
+    Returns:
+        List[str]: 유사 학과 목록 (그래프가 없거나 학과가 없으면 빈 리스트)
+    """
+    graph = get_major_graph()
+    return graph.similar(major, k) if graph is not None else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DreamCourse 학과 유사도 그래프 계산")
+    parser.add_argument("--output", type=str, default=str(MAJOR_GRAPH_PATH), help="저장할 JSON 경로")
+    args = parser.parse_args()
+
+    graph = build_major_graph(os.getenv("OPENAI_API_KEY", ""))
+    graph.save(Path(args.output))
+    for major, pairs in graph.neighbors.items():
+        print(f"{major}: {', '.join(f'{name}({score:.2f})' for name, score in pairs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+DreamCourse Prometheus 메트릭
+
+레플리카 용량 산정과 성능 회귀 감지를 위한 카운터/히스토그램을 정의하고,
+앱과 함께 뜨는 사이드카 HTTP 포트(/metrics)로 노출합니다.
+
+같은 호스트에 레플리카·워커가 여러 개일 때는 두 가지 방식 중 하나로 모든 프로세스의 메트릭을 노출합니다.
+- PROMETHEUS_MULTIPROC_DIR 설정: 각 프로세스가 값을 mmap 파일에 쓰고, 포트를 먼저 잡은 프로세스가 전체 합계를 노출
+- 미설정: 포트가 사용 중이면 다음 포트(METRICS_PORT_SPAN개까지)로 프로세스마다 따로 노출
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess, start_http_server
+
+from config import (
+    METRICS_ADDR,
+    METRICS_ENABLED,
+    METRICS_MULTIPROC_DIR,
+    METRICS_PORT,
+    METRICS_PORT_SPAN,
+    SESSION_IDLE_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================
+# 메트릭 정의
+# ===============================
+ACTIVE_SESSIONS = Gauge(
+    "dreamcourse_active_sessions",
+    "최근 SESSION_IDLE_SECONDS 이내에 스크립트를 실행한 세션 수",
+    multiprocess_mode="livesum"
+)
+SCRIPT_RUNS = Counter(
+    "dreamcourse_script_runs_total",
+    "Streamlit 스크립트 실행(rerun) 횟수",
+    ["page"]
+)
+INDEX_BUILDS = Counter(
+    "dreamcourse_index_builds_total",
+    "벡터 인덱스 구축 횟수",
+    ["status"]
+)
+INDEX_BUILD_SECONDS = Histogram(
+    "dreamcourse_index_build_seconds",
+    "벡터 인덱스 구축 소요 시간",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+CHAIN_INVOCATIONS = Counter(
+    "dreamcourse_chain_invocations_total",
+    "프롬프트 타입별 RAG 체인 호출 횟수",
+    ["prompt_type"]
+)
+LLM_LATENCY_SECONDS = Histogram(
+    "dreamcourse_llm_latency_seconds",
+    "LLM 호출 지연 시간",
+    ["prompt_type", "model"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+)
+LLM_TOKENS = Counter(
+    "dreamcourse_llm_tokens_total",
+    "LLM 토큰 사용량",
+    ["prompt_type", "kind"]
+)
+LLM_COST_USD = Counter(
+    "dreamcourse_llm_cost_usd_total",
+    "MODEL_PRICES 기준 LLM 호출 추정 비용(USD)",
+    ["prompt_type", "model"]
+)
+LLM_ESCALATIONS = Counter(
+    "dreamcourse_llm_escalations_total",
+    "응답 테이블 검증 실패로 상위 모델을 다시 호출한 횟수",
+    ["prompt_type", "reason"]
+)
+LLM_HEDGES = Counter(
+    "dreamcourse_llm_hedges_total",
+    "헤지 요청 결과 (sent = 보냄, won = 헤지 응답이 먼저 도착, denied = 예산 부족으로 보내지 않음)",
+    ["prompt_type", "result"]
+)
+LLM_TIMEOUTS = Counter(
+    "dreamcourse_llm_timeouts_total",
+    "마감 시간 안에 응답이 오지 않은 LLM 호출 수",
+    ["prompt_type"]
+)
+CIRCUIT_STATE = Gauge(
+    "dreamcourse_circuit_state",
+    "업스트림 회로 상태 (0 = closed, 1 = half_open, 2 = open)",
+    ["breaker"],
+    multiprocess_mode="livemax"
+)
+CIRCUIT_TRANSITIONS = Counter(
+    "dreamcourse_circuit_transitions_total",
+    "업스트림 회로 상태 전환 횟수 (state = 전환된 상태)",
+    ["breaker", "state"]
+)
+ANSWER_FALLBACKS = Counter(
+    "dreamcourse_answer_fallbacks_total",
+    "저장된 마지막 정상 답변으로 대신 응답한 횟수 (reason = circuit_open, revalidate, error)",
+    ["prompt_type", "reason"]
+)
+CACHE_REQUESTS = Counter(
+    "dreamcourse_cache_requests_total",
+    "캐시 조회 결과 (hit 비율 = hit / (hit + miss))",
+    ["cache", "result"]
+)
+SEMANTIC_CACHE_SIMILARITY = Histogram(
+    "dreamcourse_semantic_cache_similarity",
+    "의미 기반 캐시 조회 시 가장 가까운 질문과의 코사인 유사도 (임계값 조정용)",
+    ["prompt_type"],
+    buckets=(0.5, 0.7, 0.8, 0.85, 0.9, 0.92, 0.94, 0.96, 0.98, 0.99, 1.0)
+)
+SEMANTIC_CACHE_AUDITS = Counter(
+    "dreamcourse_semantic_cache_audits_total",
+    "의미 기반 캐시 적중 감사 결과 (mismatch = 오적중)",
+    ["prompt_type", "result"]
+)
+RETRIEVAL_BATCH_SIZE = Histogram(
+    "dreamcourse_retrieval_batch_size",
+    "검색 마이크로 배치 한 번에 묶인 질문 수 (stage = embed, search)",
+    ["stage"],
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+CORPUS_COMPACTION = Counter(
+    "dreamcourse_corpus_compaction_documents_total",
+    "코퍼스 압축 결과 문서 수 (kept = 색인, merged = 같은 엔터티 문서에 합쳐짐, deduplicated = 거의 같은 문서로 제거)",
+    ["type", "result"]
+)
+TABLE_PARSE_FAILURES = Counter(
+    "dreamcourse_table_parse_failures_total",
+    "TableParser가 빈 결과를 반환한 횟수 (no_table = 테이블 없음, column_mismatch = 컬럼 수 불일치, error = 예외)",
+    ["reason"]
+)
+
+
+class SessionTracker:
+    """마지막 활동 시각을 기준으로 활성 세션 수를 계산합니다."""
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS):
+        """
+        Args:
+            idle_seconds (float): 이 시간 동안 활동이 없으면 비활성 세션으로 간주
+        """
+        self.idle_seconds = idle_seconds
+        self._last_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session_id: str):
+        """
+        세션 활동을 기록합니다.
+
+        Args:
+            session_id (str): 세션 식별자
+        """
+        with self._lock:
+            self._last_seen[session_id] = time.monotonic()
+
+    def count_active(self) -> int:
+        """
+        활성 세션 수를 계산하고 오래된 세션은 정리합니다.
+
+        Returns:
+            int: 활성 세션 수
+        """
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            for session_id in [sid for sid, seen in self._last_seen.items() if seen < cutoff]:
+                del self._last_seen[session_id]
+            return len(self._last_seen)
+
+
+SESSION_TRACKER = SessionTracker()
+if METRICS_MULTIPROC_DIR:
+    # 멀티프로세스 모드는 mmap 파일에 쓴 값만 합치므로 set_function 대신 활동할 때마다 값을 씁니다
+    atexit.register(multiprocess.mark_process_dead, os.getpid())
+else:
+    ACTIVE_SESSIONS.set_function(SESSION_TRACKER.count_active)
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def _bind_server(port: int, addr: str, registry: CollectorRegistry, span: int):
+    """
+    port부터 span개의 포트를 차례로 시도하여 /metrics 서버를 띄웁니다.
+
+    Args:
+        port (int): 처음 시도할 포트 (0이면 임의 포트 한 번만 시도)
+        addr (str): 바인딩할 주소
+        registry (CollectorRegistry): 노출할 레지스트리
+        span (int): 시도할 포트 개수
+
+    Returns:
+        서버 객체 또는 None (모든 포트가 사용 중인 경우)
+    """
+    last_error = None
+    for candidate in [port] if port == 0 else range(port, port + max(1, span)):
+        try:
+            server, _ = start_http_server(candidate, addr=addr, registry=registry)
+            return server
+        except OSError as e:
+            last_error = e
+    logger.error("메트릭 서버를 시작하지 못했습니다 (%s:%d~%d): %s", addr, port, port + max(1, span) - 1, last_error)
+    return None
+
+
+def start_metrics_server(
+    port: int = METRICS_PORT,
+    addr: str = METRICS_ADDR,
+    span: int = METRICS_PORT_SPAN
+) -> Optional[int]:
+    """
+    /metrics 사이드카 HTTP 서버를 프로세스당 한 번만 시작합니다.
+
+    멀티프로세스 모드에서는 설정한 포트만 시도하고, 이미 사용 중이면 같은 호스트의 다른 프로세스가
+    전체 합계를 노출하고 있으므로 서버 없이 계속 실행합니다. (이 프로세스의 값도 그 합계에 포함됨)
+    그 외에는 포트가 사용 중이면 다음 포트로 넘어가 레플리카마다 자기 메트릭을 노출합니다.
+
+    Args:
+        port (int): 바인딩할 포트 (0이면 임의 포트)
+        addr (str): 바인딩할 주소
+        span (int): 포트가 사용 중일 때 시도할 포트 개수 (멀티프로세스 모드에서는 무시)
+
+    Returns:
+        Optional[int]: 실제 바인딩된 포트 또는 None (비활성화, 다른 프로세스가 노출 중이거나 바인딩 실패 시)
+    """
+    global _server
+
+    if not METRICS_ENABLED:
+        return None
+
+    with _server_lock:
+        if _server is None:
+            if METRICS_MULTIPROC_DIR:
+                registry = CollectorRegistry()
+                multiprocess.MultiProcessCollector(registry, path=METRICS_MULTIPROC_DIR)
+                _server = _bind_server(port, addr, registry, span=1)
+                if _server is None:
+                    logger.info("포트 %d는 다른 프로세스가 멀티프로세스 메트릭을 노출 중인 것으로 보고 계속 실행합니다", port)
+                    return None
+            else:
+                _server = _bind_server(port, addr, REGISTRY, span)
+                if _server is None:
+                    return None
+                if port and _server.server_port != port:
+                    logger.warning("메트릭 포트 %d가 사용 중이어서 %d에서 노출합니다", port, _server.server_port)
+        return _server.server_port
+
+
+def record_script_run(session_id: str, page: str):
+    """
+    스크립트 실행 1회와 세션 활동을 기록합니다.
+
+    Args:
+        session_id (str): 세션 식별자
+        page (str): 현재 페이지 이름
+    """
+    SESSION_TRACKER.touch(session_id)
+    if METRICS_MULTIPROC_DIR:
+        ACTIVE_SESSIONS.set(SESSION_TRACKER.count_active())
+    SCRIPT_RUNS.labels(page=page).inc()
+
+
+def record_llm_call(
+    prompt_type: str,
+    model: str,
+    seconds: float,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cost: float = 0.0,
+    cached_tokens: int = 0
+):
+    """
+    LLM 호출의 지연 시간, 토큰 사용량, 추정 비용을 기록합니다.
+
+    Args:
+        prompt_type (str): 프롬프트 타입
+        model (str): 모델 이름
+        seconds (float): 호출 소요 시간(초)
+        prompt_tokens (int): 프롬프트 토큰 수
+        completion_tokens (int): 응답 토큰 수
+        cost (float): 추정 비용(USD)
+        cached_tokens (int): 프롬프트 토큰 중 제공자 측 프롬프트 캐시에 적중한 토큰 수
+    """
+    LLM_LATENCY_SECONDS.labels(prompt_type=prompt_type, model=model).observe(seconds)
+    LLM_TOKENS.labels(prompt_type=prompt_type, kind="prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(prompt_type=prompt_type, kind="completion").inc(completion_tokens)
+    LLM_TOKENS.labels(prompt_type=prompt_type, kind="cached_prompt").inc(cached_tokens)
+    if cost:
+        LLM_COST_USD.labels(prompt_type=prompt_type, model=model).inc(cost)
@@ -0,0 +1,400 @@
+"""
+DreamCourse 프롬프트 타입별 모델 라우팅
+
+프롬프트 타입마다 모델, 최대 응답 토큰 수, 호출 마감 시간을 정하고(config.MODEL_ROUTES),
+응답 테이블이 비었거나 열 수가 맞지 않을 때만 상위 모델(config.MODEL_ESCALATION)로 한 번 더 호출합니다.
+경로(프롬프트 타입, 모델)별 호출 수, 지연 시간 분위수, 토큰, 추정 비용을 집계하여
+처리량과 비용을 기준으로 경로를 조정할 수 있게 합니다.
+
+헤지 요청을 켠 경로는 응답이 최근 p95 지연 시간 안에 오지 않으면 같은 요청을 한 번 더 보냅니다.
+헤지 요청 수는 HedgeBudget으로 일반 호출 수의 일정 비율(LLM_HEDGE_BUDGET)을 넘지 않습니다.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    LLM_HEDGE_BUDGET,
+    LLM_HEDGE_BURST,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_QUANTILE,
+    MODEL_CACHED_PROMPT_PRICE_RATIO,
+    MODEL_ESCALATION,
+    MODEL_PRICES,
+    MODEL_ROUTE_STATS_WINDOW,
+    MODEL_ROUTES,
+    OPENAI_MODEL,
+    PROMPT_CACHE_MODELS
+)
+from metrics import LLM_ESCALATIONS, LLM_HEDGES, LLM_TIMEOUTS, record_llm_call
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """한 프롬프트 타입의 LLM 호출 설정"""
+
+    prompt_type: str
+    model: str = OPENAI_MODEL
+    max_tokens: Optional[int] = None
+    timeout: Optional[float] = None
+    table: Optional[str] = None  # 응답을 검증할 TABLE_COLUMNS 키 (None이면 검증하지 않음)
+    hedge: bool = False  # p95 지연 시간이 지나면 같은 요청을 한 번 더 보낼지 여부
+    escalated: bool = False
+
+
+class HedgeBudget:
+    """
+    헤지 요청 예산
+
+    일반 호출마다 ratio만큼 적립하고 헤지 요청마다 1씩 차감하므로, 헤지 요청 수는 장기적으로
+    일반 호출 수의 ratio배를 넘지 않습니다. 적립액은 burst까지만 쌓여 장애 구간에 한꺼번에 소진되지 않습니다.
+    """
+
+    def __init__(self, ratio: float = LLM_HEDGE_BUDGET, burst: float = LLM_HEDGE_BURST):
+        """
+        Args:
+            ratio (float): 일반 호출 대비 헤지 요청 비율 상한
+            burst (float): 최대 적립액 (연속으로 보낼 수 있는 헤지 요청 수)
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.balance = 0.0
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """일반 호출 1회분을 적립합니다."""
+        with self._lock:
+            self.balance = min(self.burst, self.balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        헤지 요청 1회분을 차감합니다.
+
+        Returns:
+            bool: 예산이 있어 차감했으면 True
+        """
+        with self._lock:
+            if self.balance < 1.0:
+                return False
+            self.balance -= 1.0
+            return True
+
+
+class RouteStats:
+    """경로(프롬프트 타입, 모델)별 호출 결과를 스레드 안전하게 집계합니다."""
+
+    def __init__(self, window: int = MODEL_ROUTE_STATS_WINDOW):
+        """
+        Args:
+            window (int): 지연 시간 분위수를 계산할 최근 호출 수
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def _entry(self, route: ModelRoute) -> Dict[str, Any]:
+        """경로의 집계 항목을 반환합니다. (락을 잡은 상태에서 호출)"""
+        key = (route.prompt_type, route.model)
+        if key not in self._routes:
+            self._routes[key] = {
+                "calls": 0,
+                "errors": 0,
+                "escalations": 0,
+                "timeouts": 0,
+                "hedges": 0,
+                "hedge_wins": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cached_prompt_tokens": 0,
+                "cost_usd": 0.0,
+                "latencies": deque(maxlen=self.window),
+            }
+        return self._routes[key]
+
+    def record_call(
+        self,
+        route: ModelRoute,
+        seconds: float,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cost: float,
+        cached_tokens: int = 0
+    ):
+        """성공한 호출 1회를 기록합니다."""
+        with self._lock:
+            entry = self._entry(route)
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            entry["cached_prompt_tokens"] += cached_tokens
+            entry["cost_usd"] += cost
+            entry["latencies"].append(seconds)
+
+    def record_error(self, route: ModelRoute):
+        """실패한 호출 1회를 기록합니다."""
+        with self._lock:
+            self._entry(route)["errors"] += 1
+
+    def record_escalation(self, route: ModelRoute):
+        """이 경로의 응답이 검증에 실패해 상위 모델로 재호출한 것을 기록합니다."""
+        with self._lock:
+            self._entry(route)["escalations"] += 1
+
+    def increment(self, route: ModelRoute, field: str):
+        """경로의 timeouts, hedges, hedge_wins 중 하나를 1 올립니다."""
+        with self._lock:
+            self._entry(route)[field] += 1
+
+    def quantile(self, route: ModelRoute, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        경로의 최근 지연 시간 분위수를 계산합니다.
+
+        Args:
+            route (ModelRoute): 대상 경로
+            q (float): 분위수 (0~100)
+            min_samples (int): 최소 관측 호출 수
+
+        Returns:
+            Optional[float]: 분위수(초) 또는 None (관측 호출이 부족한 경우)
+        """
+        with self._lock:
+            entry = self._routes.get((route.prompt_type, route.model))
+            if entry is None or len(entry["latencies"]) < min_samples:
+                return None
+            latencies = np.asarray(entry["latencies"], dtype=np.float64)
+        return float(np.percentile(latencies, q))
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        경로별 집계를 반환합니다.
+
+        Returns:
+            List[Dict[str, Any]]: 경로별 호출 수, 오류·재호출·마감 초과·헤지 수, p50/p95 지연 시간(초), 토큰, 비용
+        """
+        with self._lock:
+            rows = []
+            for (prompt_type, model), entry in sorted(self._routes.items()):
+                latencies = np.asarray(entry["latencies"], dtype=np.float64)
+                p50, p95 = np.percentile(latencies, [50, 95]) if len(latencies) else (0.0, 0.0)
+                calls = entry["calls"]
+                rows.append({
+                    "prompt_type": prompt_type,
+                    "model": model,
+                    "calls": calls,
+                    "errors": entry["errors"],
+                    "escalations": entry["escalations"],
+                    "escalation_rate": round(entry["escalations"] / calls, 4) if calls else 0.0,
+                    "timeouts": entry["timeouts"],
+                    "hedges": entry["hedges"],
+                    "hedge_wins": entry["hedge_wins"],
+                    "p50_seconds": round(float(p50), 4),
+                    "p95_seconds": round(float(p95), 4),
+                    "prompt_tokens": entry["prompt_tokens"],
+                    "completion_tokens": entry["completion_tokens"],
+                    "cached_prompt_tokens": entry["cached_prompt_tokens"],
+                    # 프롬프트 토큰 중 제공자 측 프롬프트 캐시에 적중한 비율
+                    "prompt_cache_rate": (
+                        round(entry["cached_prompt_tokens"] / entry["prompt_tokens"], 4) if entry["prompt_tokens"] else 0.0
+                    ),
+                    "cost_usd": round(entry["cost_usd"], 6),
+                    "cost_per_call_usd": round(entry["cost_usd"] / calls, 6) if calls else 0.0,
+                })
+            return rows
+
+
+class ModelRouter:
+    """프롬프트 타입별 경로 선택, 상위 모델 재호출 판단, 경로별 집계를 담당하는 클래스"""
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, Dict[str, Any]]] = None,
+        escalation: Optional[Dict[str, Any]] = None,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        hedging: bool = LLM_HEDGE_ENABLED,
+        hedge_budget: Optional[HedgeBudget] = None,
+        prompt_cache_models: Optional[Tuple[str, ...]] = None
+    ):
+        """
+        Args:
+            routes (Optional[Dict[str, Dict[str, Any]]]): 프롬프트 타입별 경로 설정 (기본값: config.MODEL_ROUTES)
+            escalation (Optional[Dict[str, Any]]): 상위 모델 설정 (기본값: config.MODEL_ESCALATION)
+            prices (Optional[Dict[str, Tuple[float, float]]]): 모델별 100만 토큰당 요금 (기본값: config.MODEL_PRICES)
+            hedging (bool): 헤지 요청 사용 여부 (hedge가 켜진 경로에만 적용)
+            hedge_budget (Optional[HedgeBudget]): 헤지 요청 예산 (기본값: LLM_HEDGE_BUDGET 비율)
+            prompt_cache_models (Optional[Tuple[str, ...]]): 프롬프트 캐시를 지원하는 모델 (기본값: config.PROMPT_CACHE_MODELS)
+        """
+        routes = MODEL_ROUTES if routes is None else routes
+        self.routes = {prompt_type: ModelRoute(prompt_type, **settings) for prompt_type, settings in routes.items()}
+        self.escalation = dict(MODEL_ESCALATION if escalation is None else escalation)
+        self.prices = dict(MODEL_PRICES if prices is None else prices)
+        self.stats = RouteStats()
+        self.hedging = hedging
+        self.hedge_budget = hedge_budget or HedgeBudget()
+        self.prompt_cache_models = tuple(PROMPT_CACHE_MODELS if prompt_cache_models is None else prompt_cache_models)
+
+    def route(self, prompt_type: str) -> ModelRoute:
+        """
+        프롬프트 타입의 경로를 반환합니다.
+
+        Args:
+            prompt_type (str): 프롬프트 타입
+
+        Returns:
+            ModelRoute: 설정된 경로 (없는 타입은 OPENAI_MODEL 기본 설정)
+        """
+        return self.routes.get(prompt_type) or ModelRoute(prompt_type)
+
+    def prompt_cache(self, route: ModelRoute) -> bool:
+        """
+        경로의 모델이 제공자 측 프롬프트 캐시를 지원하는지 반환합니다.
+
+        Args:
+            route (ModelRoute): 호출 경로
+
+        Returns:
+            bool: 지원하면 True (공유 고정 부분 프롬프트를 씁니다)
+        """
+        return any(route.model == model or route.model.startswith(f"{model}-") for model in self.prompt_cache_models)
+
+    def escalate(self, route: ModelRoute) -> Optional[ModelRoute]:
+        """
+        검증에 실패한 경로 대신 호출할 상위 경로를 반환합니다.
+
+        Args:
+            route (ModelRoute): 검증에 실패한 경로
+
+        Returns:
+            Optional[ModelRoute]: 상위 경로 또는 None (이미 재호출했거나, 상위 모델이 없거나 같은 모델인 경우)
+        """
+        model = self.escalation.get("model")
+        if route.escalated or not model or model == route.model:
+            return None
+        return ModelRoute(
+            prompt_type=route.prompt_type,
+            model=model,
+            max_tokens=self.escalation.get("max_tokens", route.max_tokens),
+            timeout=self.escalation.get("timeout", route.timeout),
+            table=route.table,
+            escalated=True
+        )
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+        """
+        MODEL_PRICES로 호출 비용을 추정합니다.
+
+        Args:
+            model (str): 모델 이름
+            prompt_tokens (int): 프롬프트 토큰 수 (캐시된 토큰 포함)
+            completion_tokens (int): 응답 토큰 수
+            cached_tokens (int): 프롬프트 토큰 중 제공자 측 캐시에 적중한 토큰 수 (MODEL_CACHED_PROMPT_PRICE_RATIO 적용)
+
+        Returns:
+            float: 추정 비용(USD, 요금이 없는 모델은 0)
+        """
+        prompt_price, completion_price = self.prices.get(model, (0.0, 0.0))
+        billed_prompt = prompt_tokens - cached_tokens + cached_tokens * MODEL_CACHED_PROMPT_PRICE_RATIO
+        return (billed_prompt * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+    def record_call(
+        self,
+        route: ModelRoute,
+        seconds: float,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0
+    ) -> float:
+        """
+        성공한 호출을 경로별 집계와 메트릭에 기록합니다.
+
+        Args:
+            route (ModelRoute): 호출한 경로
+            seconds (float): 호출 소요 시간(초)
+            prompt_tokens (int): 프롬프트 토큰 수
+            completion_tokens (int): 응답 토큰 수
+            cached_tokens (int): 프롬프트 토큰 중 제공자 측 캐시에 적중한 토큰 수
+
+        Returns:
+            float: 추정 비용(USD)
+        """
+        cost = self.cost(route.model, prompt_tokens, completion_tokens, cached_tokens)
+        self.stats.record_call(route, seconds, prompt_tokens, completion_tokens, cost, cached_tokens)
+        record_llm_call(route.prompt_type, route.model, seconds, prompt_tokens, completion_tokens, cost, cached_tokens)
+        return cost
+
+    def record_escalation(self, route: ModelRoute, reason: str):
+        """
+        검증 실패로 상위 모델을 재호출한 것을 기록합니다.
+
+        Args:
+            route (ModelRoute): 검증에 실패한 경로
+            reason (str): 실패 사유 ('no_table', 'column_mismatch')
+        """
+        self.stats.record_escalation(route)
+        LLM_ESCALATIONS.labels(prompt_type=route.prompt_type, reason=reason).inc()
+
+    def plan_hedge(self, route: ModelRoute) -> Optional[float]:
+        """
+        일반 호출 1회분의 헤지 예산을 적립하고, 헤지 요청을 보낼 대기 시간을 반환합니다.
+
+        Args:
+            route (ModelRoute): 호출할 경로
+
+        Returns:
+            Optional[float]: 경로의 최근 p95 지연 시간(초) 또는 None (헤지하지 않는 경로이거나 관측 호출이 부족한 경우)
+        """
+        self.hedge_budget.deposit()
+        if not (self.hedging and route.hedge):
+            return None
+        return self.stats.quantile(route, LLM_HEDGE_QUANTILE, LLM_HEDGE_MIN_SAMPLES)
+
+    def try_hedge(self, route: ModelRoute) -> bool:
+        """
+        예산이 남아 있으면 헤지 요청 1회분을 차감합니다.
+
+        Args:
+            route (ModelRoute): 헤지할 경로
+
+        Returns:
+            bool: 헤지 요청을 보내도 되면 True
+        """
+        if not self.hedge_budget.try_spend():
+            LLM_HEDGES.labels(prompt_type=route.prompt_type, result="denied").inc()
+            return False
+        self.stats.increment(route, "hedges")
+        LLM_HEDGES.labels(prompt_type=route.prompt_type, result="sent").inc()
+        return True
+
+    def record_hedge_win(self, route: ModelRoute):
+        """헤지 요청의 응답이 원래 요청보다 먼저 도착한 것을 기록합니다."""
+        self.stats.increment(route, "hedge_wins")
+        LLM_HEDGES.labels(prompt_type=route.prompt_type, result="won").inc()
+
+    def record_timeout(self, route: ModelRoute):
+        """마감 시간 안에 응답이 오지 않은 호출을 기록합니다."""
+        self.stats.increment(route, "timeouts")
+        LLM_TIMEOUTS.labels(prompt_type=route.prompt_type).inc()
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        현재 경로 설정과 경로별 집계를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: {"routes", "escalation", "hedging", "stats"}
+        """
+        return {
+            "routes": [
+                {"prompt_type": route.prompt_type, "model": route.model, "max_tokens": route.max_tokens,
+                 "timeout": route.timeout, "table": route.table, "hedge": route.hedge,
+                 "prompt_cache": self.prompt_cache(route)}
+                for route in self.routes.values()
+            ],
+            "escalation": self.escalation,
+            "hedging": {"enabled": self.hedging, "budget_ratio": self.hedge_budget.ratio,
+                        "budget_balance": round(self.hedge_budget.balance, 2)},
+            "stats": self.stats.snapshot(),
+        }
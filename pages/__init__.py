@@ -7,9 +7,13 @@ DreamCourse 페이지 모듈
 from .home_page import render_home_page
 from .major_selection_page import render_major_selection_page
 from .curriculum_page import render_curriculum_page
+from .batch_page import render_batch_page
+from .dev_panel import render_trace_panel
 
 __all__ = [
     "render_home_page",
     "render_major_selection_page",
-    "render_curriculum_page"
+    "render_curriculum_page",
+    "render_batch_page",
+    "render_trace_panel"
 ]
@@ -0,0 +1,88 @@
+"""
+DreamCourse 학급 일괄 진로 설계 페이지
+
+명단 CSV를 업로드받아 학생별 진로 설계를 한 번에 생성하고 결과를 내려받을 수 있게 합니다.
+"""
+
+import io
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from styles import Styles
+from config import BATCH_CONCURRENCY, MESSAGES
+from roster import BatchPlanner, PlanWriter, RosterLoader
+from utils import SessionStateManager
+
+
+def render_batch_page(api_key: str):
+    """
+    일괄 생성 페이지를 렌더링합니다.
+
+    Args:
+        api_key (str): OpenAI API 키
+    """
+    Styles.inject_css()
+
+    st.title("📋 학급 일괄 진로 설계")
+    st.markdown(MESSAGES["batch_help"])
+
+    uploaded = st.file_uploader("명단 CSV", type=["csv"], key="roster_file")
+
+    if uploaded is not None and st.button("🚀 일괄 생성 시작", key="start_batch"):
+        _run_batch(uploaded, api_key)
+
+    if "batch_summary" in st.session_state:
+        _render_batch_result()
+
+    if st.button("🔙 처음으로", key="batch_back_to_home"):
+        SessionStateManager.clear_session_keys(["batch_summary", "batch_zip"])
+        SessionStateManager.navigate_to_page("Home")
+
+
+def _run_batch(uploaded, api_key: str):
+    """
+    명단을 읽어 일괄 생성을 실행하고 진행 상황과 남은 시간을 표시합니다.
+
+    Args:
+        uploaded: 업로드된 명단 CSV 파일
+        api_key (str): OpenAI API 키
+    """
+    try:
+        roster = RosterLoader.load(uploaded)
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+        st.error(f"명단을 읽을 수 없습니다: {str(e)}")
+        return
+
+    progress_bar = st.progress(0.0, text=f"학생 {len(roster)}명 준비 중...")
+    planner = BatchPlanner(api_key, concurrency=BATCH_CONCURRENCY)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        with PlanWriter(Path(output_dir)) as writer:
+            for plan, progress in planner.run(roster):
+                writer.write(plan)
+                progress_bar.progress(progress.fraction, text=progress.format())
+
+        # 완료된 파일을 하나의 zip으로 묶어 세션에 보관합니다
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in sorted(Path(output_dir).iterdir()):
+                archive.write(path, arcname=path.name)
+
+        st.session_state.batch_summary = pd.read_csv(Path(output_dir) / "summary.csv", encoding="utf-8-sig").fillna("")
+        st.session_state.batch_zip = buffer.getvalue()
+
+
+def _render_batch_result():
+    """일괄 생성 결과 요약과 다운로드 버튼을 렌더링합니다."""
+    st.markdown("#### ✅ 생성 결과")
+    st.dataframe(st.session_state.batch_summary, use_container_width=True, hide_index=True)
+    st.download_button(
+        "📥 학생별 결과 내려받기 (CSV/HTML)",
+        data=st.session_state.batch_zip,
+        file_name="dreamcourse_plans.zip",
+        mime="application/zip",
+        key="download_batch"
+    )
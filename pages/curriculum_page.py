@@ -6,16 +6,22 @@ DreamCourse 커리큘럼 페이지
 
 import pandas as pd
 import streamlit as st
+from admission_store import format_years, get_admission_store
+from answer_store import answer_scope
+from plan_store import PlanStore
 from styles import Styles
 from config import (
     TABLE_COLUMNS,
     MESSAGES,
     SUBJECT_DESCRIPTION_HTML,
     CURRICULUM_CSV,
+    DEFAULT_SCHOOL,
     ENCODINGS
 )
-from prompts import PromptTemplates
-from utils import RAGChainManager, TableParser, SessionStateManager
+from prompts import QuestionBuilder
+from rag_service import RAGService
+from tracing import tracer
+from utils import TableParser, SessionStateManager, VectorStoreManager
 
 
 def render_curriculum_page(vectorstore, api_key: str):
@@ -23,7 +29,7 @@ def render_curriculum_page(vectorstore, api_key: str):
     커리큘럼 페이지를 렌더링합니다.
 
     Args:
-        vectorstore: 벡터 스토어 인스턴스
+        vectorstore: 학교·공통 샤드 벡터 스토어 (입결 테이블은 학년도 샤드를 붙인 벡터 스토어를 따로 엶)
         api_key (str): OpenAI API 키
     """
     Styles.inject_css()
@@ -47,10 +53,10 @@ def render_curriculum_page(vectorstore, api_key: str):
     st.markdown("---")
 
     # 입결 정보 테이블
-    st.markdown("### 🏫 2024학년도 서울대/연대/고대 수시 입결정보")
+    st.markdown(f"### 🏫 {format_years(get_admission_store().recent_years())}학년도 서울대/연대/고대 수시 입결정보")
 
     if "admission_table" not in st.session_state:
-        _generate_admission_table(vectorstore, api_key)
+        _generate_admission_table(api_key)
 
     if "admission_table" in st.session_state:
         _render_admission_table()
@@ -78,77 +84,85 @@ def _display_major_comment():
 
 def _generate_curriculum_table(vectorstore, api_key: str):
     """
-    커리큘럼 테이블을 생성합니다.
+    커리큘럼 테이블을 생성합니다. 같은 입력으로 저장된 테이블이 있으면 LLM 호출 없이 복원합니다.
 
     Args:
         vectorstore: 벡터 스토어 인스턴스
         api_key (str): OpenAI API 키
     """
+    prompt = QuestionBuilder.curriculum_question(st.session_state.selected_major, st.session_state.grade)
+    fingerprint = PlanStore.fingerprint("curriculum", prompt, answer_scope(vectorstore))
+    version = getattr(vectorstore, "version", None)
+    if SessionStateManager.restore_table("curriculum_table", fingerprint, version):
+        return
+
     message = MESSAGES["loading_curriculum"].format(major=st.session_state.selected_major)
     with st.spinner(message):
-        # 현재 학년 추출 (예: "고2" -> 2)
-        current_grade = int(st.session_state.grade.replace("고", ""))
-
-        # 프롬프트 생성
-        prompt = f"""
-나는 현재 고등학교 {current_grade}학년에 재학 중입니다.
-{st.session_state.selected_major}에 입학하고 싶습니다.
-고등학교 {current_grade}학년 1학기부터 3학년 2학기까지 이수해야 할 과목을 알려주세요.
-"""
+        rag_response = RAGService.get_instance().run_query(vectorstore, "curriculum", prompt, api_key)
 
-        prompt_template = PromptTemplates.get_curriculum_prompt()
-        qa_chain = RAGChainManager.create_qa_chain(vectorstore, prompt_template, api_key)
-
-        if qa_chain is None:
-            st.error("QA 체인 생성에 실패했습니다.")
+        if rag_response is None:
             return
 
-        rag_response = qa_chain.run(prompt)
-
         # 테이블 파싱
         st.session_state.curriculum_table = TableParser.parse_table_response(
-            rag_response,
+            rag_response.text,
             TABLE_COLUMNS["curriculum"]
         )
+        st.session_state.curriculum_table_cached_at = rag_response.cached_at
+        # 장애 시 대신 받은 저장된 결과와 검증에 실패한 테이블은 다음 방문 때 다시 생성하도록 보관하지 않습니다
+        SessionStateManager.save_table("curriculum_table", fingerprint, version, rag_response, TABLE_COLUMNS["curriculum"])
 
 
 def _render_curriculum_table():
     """커리큘럼 테이블을 렌더링합니다."""
     st.markdown("### 📅 학기별 추천 커리큘럼")
-    st.dataframe(st.session_state.curriculum_table, use_container_width=True)
+    Styles.render_cached_notice(st.session_state.get("curriculum_table_cached_at"))
+    with tracer.span("render.dataframe", table="curriculum"):
+        st.dataframe(st.session_state.curriculum_table, use_container_width=True)
 
 
-def _generate_admission_table(vectorstore, api_key: str):
+def _generate_admission_table(api_key: str):
     """
-    입결 정보 테이블을 생성합니다.
+    입결 정보 테이블을 생성합니다. 같은 입력으로 저장된 테이블이 있으면 LLM 호출 없이 복원합니다.
+
+    입결 질문만 학년도 샤드까지 검색하므로, 학생의 학교·공통 샤드에 최근 학년도 샤드를 붙인 벡터 스토어를 엽니다.
 
     Args:
-        vectorstore: 벡터 스토어 인스턴스
         api_key (str): OpenAI API 키
     """
+    school = st.session_state.get("school", DEFAULT_SCHOOL)
+    vectorstore = VectorStoreManager.get_school_vectorstore(api_key, school, prompt_type="admission_table")
+    if vectorstore is None:
+        return
+
+    prompt = QuestionBuilder.admission_question(st.session_state.selected_major)
+    fingerprint = PlanStore.fingerprint("admission_table", prompt, answer_scope(vectorstore))
+    version = getattr(vectorstore, "version", None)
+    if SessionStateManager.restore_table("admission_table", fingerprint, version):
+        return
+
     message = MESSAGES["loading_admission"].format(major=st.session_state.selected_major)
     with st.spinner(message):
-        prompt = f"{st.session_state.selected_major}와 유사한 학과에 대해서 서울대, 연세대, 고려대 수시 입결정보를 알려줘"
+        rag_response = RAGService.get_instance().run_query(vectorstore, "admission_table", prompt, api_key)
 
-        prompt_template = PromptTemplates.get_admission_table_prompt()
-        qa_chain = RAGChainManager.create_qa_chain(vectorstore, prompt_template, api_key)
-
-        if qa_chain is None:
-            st.error("QA 체인 생성에 실패했습니다.")
+        if rag_response is None:
             return
 
-        rag_response = qa_chain.run(prompt)
-
         # 테이블 파싱
         st.session_state.admission_table = TableParser.parse_table_response(
-            rag_response,
+            rag_response.text,
             TABLE_COLUMNS["admission"]
         )
+        st.session_state.admission_table_cached_at = rag_response.cached_at
+        # 장애 시 대신 받은 저장된 결과와 검증에 실패한 테이블은 다음 방문 때 다시 생성하도록 보관하지 않습니다
+        SessionStateManager.save_table("admission_table", fingerprint, version, rag_response, TABLE_COLUMNS["admission"])
 
 
 def _render_admission_table():
     """입결 정보 테이블을 렌더링합니다."""
-    st.dataframe(st.session_state.admission_table, use_container_width=True)
+    Styles.render_cached_notice(st.session_state.get("admission_table_cached_at"))
+    with tracer.span("render.dataframe", table="admission"):
+        st.dataframe(st.session_state.admission_table, use_container_width=True)
 
 
 def _render_back_button():
@@ -156,7 +170,12 @@ def _render_back_button():
     st.markdown('<div class="button-container">', unsafe_allow_html=True)
 
     if st.button("⬅️ 직업/학과 선택으로 돌아가기", key="back_to_major"):
-        SessionStateManager.clear_session_keys(["curriculum_table", "admission_table"])
+        SessionStateManager.clear_session_keys([
+            "curriculum_table",
+            "curriculum_table_cached_at",
+            "admission_table",
+            "admission_table_cached_at"
+        ])
         SessionStateManager.navigate_to_page("major_selection")
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,70 @@
+"""
+DreamCourse 개발자 패널
+
+현재 세션의 마지막 페이지 뷰를 span 워터폴로 보여줍니다.
+"""
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+from tracing import tracer
+
+
+def render_trace_panel(session_id: str):
+    """
+    사이드바에 트레이스 워터폴 패널을 렌더링합니다.
+
+    Args:
+        session_id (str): 세션 식별자
+    """
+    spans = tracer.get_last_page_view(session_id)
+
+    with st.sidebar.expander("🛠️ 개발자 패널 - 트레이스 워터폴"):
+        if not spans:
+            st.caption("아직 기록된 페이지 뷰가 없습니다.")
+            return
+
+        df = _build_waterfall_frame(spans)
+        root = spans[0]
+        st.caption(f"trace `{root.trace_id[:8]}` · 총 {root.duration_ms:.1f} ms")
+
+        chart = alt.Chart(df).mark_bar().encode(
+            x=alt.X("start_ms:Q", title="시작 (ms)"),
+            x2="end_ms:Q",
+            y=alt.Y("label:N", sort=None, title=None),
+            color=alt.Color("stage:N", legend=None),
+            tooltip=["name", "duration_ms", "attributes"]
+        )
+        st.altair_chart(chart, use_container_width=True)
+        st.dataframe(df[["name", "start_ms", "duration_ms", "attributes"]], use_container_width=True)
+
+
+def _build_waterfall_frame(spans: list) -> pd.DataFrame:
+    """
+    span 리스트를 워터폴 차트용 데이터프레임으로 변환합니다.
+
+    Args:
+        spans (list): 시작 시각 순으로 정렬된 span 리스트
+
+    Returns:
+        pd.DataFrame: 워터폴 데이터프레임
+    """
+    origin = spans[0].start_ns
+    depths = {}
+    rows = []
+
+    for i, span in enumerate(spans):
+        depth = depths.get(span.parent_span_id, -1) + 1
+        depths[span.span_id] = depth
+        start_ms = (span.start_ns - origin) / 1e6
+        rows.append({
+            "label": f"{i:02d} {'· ' * depth}{span.name}",
+            "name": span.name,
+            "stage": span.name.split(".")[0],
+            "start_ms": round(start_ms, 2),
+            "end_ms": round(start_ms + span.duration_ms, 2),
+            "duration_ms": round(span.duration_ms, 2),
+            "attributes": ", ".join(f"{key}={value}" for key, value in span.attributes.items()),
+        })
+
+    return pd.DataFrame(rows)
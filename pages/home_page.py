@@ -11,13 +11,14 @@ from config import (
     PAGE_SUBTITLE,
     SIDEBAR_TAGLINE,
     GRADE_OPTIONS,
-    JOB_OPTIONS,
     DEFAULT_SCHOOL,
     CAREER_TEST_URL,
-    CAREER_TEST_IMAGE_URL,
+    CAREER_TEST_IMAGE,
     LOGO_IMAGE,
     MESSAGES
 )
+from assets import get_asset
+from job_index import get_job_index
 from utils import SessionStateManager
 
 
@@ -29,13 +30,18 @@ def render_home_page():
     st.title(PAGE_TITLE)
     st.markdown(PAGE_SUBTITLE)
 
-    # 진로심리검사 이미지 링크
-    image_link_html = Styles.create_image_link(
-        url=CAREER_TEST_URL,
-        image_url=CAREER_TEST_IMAGE_URL,
-        alt_text="진로심리검사 안내 이미지"
-    )
-    st.markdown(image_link_html, unsafe_allow_html=True)
+    # 진로심리검사 이미지 링크 (빌드된 정적 자산, 없으면 원본 이미지를 직접 전송)
+    career_test = get_asset("career_test")
+    if career_test is not None:
+        picture_html = Styles.create_picture(
+            career_test,
+            alt_text="진로심리검사 안내 이미지",
+            style="max-width: 70%; height: auto; border-radius: 10px;"
+        )
+        st.markdown(Styles.create_image_link(CAREER_TEST_URL, picture_html), unsafe_allow_html=True)
+    else:
+        st.image(str(CAREER_TEST_IMAGE), width=700)
+        st.markdown(f"[진로심리검사 바로가기]({CAREER_TEST_URL})")
 
     # 사이드바
     _render_sidebar()
@@ -44,14 +50,28 @@ def render_home_page():
 def _render_sidebar():
     """사이드바를 렌더링합니다."""
     with st.sidebar:
-        st.sidebar.image(str(LOGO_IMAGE))
+        logo = get_asset("logo")
+        if logo is not None:
+            st.markdown(
+                Styles.create_picture(logo, alt_text="DreamCourse 로고", style="width: 100%; height: auto;"),
+                unsafe_allow_html=True
+            )
+        else:
+            st.image(str(LOGO_IMAGE))
         st.markdown(SIDEBAR_TAGLINE)
         st.divider()
 
         # 사용자 정보 입력 폼
         with st.form("info_form"):
             name = st.text_input("이름", placeholder="이름을 입력해주세요")
-            job = st.selectbox("희망하는 직업", JOB_OPTIONS)
+            # 목록에 없는 직업도 입력할 수 있으며, 제출 시 표준 직업명으로 교정합니다
+            job = st.selectbox(
+                "희망하는 직업",
+                get_job_index().names,
+                index=None,
+                accept_new_options=True,
+                placeholder="직업을 검색하거나 직접 입력하세요"
+            )
             grade = st.selectbox("학년", GRADE_OPTIONS)
             school = st.text_input("고등학교", value=DEFAULT_SCHOOL, disabled=True)
 
@@ -61,6 +81,10 @@ def _render_sidebar():
             if submitted:
                 _handle_form_submission(name, school, job, grade)
 
+        # 교사용 학급 일괄 생성
+        if st.button("📋 학급 일괄 진로 설계", key="go_batch"):
+            SessionStateManager.navigate_to_page("batch")
+
 
 def _handle_form_submission(name: str, school: str, job: str, grade: str):
     """
@@ -69,14 +93,18 @@ def _handle_form_submission(name: str, school: str, job: str, grade: str):
     Args:
         name (str): 학생 이름
         school (str): 학교 이름
-        job (str): 희망 직업
+        job (str): 희망 직업 (직접 입력한 값일 수 있음)
         grade (str): 학년
     """
-    if name and school:
+    if name and school and job:
+        # 오타나 띄어쓰기가 다른 입력은 LLM 호출 없이 표준 직업명으로 교정합니다
+        resolved = get_job_index().resolve(job)
         st.session_state.name = name
         st.session_state.school = school
-        st.session_state.job = job
+        st.session_state.job = resolved[0] if resolved else job.strip()
         st.session_state.grade = grade
+        # 새로 고침·재접속 후에도 입력값과 생성된 테이블을 복원할 수 있도록 URL에 학생 토큰을 붙입니다
+        SessionStateManager.get_student_token(create=True)
         SessionStateManager.navigate_to_page("major_selection")
     else:
         st.warning(MESSAGES["input_required"])
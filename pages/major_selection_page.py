@@ -6,9 +6,13 @@ DreamCourse 학과 선택 페이지
 
 import streamlit as st
 from styles import Styles
+from answer_store import answer_scope
 from config import TABLE_COLUMNS, MESSAGES
-from prompts import PromptTemplates
-from utils import RAGChainManager, TableParser, SessionStateManager
+from plan_store import PlanStore
+from prompts import QuestionBuilder
+from rag_service import RAGService
+from tracing import tracer
+from utils import TableParser, SessionStateManager
 
 
 def render_major_selection_page(vectorstore, api_key: str):
@@ -29,49 +33,48 @@ def render_major_selection_page(vectorstore, api_key: str):
     if "job_table" not in st.session_state:
         _generate_job_table(vectorstore, api_key)
 
-    # 테이블 출력
+    # 테이블 출력과 학과 선택은 각각 프래그먼트로 분리하여, 학과를 고를 때 선택 영역만 다시 실행합니다
     if "job_table" in st.session_state:
         _render_job_table()
-
-    # 학과 선택 후 버튼
-    if st.session_state.get("selected_major"):
-        _render_navigation_buttons()
+        _render_major_selector()
 
 
 def _generate_job_table(vectorstore, api_key: str):
     """
-    직업 정보 테이블을 생성합니다.
+    직업 정보 테이블을 생성합니다. 같은 입력으로 저장된 테이블이 있으면 LLM 호출 없이 복원합니다.
 
     Args:
         vectorstore: 벡터 스토어 인스턴스
         api_key (str): OpenAI API 키
     """
+    prompt = QuestionBuilder.job_question(st.session_state.job)
+    fingerprint = PlanStore.fingerprint("major_selection", prompt, answer_scope(vectorstore))
+    version = getattr(vectorstore, "version", None)
+    if SessionStateManager.restore_table("job_table", fingerprint, version):
+        return
+
     message = MESSAGES["loading_job_info"].format(name=st.session_state.name)
     with st.spinner(message):
-        prompt_template = PromptTemplates.get_major_selection_prompt()
-        qa_chain = RAGChainManager.create_qa_chain(vectorstore, prompt_template, api_key)
+        rag_response = RAGService.get_instance().run_query(vectorstore, "major_selection", prompt, api_key)
 
-        if qa_chain is None:
-            st.error("QA 체인 생성에 실패했습니다.")
+        if rag_response is None:
             return
 
-        prompt = f'{st.session_state.job}을 하고 싶습니다'
-        rag_response = qa_chain.run(prompt)
-
         # 테이블 파싱
         st.session_state.job_table = TableParser.parse_table_response(
-            rag_response,
+            rag_response.text,
             TABLE_COLUMNS["job"]
         )
+        st.session_state.job_table_cached_at = rag_response.cached_at
+        # 장애 시 대신 받은 저장된 결과와 검증에 실패한 테이블은 다음 방문 때 다시 생성하도록 보관하지 않습니다
+        SessionStateManager.save_table("job_table", fingerprint, version, rag_response, TABLE_COLUMNS["job"])
 
 
 def _render_job_table():
     """직업 및 추천 학과 테이블을 렌더링합니다."""
     st.markdown("#### 🎒 직업 및 추천학과 보기")
     st.markdown("---")
-
-    if "selected_major" not in st.session_state:
-        st.session_state.selected_major = None
+    Styles.render_cached_notice(st.session_state.get("job_table_cached_at"))
 
     df = st.session_state.job_table
 
@@ -79,16 +82,16 @@ def _render_job_table():
     Styles.render_table_header(["직업명", "직업 설명", "추천 학과"], [5, 10, 10])
 
     # 테이블 행 출력
-    for idx, row in df.iterrows():
-        _render_job_row(idx, row)
+    with tracer.span("render.job_table", rows=len(df)):
+        for _, row in df.iterrows():
+            _render_job_row(row)
 
 
-def _render_job_row(idx: int, row):
+def _render_job_row(row):
     """
     직업 테이블의 한 행을 렌더링합니다.
 
     Args:
-        idx (int): 행 인덱스
         row: 데이터프레임 행
     """
     col1, col2, col3 = st.columns([5, 10, 10])
@@ -101,15 +104,46 @@ def _render_job_row(idx: int, row):
         f"<div class='small-text'>{row['직업 설명']}</div>",
         unsafe_allow_html=True
     )
+    col3.markdown(
+        f"<div class='small-text'>{row['추천 학과']}</div>",
+        unsafe_allow_html=True
+    )
 
-    # 추천 학과 버튼 렌더링
-    major_list = [m.strip() for m in row["추천 학과"].split(",")]
-    major_cols = col3.columns(len(major_list))
 
-    for i, major in enumerate(major_list):
-        with major_cols[i]:
-            if st.button(major, key=f"major_{idx}_{i}"):
-                st.session_state.selected_major = major
+def _get_major_options(df) -> list:
+    """
+    테이블의 추천 학과를 등장 순서대로 중복 없이 반환합니다.
+
+    Args:
+        df: 직업 테이블 데이터프레임
+
+    Returns:
+        list: 학과 이름 리스트
+    """
+    majors = (major.strip() for cell in df["추천 학과"] for major in str(cell).split(","))
+    return list(dict.fromkeys(major for major in majors if major))
+
+
+@st.fragment
+def _render_major_selector():
+    """학과 선택 위젯과 페이지 이동 버튼을 렌더링합니다."""
+    options = _get_major_options(st.session_state.job_table)
+    selected_major = st.session_state.get("selected_major")
+
+    choice = st.pills(
+        "🎓 추천 학과 선택",
+        options,
+        selection_mode="single",
+        default=selected_major if selected_major in options else None,
+        key="major_choice"
+    )
+    st.session_state.selected_major = choice
+    if choice != selected_major:
+        SessionStateManager.save_profile()
+
+    # 학과 선택 후 버튼
+    if choice:
+        _render_navigation_buttons()
 
 
 def _render_navigation_buttons():
@@ -127,9 +161,12 @@ def _render_navigation_buttons():
         if st.button("🔙 뒤로가기", key="back_to_home"):
             SessionStateManager.clear_session_keys([
                 "job_table",
+                "job_table_cached_at",
                 "selected_major",
                 "curriculum_table",
-                "admission_table"
+                "curriculum_table_cached_at",
+                "admission_table",
+                "admission_table_cached_at"
             ])
             SessionStateManager.navigate_to_page("Home")
 
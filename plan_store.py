@@ -0,0 +1,155 @@
+"""
+DreamCourse 학생별 진로 설계 저장소
+
+페이지가 생성한 직업·커리큘럼·입결 테이블은 st.session_state에만 있어서 새로 고침, 끊긴 Wi-Fi 재접속,
+뒤로가기 후 다시 방문하면 모든 LLM 호출을 다시 실행했습니다. 이 저장소는 URL의 학생 토큰별로
+입력값(이름, 학교, 희망 직업, 학년, 선택 학과, 현재 페이지)과 생성된 테이블을 SQLite에 보관합니다.
+
+- 테이블은 입력 지문(프롬프트 타입, 질문, 검색 범위의 해시)과 인덱스 버전과 함께 저장하며,
+  둘 다 같을 때만 복원합니다. 입력이 바뀌거나 새 인덱스 버전이 게시되면 다시 생성합니다.
+- WAL 모드로 열어 여러 레플리카 프로세스가 같은 파일을 동시에 읽고 쓸 수 있습니다.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from io import StringIO
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from config import PLAN_STORE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    token TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plan_tables (
+    token TEXT NOT NULL,
+    name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    version TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (token, name)
+);
+"""
+
+
+class PlanStore:
+    """학생 토큰별 입력값과 생성된 테이블을 보관하는 SQLite 저장소"""
+
+    def __init__(self, path: Optional[Path] = PLAN_STORE_PATH):
+        """
+        Args:
+            path (Optional[Path]): SQLite 파일 경로 (None이면 메모리에만 보관)
+        """
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        # Streamlit 세션마다 스크립트 스레드가 다르므로 스레드 간 공유를 허용하고 락으로 직렬화합니다
+        self._conn = sqlite3.connect(
+            ":memory:" if path is None else str(path),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=5.0
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            if path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def fingerprint(*parts: str) -> str:
+        """
+        테이블을 만든 입력값의 지문을 계산합니다.
+
+        Args:
+            *parts (str): 입력값 (예: 프롬프트 타입, 질문, 검색 범위)
+
+        Returns:
+            str: SHA-256 16진 문자열
+        """
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def load_profile(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        저장된 입력값을 조회합니다.
+
+        Args:
+            token (str): 학생 토큰
+
+        Returns:
+            Optional[Dict[str, Any]]: 입력값 또는 None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT profile FROM profiles WHERE token = ?", (token,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def save_profile(self, token: str, profile: Dict[str, Any]):
+        """
+        입력값을 저장하거나 교체합니다.
+
+        Args:
+            token (str): 학생 토큰
+            profile (Dict[str, Any]): 입력값
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (token, profile, updated_at) VALUES (?, ?, ?)",
+                (token, json.dumps(profile, ensure_ascii=False), time.time())
+            )
+
+    def load_table(self, token: str, name: str, fingerprint: str, version: Optional[str]) -> Optional[pd.DataFrame]:
+        """
+        입력 지문과 인덱스 버전이 모두 같은 저장된 테이블을 조회합니다.
+
+        Args:
+            token (str): 학생 토큰
+            name (str): 세션 키 ('job_table', 'curriculum_table', 'admission_table')
+            fingerprint (str): fingerprint()로 계산한 입력 지문
+            version (Optional[str]): 현재 인덱스 버전
+
+        Returns:
+            Optional[pd.DataFrame]: 저장된 테이블 또는 None (없거나 입력·버전이 바뀐 경우)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, version, data FROM plan_tables WHERE token = ? AND name = ?",
+                (token, name)
+            ).fetchone()
+        if row is None or row[0] != fingerprint or row[1] != version:
+            return None
+        # 셀 값은 LLM이 만든 문자열이므로 형 변환 없이 그대로 복원합니다
+        return pd.read_json(StringIO(row[2]), orient="split", dtype=False)
+
+    def save_table(self, token: str, name: str, fingerprint: str, version: Optional[str], df: pd.DataFrame):
+        """
+        생성된 테이블을 저장하거나 교체합니다.
+
+        Args:
+            token (str): 학생 토큰
+            name (str): 세션 키
+            fingerprint (str): 입력 지문
+            version (Optional[str]): 테이블을 생성한 인덱스 버전
+            df (pd.DataFrame): 테이블
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plan_tables (token, name, fingerprint, version, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (token, name, fingerprint, version, df.to_json(orient="split", force_ascii=False), time.time())
+            )
+
+
+@lru_cache(maxsize=1)
+def get_plan_store() -> PlanStore:
+    """프로세스 공용 저장소 (PLAN_STORE_PATH)를 반환합니다."""
+    return PlanStore()
@@ -2,61 +2,122 @@
 DreamCourse 프롬프트 템플릿 관리
 
 LangChain에서 사용되는 모든 프롬프트 템플릿을 관리합니다.
+
+시스템 메시지는 호출마다 같은 고정 부분(역할, 지시문·응답 형식·예시)이고, 호출마다 달라지는 문맥과 질문은 그 뒤의 사용자 메시지에만 넣습니다.
+기본은 프롬프트 타입별 고정 부분(자기 작업만)입니다. OpenAI의 프롬프트 캐시(1,024토큰 이상, 128토큰 단위)를 지원하는 모델
+(config.PROMPT_CACHE_MODELS)로 라우팅된 타입만 세 작업을 모두 담은 공유 고정 부분(1,024토큰 이상)과 작업을 고르는 한 줄을 써서,
+타입이 달라도 같은 접두부가 캐시되게 합니다. 캐시가 없는 모델에서는 공유 고정 부분이 입력 토큰만 늘리기 때문입니다.
+PromptRegistry는 템플릿을 프로세스당 한 번만 컴파일하고 고정 부분의 내용 해시를 버전으로 붙여,
+지시문이 바뀌면 버전(과 서버 캐시)이 바뀐 것을 추적할 수 있게 합니다.
 """
 
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, List, Optional, Sequence, Tuple
+
 from langchain.prompts import PromptTemplate
+from langchain.schema import BaseMessage, HumanMessage, SystemMessage
+
+from admission_store import format_years, get_admission_store
+from major_graph import similar_majors
 
 
 class PromptTemplates:
     """프롬프트 템플릿을 관리하는 클래스"""
 
-    @staticmethod
-    def get_major_selection_prompt() -> PromptTemplate:
-        """
-        직업 및 학과 추천을 위한 프롬프트 템플릿
+    # 모든 고정 부분의 머리말
+    ROLE = """당신은 고등학생 진로 컨설턴트입니다.
+DreamCourse는 학생이 입력한 희망 직업에서 출발해 관련 직업과 추천 학과, 학과별 고등학교 이수 과목, 대학별 수시 입결 정보를 차례로 안내합니다.
+"""
 
-        Returns:
-            PromptTemplate: 학과 선택용 프롬프트
-        """
-        template = """
-당신은 고등학생 진로 컨설턴트입니다.
-문맥을 참고해서 학생이 입력한 직업에 대해
+    # 공유 고정 부분에만 붙는 안내
+    SHARED_GUIDE = """아래에는 DreamCourse의 세 가지 작업별 지시문, 응답 형식, 예시가 있습니다. 맨 마지막 줄의 "이번 작업"에 해당하는 지시문과 응답 형식만 따라 답변합니다.
+"""
+
+    # 프롬프트 타입 -> (작업 이름, 지시문·응답 형식·예시) — 호출마다 달라지는 값을 넣지 않습니다
+    TASKS = {
+        "major_selection": ("직업 추천", """문맥을 참고해서 학생이 입력한 직업에 대해
 관련 직업명, 직업 설명, 추천 학과(2개 이상, 쉼표로 구분)를 테이블 형태로 응답해줘.
 
 직업설명은 너가 찾은 직업에 대한 정보를 20자 이상 입력해주세요.
 
+응답 형식:
 | 관련 직업명 | 직업설명 | 추천 학과 |
 |-------------|----------|------------|
 
+예시:
 문맥:
-{context}
+간호사은(는) 보건·의료 분야에 속하는 직업이며, 취업을 위해 추천하는 학과는 간호학과, 보건행정학과입니다.
+보건교사은(는) 교육 분야에 속하는 직업이며, 취업을 위해 추천하는 학과는 간호학과, 보건교육과입니다.
 
 질문:
-{question}
+간호사을 하고 싶습니다
 
 답변:
-"""
-        return PromptTemplate.from_template(template)
-
-    @staticmethod
-    def get_curriculum_prompt() -> PromptTemplate:
-        """
-        커리큘럼 추천을 위한 프롬프트 템플릿
-
-        Returns:
-            PromptTemplate: 커리큘럼용 프롬프트
-        """
-        template = """
-당신은 고등학생 진로 컨설턴트입니다.
-학생이 입력한 학과와 비슷한 학과에 대해서 이수 과목을 고등학교 1학년 1학기부터 3학년 2학기까지 순서대로 정리해서 알려줘.
+| 관련 직업명 | 직업설명 | 추천 학과 |
+|-------------|----------|------------|
+| 간호사 | 병원과 의료기관에서 환자를 돌보고 의사의 진료를 보조하는 직업입니다 | 간호학과, 보건행정학과 |
+| 보건교사 | 학교에서 학생의 건강을 관리하고 보건 교육을 담당하는 직업입니다 | 간호학과, 보건교육과 |
+"""),
+        "curriculum": ("학과별 이수 과목", """학생이 입력한 학과와 질문에 주어진 비슷한 학과(목록이 없으면 예: 의예과 -> 치의예과, 한의예과처럼 문맥에서 이름이나 계열이 비슷한 학과)에 대해서 이수 과목을 고등학교 1학년 1학기부터 3학년 2학기까지 순서대로 정리해서 알려줘.
 
 답변은 문맥 내용 기반으로 답해주고 없으면 NULL 값으로 남겨놔줘.
 답변형식은 테이블 형태로 대답해줘.
 
+응답 형식:
 | 학기정보 | 공통과목 | 기본선택 | 일반선택 | 진로선택 | 융합과목 |
 |---------|----------|---------|---------|---------|---------|
 
+예시:
 문맥:
+간호학과에 입학하기 위해 고등학교 재학 중 다음과 같은 과목을 이수해야 합니다. 1학년 1학기: 공통과목 공통국어1, 공통수학1, 통합과학1, 기본선택 NULL, 일반선택 NULL, 진로선택 NULL, 융합선택 NULL. 2학년 1학기: 공통과목 NULL, 기본선택 NULL, 일반선택 생명과학, 화학, 진로선택 NULL, 융합선택 NULL.
+
+질문:
+나는 현재 고등학교 1학년에 재학 중입니다.
+간호학과에 입학하고 싶습니다.
+고등학교 1학년 1학기부터 3학년 2학기까지 이수해야 할 과목을 알려주세요.
+
+답변:
+| 학기정보 | 공통과목 | 기본선택 | 일반선택 | 진로선택 | 융합과목 |
+|---------|----------|---------|---------|---------|---------|
+| 1학년 1학기 | 공통국어1, 공통수학1, 통합과학1 | NULL | NULL | NULL | NULL |
+| 1학년 2학기 | NULL | NULL | NULL | NULL | NULL |
+| 2학년 1학기 | NULL | NULL | 생명과학, 화학 | NULL | NULL |
+| 2학년 2학기 | NULL | NULL | NULL | NULL | NULL |
+| 3학년 1학기 | NULL | NULL | NULL | NULL | NULL |
+| 3학년 2학기 | NULL | NULL | NULL | NULL | NULL |
+"""),
+        "admission_table": ("대학별 입결 정보", """학생이 질문에서 선택한 학과와 질문에 주어진 비슷한 학과(목록이 없으면 예: 컴퓨터공학과 -> 컴퓨터 키워드가 들어간 학과 위주)를 문맥에서 찾아서
+질문에 주어진 학년도의 학교별 수시 입결 정보를 학년도 순으로 표로 정리해서 보여주세요.
+
+아래 포맷에 맞게 답변하세요:
+
+응답 형식:
+| 학년도 | 대학명 | 학과명 | 전형명 | 모집인원 | 경쟁률 | 50% 컷 | 70% 컷 |
+|--------|--------|--------|--------|---------|--------|--------|--------|
+
+예시:
+문맥:
+2024학년도 간호학과의 입결정보는 다음과 같습니다. 서울대학교 간호학과는 지역균형전형으로 10명을 선발했고, 경쟁률은 3.4입니다. 50%컷은 1.35, 70%컷은 1.52입니다.
+
+질문:
+간호학과와 유사한 학과에 대해서 2024학년도 서울대, 연세대, 고려대 수시 입결정보를 알려줘
+
+답변:
+| 학년도 | 대학명 | 학과명 | 전형명 | 모집인원 | 경쟁률 | 50% 컷 | 70% 컷 |
+|--------|--------|--------|--------|---------|--------|--------|--------|
+| 2024 | 서울대학교 | 간호학과 | 지역균형전형 | 10 | 3.4 | 1.35 | 1.52 |
+"""),
+    }
+
+    # 고정 부분의 마지막 줄 (공유 고정 부분에서는 프롬프트 타입별로 달라지는 유일한 줄)
+    TASK_LINE = "이번 작업: {title}"
+
+    # 호출마다 달라지는 부분 (모든 프롬프트 타입 공통, 고정 부분 뒤에 옵니다)
+    VARIABLE_TEMPLATE = """문맥:
 {context}
 
 질문:
@@ -64,57 +125,231 @@ class PromptTemplates:
 
 답변:
 """
-        return PromptTemplate.from_template(template)
 
     @staticmethod
-    def get_admission_table_prompt() -> PromptTemplate:
+    @lru_cache(maxsize=1)
+    def shared_prefix() -> str:
         """
-        입결 정보 조회를 위한 프롬프트 템플릿
+        모든 프롬프트 타입이 공유하는 고정 부분을 반환합니다.
 
         Returns:
-            PromptTemplate: 입결 정보용 프롬프트
+            str: 머리말과 작업별 지시문·응답 형식·예시 (프롬프트 타입과 무관하게 같은 문자열)
         """
-        template = """
-당신은 고등학생 진로 컨설턴트입니다.
-학생이 질문에서 선택한 학과와 비슷한 학과(예: 컴퓨터공학과 -> 컴퓨터 키워드가 들어간 학과 위주)를 문맥에서 찾아서
-학교별 수시 입결 정보를 표로 정리해서 보여주세요.
+        sections = [f"[{title}]\n{body}" for title, body in PromptTemplates.TASKS.values()]
+        return "\n".join([PromptTemplates.ROLE + PromptTemplates.SHARED_GUIDE, *sections])
 
-아래 포맷에 맞게 답변하세요:
+    @staticmethod
+    def task_prefix(prompt_type: str) -> str:
+        """
+        한 프롬프트 타입의 고정 부분을 반환합니다.
 
-| 대학명 | 학과명 | 전형명 | 모집인원 | 경쟁률 | 50% 컷 | 70% 컷 |
-|--------|--------|--------|---------|--------|--------|--------|
+        Args:
+            prompt_type (str): 프롬프트 타입
 
-문맥:
-{context}
+        Returns:
+            str: 머리말과 그 작업의 지시문·응답 형식·예시
+        """
+        title, body = PromptTemplates.TASKS[prompt_type]
+        return "\n".join([PromptTemplates.ROLE, f"[{title}]\n{body}"])
 
-질문:
-{question}
 
-답변:
-"""
-        return PromptTemplate.from_template(template)
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """한 번 컴파일한 프롬프트 (고정 시스템 메시지 + 문맥·질문 사용자 메시지)"""
+
+    prompt_type: str
+    version: str  # 고정 부분과 가변 템플릿의 내용 해시 (앞 12자리)
+    system: str
+    user: PromptTemplate
+    template: PromptTemplate  # RetrievalQA 등 단일 문자열 프롬프트가 필요한 곳에 쓰는 템플릿 (고정 부분이 앞)
+
+    def format_messages(self, context: str, question: str) -> List[BaseMessage]:
+        """
+        채팅 모델에 보낼 메시지를 만듭니다.
+
+        Args:
+            context (str): 검색된 문서 문맥
+            question (str): 사용자 질문
+
+        Returns:
+            List[BaseMessage]: [고정 시스템 메시지, 문맥·질문 사용자 메시지]
+        """
+        return [SystemMessage(content=self.system), HumanMessage(content=self.user.format(context=context, question=question))]
+
+
+class PromptRegistry:
+    """프롬프트 타입별 컴파일된 프롬프트와 버전을 관리하는 클래스"""
 
     @staticmethod
-    def get_prompt_by_type(prompt_type: str) -> PromptTemplate:
+    @lru_cache(maxsize=None)
+    def get(prompt_type: str, shared: bool = False) -> CompiledPrompt:
         """
-        프롬프트 타입에 따라 적절한 템플릿을 반환
+        프롬프트 타입의 컴파일된 프롬프트를 반환합니다. (프로세스당 한 번만 컴파일)
 
         Args:
             prompt_type (str): 프롬프트 타입 ('major_selection', 'curriculum', 'admission_table')
+            shared (bool): 세 작업을 모두 담은 공유 고정 부분을 쓸지 여부
+                (프롬프트 캐시를 지원하는 모델로 라우팅된 경우, ModelRouter.prompt_cache)
 
         Returns:
-            PromptTemplate: 요청된 프롬프트 템플릿
+            CompiledPrompt: 컴파일된 프롬프트
 
         Raises:
             ValueError: 알 수 없는 프롬프트 타입인 경우
         """
-        prompt_map = {
-            "major_selection": PromptTemplates.get_major_selection_prompt,
-            "curriculum": PromptTemplates.get_curriculum_prompt,
-            "admission_table": PromptTemplates.get_admission_table_prompt
+        tasks = PromptTemplates.TASKS
+        if prompt_type not in tasks:
+            raise ValueError(f"Unknown prompt type: {prompt_type}. Available types: {list(tasks.keys())}")
+
+        title, _ = tasks[prompt_type]
+        prefix = PromptTemplates.shared_prefix() if shared else PromptTemplates.task_prefix(prompt_type)
+        system = f"{prefix}\n{PromptTemplates.TASK_LINE.format(title=title)}\n"
+        variable = PromptTemplates.VARIABLE_TEMPLATE
+        digest = hashlib.sha256(f"{system}\x1f{variable}".encode("utf-8")).hexdigest()
+        return CompiledPrompt(
+            prompt_type=prompt_type,
+            version=digest[:12],
+            system=system,
+            user=PromptTemplate.from_template(variable),
+            template=PromptTemplate.from_template(f"{system}\n{variable}")
+        )
+
+    @staticmethod
+    def versions(shared_types: Sequence[str] = ()) -> Dict[str, str]:
+        """
+        프롬프트 타입별 버전을 반환합니다.
+
+        Args:
+            shared_types (Sequence[str]): 공유 고정 부분을 쓰는 프롬프트 타입
+
+        Returns:
+            Dict[str, str]: {프롬프트 타입: 내용 해시}
+        """
+        return {
+            prompt_type: PromptRegistry.get(prompt_type, prompt_type in shared_types).version
+            for prompt_type in PromptTemplates.TASKS
         }
 
-        if prompt_type not in prompt_map:
-            raise ValueError(f"Unknown prompt type: {prompt_type}. Available types: {list(prompt_map.keys())}")
 
-        return prompt_map[prompt_type]()
+class QuestionBuilder:
+    """RAG 파이프라인에 전달할 학생 질문을 생성하는 클래스 (페이지·일괄 생성·API 공용)"""
+
+    # 질문 틀 이름 -> (템플릿, 학생이 자유롭게 입력하는 필드)
+    TEMPLATES = {
+        "job": ("{job}을 하고 싶습니다", "job"),
+        "curriculum": (
+            """
+나는 현재 고등학교 {grade}학년에 재학 중입니다.
+{major}에 입학하고 싶습니다.
+고등학교 {grade}학년 1학기부터 3학년 2학기까지 이수해야 할 과목을 알려주세요.
+""",
+            "major"
+        ),
+        "admission": ("{major}와 유사한 학과에 대해서 {years}학년도 서울대, 연세대, 고려대 수시 입결정보를 알려줘", "major"),
+    }
+
+    # 학과 유사도 그래프에서 찾은 유사 학과를 질문 끝에 덧붙이는 줄 (parse에서는 제외)
+    SIMILAR_MAJORS_LINE = "비슷한 학과: {similar}"
+
+    @staticmethod
+    def job_question(job: str) -> str:
+        """
+        희망 직업에 대한 학과 추천 질문
+
+        Args:
+            job (str): 희망 직업
+
+        Returns:
+            str: 'major_selection' 프롬프트용 질문
+        """
+        return QuestionBuilder.TEMPLATES["job"][0].format(job=job)
+
+    @staticmethod
+    def curriculum_question(major: str, grade: str) -> str:
+        """
+        학과 진학을 위한 학기별 이수 과목 질문
+
+        Args:
+            major (str): 희망 학과
+            grade (str): 현재 학년 (예: "고2")
+
+        Returns:
+            str: 'curriculum' 프롬프트용 질문
+        """
+        # 현재 학년 추출 (예: "고2" -> 2)
+        current_grade = int(str(grade).replace("고", ""))
+        question = QuestionBuilder.TEMPLATES["curriculum"][0].format(major=major, grade=current_grade)
+        return QuestionBuilder._with_similar_majors(question, major)
+
+    @staticmethod
+    def admission_question(major: str, years: Optional[Sequence[int]] = None) -> str:
+        """
+        학과 입결 정보 질문
+
+        Args:
+            major (str): 희망 학과
+            years (Optional[Sequence[int]]): 조회할 학년도 (기본값: 저장소의 최근 ADMISSION_TREND_YEARS개 학년도)
+
+        Returns:
+            str: 'admission_table' 프롬프트용 질문
+        """
+        if years is None:
+            years = get_admission_store().recent_years()
+        question = QuestionBuilder.TEMPLATES["admission"][0].format(major=major, years=format_years(years))
+        return QuestionBuilder._with_similar_majors(question, major)
+
+    @staticmethod
+    def _with_similar_majors(question: str, major: str) -> str:
+        """
+        미리 계산한 유사 학과가 있으면 질문 끝에 덧붙입니다.
+
+        Args:
+            question (str): 템플릿으로 만든 질문
+            major (str): 희망 학과
+
+        Returns:
+            str: 유사 학과 줄이 붙은 질문 (유사 학과가 없으면 그대로)
+        """
+        similar = similar_majors(major)
+        if not similar:
+            return question
+        line = QuestionBuilder.SIMILAR_MAJORS_LINE.format(similar=", ".join(similar))
+        return f"{question.rstrip()}\n{line}\n"
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _patterns() -> Dict[str, "re.Pattern"]:
+        """템플릿을 필드별 명명 그룹을 가진 정규식으로 변환합니다. (같은 필드가 반복되면 역참조)"""
+        patterns = {}
+        for name, (template, _) in QuestionBuilder.TEMPLATES.items():
+            parts, seen = [], set()
+            for literal, field, _, _ in Formatter().parse(template.strip()):
+                parts.append(re.escape(literal))
+                if field:
+                    parts.append(f"(?P={field})" if field in seen else f"(?P<{field}>.+?)")
+                    seen.add(field)
+            patterns[name] = re.compile("".join(parts), re.DOTALL)
+        return patterns
+
+    @staticmethod
+    def parse(question: str) -> Optional[Tuple[str, str, Tuple[Tuple[str, str], ...]]]:
+        """
+        QuestionBuilder가 만든 질문을 질문 틀, 자유 입력 값, 나머지 고정 필드로 분해합니다.
+
+        Args:
+            question (str): 질문
+
+        Returns:
+            Optional[Tuple[str, str, Tuple[Tuple[str, str], ...]]]:
+                (질문 틀 이름, 자유 입력 값, 정렬된 (필드, 값) 목록) 또는 None (템플릿 질문이 아닌 경우)
+        """
+        # 유사 학과 줄은 학과명에서 파생되므로 비교 대상에서 제외합니다
+        prefix = QuestionBuilder.SIMILAR_MAJORS_LINE.split("{")[0]
+        question = re.sub(rf"\n{re.escape(prefix)}[^\n]*$", "", question.strip())
+        for name, pattern in QuestionBuilder._patterns().items():
+            match = pattern.fullmatch(question.strip())
+            if match:
+                fields = match.groupdict()
+                subject = fields.pop(QuestionBuilder.TEMPLATES[name][1])
+                return name, subject.strip(), tuple(sorted(fields.items()))
+        return None
@@ -0,0 +1,576 @@
+"""
+DreamCourse 비동기 RAG 서비스
+
+프로세스당 하나의 asyncio 이벤트 루프를 소유하고 검색, LLM 호출, 응답 캐싱을 비동기로 처리합니다.
+페이지 함수는 작업을 제출하고 Future의 결과를 기다리며, 여러 세션의 네트워크 I/O는
+하나의 루프 스레드 위에서 다중화됩니다. LLM 호출은 프롬프트 타입별 경로(ModelRouter)를 따릅니다.
+
+여러 세션이 거의 동시에 보낸 질문의 임베딩과 FAISS 검색은 RetrievalBatcher가 짧은 창 안에서 묶어 한 번에 실행합니다.
+
+LLM·임베딩 호출은 회로 차단기를 거치며, 회로가 열려 있거나 호출이 실패하면 AnswerStore에 저장된
+마지막 정상 답변을 "저장된 결과"로 대신 제공합니다. 회로가 시험 호출을 받을 때가 되면 저장된 답변을 먼저
+돌려주고 시험 호출은 백그라운드에서 실행합니다 (stale-while-revalidate).
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Coroutine, Dict, Hashable, List, Optional, Set, Tuple
+
+import streamlit as st
+from langchain.chat_models.base import BaseChatModel
+from langchain.docstore.document import Document
+from langchain.schema import BaseMessage, LLMResult
+
+from answer_store import AnswerStore, answer_scope
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from config import RAG_CACHE_SIZE, RAG_RETRIEVER_K, RETRIEVAL_BATCH_ENABLED, SEMANTIC_CACHE_ENABLED, TABLE_COLUMNS
+from metrics import ANSWER_FALLBACKS, CACHE_REQUESTS, CHAIN_INVOCATIONS
+from model_router import ModelRoute, ModelRouter
+from prompts import PromptRegistry
+from retrieval_batcher import RetrievalBatcher
+from semantic_cache import SemanticCache, SemanticHit
+from tracing import tracer
+from utils import RAGChainManager, TableParser
+
+
+class AsyncLRUCache:
+    """
+    이벤트 루프 전용 LRU 캐시
+
+    같은 키에 대한 동시 요청은 진행 중인 하나의 작업을 공유합니다 (single-flight).
+    모든 메서드는 서비스 루프 스레드에서만 호출되므로 별도의 락이 필요 없습니다.
+    """
+
+    def __init__(self, max_size: int = RAG_CACHE_SIZE):
+        """
+        Args:
+            max_size (int): 최대 캐시 항목 수
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    async def get_or_create(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable],
+        cacheable: Optional[Callable[[object], bool]] = None
+    ):
+        """
+        캐시된 값을 반환하거나, 없으면 factory로 값을 생성해 캐시합니다.
+
+        Args:
+            key (Hashable): 캐시 키
+            factory (Callable[[], Awaitable]): 값을 생성하는 코루틴 팩토리
+            cacheable (Optional[Callable[[object], bool]]): 생성한 값을 캐시할지 판단하는 함수
+                (False이면 기다리던 호출자에게만 돌려주고 저장하지 않음, 기본값: None이 아니면 저장)
+
+        Returns:
+            캐시되었거나 새로 생성된 값
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done, cacheable))
+
+        # 호출자가 취소되어도 다른 대기자를 위해 작업은 계속 진행합니다
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task, cacheable: Optional[Callable[[object], bool]] = None):
+        """진행 중 작업이 끝나면 성공한 결과만 캐시에 저장합니다."""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            return
+        if cacheable is not None and not cacheable(task.result()):
+            return
+
+        self._entries[key] = task.result()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+@dataclass
+class RAGAnswer:
+    """RAG 응답과 저장된 결과 여부"""
+
+    text: str
+    cached_at: Optional[float] = None  # 저장된 결과로 대신 응답한 경우 그 답변의 저장 시각 (Unix 시간)
+
+    @property
+    def cached(self) -> bool:
+        """업스트림 대신 저장된 마지막 정상 답변인지 여부"""
+        return self.cached_at is not None
+
+
+class RAGService:
+    """프로세스 단일 이벤트 루프 위에서 동작하는 비동기 RAG 파이프라인"""
+
+    _instance: Optional["RAGService"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        llm_factory: Callable[[str, ModelRoute], BaseChatModel] = RAGChainManager.create_llm,
+        cache_size: int = RAG_CACHE_SIZE,
+        semantic_cache: Optional[SemanticCache] = None,
+        router: Optional[ModelRouter] = None,
+        answer_store: Optional[AnswerStore] = None,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+        retrieval_batcher: Optional[RetrievalBatcher] = None
+    ):
+        """
+        Args:
+            llm_factory (Callable[[str, ModelRoute], BaseChatModel]): API 키와 경로로 LLM을 만드는 팩토리
+            cache_size (int): 응답 캐시 최대 항목 수
+            semantic_cache (Optional[SemanticCache]): 의미 기반 캐시 (기본값: SEMANTIC_CACHE_ENABLED이면 새로 생성)
+            router (Optional[ModelRouter]): 프롬프트 타입별 모델 라우터 (기본값: config.MODEL_ROUTES로 새로 생성)
+            answer_store (Optional[AnswerStore]): 마지막 정상 답변 저장소 (기본값: config.ANSWER_STORE_PATH)
+            breakers (Optional[Dict[str, CircuitBreaker]]): 'llm', 'embedding' 회로 차단기 (기본값: 설정값으로 새로 생성)
+            retrieval_batcher (Optional[RetrievalBatcher]): 검색 마이크로 배처 (기본값: RETRIEVAL_BATCH_ENABLED이면 새로 생성)
+        """
+        self._llm_factory = llm_factory
+        self._llms: Dict[Tuple[str, ModelRoute], BaseChatModel] = {}
+        self.router = router or ModelRouter()
+        self.cache = AsyncLRUCache(cache_size)
+        if semantic_cache is None and SEMANTIC_CACHE_ENABLED:
+            semantic_cache = SemanticCache()
+        self.semantic_cache = semantic_cache
+        self.answer_store = answer_store or AnswerStore()
+        self.breakers = breakers or {name: CircuitBreaker(name) for name in ("llm", "embedding")}
+        if retrieval_batcher is None and RETRIEVAL_BATCH_ENABLED:
+            retrieval_batcher = RetrievalBatcher()
+        self.retrieval_batcher = retrieval_batcher
+        self._background: Set[asyncio.Task] = set()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            name="dreamcourse-rag-service",
+            daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def get_instance(cls) -> "RAGService":
+        """
+        프로세스 공용 서비스 인스턴스를 반환합니다.
+
+        Returns:
+            RAGService: 싱글턴 서비스 인스턴스
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """서비스가 소유한 이벤트 루프"""
+        return self._loop
+
+    def _run_loop(self):
+        """서비스 스레드에서 이벤트 루프를 실행합니다."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        코루틴을 서비스 루프에 제출합니다.
+
+        Args:
+            coro (Coroutine): 실행할 코루틴
+
+        Returns:
+            Future: 스레드 안전한 결과 Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _get_llm(self, api_key: str, route: ModelRoute) -> BaseChatModel:
+        """API 키·경로별로 LLM 인스턴스를 재사용하여 커넥션 풀을 공유합니다."""
+        key = (api_key, route)
+        if key not in self._llms:
+            self._llms[key] = self._llm_factory(api_key, route)
+        return self._llms[key]
+
+    async def aretrieve(self, vectorstore, question: str, embedding: Optional[List[float]] = None) -> List[Document]:
+        """
+        질문과 관련된 문서를 비동기로 검색합니다.
+
+        Args:
+            vectorstore: 벡터 스토어 인스턴스
+            question (str): 검색 질문
+            embedding (Optional[List[float]]): 이미 계산한 질문 임베딩 (없으면 새로 계산)
+
+        Returns:
+            List[Document]: 검색된 문서 리스트
+        """
+        with tracer.span("rag.retrieve", k=RAG_RETRIEVER_K):
+            if embedding is None:
+                embedding = await self.aembed_query(vectorstore, question)
+            with tracer.span("rag.vector_search", batched=self.retrieval_batcher is not None):
+                if self.retrieval_batcher is not None:
+                    return await self.retrieval_batcher.asimilarity_search_by_vector(
+                        vectorstore, embedding, RAG_RETRIEVER_K
+                    )
+                return await vectorstore.asimilarity_search_by_vector(embedding, k=RAG_RETRIEVER_K)
+
+    async def aembed_queries(self, vectorstore, texts: List[str]) -> List[List[float]]:
+        """
+        여러 텍스트의 임베딩을 요청 한 번으로 계산합니다. (배처가 임베딩을 묶으면 같은 창에 함께 넣음)
+
+        Args:
+            vectorstore: 벡터 스토어 인스턴스
+            texts (List[str]): 임베딩할 텍스트
+
+        Returns:
+            List[List[float]]: 텍스트 순서대로의 임베딩
+        """
+        with tracer.span("rag.embed_query", batched=self.retrieval_batcher is not None, texts=len(texts)):
+            batcher = self.retrieval_batcher
+            if batcher is not None and batcher.batch_embeddings:
+                return await self.breakers["embedding"].call(lambda: asyncio.gather(
+                    *(batcher.aembed_query(vectorstore.embeddings, text) for text in texts)
+                ))
+            return await self.breakers["embedding"].call(lambda: vectorstore.embeddings.aembed_documents(texts))
+
+    async def aembed_query(self, vectorstore, text: str) -> List[float]:
+        """임베딩 회로 차단기를 거쳐 텍스트 임베딩을 계산합니다. (배처가 있으면 다른 세션의 질문과 묶어서 요청)"""
+        with tracer.span("rag.embed_query", batched=self.retrieval_batcher is not None):
+            if self.retrieval_batcher is not None:
+                batcher = self.retrieval_batcher
+                return await self.breakers["embedding"].call(lambda: batcher.aembed_query(vectorstore.embeddings, text))
+            return await self.breakers["embedding"].call(lambda: vectorstore.embeddings.aembed_query(text))
+
+    def _spawn(self, coro: Coroutine):
+        """응답과 무관한 백그라운드 작업을 실행하고, 끝날 때까지 참조를 유지합니다."""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _circuit_state(self) -> str:
+        """업스트림 회로 중 가장 나쁜 상태 (open > half_open > closed)"""
+        states = {breaker.state for breaker in self.breakers.values()}
+        if OPEN in states:
+            return OPEN
+        return CLOSED if states == {CLOSED} else HALF_OPEN
+
+    async def aanswer(self, vectorstore, prompt_type: str, question: str, api_key: str) -> RAGAnswer:
+        """
+        RAG 응답을 생성하되, 업스트림 장애 시에는 저장된 마지막 정상 답변으로 대신 응답합니다.
+
+        - 회로가 열려 있으면 업스트림을 호출하지 않고 저장된 답변을 돌려줍니다.
+        - 회로가 시험 호출을 받을 때가 되었으면 저장된 답변을 먼저 돌려주고, 시험 호출은 백그라운드에서 실행합니다.
+        - 호출이 실패(마감 시간 초과 포함)하면 저장된 답변을 돌려줍니다.
+        저장된 답변이 없으면 원래 예외를 그대로 전달합니다.
+
+        Args:
+            vectorstore: 벡터 스토어 인스턴스
+            prompt_type (str): 프롬프트 타입
+            question (str): 사용자 질문
+            api_key (str): OpenAI API 키
+
+        Returns:
+            RAGAnswer: 응답 (저장된 결과이면 cached_at 설정)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있고 저장된 답변이 없는 경우
+        """
+        key = (getattr(vectorstore, "version", None), prompt_type, question.strip())
+        state = self._circuit_state()
+        if state != CLOSED and key not in self.cache:
+            stored = self.answer_store.get(answer_scope(vectorstore), prompt_type, question)
+            if stored is not None:
+                if state != OPEN:
+                    self._spawn(self._arevalidate(vectorstore, prompt_type, question, api_key))
+                ANSWER_FALLBACKS.labels(prompt_type=prompt_type, reason="circuit_open" if state == OPEN else "revalidate").inc()
+                return RAGAnswer(stored.answer, stored.updated_at)
+
+        try:
+            return RAGAnswer(await self.aquery(vectorstore, prompt_type, question, api_key))
+        except Exception:
+            stored = self.answer_store.get(answer_scope(vectorstore), prompt_type, question)
+            if stored is None:
+                raise
+            ANSWER_FALLBACKS.labels(prompt_type=prompt_type, reason="error").inc()
+            return RAGAnswer(stored.answer, stored.updated_at)
+
+    async def _arevalidate(self, vectorstore, prompt_type: str, question: str, api_key: str):
+        """저장된 답변을 돌려준 뒤 백그라운드에서 새 답변을 생성합니다. (성공하면 회로가 닫히고 저장소가 갱신됨)"""
+        with tracer.span("rag.revalidate", prompt_type=prompt_type):
+            try:
+                await self.aquery(vectorstore, prompt_type, question, api_key)
+            except Exception:
+                pass  # 시험 호출 실패는 회로 차단기가 기록합니다
+
+    async def aquery(self, vectorstore, prompt_type: str, question: str, api_key: str) -> str:
+        """
+        캐시를 거쳐 RAG 응답을 비동기로 생성합니다.
+
+        Args:
+            vectorstore: 벡터 스토어 인스턴스
+            prompt_type (str): 프롬프트 타입 ('major_selection', 'curriculum', 'admission_table')
+            question (str): 사용자 질문
+            api_key (str): OpenAI API 키
+
+        Returns:
+            str: LLM 응답 텍스트
+        """
+        # 인덱스 버전이 바뀌면(새 버전 게시) 이전 답변은 재사용하지 않습니다
+        key = (getattr(vectorstore, "version", None), prompt_type, question.strip())
+        with tracer.span("rag.query", prompt_type=prompt_type) as span:
+            cache_hit = key in self.cache
+            span.set_attribute("cache_hit", cache_hit)
+            CHAIN_INVOCATIONS.labels(prompt_type=prompt_type).inc()
+            CACHE_REQUESTS.labels(cache="answer", result="hit" if cache_hit else "miss").inc()
+            # 테이블 검증에 실패한 답변(상위 모델 재호출 후에도 실패 포함)은 이번 호출자에게만 돌려주고 캐시하지 않습니다
+            return await self.cache.get_or_create(
+                key,
+                lambda: self._aquery_uncached(vectorstore, prompt_type, question, api_key),
+                cacheable=lambda answer: self._is_valid_answer(prompt_type, answer)
+            )
+
+    def _is_valid_answer(self, prompt_type: str, answer: str) -> bool:
+        """
+        답변이 프롬프트 타입의 테이블 검증을 통과하는지 확인합니다.
+
+        Args:
+            prompt_type (str): 프롬프트 타입
+            answer (str): LLM 응답 텍스트
+
+        Returns:
+            bool: 검증할 테이블이 없거나 검증을 통과하면 True
+        """
+        table = self.router.route(prompt_type).table
+        return table is None or TableParser.validate_table(answer, TABLE_COLUMNS[table]) is None
+
+    async def _aquery_uncached(self, vectorstore, prompt_type: str, question: str, api_key: str) -> str:
+        """의미 기반 캐시를 확인하고, 없으면 검색 → 프롬프트 구성 → LLM 호출 순서로 응답을 생성합니다."""
+        # 임계값을 측정하지 않은 프롬프트 타입은 비교용 텍스트를 임베딩하지 않고 바로 생성합니다
+        if self.semantic_cache is None or prompt_type not in self.semantic_cache.thresholds:
+            return await self._agenerate_answer(vectorstore, prompt_type, question, api_key)
+
+        partition, text = SemanticCache.key(getattr(vectorstore, "version", None), prompt_type, question)
+        with tracer.span("rag.semantic_cache", prompt_type=prompt_type) as span:
+            if text == question.strip():
+                # 템플릿이 아닌 질문은 비교 텍스트가 질문 자체이므로 임베딩을 검색에 재사용합니다
+                text_embedding = embedding = await self.aembed_query(vectorstore, text)
+            else:
+                # 템플릿 질문은 비교 텍스트(자유 입력 값)와 검색용 질문을 요청 한 번으로 함께 임베딩합니다
+                # (적중하면 질문 임베딩은 쓰이지 않지만, 미적중 시 검색 전에 임베딩을 한 번 더 왕복하지 않음)
+                text_embedding, embedding = await self.aembed_queries(vectorstore, [text, question])
+            hit = self.semantic_cache.lookup(partition, prompt_type, text_embedding)
+            span.set_attribute("cache_hit", hit is not None)
+            if hit is not None:
+                span.set_attribute("similarity", round(hit.similarity, 4))
+
+        if hit is not None:
+            if self.semantic_cache.should_audit():
+                self._spawn(self._aaudit(vectorstore, prompt_type, question, api_key, embedding, text, hit))
+            return hit.answer
+
+        answer = await self._agenerate_answer(vectorstore, prompt_type, question, api_key, embedding)
+        # 검증에 실패한 테이블이 비슷한 질문 모두에 유효 시간 동안 재사용되지 않도록 통과한 답변만 저장합니다
+        if self._is_valid_answer(prompt_type, answer):
+            self.semantic_cache.add(partition, prompt_type, text, text_embedding, answer)
+        return answer
+
+    async def _agenerate_answer(
+        self,
+        vectorstore,
+        prompt_type: str,
+        question: str,
+        api_key: str,
+        embedding: Optional[List[float]] = None
+    ) -> str:
+        """검색 → 프롬프트 구성 → LLM 호출 순서로 응답을 생성하고, 테이블 검증에 실패하면 상위 모델로 한 번 더 호출합니다."""
+        documents = await self.aretrieve(vectorstore, question, embedding)
+        context = "\n\n".join(doc.page_content for doc in documents)
+
+        # 고정 지시문이 앞에 오는 메시지 배열이라 같은 프롬프트 타입의 호출은 제공자 측 프롬프트 캐시를 공유하고,
+        # 캐시를 지원하는 모델이면 세 작업을 담은 공유 고정 부분으로 다른 타입과도 공유합니다
+        route = self.router.route(prompt_type)
+        prompt = PromptRegistry.get(prompt_type, self.router.prompt_cache(route))
+        messages = prompt.format_messages(context=context, question=question)
+
+        answer = await self.agenerate(self._get_llm(api_key, route), route, messages, prompt.version)
+        if route.table is None:
+            return answer
+
+        columns = TABLE_COLUMNS[route.table]
+        reason = TableParser.validate_table(answer, columns)
+        escalation = self.router.escalate(route) if reason else None
+        if escalation is not None:
+            self.router.record_escalation(route, reason)
+            with tracer.span("llm.escalate", prompt_type=prompt_type, reason=reason, model=escalation.model):
+                answer = await self.agenerate(self._get_llm(api_key, escalation), escalation, messages, prompt.version)
+
+        # 장애 시 대신 제공할 수 있도록 검증을 통과한 테이블만 백그라운드에서 저장합니다
+        if TableParser.validate_table(answer, columns) is None:
+            self._spawn(asyncio.to_thread(
+                self.answer_store.put,
+                answer_scope(vectorstore), prompt_type, question, getattr(vectorstore, "version", None), answer
+            ))
+        return answer
+
+    async def _aaudit(
+        self,
+        vectorstore,
+        prompt_type: str,
+        question: str,
+        api_key: str,
+        embedding: Optional[List[float]],
+        text: str,
+        hit: SemanticHit
+    ):
+        """의미 기반 적중을 실제 답변과 비교하여 오적중을 기록합니다. (백그라운드 실행)"""
+        with tracer.span("rag.semantic_audit", prompt_type=prompt_type):
+            try:
+                fresh_answer = await self._agenerate_answer(vectorstore, prompt_type, question, api_key, embedding)
+            except Exception:
+                return  # 감사 실패는 사용자 응답에 영향을 주지 않습니다
+            self.semantic_cache.record_audit(prompt_type, text, hit, fresh_answer)
+
+    async def agenerate(
+        self,
+        llm: BaseChatModel,
+        route: ModelRoute,
+        messages: List[BaseMessage],
+        prompt_version: Optional[str] = None
+    ) -> str:
+        """
+        경로의 마감 시간 안에 LLM을 비동기로 호출하고 지연 시간, 토큰 사용량(캐시된 토큰 포함), 비용을 경로별로 기록합니다.
+
+        Args:
+            llm (BaseChatModel): 호출할 채팅 모델
+            route (ModelRoute): 호출 경로 (프롬프트 타입, 모델, 마감 시간, 헤지 여부)
+            messages (List[BaseMessage]): 완성된 메시지 (CompiledPrompt.format_messages)
+            prompt_version (Optional[str]): 프롬프트 버전 (추적용)
+
+        Returns:
+            str: 응답 텍스트
+
+        Raises:
+            TimeoutError: 마감 시간 안에 응답이 오지 않은 경우
+            CircuitOpenError: LLM 회로가 열려 있는 경우
+        """
+        with tracer.span("llm.call", prompt_type=route.prompt_type) as span:
+            try:
+                result, elapsed, hedged = await self.breakers["llm"].call(
+                    lambda: asyncio.wait_for(self._ahedged(llm, route, messages), route.timeout)
+                )
+            except CircuitOpenError:
+                raise
+            except asyncio.TimeoutError:
+                self.router.record_timeout(route)
+                raise TimeoutError(f"LLM 응답이 {route.timeout:g}초 안에 오지 않았습니다. ({route.prompt_type})") from None
+            except Exception:
+                self.router.stats.record_error(route)
+                raise
+
+            usage = (result.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+            cost = self.router.record_call(route, elapsed, prompt_tokens, completion_tokens, cached_tokens)
+
+            span.set_attribute("model", route.model)
+            span.set_attribute("escalated", route.escalated)
+            span.set_attribute("hedged", hedged)
+            span.set_attribute("prompt_tokens", prompt_tokens)
+            span.set_attribute("completion_tokens", completion_tokens)
+            span.set_attribute("cached_tokens", cached_tokens)
+            span.set_attribute("prompt_version", prompt_version)
+            span.set_attribute("cost_usd", round(cost, 6))
+            return result.generations[0][0].text
+
+    @staticmethod
+    async def _ainvoke(llm: BaseChatModel, messages: List[BaseMessage]) -> Tuple[LLMResult, float]:
+        """LLM을 한 번 호출하고 (결과, 소요 시간)을 반환합니다."""
+        start = time.perf_counter()
+        result = await llm.agenerate([messages])
+        return result, time.perf_counter() - start
+
+    async def _ahedged(
+        self,
+        llm: BaseChatModel,
+        route: ModelRoute,
+        messages: List[BaseMessage]
+    ) -> Tuple[LLMResult, float, bool]:
+        """
+        LLM을 호출하되, 경로의 p95 지연 시간이 지나도 응답이 없고 예산이 남아 있으면 같은 요청을 한 번 더 보내
+        먼저 성공한 응답을 사용합니다. 남은 요청은 취소합니다.
+
+        Returns:
+            Tuple[LLMResult, float, bool]: (결과, 성공한 요청의 소요 시간, 헤지 요청이 먼저 도착했는지 여부)
+        """
+        delay = self.router.plan_hedge(route)
+        primary = asyncio.ensure_future(self._ainvoke(llm, messages))
+        tasks = [primary]
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not primary.done() and self.router.try_hedge(route):
+                    with tracer.span("llm.hedge", prompt_type=route.prompt_type, delay=round(delay, 3)):
+                        tasks.append(asyncio.ensure_future(self._ainvoke(llm, messages)))
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    winner = primary if primary in succeeded else succeeded[0]
+                    if winner is not primary:
+                        self.router.record_hedge_win(route)
+                    result, elapsed = winner.result()
+                    return result, elapsed, winner is not primary
+                if not pending:
+                    # 모든 요청이 실패하면 원래 요청의 예외를 전달합니다
+                    return primary.result()
+        finally:
+            # 마감 시간 초과(취소)나 응답 도착 후 남은 요청은 취소하여 커넥션을 반환합니다
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def run_query(self, vectorstore, prompt_type: str, question: str, api_key: str) -> Optional[RAGAnswer]:
+        """
+        Streamlit 스크립트 스레드에서 RAG 응답을 요청하고 결과를 기다립니다.
+
+        Args:
+            vectorstore: 벡터 스토어 인스턴스
+            prompt_type (str): 프롬프트 타입
+            question (str): 사용자 질문
+            api_key (str): OpenAI API 키
+
+        Returns:
+            Optional[RAGAnswer]: 응답 (업스트림 장애 시 저장된 결과일 수 있음) 또는 None (실패 시)
+        """
+        future = self.submit(self.aanswer(vectorstore, prompt_type, question, api_key))
+        try:
+            return future.result()
+        except Exception as e:
+            st.error(f"AI 응답 생성 중 오류 발생: {str(e)}")
+            return None
@@ -0,0 +1,251 @@
+"""
+DreamCourse 검색 마이크로 배치
+
+교실 단위로 접속하면 수십 개 세션이 거의 같은 순간에 짧은 질문 하나를 임베딩하고 k=4 FAISS 검색을 한 번씩 실행합니다.
+RetrievalBatcher는 RETRIEVAL_BATCH_WINDOW_MS 안에 도착한 질문을 모아 임베딩 요청 한 번과 index.search 한 번으로
+처리한 뒤 결과를 각 호출자에게 나누어 돌려줍니다.
+
+- 임베딩은 같은 임베딩 모델 인스턴스끼리, 검색은 같은 벡터 스토어(버전)와 k끼리 묶습니다.
+- 창은 첫 질문이 도착할 때 열리고, 창이 끝나거나 RETRIEVAL_BATCH_MAX_SIZE개가 모이면 바로 실행합니다.
+- FAISS 검색은 전용 스레드(RETRIEVAL_SEARCH_WORKERS개)에서만 실행하고 OpenMP 스레드 수를 FAISS_OMP_THREADS로 고정하여,
+  동시에 실행되는 검색이 각자 모든 코어에 OpenMP 스레드를 띄워 코어를 초과 구독하지 않게 합니다.
+
+RAGService의 이벤트 루프 스레드에서만 사용하므로 별도의 락이 없습니다.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import faiss
+import numpy as np
+from langchain.docstore.document import Document
+from langchain.embeddings.base import Embeddings
+
+from config import (
+    CASSETTE_MODE,
+    FAISS_OMP_THREADS,
+    RETRIEVAL_BATCH_MAX_SIZE,
+    RETRIEVAL_BATCH_WINDOW_MS,
+    RETRIEVAL_SEARCH_WORKERS,
+)
+from metrics import RETRIEVAL_BATCH_SIZE
+
+
+def configure_faiss_threads(threads: int = FAISS_OMP_THREADS, workers: int = RETRIEVAL_SEARCH_WORKERS) -> int:
+    """
+    FAISS의 OpenMP 스레드 수를 설정합니다. (프로세스 전역 설정)
+
+    Args:
+        threads (int): 검색당 OpenMP 스레드 수 (0이면 CPU 코어 수 / 검색 스레드 수)
+        workers (int): 동시에 검색하는 스레드 수
+
+    Returns:
+        int: 설정한 OpenMP 스레드 수
+    """
+    if threads <= 0:
+        threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+    faiss.omp_set_num_threads(threads)
+    return threads
+
+
+def search_with_score(vectorstore, vectors: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+    """
+    여러 쿼리 임베딩을 index.search 한 번으로 검색합니다.
+
+    Args:
+        vectorstore: FAISS 벡터 스토어 또는 샤드 벡터 스토어 (shards 속성)
+        vectors (np.ndarray): (쿼리 수, 차원) float32 행렬
+        k (int): 쿼리별 반환할 문서 수
+
+    Returns:
+        List[List[Tuple[Document, float]]]: 쿼리별 (문서, 거리) 리스트 — similarity_search_with_score_by_vector와 같은 순서
+    """
+    shards = getattr(vectorstore, "shards", None)
+    if shards:
+        # 샤드마다 한 번씩 검색한 뒤 쿼리별로 거리(L2)가 가까운 순으로 합칩니다
+        merged: List[List[Tuple[Document, float]]] = [[] for _ in range(len(vectors))]
+        for _, store in shards:
+            for results, shard_results in zip(merged, search_with_score(store, vectors, k)):
+                results.extend(shard_results)
+        for results in merged:
+            results.sort(key=lambda pair: pair[1])
+        return [results[:k] for results in merged]
+
+    index = getattr(vectorstore, "index", None)
+    if index is None:
+        return [vectorstore.similarity_search_with_score_by_vector(vector.tolist(), k=k) for vector in vectors]
+
+    if getattr(vectorstore, "_normalize_L2", False):
+        vectors = vectors.copy()
+        faiss.normalize_L2(vectors)
+    scores, indices = index.search(vectors, k)
+    batch = []
+    for row_scores, row_indices in zip(scores, indices):
+        results = []
+        for score, i in zip(row_scores, row_indices):
+            if i == -1:
+                continue  # 문서 수가 k보다 적은 경우
+            doc_id = vectorstore.index_to_docstore_id[i]
+            document = vectorstore.docstore.search(doc_id)
+            if not isinstance(document, Document):
+                raise ValueError(f"Could not find document for id {doc_id}, got {document}")
+            results.append((document, float(score)))
+        batch.append(results)
+    return batch
+
+
+@dataclass
+class _PendingBatch:
+    """창이 열려 있는 배치"""
+
+    target: Any
+    items: List[Any] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """같은 키로 창 안에 도착한 요청을 모아 한 번에 실행하는 배처"""
+
+    def __init__(
+        self,
+        stage: str,
+        run: Callable[[Any, List[Any]], Awaitable[List[Any]]],
+        window_seconds: float,
+        max_size: int
+    ):
+        """
+        Args:
+            stage (str): 메트릭 레이블로 쓸 단계 이름 ('embed', 'search')
+            run (Callable[[Any, List[Any]], Awaitable[List[Any]]]): (대상, 요청 목록)을 받아 요청 순서대로 결과를 돌려주는 코루틴 함수
+            window_seconds (float): 첫 요청 도착 후 배치를 모으는 시간(초)
+            max_size (int): 창이 끝나기 전이라도 바로 실행할 요청 수
+        """
+        self.stage = stage
+        self._run = run
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, target: Any, item: Any) -> Any:
+        """
+        요청을 배치에 추가하고 결과를 기다립니다.
+
+        Args:
+            key (Hashable): 함께 묶을 수 있는 요청의 키
+            target (Any): 배치를 실행할 대상 (키의 첫 요청 것을 사용)
+            item (Any): 요청
+
+        Returns:
+            Any: 이 요청의 결과
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch(target)
+            batch.timer = loop.call_later(self.window_seconds, self._flush, key)
+
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self.max_size:
+            batch.timer.cancel()
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Hashable):
+        """창이 닫힌 배치를 실행합니다."""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        task = asyncio.ensure_future(self._execute(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _execute(self, batch: _PendingBatch):
+        """배치를 실행하고 결과(또는 예외)를 각 호출자에게 전달합니다."""
+        RETRIEVAL_BATCH_SIZE.labels(stage=self.stage).observe(len(batch.items))
+        try:
+            results = await self._run(batch.target, batch.items)
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            if not future.done():  # 기다리던 호출자가 취소된 경우
+                future.set_result(result)
+
+
+class RetrievalBatcher:
+    """질문 임베딩과 FAISS 검색을 세션 간에 묶어 실행하는 배처"""
+
+    def __init__(
+        self,
+        window_ms: float = RETRIEVAL_BATCH_WINDOW_MS,
+        max_size: int = RETRIEVAL_BATCH_MAX_SIZE,
+        search_workers: int = RETRIEVAL_SEARCH_WORKERS,
+        batch_embeddings: bool = CASSETTE_MODE == "off"
+    ):
+        """
+        Args:
+            window_ms (float): 배치를 모으는 시간(ms)
+            max_size (int): 한 배치의 최대 질문 수
+            search_workers (int): FAISS 검색 전용 스레드 수
+            batch_embeddings (bool): 임베딩 요청도 묶을지 여부 (카세트는 요청 본문으로 응답을 찾으므로, 도착 시점에 따라
+                본문이 달라지는 임베딩 배치는 녹화·재생 중에는 끕니다)
+        """
+        self.batch_embeddings = batch_embeddings
+        self._executor = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="dreamcourse-faiss")
+        self.omp_threads = configure_faiss_threads(workers=search_workers)
+        self._embed = MicroBatcher("embed", self._aembed_batch, window_ms / 1000, max_size)
+        self._search = MicroBatcher("search", self._asearch_batch, window_ms / 1000, max_size)
+
+    async def aembed_query(self, embeddings: Embeddings, text: str) -> List[float]:
+        """
+        다른 세션의 질문과 묶어 질문 임베딩을 계산합니다.
+
+        Args:
+            embeddings (Embeddings): 임베딩 모델
+            text (str): 질문
+
+        Returns:
+            List[float]: 질문 임베딩
+        """
+        if not self.batch_embeddings:
+            return await embeddings.aembed_query(text)
+        return await self._embed.submit(id(embeddings), embeddings, text)
+
+    async def asimilarity_search_by_vector(self, vectorstore, embedding: List[float], k: int) -> List[Document]:
+        """
+        다른 세션의 검색과 묶어 벡터 스토어를 검색합니다.
+
+        Args:
+            vectorstore: 벡터 스토어 인스턴스
+            embedding (List[float]): 쿼리 임베딩
+            k (int): 반환할 문서 수
+
+        Returns:
+            List[Document]: 거리순 문서 리스트
+        """
+        # 버전이 같으면 내용이 같은 인덱스이므로 세션마다 만든 샤드 벡터 스토어도 함께 묶습니다
+        key = (getattr(vectorstore, "version", None) or id(vectorstore), k)
+        return await self._search.submit(key, (vectorstore, k), embedding)
+
+    @staticmethod
+    async def _aembed_batch(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+        """질문을 임베딩 요청 한 번으로 계산합니다."""
+        return await embeddings.aembed_documents(texts)
+
+    async def _asearch_batch(self, target: Tuple[Any, int], embeddings: List[List[float]]) -> List[List[Document]]:
+        """쿼리 임베딩을 검색 전용 스레드에서 index.search 한 번으로 검색합니다."""
+        vectorstore, k = target
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        results = await asyncio.get_running_loop().run_in_executor(
+            self._executor, search_with_score, vectorstore, vectors, k
+        )
+        return [[document for document, _ in pairs] for pairs in results]
@@ -0,0 +1,345 @@
+"""
+DreamCourse 학급 일괄 진로 설계
+
+명단 CSV(이름, 학년, 희망직업, 희망학과, 학교)를 읽어 학생별 직업·학과 추천, 커리큘럼, 입결 정보를 한 번에 생성합니다.
+학생마다 질의를 보내지 않고 서로 다른 (프롬프트 타입, 학교, 질문) 조합만 한 번씩 실행하므로
+처리 시간은 학생 수가 아니라 고유 질의 수에 비례합니다. 질의는 RAGService의 이벤트 루프에서
+동시 실행 수를 제한하여 처리되며, 학생별 결과는 완료되는 즉시 CSV/HTML로 기록됩니다.
+
+사용 예:
+    python -m roster 명단.csv --output batch_output --concurrency 8
+"""
+
+import argparse
+import asyncio
+import csv
+import html
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from config import (
+    ADMISSION_PROMPT_TYPES,
+    BATCH_CONCURRENCY,
+    BATCH_OUTPUT_DIR,
+    DEFAULT_SCHOOL,
+    GRADE_OPTIONS,
+    ROSTER_COLUMNS,
+    TABLE_COLUMNS
+)
+from job_index import resolve_job
+from prompts import QuestionBuilder
+from rag_service import RAGService
+from utils import TableParser, VectorStoreManager
+
+# 질의 종류별 결과 테이블 컬럼
+QUERY_COLUMNS = {
+    "major_selection": TABLE_COLUMNS["job"],
+    "curriculum": TABLE_COLUMNS["curriculum"],
+    "admission_table": TABLE_COLUMNS["admission"],
+}
+
+# 출력 파일의 섹션 제목
+SECTION_TITLES = {
+    "major_selection": "직업 및 추천 학과",
+    "curriculum": "학기별 추천 커리큘럼",
+    "admission_table": "서울대/연대/고대 수시 입결정보",
+}
+
+
+@dataclass
+class StudentPlan:
+    """학생 한 명의 진로 설계 결과"""
+
+    index: int
+    name: str
+    school: str
+    grade: str
+    job: str
+    major: str = ""
+    tables: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BatchProgress:
+    """일괄 생성 진행 상황"""
+
+    total_students: int
+    done_students: int = 0
+    total_queries: int = 0
+    done_queries: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def fraction(self) -> float:
+        return self.done_students / self.total_students if self.total_students else 1.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """완료된 질의의 평균 처리 속도로 남은 질의 시간을 추정합니다."""
+        if not self.done_queries:
+            return None
+        return self.elapsed / self.done_queries * (self.total_queries - self.done_queries)
+
+    def format(self) -> str:
+        eta = "계산 중" if self.eta_seconds is None else f"{self.eta_seconds:.0f}초"
+        return (
+            f"학생 {self.done_students}/{self.total_students} · 고유 질의 {self.done_queries}/{self.total_queries} · "
+            f"경과 {self.elapsed:.0f}초 · 남은 시간 {eta}"
+        )
+
+
+class RosterLoader:
+    """명단 CSV를 읽고 정규화하는 클래스"""
+
+    @staticmethod
+    def load(source: Union[str, Path, object]) -> pd.DataFrame:
+        """
+        명단 CSV를 읽어 영문 키(name, grade, job, major, school) 컬럼으로 정규화합니다.
+
+        Args:
+            source (Union[str, Path, object]): 파일 경로 또는 업로드된 파일 객체
+
+        Returns:
+            pd.DataFrame: 정규화된 명단
+
+        Raises:
+            ValueError: 필수 컬럼이 없거나 학년 값이 올바르지 않은 경우
+        """
+        df = pd.read_csv(source, dtype=str, encoding="utf-8-sig").fillna("")
+        df.columns = [column.strip() for column in df.columns]
+        df = df.rename(columns={korean: key for key, korean in ROSTER_COLUMNS.items()})
+
+        missing = [ROSTER_COLUMNS[key] for key in ("name", "grade", "job") if key not in df.columns]
+        if missing:
+            raise ValueError(f"명단에 필수 컬럼이 없습니다: {', '.join(missing)}")
+
+        for key in ("major", "school"):
+            if key not in df.columns:
+                df[key] = ""
+        df = df[list(ROSTER_COLUMNS)].apply(lambda column: column.str.strip())
+        df["school"] = df["school"].replace("", DEFAULT_SCHOOL)
+
+        # 직업명 오타·띄어쓰기를 표준 직업명으로 맞춰 같은 직업의 질의가 하나로 합쳐지게 합니다
+        df["job"] = df["job"].map(resolve_job)
+
+        # "2", "2학년", "고2" 모두 "고2"로 맞춥니다
+        df["grade"] = df["grade"].map(lambda grade: f"고{re.sub(r'[^0-9]', '', grade)}")
+        invalid = df.loc[~df["grade"].isin(GRADE_OPTIONS), "name"].tolist()
+        if invalid:
+            raise ValueError(f"학년 값이 올바르지 않은 학생이 있습니다: {', '.join(invalid[:5])}")
+
+        return df[df["name"] != ""].reset_index(drop=True)
+
+
+class BatchPlanner:
+    """고유 질의만 실행하여 명단 전체의 진로 설계를 생성하는 클래스"""
+
+    def __init__(self, api_key: str, concurrency: int = BATCH_CONCURRENCY, service: Optional[RAGService] = None):
+        """
+        Args:
+            api_key (str): OpenAI API 키
+            concurrency (int): 동시에 실행할 최대 질의 수
+            service (Optional[RAGService]): 사용할 RAG 서비스 (기본값: 프로세스 공용 인스턴스)
+        """
+        self.api_key = api_key
+        self.service = service or RAGService.get_instance()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._vectorstores: Dict[Tuple[str, bool], object] = {}
+
+    async def _abounded_query(self, vectorstore, prompt_type: str, question: str) -> str:
+        """동시 실행 수를 제한하여 RAG 질의를 실행합니다."""
+        async with self._semaphore:
+            return (await self.service.aanswer(vectorstore, prompt_type, question, self.api_key)).text
+
+    def _get_vectorstore(self, school: str, prompt_type: str = "major_selection"):
+        """학교·프롬프트 타입별 샤드 벡터 스토어를 한 번만 엽니다. (입결 질문만 학년도 샤드 포함)"""
+        key = (school, prompt_type in ADMISSION_PROMPT_TYPES)
+        if key not in self._vectorstores:
+            self._vectorstores[key] = VectorStoreManager.get_school_vectorstore(
+                self.api_key, school, prompt_type=prompt_type
+            )
+        return self._vectorstores[key]
+
+    def run(self, roster: pd.DataFrame) -> Iterator[Tuple[StudentPlan, BatchProgress]]:
+        """
+        명단의 모든 학생에 대해 진로 설계를 생성합니다.
+
+        학생의 모든 질의가 끝나는 즉시 결과를 내보내므로 호출자는 결과를 바로 기록할 수 있습니다.
+
+        Args:
+            roster (pd.DataFrame): RosterLoader.load()로 읽은 명단
+
+        Yields:
+            Tuple[StudentPlan, BatchProgress]: 완료된 학생의 결과와 현재 진행 상황
+        """
+        progress = BatchProgress(total_students=len(roster))
+        pending: Dict[Future, Hashable] = {}
+        submitted: Set[Hashable] = set()
+        results: Dict[Hashable, Tuple[pd.DataFrame, Optional[str]]] = {}
+        waiting: Dict[Hashable, Set[int]] = {}
+        remaining: Dict[int, Set[Hashable]] = {}
+        plans: Dict[int, StudentPlan] = {}
+
+        def attach(plan: StudentPlan, key: Hashable):
+            table, error = results[key]
+            plan.tables[key[0]] = table
+            if error:
+                plan.errors.append(error)
+
+        def submit(plan: StudentPlan, prompt_type: str, question: str):
+            key = (prompt_type, plan.school, question.strip())
+            if key in results:
+                attach(plan, key)
+                return
+            remaining[plan.index].add(key)
+            waiting.setdefault(key, set()).add(plan.index)
+            if key not in submitted:
+                submitted.add(key)
+                vectorstore = self._get_vectorstore(plan.school, prompt_type)
+                pending[self.service.submit(self._abounded_query(vectorstore, prompt_type, question))] = key
+                progress.total_queries += 1
+
+        def submit_major_queries(plan: StudentPlan):
+            submit(plan, "curriculum", QuestionBuilder.curriculum_question(plan.major, plan.grade))
+            submit(plan, "admission_table", QuestionBuilder.admission_question(plan.major))
+
+        for index, row in roster.iterrows():
+            plan = StudentPlan(index + 1, row["name"], row["school"], row["grade"], row["job"], row["major"])
+            plans[plan.index] = plan
+            remaining[plan.index] = set()
+
+            if self._get_vectorstore(plan.school) is None:
+                plan.errors.append(f"{plan.school}의 벡터 스토어를 열 수 없습니다.")
+                progress.done_students += 1
+                yield plan, progress
+                continue
+
+            submit(plan, "major_selection", QuestionBuilder.job_question(plan.job))
+            if plan.major:
+                submit_major_queries(plan)
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                prompt_type = key[0]
+                progress.done_queries += 1
+
+                try:
+                    table = TableParser.parse_table_response(future.result(), QUERY_COLUMNS[prompt_type])
+                    results[key] = (table, None)
+                except Exception as e:
+                    results[key] = (pd.DataFrame(columns=QUERY_COLUMNS[prompt_type]), f"{SECTION_TITLES[prompt_type]} 생성 실패: {e}")
+
+                for student in sorted(waiting.pop(key, ())):
+                    plan = plans[student]
+                    attach(plan, key)
+                    remaining[student].discard(key)
+
+                    # 희망학과가 없으면 추천 학과 중 첫 번째 학과로 커리큘럼·입결을 이어서 생성합니다
+                    table = plan.tables[prompt_type]
+                    if prompt_type == "major_selection" and not plan.major and not table.empty:
+                        plan.major = str(table.iloc[0]["추천 학과"]).split(",")[0].strip()
+                        if plan.major:
+                            submit_major_queries(plan)
+
+                    if not remaining[student]:
+                        progress.done_students += 1
+                        yield plan, progress
+
+
+class PlanWriter:
+    """학생별 결과를 완료 즉시 CSV/HTML 파일로 기록하는 클래스"""
+
+    def __init__(self, output_dir: Path):
+        """
+        Args:
+            output_dir (Path): 출력 디렉토리 (학생별 파일과 summary.csv가 기록됨)
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._summary_file = open(self.output_dir / "summary.csv", "w", newline="", encoding="utf-8-sig")
+        self._summary = csv.writer(self._summary_file)
+        self._summary.writerow(["번호", "이름", "학교", "학년", "희망직업", "설계 학과", "파일", "오류"])
+
+    def __enter__(self) -> "PlanWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._summary_file.close()
+
+    def write(self, plan: StudentPlan) -> str:
+        """
+        학생 한 명의 결과를 CSV/HTML로 기록하고 요약 행을 추가합니다.
+
+        Args:
+            plan (StudentPlan): 학생 결과
+
+        Returns:
+            str: 확장자를 제외한 파일 이름
+        """
+        stem = f"{plan.index:04d}_{re.sub(r'[^0-9A-Za-z가-힣_-]', '_', plan.name)}"
+
+        with open(self.output_dir / f"{stem}.csv", "w", newline="", encoding="utf-8-sig") as f:
+            for prompt_type, title in SECTION_TITLES.items():
+                f.write(f"[{title}]\n")
+                plan.tables.get(prompt_type, pd.DataFrame(columns=QUERY_COLUMNS[prompt_type])).to_csv(f, index=False)
+                f.write("\n")
+
+        sections = "".join(
+            f"<h2>{title}</h2>"
+            + plan.tables.get(prompt_type, pd.DataFrame(columns=QUERY_COLUMNS[prompt_type])).to_html(index=False)
+            for prompt_type, title in SECTION_TITLES.items()
+        )
+        header = html.escape(f"{plan.school} {plan.grade} {plan.name} · 희망직업 {plan.job} · 설계 학과 {plan.major or '-'}")
+        (self.output_dir / f"{stem}.html").write_text(
+            f'<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>{html.escape(plan.name)}</title></head>'
+            f"<body><h1>{header}</h1>{sections}</body></html>",
+            encoding="utf-8"
+        )
+
+        self._summary.writerow([plan.index, plan.name, plan.school, plan.grade, plan.job, plan.major, stem, " / ".join(plan.errors)])
+        self._summary_file.flush()
+        return stem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DreamCourse 학급 일괄 진로 설계")
+    parser.add_argument("roster", type=str, help="명단 CSV 경로 (이름, 학년, 희망직업[, 희망학과, 학교])")
+    parser.add_argument("--output", type=str, default=str(BATCH_OUTPUT_DIR), help="결과를 기록할 디렉토리")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="동시에 실행할 최대 질의 수")
+    args = parser.parse_args()
+
+    try:
+        roster = RosterLoader.load(args.roster)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    planner = BatchPlanner(os.getenv("OPENAI_API_KEY", ""), concurrency=args.concurrency)
+    progress = None
+    with PlanWriter(Path(args.output)) as writer:
+        for plan, progress in planner.run(roster):
+            writer.write(plan)
+            print(f"\r{progress.format()}", end="", flush=True)
+
+    if progress is not None:
+        print(f"\n완료: {args.output} (학생 {progress.total_students}명, 고유 질의 {progress.total_queries}개)")
+
+
+if __name__ == "__main__":
+    main()
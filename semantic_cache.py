@@ -0,0 +1,429 @@
+"""
+DreamCourse 의미 기반 응답 캐시
+
+"데이터 과학자"와 "데이터사이언티스트"처럼 표현만 다른 질문은 정확 일치 캐시에서 놓치므로,
+질문 임베딩을 작은 전용 FAISS 내적(코사인) 인덱스에 저장해 두고 가장 가까운 질문의 유사도가
+프롬프트 타입별 임계값 이상이면 그 답변을 재사용합니다.
+
+- QuestionBuilder가 만든 질문은 공통 문구를 빼고 자유 입력 값(직업명, 학과명)만 임베딩해 비교하며,
+  학년처럼 고정된 필드와 인덱스 버전, 프롬프트 타입이 모두 같은 질문끼리만 비교합니다.
+- 최대 항목 수를 넘으면 가장 오래 쓰이지 않은 항목부터(LRU), 유효 시간이 지난 항목은 조회 시 해제합니다.
+- 적중 중 일부는 실제 답변을 다시 생성해 비교하고, 일치하지 않으면 오적중으로 기록한 뒤 항목을 무효화합니다.
+- 임계값은 CALIBRATION_PAIRS(같은 뜻의 표현 쌍과 서로 다른 직업·학과 쌍)를 백엔드의 임베딩 모델로 측정하여,
+  서로 다른 쌍이 하나도 적중하지 않는 가장 낮은 값으로 정합니다. (`python -m semantic_cache calibrate --write`)
+
+RAGService의 이벤트 루프 스레드에서만 사용하므로 별도의 락이 없습니다.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+from config import (
+    LLM_BACKEND,
+    SEMANTIC_CACHE_AUDIT_AGREEMENT,
+    SEMANTIC_CACHE_AUDIT_PATH,
+    SEMANTIC_CACHE_AUDIT_RATE,
+    SEMANTIC_CACHE_CALIBRATION_MARGIN,
+    SEMANTIC_CACHE_SIZE,
+    SEMANTIC_CACHE_THRESHOLDS_PATH,
+    SEMANTIC_CACHE_TTL_SECONDS
+)
+from metrics import CACHE_REQUESTS, SEMANTIC_CACHE_AUDITS, SEMANTIC_CACHE_SIMILARITY
+from prompts import QuestionBuilder
+
+logger = logging.getLogger(__name__)
+
+# 임계값 보정용 비교 텍스트 쌍 (QuestionBuilder 질문은 자유 입력 값만 비교하므로 직업명·학과명 쌍)
+# (첫 번째, 두 번째, 같은 뜻인지) — 같은 뜻이면 적중해야 하고, 다른 직업·학과이면 적중하면 안 됩니다
+_JOB_PAIRS = [
+    ("데이터 과학자", "데이터과학자", True),
+    ("데이터 과학자", "데이터사이언티스트", True),
+    ("소프트웨어 개발자", "소프트웨어개발자", True),
+    ("웹 개발자", "웹개발자", True),
+    ("스포츠 해설가", "스포츠해설가", True),
+    ("사회 복지사", "사회복지사", True),
+    ("소프트웨어 개발자", "하드웨어 개발자", False),
+    ("데이터 과학자", "데이터 엔지니어", False),
+    ("웹 개발자", "앱 개발자", False),
+    ("간호사", "간호조무사", False),
+    ("사회복지사", "사회학자", False),
+    ("스포츠해설가", "스포츠기자", False),
+]
+_MAJOR_PAIRS = [
+    ("컴퓨터공학과", "컴퓨터 공학과", True),
+    ("사회복지학과", "사회 복지학과", True),
+    ("체육교육과", "체육 교육과", True),
+    ("소프트웨어학과", "소프트웨어 학과", True),
+    ("간호학과", "간호 학과", True),
+    ("컴퓨터공학과", "컴퓨터교육과", False),
+    ("사회복지학과", "사회학과", False),
+    ("체육학과", "체육교육과", False),
+    ("전자공학과", "전기공학과", False),
+    ("화학과", "화학공학과", False),
+    ("경영학과", "경제학과", False),
+    ("수학과", "수학교육과", False),
+    ("소프트웨어학과", "소프트웨어공학과", False),
+]
+CALIBRATION_PAIRS = {
+    "major_selection": _JOB_PAIRS,
+    "curriculum": _MAJOR_PAIRS,
+    "admission_table": _MAJOR_PAIRS,
+}
+
+
+@dataclass
+class SemanticEntry:
+    """캐시에 저장된 질문과 답변"""
+
+    partition: Hashable
+    prompt_type: str
+    text: str
+    answer: str
+    created_at: float
+    hits: int = 0
+
+
+@dataclass
+class SemanticHit:
+    """의미 기반 캐시 적중 결과"""
+
+    entry_id: int
+    text: str
+    answer: str
+    similarity: float
+
+
+def calibrate(
+    embeddings: Embeddings,
+    pairs: Optional[Dict[str, List[Tuple[str, str, bool]]]] = None,
+    margin: float = SEMANTIC_CACHE_CALIBRATION_MARGIN
+) -> Dict[str, Dict[str, float]]:
+    """
+    보정용 쌍의 코사인 유사도를 측정하여 프롬프트 타입별 임계값을 정합니다.
+
+    임계값은 서로 다른 쌍의 최대 유사도 + margin을 0.01 단위로 올린 값이며, 그 값에서 같은 뜻의 쌍이
+    적중하는 비율(paraphrase_recall)을 함께 보고합니다.
+
+    Args:
+        embeddings (Embeddings): 측정할 임베딩 모델
+        pairs (Optional[Dict[str, List[Tuple[str, str, bool]]]]): 프롬프트 타입별 (텍스트, 텍스트, 같은 뜻인지) 쌍
+            (기본값: CALIBRATION_PAIRS)
+        margin (float): 서로 다른 쌍의 최대 유사도에 더하는 여유
+
+    Returns:
+        Dict[str, Dict[str, float]]: {프롬프트 타입: {threshold, max_distinct, min_paraphrase, paraphrase_recall}}
+    """
+    pairs = CALIBRATION_PAIRS if pairs is None else pairs
+    texts = sorted({text for type_pairs in pairs.values() for first, second, _ in type_pairs for text in (first, second)})
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    position = {text: i for i, text in enumerate(texts)}
+
+    result = {}
+    for prompt_type, type_pairs in pairs.items():
+        similarities = [
+            (float(vectors[position[first]] @ vectors[position[second]]), same)
+            for first, second, same in type_pairs
+        ]
+        paraphrases = [similarity for similarity, same in similarities if same]
+        distinct = [similarity for similarity, same in similarities if not same]
+        threshold = math.ceil((max(distinct) + margin) * 100) / 100
+        result[prompt_type] = {
+            "threshold": threshold,
+            "max_distinct": round(max(distinct), 4),
+            "min_paraphrase": round(min(paraphrases), 4),
+            "paraphrase_recall": round(sum(similarity >= threshold for similarity in paraphrases) / len(paraphrases), 4),
+        }
+    return result
+
+
+def load_thresholds(backend: str = LLM_BACKEND, path: Path = SEMANTIC_CACHE_THRESHOLDS_PATH) -> Dict[str, float]:
+    """
+    백엔드의 임베딩 모델로 측정해 저장한 프롬프트 타입별 임계값을 읽습니다.
+
+    Args:
+        backend (str): LLM 백엔드 ('openai', 'stub')
+        path (Path): calibrate 결과 JSON 경로
+
+    Returns:
+        Dict[str, float]: {프롬프트 타입: 임계값} (측정값이 없으면 빈 딕셔너리 — 의미 기반 캐시를 쓰지 않음)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            measured = json.load(f).get(backend, {})
+    except (OSError, ValueError):
+        measured = {}
+    thresholds = {prompt_type: values["threshold"] for prompt_type, values in measured.items() if values["threshold"] <= 1}
+    if not thresholds:
+        logger.warning("%s 백엔드의 의미 기반 캐시 임계값이 없어 정확 일치 캐시만 사용합니다. "
+                       "(python -m semantic_cache calibrate --write)", backend)
+    return thresholds
+
+
+def answer_agreement(first: str, second: str) -> float:
+    """
+    두 답변의 마크다운 테이블 셀 집합의 Jaccard 유사도를 계산합니다.
+
+    Args:
+        first (str): 첫 번째 답변
+        second (str): 두 번째 답변
+
+    Returns:
+        float: 0~1 사이의 일치도 (테이블이 없으면 텍스트 일치 여부)
+    """
+    def cells(text: str) -> set:
+        return {
+            cell.strip()
+            for line in text.splitlines() if "|" in line and "---" not in line
+            for cell in line.strip().strip("|").split("|") if cell.strip()
+        }
+
+    first_cells, second_cells = cells(first), cells(second)
+    if not first_cells and not second_cells:
+        return float(first.strip() == second.strip())
+    return len(first_cells & second_cells) / len(first_cells | second_cells)
+
+
+class SemanticCache:
+    """질문 임베딩의 코사인 유사도로 답변을 재사용하는 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = SEMANTIC_CACHE_SIZE,
+        thresholds: Optional[Dict[str, float]] = None,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+        audit_rate: float = SEMANTIC_CACHE_AUDIT_RATE,
+        audit_path: Optional[Path] = SEMANTIC_CACHE_AUDIT_PATH
+    ):
+        """
+        Args:
+            max_entries (int): 최대 항목 수
+            thresholds (Optional[Dict[str, float]]): 프롬프트 타입별 유사도 임계값 (없는 타입은 캐시하지 않음,
+                기본값: load_thresholds()로 읽은 현재 백엔드의 측정값)
+            ttl_seconds (float): 항목 유효 시간(초)
+            audit_rate (float): 적중 중 감사할 비율 (0~1)
+            audit_path (Optional[Path]): 오적중을 기록할 JSONL 경로 (None이면 기록하지 않음)
+        """
+        self.max_entries = max_entries
+        self.thresholds = dict(load_thresholds() if thresholds is None else thresholds)
+        self.ttl_seconds = ttl_seconds
+        self.audit_rate = audit_rate
+        self.audit_path = audit_path
+        self.hits = 0
+        self.misses = 0
+
+        self._indexes: Dict[Hashable, faiss.IndexIDMap2] = {}
+        # entry_id -> 항목 (사용 순서대로 정렬, 맨 앞이 가장 오래 쓰이지 않은 항목)
+        self._entries: "OrderedDict[int, SemanticEntry]" = OrderedDict()
+        self._next_id = 0
+        self._rng = random.Random(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(version: Optional[str], prompt_type: str, question: str) -> Tuple[Hashable, str]:
+        """
+        질문의 비교 범위(파티션)와 임베딩할 텍스트를 반환합니다.
+
+        템플릿 질문은 공통 문구가 유사도를 지배하지 않도록 자유 입력 값만 비교하고, 학년 같은 고정 필드는
+        파티션에 넣습니다. 그 밖의 질문은 "고1"과 "고2"처럼 숫자만 다른 질문이 섞이지 않도록
+        질문 속 숫자가 모두 같은 질문끼리만 비교합니다.
+
+        Args:
+            version (Optional[str]): 벡터 스토어 버전
+            prompt_type (str): 프롬프트 타입
+            question (str): 질문
+
+        Returns:
+            Tuple[Hashable, str]: (파티션 키, 임베딩할 텍스트)
+        """
+        parsed = QuestionBuilder.parse(question)
+        if parsed is not None:
+            template, subject, fields = parsed
+            return (version, prompt_type, template, fields), subject
+        return (version, prompt_type, tuple(re.findall(r"\d+", question))), question.strip()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """내적이 코사인 유사도가 되도록 L2 정규화한 (1, D) 벡터를 반환합니다."""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1).copy()
+        faiss.normalize_L2(vector)
+        return vector
+
+    def lookup(self, partition: Hashable, prompt_type: str, embedding: List[float]) -> Optional[SemanticHit]:
+        """
+        같은 파티션에서 가장 가까운 질문의 유사도가 임계값 이상이면 그 답변을 반환합니다.
+
+        Args:
+            partition (Hashable): key()가 반환한 파티션 키
+            prompt_type (str): 프롬프트 타입
+            embedding (List[float]): key()가 반환한 텍스트의 임베딩
+
+        Returns:
+            Optional[SemanticHit]: 적중 결과 또는 None
+        """
+        threshold = self.thresholds.get(prompt_type)
+        if threshold is None:
+            return None
+
+        index = self._indexes.get(partition)
+        hit = None
+        if index is not None:
+            similarities, ids = index.search(self._normalize(embedding), 1)
+            entry_id, similarity = int(ids[0][0]), float(similarities[0][0])
+            if entry_id >= 0:
+                SEMANTIC_CACHE_SIMILARITY.labels(prompt_type=prompt_type).observe(similarity)
+                entry = self._entries[entry_id]
+                if time.time() - entry.created_at > self.ttl_seconds:
+                    self.invalidate(entry_id)
+                elif similarity >= threshold:
+                    entry.hits += 1
+                    self._entries.move_to_end(entry_id)
+                    hit = SemanticHit(entry_id, entry.text, entry.answer, similarity)
+
+        if hit is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        CACHE_REQUESTS.labels(cache="semantic", result="miss" if hit is None else "hit").inc()
+        return hit
+
+    def add(self, partition: Hashable, prompt_type: str, text: str, embedding: List[float], answer: str) -> Optional[int]:
+        """
+        질문과 답변을 캐시에 추가합니다.
+
+        Args:
+            partition (Hashable): key()가 반환한 파티션 키
+            prompt_type (str): 프롬프트 타입
+            text (str): key()가 반환한 텍스트
+            embedding (List[float]): text의 임베딩
+            answer (str): 답변
+
+        Returns:
+            Optional[int]: 항목 ID (캐시하지 않는 타입이면 None)
+        """
+        if prompt_type not in self.thresholds:
+            return None
+
+        vector = self._normalize(embedding)
+        index = self._indexes.get(partition)
+        if index is None:
+            index = self._indexes[partition] = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+
+        entry_id = self._next_id
+        self._next_id += 1
+        index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+        self._entries[entry_id] = SemanticEntry(partition, prompt_type, text, answer, time.time())
+
+        while len(self._entries) > self.max_entries:
+            self.invalidate(next(iter(self._entries)))
+        return entry_id
+
+    def invalidate(self, entry_id: int):
+        """
+        항목을 캐시와 인덱스에서 제거합니다.
+
+        Args:
+            entry_id (int): 항목 ID
+        """
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+
+        index = self._indexes[entry.partition]
+        index.remove_ids(np.array([entry_id], dtype=np.int64))
+        if index.ntotal == 0:
+            del self._indexes[entry.partition]
+
+    def should_audit(self) -> bool:
+        """이번 적중을 감사할지 audit_rate 비율로 결정합니다."""
+        return self._rng.random() < self.audit_rate
+
+    def record_audit(self, prompt_type: str, text: str, hit: SemanticHit, fresh_answer: str) -> bool:
+        """
+        적중한 답변과 새로 생성한 답변을 비교해 감사 결과를 기록합니다.
+
+        일치도가 기준 미만이면 오적중으로 JSONL에 기록하고 해당 항목을 무효화합니다.
+
+        Args:
+            prompt_type (str): 프롬프트 타입
+            text (str): 새 질문의 비교 텍스트
+            hit (SemanticHit): 적중 결과
+            fresh_answer (str): 새로 생성한 답변
+
+        Returns:
+            bool: 두 답변이 일치하면 True
+        """
+        agreement = answer_agreement(hit.answer, fresh_answer)
+        matched = agreement >= SEMANTIC_CACHE_AUDIT_AGREEMENT
+        SEMANTIC_CACHE_AUDITS.labels(prompt_type=prompt_type, result="match" if matched else "mismatch").inc()
+
+        if not matched:
+            self.invalidate(hit.entry_id)
+            if self.audit_path is not None:
+                record = {
+                    "time": time.time(),
+                    "prompt_type": prompt_type,
+                    "text": text,
+                    "cached_text": hit.text,
+                    "similarity": round(hit.similarity, 4),
+                    "agreement": round(agreement, 4),
+                }
+                with open(self.audit_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return matched
+
+    def stats(self) -> Dict[str, int]:
+        """
+        캐시 상태를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 항목 수, 파티션 수, 적중/미적중 횟수
+        """
+        return {
+            "entries": len(self._entries),
+            "partitions": len(self._indexes),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def main():
+    """현재 백엔드의 임베딩 모델로 의미 기반 캐시 임계값을 측정하고, --write이면 저장합니다."""
+    parser = argparse.ArgumentParser(description="DreamCourse 의미 기반 캐시 임계값 보정")
+    parser.add_argument("command", choices=["calibrate"], help="실행할 작업")
+    parser.add_argument("--write", action="store_true", help=f"측정한 임계값을 {SEMANTIC_CACHE_THRESHOLDS_PATH.name}에 저장")
+    args = parser.parse_args()
+
+    from utils import VectorStoreManager
+
+    result = calibrate(VectorStoreManager.create_embeddings(os.getenv("OPENAI_API_KEY", "")))
+    print(json.dumps({LLM_BACKEND: result}, ensure_ascii=False, indent=2))
+    if args.write:
+        try:
+            with open(SEMANTIC_CACHE_THRESHOLDS_PATH, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        stored[LLM_BACKEND] = result
+        with open(SEMANTIC_CACHE_THRESHOLDS_PATH, "w", encoding="utf-8") as f:
+            f.write(json.dumps(stored, ensure_ascii=False, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
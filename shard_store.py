@@ -0,0 +1,154 @@
+"""
+DreamCourse 학교별 인덱스 샤드
+
+코퍼스를 학교별 커리큘럼 샤드와 학교 무관 정보(학과·입결)를 담는 공통 샤드로 나눕니다.
+샤드는 처음 사용할 때 mmap으로 열리고, 프로세스당 최대 SHARD_CACHE_SIZE개까지만 유지되며
+가장 오래 쓰이지 않은 샤드부터(LRU) 또는 SHARD_IDLE_SECONDS 동안 쓰이지 않으면 해제됩니다.
+샤드 로딩은 캐시 전체 락 밖에서 (샤드, 버전)별 락으로 한 번만 실행하므로, 한 샤드를 여는 동안에도
+다른 샤드의 적중은 기다리지 않습니다.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain.docstore.document import Document
+from langchain.embeddings.base import Embeddings
+from langchain.vectorstores import FAISS
+
+from config import SHARD_CACHE_SIZE, SHARD_IDLE_SECONDS
+from metrics import CACHE_REQUESTS
+
+
+class ShardCache:
+    """샤드 이름별로 열린 벡터 스토어를 LRU + 유휴 시간 기준으로 유지하는 캐시"""
+
+    def __init__(self, max_shards: int = SHARD_CACHE_SIZE, idle_seconds: float = SHARD_IDLE_SECONDS):
+        """
+        Args:
+            max_shards (int): 동시에 유지할 최대 샤드 수
+            idle_seconds (float): 이 시간 동안 쓰이지 않은 샤드는 해제
+        """
+        self.max_shards = max_shards
+        self.idle_seconds = idle_seconds
+        # shard -> (version, vectorstore, 마지막 사용 시각)
+        self._entries: "OrderedDict[str, Tuple[str, FAISS, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # (shard, version) -> 로딩 중인 스레드가 잡는 락 (같은 샤드를 동시에 두 번 열지 않음)
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, shard: str) -> bool:
+        return shard in self._entries
+
+    def get(self, shard: str, version: str, loader: Callable[[], Optional[FAISS]]) -> Optional[FAISS]:
+        """
+        캐시된 샤드를 반환하고, 없거나 버전이 바뀌었으면 loader로 새로 엽니다.
+
+        loader는 캐시 전체 락 밖에서 (샤드, 버전)별 락을 잡고 실행하며, 같은 샤드를 기다리던 요청은
+        락을 얻은 뒤 캐시를 다시 확인하여 먼저 연 결과를 그대로 사용합니다.
+
+        Args:
+            shard (str): 샤드 이름
+            version (str): 게시된 버전
+            loader (Callable[[], Optional[FAISS]]): 샤드를 여는 함수
+
+        Returns:
+            Optional[FAISS]: 샤드 벡터 스토어 또는 None (로딩 실패 시)
+        """
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            cached = self._touch(shard, version)
+            if cached is not None:
+                CACHE_REQUESTS.labels(cache="shard", result="hit").inc()
+                return cached
+            CACHE_REQUESTS.labels(cache="shard", result="miss").inc()
+            shard_lock = self._loading.setdefault((shard, version), threading.Lock())
+
+        with shard_lock:
+            # 기다리는 동안 다른 요청이 같은 버전을 열었으면 그 결과를 사용합니다
+            with self._lock:
+                cached = self._touch(shard, version)
+            if cached is not None:
+                return cached
+
+            try:
+                vectorstore = loader()
+                if vectorstore is not None:
+                    with self._lock:
+                        self._entries[shard] = (version, vectorstore, time.monotonic())
+                        self._entries.move_to_end(shard)
+                        while len(self._entries) > self.max_shards:
+                            self._entries.popitem(last=False)
+            finally:
+                # 캐시에 넣은 뒤에 지워야 그 사이에 온 요청이 같은 샤드를 다시 열지 않습니다
+                with self._lock:
+                    if self._loading.get((shard, version)) is shard_lock:
+                        del self._loading[(shard, version)]
+            return vectorstore
+
+    def _touch(self, shard: str, version: str) -> Optional[FAISS]:
+        """같은 버전의 캐시된 샤드를 최근 사용으로 표시하고 반환합니다. (호출자가 락을 잡은 상태)"""
+        entry = self._entries.get(shard)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries[shard] = (version, entry[1], time.monotonic())
+        self._entries.move_to_end(shard)
+        return entry[1]
+
+    def _evict_idle(self, now: float):
+        """유휴 시간이 지난 샤드를 해제합니다. (호출자가 락을 잡은 상태)"""
+        cutoff = now - self.idle_seconds
+        for shard in [name for name, (_, _, last_used) in self._entries.items() if last_used < cutoff]:
+            del self._entries[shard]
+
+
+SHARD_CACHE = ShardCache()
+
+
+class ShardedVectorStore:
+    """
+    학교 샤드와 공통 샤드를 함께 검색하는 벡터 스토어
+
+    RAGService가 사용하는 embeddings, version, asimilarity_search_by_vector만 제공하며,
+    쿼리 임베딩은 한 번만 계산해 각 샤드를 검색한 뒤 거리순으로 합칩니다.
+    """
+
+    def __init__(self, shards: List[Tuple[str, FAISS]]):
+        """
+        Args:
+            shards (List[Tuple[str, FAISS]]): (샤드 이름, 벡터 스토어) 목록
+        """
+        self.shards = shards
+        self.version = "+".join(f"{name}@{getattr(store, 'version', None)}" for name, store in shards)
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.shards[0][1].embeddings
+
+    def similarity_search_with_score_by_vector(self, embedding: List[float], k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        모든 샤드에서 상위 k개를 찾아 거리(L2)가 가까운 순으로 k개를 반환합니다.
+
+        Args:
+            embedding (List[float]): 쿼리 임베딩
+            k (int): 반환할 문서 수
+
+        Returns:
+            List[Tuple[Document, float]]: (문서, 거리) 리스트
+        """
+        results = []
+        for _, store in self.shards:
+            results.extend(store.similarity_search_with_score_by_vector(embedding, k=k))
+        results.sort(key=lambda pair: pair[1])
+        return results[:k]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score_by_vector(embedding, k=k)]
+
+    async def asimilarity_search_by_vector(self, embedding: List[float], k: int = 4) -> List[Document]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.similarity_search_by_vector, embedding, k)
@@ -0,0 +1,310 @@
+"""
+DreamCourse 스텁 LLM/임베딩 백엔드
+
+네트워크 없이 파이프라인을 구동하기 위한 결정적(deterministic) 백엔드입니다.
+지연 시간을 주입할 수 있어 부하 테스트와 벤치마크에 사용됩니다.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain.chat_models.base import BaseChatModel
+from langchain.embeddings.base import Embeddings
+from langchain.schema import AIMessage, BaseMessage, ChatGeneration, ChatResult, SystemMessage
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    대략적인 토큰 수를 계산합니다. (한글 기준 약 2자당 1토큰)
+
+    Args:
+        text (str): 대상 텍스트
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    return max(1, len(text) // 2)
+
+
+class StubUsage:
+    """스텁 백엔드의 호출 횟수와 토큰 사용량을 스레드 안전하게 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """집계를 초기화합니다."""
+        with self._lock:
+            self.llm_calls = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.cached_prompt_tokens = 0
+            self.embedding_calls = 0
+            self.embedded_texts = 0
+
+    def record_llm(self, prompt_tokens: int, completion_tokens: int, cached_prompt_tokens: int = 0):
+        """LLM 호출 1회를 기록합니다."""
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cached_prompt_tokens += cached_prompt_tokens
+
+    def record_embedding(self, text_count: int):
+        """임베딩 호출 1회를 기록합니다."""
+        with self._lock:
+            self.embedding_calls += 1
+            self.embedded_texts += text_count
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        현재 집계값을 반환합니다.
+
+        Returns:
+            Dict[str, int]: 항목별 집계값
+        """
+        with self._lock:
+            return {
+                "llm_calls": self.llm_calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cached_prompt_tokens": self.cached_prompt_tokens,
+                "embedding_calls": self.embedding_calls,
+                "embedded_texts": self.embedded_texts,
+            }
+
+
+# 프로세스 공용 스텁 사용량 집계
+STUB_USAGE = StubUsage()
+
+
+class StubPromptCache:
+    """
+    제공자 측 프롬프트 캐시를 흉내 냅니다.
+
+    시스템 메시지를 128토큰 단위 블록으로 나누어 앞에서부터 누적한 접두부를 기록하고, 이전 호출과 같은 가장 긴
+    접두부의 길이를 캐시된 토큰으로 보고합니다. (그 길이가 최소 길이 미만이면 캐시하지 않음)
+    """
+
+    BLOCK_TOKENS = 128
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = set()
+
+    def reset(self):
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._seen.clear()
+
+    def cached_tokens(self, prefix: str, min_tokens: int) -> int:
+        """
+        고정 부분을 기록하고, 이전에 본 적이 있으면 캐시된 토큰 수를 반환합니다.
+
+        Args:
+            prefix (str): 시스템 메시지 내용
+            min_tokens (int): 캐시되는 최소 접두부 길이(토큰)
+
+        Returns:
+            int: 캐시된 프롬프트 토큰 수
+        """
+        # estimate_tokens 기준 블록 하나의 글자 수
+        block_chars = StubPromptCache.BLOCK_TOKENS * 2
+        digest, keys = hashlib.sha256(), []
+        for end in range(block_chars, len(prefix) + 1, block_chars):
+            digest.update(prefix[end - block_chars:end].encode("utf-8"))
+            keys.append(digest.copy().digest())
+
+        with self._lock:
+            blocks = 0
+            while blocks < len(keys) and keys[blocks] in self._seen:
+                blocks += 1
+            self._seen.update(keys)
+        tokens = blocks * StubPromptCache.BLOCK_TOKENS
+        return tokens if tokens >= min_tokens else 0
+
+
+# 프로세스 공용 스텁 프롬프트 캐시
+STUB_PROMPT_CACHE = StubPromptCache()
+
+
+class StubChatModel(BaseChatModel):
+    """프롬프트 종류에 맞는 마크다운 테이블을 돌려주는 스텁 채팅 모델"""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    distribution: str = "normal"  # "normal"(jitter = 표준편차) 또는 "lognormal"(latency = 중앙값, jitter = 로그 표준편차)
+    tail_probability: float = 0.0  # 이 확률로 tail_latency초 동안 응답하지 않음 (업스트림 정체)
+    tail_latency: float = 0.0
+    model_name: str = "dreamcourse-stub"
+    max_tokens: Optional[int] = None  # 설정하면 응답을 이 토큰 수에서 잘라 냅니다 (실제 모델의 max_tokens와 같은 동작)
+    prompt_cache_min_tokens: int = 1024  # 이전 호출과 같은 시스템 메시지 접두부가 이 길이 이상이면 캐시 적중으로 보고합니다
+
+    @property
+    def _llm_type(self) -> str:
+        return "dreamcourse-stub"
+
+    def _sample_latency(self) -> float:
+        """설정된 분포에서 지연 시간(초)을 뽑습니다."""
+        if self.tail_probability > 0 and random.random() < self.tail_probability:
+            return self.tail_latency
+        if self.jitter <= 0 or self.latency <= 0:
+            return self.latency
+        if self.distribution == "lognormal":
+            return random.lognormvariate(math.log(self.latency), self.jitter)
+        return max(0.0, random.gauss(self.latency, self.jitter))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        time.sleep(self._sample_latency())
+        return self._build_result(messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        await asyncio.sleep(self._sample_latency())
+        return self._build_result(messages)
+
+    def _build_result(self, messages: List[BaseMessage]) -> ChatResult:
+        """응답 텍스트와 토큰 사용량을 담은 ChatResult를 생성합니다."""
+        prompt = "\n".join(str(message.content) for message in messages)
+        text = self._answer(prompt)
+        if self.max_tokens is not None and estimate_tokens(text) > self.max_tokens:
+            text = text[:self.max_tokens * 2]
+
+        cached_tokens = 0
+        if messages and isinstance(messages[0], SystemMessage):
+            cached_tokens = STUB_PROMPT_CACHE.cached_tokens(str(messages[0].content), self.prompt_cache_min_tokens)
+
+        # ChatOpenAI와 같은 형식 (prompt_tokens_details.cached_tokens)
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(text),
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        STUB_USAGE.record_llm(usage["prompt_tokens"], usage["completion_tokens"], cached_tokens)
+
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=text))],
+            llm_output={"token_usage": usage, "model_name": self.model_name}
+        )
+
+    def _combine_llm_outputs(self, llm_outputs: List[Optional[dict]]) -> dict:
+        """ChatOpenAI와 같은 형식으로 토큰 사용량을 합산합니다."""
+        usage: Dict[str, Any] = {}
+        for output in llm_outputs:
+            for key, value in (output or {}).get("token_usage", {}).items():
+                if isinstance(value, dict):
+                    details = usage.setdefault(key, {})
+                    for detail, count in value.items():
+                        details[detail] = details.get(detail, 0) + count
+                else:
+                    usage[key] = usage.get(key, 0) + value
+        return {"token_usage": usage, "model_name": self.model_name}
+
+    @staticmethod
+    def _task_section(prompt: str) -> str:
+        """
+        여러 작업의 응답 형식을 담은 공유 고정 부분에서 "이번 작업" 줄이 가리키는 작업의 부분만 잘라냅니다.
+
+        Args:
+            prompt (str): 전체 프롬프트
+
+        Returns:
+            str: "[작업 이름]"부터 다음 작업 전까지의 부분 (작업 줄이 없으면 프롬프트 전체)
+        """
+        match = re.search(r"^이번 작업: (.+)$", prompt, re.MULTILINE)
+        if match is None:
+            return prompt
+        start = prompt.find(f"[{match.group(1).strip()}]")
+        if start < 0:
+            return prompt
+        end = prompt.find("\n[", start + 1)
+        return prompt[start:end if end >= 0 else len(prompt)]
+
+    @staticmethod
+    def _answer(prompt: str) -> str:
+        """프롬프트의 테이블 헤더를 보고 알맞은 형식의 응답을 만듭니다."""
+        prompt = StubChatModel._task_section(prompt)
+        if "관련 직업명" in prompt:
+            rows = [
+                ["소프트웨어 개발자", "컴퓨터 프로그램과 서비스를 설계하고 개발하는 직업입니다", "컴퓨터공학과, 소프트웨어공학과"],
+                ["데이터 과학자", "데이터를 분석해 의사결정에 필요한 인사이트를 찾는 직업입니다", "통계학과, 컴퓨터공학과"],
+            ]
+            header = ["관련 직업명", "직업설명", "추천 학과"]
+        elif "학기정보" in prompt:
+            rows = [
+                [f"{grade}학년 {semester}학기", "공통국어", "체육", "수학", "정보", "-"]
+                for grade in (1, 2, 3) for semester in (1, 2)
+            ]
+            header = ["학기정보", "공통과목", "기본선택", "일반선택", "진로선택", "융합과목"]
+        elif "대학명" in prompt:
+            rows = [
+                ["2024", university, "컴퓨터공학과", "학교추천전형", "21", "10.86", "1.27", "1.32"]
+                for university in ("서울대학교", "연세대학교", "고려대학교")
+            ]
+            header = ["학년도", "대학명", "학과명", "전형명", "모집인원", "경쟁률", "50% 컷", "70% 컷"]
+        else:
+            return "관련 정보를 찾을 수 없습니다."
+
+        lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+        lines += ["| " + " | ".join(row) + " |" for row in rows]
+        return "\n".join(lines)
+
+
+class StubEmbeddings(Embeddings):
+    """문자 바이그램 해싱 기반의 결정적 스텁 임베딩"""
+
+    def __init__(self, dimension: int = 256, latency: float = 0.0):
+        """
+        Args:
+            dimension (int): 임베딩 차원 수
+            latency (float): 호출당 주입할 지연 시간(초)
+        """
+        self.dimension = dimension
+        self.latency = latency
+
+    def _embed(self, text: str) -> List[float]:
+        """텍스트의 문자 바이그램을 해싱하여 정규화된 벡터를 만듭니다."""
+        vector = [0.0] * self.dimension
+        padded = f" {text} "
+        for i in range(len(padded) - 1):
+            digest = hashlib.md5(padded[i:i + 2].encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dimension] += 1.0
+
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        STUB_USAGE.record_embedding(len(texts))
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency)
+        STUB_USAGE.record_embedding(len(texts))
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
@@ -4,8 +4,13 @@ DreamCourse UI 스타일 관리
 Streamlit 애플리케이션의 CSS 스타일을 관리합니다.
 """
 
+from datetime import datetime
+from typing import Optional
+
 import streamlit as st
 
+from config import MESSAGES
+
 
 class Styles:
     """UI 스타일을 관리하는 클래스"""
@@ -71,26 +76,52 @@ class Styles:
         st.markdown(Styles.CUSTOM_CSS, unsafe_allow_html=True)
 
     @staticmethod
-    def create_image_link(url: str, image_url: str, alt_text: str, max_width: str = "70%") -> str:
+    def create_picture(asset: dict, alt_text: str, style: str = "") -> str:
+        """
+        빌드된 자산으로 <picture> 태그를 생성합니다.
+
+        Args:
+            asset (dict): assets.get_asset()이 반환한 자산 정보
+            alt_text (str): 대체 텍스트
+            style (str): img 태그에 적용할 인라인 스타일
+
+        Returns:
+            str: HTML 형식의 picture 태그 (브라우저가 지원하는 첫 포맷을 사용)
+        """
+        sources = "".join(
+            f'<source srcset="{url}" type="{mime}">' for url, mime in asset["sources"]
+        )
+        return (
+            f"<picture>{sources}"
+            f'<img src="{asset["fallback"]}" alt="{alt_text}" '
+            f'width="{asset["width"]}" height="{asset["height"]}" '
+            f'style="{style}"></picture>'
+        )
+
+    @staticmethod
+    def create_image_link(url: str, image_html: str) -> str:
         """
         이미지 링크를 생성합니다.
 
         Args:
             url (str): 링크 URL
-            image_url (str): 이미지 URL
-            alt_text (str): 대체 텍스트
-            max_width (str): 최대 너비 (기본값: "70%")
+            image_html (str): 링크로 감쌀 이미지 HTML
 
         Returns:
             str: HTML 형식의 이미지 링크
         """
-        return f"""
-        <a href="{url}" target="_blank">
-            <img src="{image_url}"
-                 alt="{alt_text}"
-                 style="max-width: {max_width}; height: auto; border-radius: 10px;">
-        </a>
+        return f'<a href="{url}" target="_blank">{image_html}</a>'
+
+    @staticmethod
+    def render_cached_notice(cached_at: Optional[float]):
+        """
+        저장된 결과로 대신 응답한 경우 안내 문구를 렌더링합니다.
+
+        Args:
+            cached_at (Optional[float]): 저장된 답변의 저장 시각 (Unix 시간, None이면 렌더링하지 않음)
         """
+        if cached_at is not None:
+            st.caption(MESSAGES["cached_answer"].format(time=datetime.fromtimestamp(cached_at).strftime("%m월 %d일 %H:%M")))
 
     @staticmethod
     def render_table_header(columns: list, widths: list):
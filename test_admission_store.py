@@ -0,0 +1,95 @@
+"""
+학년도별 입결 데이터 저장소 테스트
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+# config는 처음 임포트될 때 백엔드를 정하므로, 같은 세션의 API 테스트와 마찬가지로 스텁 백엔드를 사용합니다
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+import pandas as pd
+
+from admission_store import AdmissionStore, admission_shard, format_years, shard_year
+
+ROWS = pd.DataFrame({
+    "대학명": ["서울대학교", "연세대학교", "서울대학교", "연세대학교", "서울대학교"],
+    "전형명": ["일반전형", "학생부종합", "지역균형전형", "학생부교과", "기회균형"],
+    "학과": ["컴퓨터공학부", "컴퓨터과학과", "사회복지학과", "사회복지학과", "컴퓨터공학부"],
+    "인원": [28, 11, 6, 5, 3],
+    "경쟁률": [7.39, 13.91, 3.0, 4.2, 11.33],
+    "충원순위": [1, 6, 0, 0, 0],
+    "50% 컷": [1.39, 1.33, 1.32, 1.71, None],
+    "70% 컷": [1.39, 1.36, 1.39, 2.33, None],
+})
+
+
+def _write_csv(directory: str, name: str, df: pd.DataFrame) -> Path:
+    path = Path(directory) / name
+    df.to_csv(path, index=False, encoding="cp949")
+    return path
+
+
+def test_ingest_and_query_partitions():
+    """학년도를 독립적으로 수집·교체하고, 조건에 맞는 파티션·학과만 읽는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = AdmissionStore(Path(directory) / "admission")
+        assert store.years() == []
+        assert store.query().empty
+
+        assert store.ingest(_write_csv(directory, "2023.csv", ROWS), 2023, chunk_rows=2) == len(ROWS)
+        assert store.ingest(_write_csv(directory, "2024.csv", ROWS.head(2)), 2024) == 2
+        assert store.years() == [2023, 2024]
+
+        result = store.query(years=[2023], universities=["서울대학교"], majors=["컴퓨터공학부"])
+        assert len(result) == 2
+        assert set(result["학년도"]) == {2023} and set(result["대학명"]) == {"서울대학교"}
+        assert store.query(majors=["컴퓨터과학과"], columns=["학년도"])["학년도"].tolist() == [2023, 2024]
+
+        # 같은 학년도를 다시 수집하면 그 학년도만 교체됩니다
+        store.ingest(_write_csv(directory, "2024b.csv", ROWS.tail(1)), 2024)
+        assert len(store.query(years=[2024])) == 1
+        assert len(store.query(years=[2023])) == len(ROWS)
+
+
+def test_iter_chunks_order():
+    """학년도 청크가 대학 파티션 순, 대학 안에서는 학과 순으로 읽히는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = AdmissionStore(Path(directory) / "admission")
+        store.ingest(_write_csv(directory, "2024.csv", ROWS), 2024)
+
+        chunks = list(store.iter_chunks(2024, chunk_rows=2))
+        assert sum(len(chunk) for chunk in chunks) == len(ROWS)
+        for university, group in pd.concat(chunks).groupby("대학명", sort=False):
+            assert group["학과"].tolist() == sorted(group["학과"])
+        assert list(store.iter_chunks(1999)) == []
+
+
+def test_year_shards_only_for_admission_questions():
+    """입결 질문만 학년도 샤드를 검색하고, 다른 질문은 학교·공통 샤드만 검색하는지 확인"""
+    from config import DEFAULT_SCHOOL, SHARED_SHARD
+    from utils import VectorStoreManager
+
+    for prompt_type in ("major_selection", "curriculum", None):
+        vectorstore = VectorStoreManager.get_school_vectorstore("", DEFAULT_SCHOOL, prompt_type=prompt_type)
+        assert [name for name, _ in vectorstore.shards] == [DEFAULT_SCHOOL, SHARED_SHARD]
+
+    vectorstore = VectorStoreManager.get_school_vectorstore("", DEFAULT_SCHOOL, years=[2024], prompt_type="admission_table")
+    assert [name for name, _ in vectorstore.shards] == [DEFAULT_SCHOOL, SHARED_SHARD, admission_shard(2024)]
+
+
+def test_shard_names():
+    """입결 샤드 이름과 학년도 표기"""
+    assert shard_year(admission_shard(2024)) == 2024
+    assert shard_year("경기고등학교") is None
+    assert format_years([2024]) == "2024"
+    assert format_years([2020, 2021, 2024]) == "2020~2024"
+
+
+if __name__ == "__main__":
+    test_ingest_and_query_partitions()
+    test_iter_chunks_order()
+    test_year_shards_only_for_admission_questions()
+    test_shard_names()
+    print("✅ 입결 데이터 저장소 테스트 통과")
@@ -0,0 +1,61 @@
+"""
+JSON API 테스트
+
+스텁 LLM·임베딩 백엔드로 앱을 띄우고 Starlette TestClient로 각 엔드포인트를 호출합니다.
+"""
+
+import os
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+from starlette.testclient import TestClient
+
+from api import create_app
+from config import TABLE_COLUMNS
+
+
+def test_api_endpoints():
+    """엔드포인트별 응답이 TABLE_COLUMNS 스키마를 따르는지 확인"""
+    client = TestClient(create_app(api_key="stub"))
+
+    assert client.get("/health").json() == {"status": "ok"}
+
+    cases = [
+        ("/v1/majors", {"job": "의사"}, "job"),
+        ("/v1/curriculum", {"major": "의예과", "grade": "고2"}, "curriculum"),
+        ("/v1/admission", {"major": "의예과"}, "admission"),
+    ]
+    for path, payload, table in cases:
+        response = client.post(path, json=payload)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["columns"] == TABLE_COLUMNS[table]
+        assert body["rows"]
+        assert all(list(row) == TABLE_COLUMNS[table] for row in body["rows"])
+        assert body["cached"] is False and body["cached_at"] is None
+
+    # 직업명 오타는 RAG 호출 전에 표준 직업명으로 교정됩니다
+    assert client.post("/v1/majors", json={"job": "사회복지새"}).json()["job"] == "사회복지사"
+    suggestions = client.get("/v1/jobs/complete", params={"q": "사회복"}).json()["suggestions"]
+    assert suggestions[0] == "사회복지사"
+
+    # 호출한 프롬프트 타입은 경로별 집계에 나타납니다
+    stats = client.get("/v1/routes").json()["stats"]
+    assert {"major_selection", "curriculum", "admission_table"} <= {row["prompt_type"] for row in stats}
+
+
+def test_api_validation():
+    """필수 필드 누락, 잘못된 학년, 미지원 학교, 없는 학년도는 422로 거부되는지 확인"""
+    client = TestClient(create_app(api_key="stub"))
+
+    assert client.post("/v1/majors", json={}).status_code == 422
+    assert client.post("/v1/curriculum", json={"major": "의예과", "grade": "중3"}).status_code == 422
+    assert client.post("/v1/admission", json={"major": "의예과", "school": "없는학교"}).status_code == 422
+    assert client.post("/v1/admission", json={"major": "의예과", "years": [1999]}).status_code == 422
+    assert client.post("/v1/majors", content=b"not json").status_code == 422
+
+
+if __name__ == "__main__":
+    test_api_endpoints()
+    test_api_validation()
+    print("✅ API 테스트 통과")
@@ -0,0 +1,86 @@
+"""
+OpenAI 호출 녹화/재생 테스트
+
+MockTransport를 실제 업스트림 대신 사용해 녹화한 카세트를 새 프로세스처럼 다시 열어
+같은 응답을 네트워크 없이 재생하는지, 기록에 없는 요청은 404로 응답하는지 확인합니다.
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from cassette import AsyncCassetteTransport, Cassette, CassetteTransport
+
+CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    """요청한 질문을 그대로 돌려주는 가짜 OpenAI 응답"""
+    body = json.loads(request.content)
+    return httpx.Response(200, json={"choices": [{"message": {"content": body["messages"][0]["content"]}}]})
+
+
+def test_record_then_replay():
+    """녹화한 응답을 키 순서·API 키와 무관하게 재생하고, 기록 당시 지연을 배율만큼 재현하는지 확인"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cassettes" / "openai.jsonl.gz"
+        payload = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "의예과 커리큘럼"}]}
+
+        calls = []
+
+        def upstream(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            time.sleep(0.05)
+            return _upstream(request)
+
+        recorder = httpx.Client(transport=CassetteTransport(Cassette(path), "record", inner=httpx.MockTransport(upstream)))
+        recorded = recorder.post(CHAT_URL, json=payload, headers={"Authorization": "Bearer sk-record"}).json()
+        assert len(calls) == 1 and path.exists()
+
+        # 새 프로세스처럼 파일에서 다시 읽고, 본문 키 순서와 API 키가 달라도 같은 요청으로 봅니다
+        cassette = Cassette(path)
+        assert len(cassette) == 1
+        player = httpx.Client(transport=CassetteTransport(cassette, "replay", latency_scale=0))
+        reordered = json.dumps({"messages": payload["messages"], "model": payload["model"]}, ensure_ascii=False)
+        response = player.post(CHAT_URL, content=reordered.encode("utf-8"), headers={"Authorization": "Bearer other"})
+        assert response.status_code == 200 and response.json() == recorded
+        assert len(calls) == 1
+
+        # 기록에 없는 요청은 404 (SDK는 재시도하지 않음)
+        missing = player.post(CHAT_URL, json={**payload, "model": "gpt-4o"})
+        assert missing.status_code == 404 and missing.json()["error"]["type"] == "cassette_miss"
+
+        # 비동기 전송 계층은 기록된 응답 시간을 배율만큼 재현합니다
+        async def replay_async():
+            async with httpx.AsyncClient(transport=AsyncCassetteTransport(cassette, "replay", latency_scale=1)) as client:
+                start = time.perf_counter()
+                response = await client.post(CHAT_URL, json=payload)
+                return response, time.perf_counter() - start
+
+        response, elapsed = asyncio.run(replay_async())
+        assert response.json() == recorded
+        assert elapsed >= 0.05
+
+
+def test_errors_are_not_recorded():
+    """업스트림 오류 응답은 카세트에 남기지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "openai.jsonl.gz"
+        transport = CassetteTransport(
+            Cassette(path),
+            "record",
+            inner=httpx.MockTransport(lambda request: httpx.Response(429, json={"error": {"message": "rate limit"}}))
+        )
+        response = httpx.Client(transport=transport).post(CHAT_URL, json={"model": "gpt-3.5-turbo"})
+        assert response.status_code == 429
+        assert not path.exists()
+
+
+if __name__ == "__main__":
+    test_record_then_replay()
+    test_errors_are_not_recorded()
+    print("✅ 카세트 녹화/재생 테스트 통과")
@@ -0,0 +1,123 @@
+"""
+회로 차단기와 마지막 정상 답변 저장소 테스트
+
+가짜 시계로 회로 상태 전환을, 실패하도록 전환할 수 있는 스텁 모델로 업스트림 장애 시
+저장된 답변으로 대신 응답하는지 확인합니다.
+"""
+
+import os
+import time
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+from langchain.vectorstores import FAISS
+
+from answer_store import AnswerStore, answer_scope
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from rag_service import RAGService
+from stub_backends import StubChatModel, StubEmbeddings
+
+
+class FakeClock:
+    """수동으로 움직이는 단조 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_transitions():
+    """연속 실패로 열리고, 재설정 시간이 지나면 한 요청만 시험 호출하며, 결과에 따라 닫히거나 다시 열리는지 확인"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # 시험 호출은 하나만
+    breaker.record_failure()
+    assert breaker.state == OPEN  # 시험 호출 실패는 곧바로 다시 open
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_answer_store():
+    """같은 키는 덮어쓰고, 질문 앞뒤 공백은 무시하는지 확인"""
+    store = AnswerStore(None)
+    assert store.get("default", "curriculum", "질문") is None
+
+    store.put("default", "curriculum", "질문", "v1", "이전 답변")
+    store.put("default", "curriculum", " 질문 ", "v2", "새 답변")
+    stored = store.get("default", "curriculum", "질문")
+    assert (stored.answer, stored.version) == ("새 답변", "v2")
+    assert store.get("other", "curriculum", "질문") is None
+
+
+class FlakyChatModel(StubChatModel):
+    """failing이 True인 동안 호출마다 예외를 일으키는 스텁 모델"""
+
+    failing: bool = False
+
+    def _sample_latency(self) -> float:
+        if self.failing:
+            raise ConnectionError("upstream unavailable")
+        return 0.0
+
+
+def test_serves_stored_answer_on_outage():
+    """업스트림 장애 시 저장된 답변으로 대신 응답하고, 회로가 열리면 호출을 보내지 않는지 확인"""
+    vectorstore = FAISS.from_texts(["컴퓨터공학과 커리큘럼"], StubEmbeddings(dimension=32))
+    llm = FlakyChatModel()
+    breakers = {name: CircuitBreaker(name, failure_threshold=2, reset_seconds=60) for name in ("llm", "embedding")}
+    store = AnswerStore(None)
+    service = RAGService(
+        llm_factory=lambda api_key, route: llm,
+        cache_size=0,
+        semantic_cache=None,
+        answer_store=store,
+        breakers=breakers
+    )
+
+    def ask(question: str):
+        return service.submit(service.aanswer(vectorstore, "curriculum", question, "stub")).result()
+
+    fresh = ask("컴퓨터공학과 커리큘럼")
+    assert not fresh.cached
+
+    # 저장은 백그라운드에서 이루어집니다
+    deadline = time.monotonic() + 2
+    while store.get(answer_scope(vectorstore), "curriculum", "컴퓨터공학과 커리큘럼") is None:
+        assert time.monotonic() < deadline, "정상 답변이 저장되지 않았습니다"
+        time.sleep(0.01)
+
+    # 의미 기반 캐시를 끄고 업스트림을 다시 호출하게 합니다
+    service.semantic_cache = None
+    llm.failing = True
+    for _ in range(2):
+        fallback = ask("컴퓨터공학과 커리큘럼")
+        assert fallback.cached and fallback.text == fresh.text
+    assert breakers["llm"].state == OPEN
+
+    # 회로가 열린 동안 저장된 답변이 없는 질문은 업스트림을 호출하지 않고 실패합니다
+    try:
+        ask("저장된 적 없는 질문")
+        raise AssertionError("회로가 열려 있는데 CircuitOpenError가 발생하지 않았습니다")
+    except CircuitOpenError:
+        pass
+
+
+if __name__ == "__main__":
+    test_breaker_transitions()
+    test_answer_store()
+    test_serves_stored_answer_on_outage()
+    print("✅ 회로 차단기 테스트 통과")
@@ -0,0 +1,101 @@
+"""
+코퍼스 압축 테스트
+
+추천 학과만 다른 직업 문서가 하나로 합쳐지고, 거의 같은 문서는 제거되며, 서로 다른 문서는 순서대로 남는지 확인합니다.
+"""
+
+import os
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+import pandas as pd
+from langchain.docstore.document import Document
+
+from config import ENCODINGS, SCHOOL_CURRICULUM_CSVS, SHARED_SHARD
+from corpus_compactor import CorpusCompactor
+from utils import DocumentProcessor, VectorStoreManager
+
+ADMISSION_TEXT = (
+    "2024학년도 컴퓨터공학과의 입결정보는 다음과 같습니다. 서울대학교 컴퓨터공학과는 지역균형으로 10명을 선발했고, "
+    "경쟁률은 5.2입니다. 50%컷은 1.2, 70%컷은 1.4입니다. 연세대학교 컴퓨터공학과는 학생부종합으로 20명을 선발했고, "
+    "경쟁률은 8.1입니다. 50%컷은 1.5, 70%컷은 1.7입니다."
+)
+
+
+def admission(text: str, major: str) -> Document:
+    return Document(page_content=text, metadata={"type": "admission", "학과": major, "year": 2024})
+
+
+def test_job_rows_are_merged():
+    """학과 정보 CSV의 직업별 행이 추천 학과를 모두 나열한 문서 하나로 합쳐지는지 확인"""
+    documents = list(VectorStoreManager.iter_documents(SHARED_SHARD))
+    jobs = [document.metadata["직업"] for document in documents]
+    assert len(jobs) == len(set(jobs)) == 3
+
+    sports = next(document for document in documents if document.metadata["직업"] == "스포츠해설가")
+    assert sports.metadata["학과"] == "체육학과, 체육교육과"
+    assert sports.page_content.endswith("추천하는 학과는 체육학과, 체육교육과입니다.")
+
+    welfare = next(document for document in documents if document.metadata["직업"] == "사회복지사")
+    assert welfare.metadata["학과"].count(",") == 2
+
+
+def test_near_duplicates_are_dropped():
+    """본문이 거의 같은 같은 종류 문서는 나중 것이 제거되고, 다른 학년도·다른 내용의 문서는 남는지 확인"""
+    compactor = CorpusCompactor(mergers={"job": DocumentProcessor.merge_job_documents})
+    other_year = Document(page_content=ADMISSION_TEXT.replace("2024", "2025"),
+                          metadata={"type": "admission", "학과": "컴퓨터공학과", "year": 2025})
+    documents = [
+        admission(ADMISSION_TEXT, "컴퓨터공학과"),
+        DocumentProcessor.job_document("간호사", "보건", "간호학과"),
+        # 같은 입결을 공백과 마침표만 다르게 다시 내보낸 문서
+        admission(ADMISSION_TEXT.replace("2024학년도 ", "2024학년도  ").rstrip("."), "컴퓨터공학과"),
+        other_year,
+        admission("2024학년도 간호학과의 입결정보는 다음과 같습니다. 서울대학교 간호학과는 지역균형으로 5명을 선발했습니다.", "간호학과"),
+    ]
+
+    kept = list(compactor.compact(documents))
+    assert [document.metadata["학과"] for document in kept] == ["컴퓨터공학과", "간호학과", "컴퓨터공학과", "간호학과"]
+    assert kept[2].metadata["year"] == 2025
+    assert compactor.stats.deduplicated == 1
+    assert compactor.stats.output_documents == 4
+
+
+def test_school_shard_keeps_every_major():
+    """본문 대부분이 같은 다른 학과(체육학과/체육교육과 등)의 커리큘럼이 학교 샤드에서 하나도 빠지지 않는지 확인"""
+    for school, path in SCHOOL_CURRICULUM_CSVS.items():
+        majors = set(pd.read_csv(path, encoding=ENCODINGS["curriculum"])["학과"].dropna())
+        vectorstore = VectorStoreManager.build_vectorstore("", shard=school)
+        documents = [vectorstore.docstore.search(vectorstore.index_to_docstore_id[i]) for i in range(vectorstore.index.ntotal)]
+
+        entities = {(document.metadata["school"], document.metadata["학과"]) for document in documents}
+        assert entities == {(school, major) for major in majors}
+        assert len(documents) == len(majors)
+
+
+def test_only_contiguous_entities_merge():
+    """같은 엔터티라도 떨어져 있으면 합치지 않고, 메타데이터가 없는 문서는 그대로 지나가는지 확인"""
+    compactor = CorpusCompactor(threshold=2.0)
+    documents = [
+        DocumentProcessor.job_document("스포츠해설가", "방송", "체육학과"),
+        DocumentProcessor.job_document("스포츠해설가", "방송", "체육교육과"),
+        Document(page_content="메타데이터 없는 문서"),
+        Document(page_content="메타데이터 없는 문서"),
+        DocumentProcessor.job_document("스포츠해설가", "방송", "체육학과"),
+    ]
+
+    kept = list(compactor.compact(documents))
+    assert len(kept) == 4
+    # 합치기 함수가 없으면 서로 다른 본문을 이어 붙이고 학과는 합집합이 됩니다
+    assert kept[0].metadata["학과"] == "체육학과, 체육교육과"
+    assert kept[0].page_content.count("스포츠해설가") == 2
+    assert kept[3].metadata["학과"] == "체육학과"
+    assert compactor.stats.merged == 1
+
+
+if __name__ == "__main__":
+    test_job_rows_are_merged()
+    test_near_duplicates_are_dropped()
+    test_school_shard_keeps_every_major()
+    test_only_contiguous_entities_merge()
+    print("✅ 코퍼스 압축 테스트 통과")
@@ -24,7 +24,7 @@ def test_imports():
 
     # prompts.py 테스트
     try:
-        from prompts import PromptTemplates
+        from prompts import PromptRegistry, PromptTemplates
         print("✅ prompts.py 임포트 성공")
         tests_passed += 1
     except Exception as e:
@@ -56,12 +56,203 @@ def test_imports():
         print(f"❌ utils.py 임포트 실패: {e}")
         tests_failed += 1
 
+    # rag_service.py 테스트
+    try:
+        from rag_service import RAGService, AsyncLRUCache
+        print("✅ rag_service.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ rag_service.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # stub_backends.py 테스트
+    try:
+        from stub_backends import StubChatModel, StubEmbeddings
+        print("✅ stub_backends.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ stub_backends.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # tracing.py 테스트
+    try:
+        from tracing import Tracer, tracer, traced
+        print("✅ tracing.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ tracing.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # metrics.py 테스트
+    try:
+        from metrics import start_metrics_server, record_llm_call
+        print("✅ metrics.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ metrics.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # index_store.py 테스트
+    try:
+        from index_store import CompactDocstore, IndexStore, MmapDocstore, MmapDocstoreWriter
+        print("✅ index_store.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ index_store.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # corpus_compactor.py 테스트
+    try:
+        from corpus_compactor import CorpusCompactor
+        print("✅ corpus_compactor.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ corpus_compactor.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # ann_index.py 테스트
+    try:
+        from ann_index import AnnIndexFactory, IncrementalIndexBuilder
+        print("✅ ann_index.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ ann_index.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # admission_store.py 테스트
+    try:
+        from admission_store import AdmissionStore, get_admission_store
+        print("✅ admission_store.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ admission_store.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # model_router.py 테스트
+    try:
+        from model_router import ModelRoute, ModelRouter
+        print("✅ model_router.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ model_router.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # cassette.py 테스트
+    try:
+        from cassette import Cassette, CassetteTransport, openai_clients
+        print("✅ cassette.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ cassette.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # plan_store.py 테스트
+    try:
+        from plan_store import PlanStore, get_plan_store
+        print("✅ plan_store.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ plan_store.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # circuit_breaker.py 테스트
+    try:
+        from circuit_breaker import CircuitBreaker, CircuitOpenError
+        print("✅ circuit_breaker.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ circuit_breaker.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # answer_store.py 테스트
+    try:
+        from answer_store import AnswerStore, answer_scope
+        print("✅ answer_store.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ answer_store.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # major_graph.py 테스트
+    try:
+        from major_graph import MajorGraph, similar_majors
+        print("✅ major_graph.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ major_graph.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # job_index.py 테스트
+    try:
+        from job_index import JobNameIndex, get_job_index
+        print("✅ job_index.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ job_index.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # semantic_cache.py 테스트
+    try:
+        from semantic_cache import SemanticCache
+        print("✅ semantic_cache.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ semantic_cache.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # retrieval_batcher.py 테스트
+    try:
+        from retrieval_batcher import MicroBatcher, RetrievalBatcher
+        print("✅ retrieval_batcher.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ retrieval_batcher.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # shard_store.py 테스트
+    try:
+        from shard_store import ShardCache, ShardedVectorStore
+        print("✅ shard_store.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ shard_store.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # assets.py 테스트
+    try:
+        from assets import AssetPipeline, get_asset
+        print("✅ assets.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ assets.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # roster.py 테스트
+    try:
+        from roster import BatchPlanner, PlanWriter, RosterLoader
+        print("✅ roster.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ roster.py 임포트 실패: {e}")
+        tests_failed += 1
+
+    # api.py 테스트
+    try:
+        from api import create_app
+        print("✅ api.py 임포트 성공")
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ api.py 임포트 실패: {e}")
+        tests_failed += 1
+
     # pages 모듈 테스트
     try:
         from pages import (
             render_home_page,
             render_major_selection_page,
-            render_curriculum_page
+            render_curriculum_page,
+            render_batch_page,
+            render_trace_panel
         )
         print("✅ pages 모듈 임포트 성공")
         tests_passed += 1
@@ -0,0 +1,179 @@
+"""
+스트리밍 색인 테스트
+"""
+
+import logging
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from langchain.docstore.document import Document
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.vectorstores import FAISS
+
+from ann_index import AnnIndexFactory
+from config import VECTOR_INDEX_PARAMS
+import index_store
+from index_store import CompactDocstore, IndexStore
+from stub_backends import StubEmbeddings
+from utils import DocumentProcessor
+
+ADMISSION = pd.DataFrame({
+    "대학명": ["서울대학교", "연세대학교", "고려대학교", "서울대학교", "연세대학교"],
+    "전형명": ["지역균형", "학생부종합", "학생부교과", "기회균형", "논술"],
+    "학과": ["컴퓨터공학과", "컴퓨터공학과", "컴퓨터공학과", "사회복지학과", None],
+    "인원": [10, 20, 15, 3, 5],
+    "경쟁률": [5.2, 8.1, 6.0, 3.3, 40.5],
+    "충원순위": [1, 2, 3, 0, 1],
+    "50% 컷": [1.2, 1.5, 1.8, 2.0, 2.2],
+    "70% 컷": [1.4, 1.7, 2.0, 2.3, 2.5],
+})
+
+
+def test_chunked_texts_match_whole_file():
+    """청크 경계에 걸친 학과도 파일 전체를 한 번에 변환한 것과 같은 문서가 되는지 확인"""
+    whole = DocumentProcessor.create_admission_texts(ADMISSION)
+    for chunk_rows in (1, 2, 4):
+        chunks = (ADMISSION.iloc[i:i + chunk_rows] for i in range(0, len(ADMISSION), chunk_rows))
+        assert list(DocumentProcessor.iter_admission_texts(chunks)) == whole
+
+    assert len(whole) == 2  # 학과가 빈 행은 제외
+    assert whole[0].count("컴퓨터공학과는") == 3
+
+
+def test_publish_stream_matches_publish():
+    """배치 단위 스트리밍 게시가 메모리 구축 후 게시한 것과 같은 버전·검색 결과를 내는지 확인"""
+    embeddings = StubEmbeddings(dimension=32)
+    texts = [f"{major} 관련 문서 {i}" for i in range(120) for major in ("컴퓨터공학과", "사회복지학과")]
+    params = {**VECTOR_INDEX_PARAMS, "ivf_nlist": 4, "ivf_nprobe": 4, "train_sample_size": 100}
+
+    with tempfile.TemporaryDirectory() as root:
+        vectors = np.array(embeddings.embed_documents(texts), dtype=np.float32)
+        vectorstore = FAISS(
+            embedding_function=embeddings,
+            index=AnnIndexFactory.build(vectors, "ivf_flat", params),
+            docstore=InMemoryDocstore({str(i): Document(page_content=text) for i, text in enumerate(texts)}),
+            index_to_docstore_id={i: str(i) for i in range(len(texts))}
+        )
+        in_memory = IndexStore(Path(root) / "in_memory")
+        streamed = IndexStore(Path(root) / "streamed")
+        in_memory_version = in_memory.publish(vectorstore)
+        streamed_version = streamed.publish_stream(iter(texts), embeddings, batch_size=16, index_type="ivf_flat", params=params)
+
+        assert in_memory_version.split("-")[1] == streamed_version.split("-")[1]
+        loaded = streamed.load(embeddings)
+        assert loaded.index.ntotal == len(texts)
+        assert loaded.docstore.search("17").page_content == texts[17]
+        assert loaded.similarity_search(texts[5], k=1)[0].page_content == texts[5]
+
+
+def test_compact_docstore_metadata():
+    """메모리·mmap 문서 저장소 모두 본문과 메타데이터 열을 그대로 복원하고, 메타데이터가 버전에 반영되는지 확인"""
+    documents = list(DocumentProcessor.iter_admission_documents([ADMISSION.assign(학년도=2024)]))
+    documents.append(Document(page_content="컴퓨터공학과 커리큘럼", metadata={"type": "curriculum", "학과": "컴퓨터공학과",
+                                                                       "school": "경기고등학교", "page": 3}))
+    documents.append(Document(page_content="메타데이터 없는 문서"))
+
+    in_memory = CompactDocstore.from_documents(documents)
+    assert len(in_memory) == len(documents)
+    assert in_memory.search("0").metadata == {
+        "type": "admission", "학과": "컴퓨터공학과", "대학": "서울대학교, 연세대학교, 고려대학교", "year": 2024
+    }
+    # 보관하지 않는 키(page)와 빈 값은 복원하지 않습니다
+    assert in_memory.search("2").metadata == {"type": "curriculum", "학과": "컴퓨터공학과", "school": "경기고등학교"}
+    assert in_memory.search("3") == Document(page_content="메타데이터 없는 문서")
+    assert in_memory.search("4") == "ID 4 not found."
+    # 읽기 전용 저장소는 추가·삭제 시 새 버전을 게시하라는 오류를 냅니다
+    for mutate in (lambda: in_memory.add({"5": documents[0]}), lambda: in_memory.delete(["0"])):
+        try:
+            mutate()
+            raise AssertionError("읽기 전용 문서 저장소가 변경을 허용했습니다")
+        except TypeError as e:
+            assert "읽기 전용" in str(e) and "publish_stream" in str(e)
+
+    embeddings = StubEmbeddings(dimension=32)
+    with tempfile.TemporaryDirectory() as root:
+        store = IndexStore(Path(root))
+        version = store.publish_stream(iter(documents), embeddings, index_type="flat")
+        loaded = store.load(embeddings)
+        for i, document in enumerate(documents):
+            assert loaded.docstore.search(str(i)) == in_memory.search(str(i))
+
+        plain = store.publish_stream(iter(document.page_content for document in documents), embeddings, index_type="flat")
+        assert plain.split("-")[1] != version.split("-")[1]
+
+
+def test_republish_reuses_version():
+    """같은 내용·인덱스 구성을 다시 게시하면 새 버전을 만들지 않고 기존 버전으로 current를 되돌리는지 확인"""
+    embeddings = StubEmbeddings(dimension=32)
+    texts = [f"{major} 관련 문서 {i}" for i in range(40) for major in ("컴퓨터공학과", "사회복지학과")]
+
+    with tempfile.TemporaryDirectory() as root:
+        store = IndexStore(Path(root))
+        first = store.publish_stream(iter(texts), embeddings, batch_size=16, index_type="flat")
+        other = store.publish_stream(iter(texts[:10]), embeddings, index_type="flat")
+        assert store.current_version() == other != first
+
+        again = store.publish_stream(iter(texts), embeddings, batch_size=7, index_type="flat")
+        assert again == first
+        assert store.current_version() == first
+
+        loaded = store.load(embeddings)
+        assert store.publish(loaded) == first
+        # 인덱스 구성이 다르면 내용이 같아도 새 버전입니다
+        assert store.publish_stream(iter(texts), embeddings, index_type="hnsw") != first
+        assert sorted(path.name for path in store.versions_dir.iterdir() if path.name.startswith(".")) == []
+        assert len(list(store.versions_dir.iterdir())) == 3
+
+
+def test_same_second_versions_do_not_collide():
+    """같은 초에 같은 문서를 다른 인덱스 구성으로 게시해도 rename이 실패하지 않는지 확인"""
+    embeddings = StubEmbeddings(dimension=32)
+    texts = [f"학과 문서 {i}" for i in range(30)]
+    clock = index_store.time
+    index_store.time = SimpleNamespace(strftime=lambda fmt: "20240101000000")
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            store = IndexStore(Path(root))
+            flat = store.publish_stream(iter(texts), embeddings, index_type="flat")
+            hnsw = store.publish_stream(iter(texts), embeddings, index_type="hnsw")
+            assert hnsw.startswith(f"{flat}-")
+            assert store.publish_stream(iter(texts), embeddings, index_type="hnsw") == hnsw
+            assert store.load(embeddings).index.ntotal == len(texts)
+    finally:
+        index_store.time = clock
+
+
+def test_index_downgrade_is_logged():
+    """학습 표본이 부족해 IVF-PQ를 IVF-Flat으로 대체하면 경고를 남기고, 그대로 쓰면 남기지 않는지 확인"""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("ann_index")
+    logger.addHandler(handler)
+    try:
+        params = AnnIndexFactory.resolve_params("ivf_pq", 2000, 32, VECTOR_INDEX_PARAMS)
+        assert params["index_type"] == "ivf_flat"
+        assert len(records) == 1 and records[0].levelno == logging.WARNING
+        assert "ivf_pq" in records[0].getMessage() and "ivf_flat" in records[0].getMessage()
+
+        index = AnnIndexFactory.build(np.random.default_rng(0).random((2000, 32), dtype=np.float32), "ivf_pq", VECTOR_INDEX_PARAMS)
+        assert AnnIndexFactory.describe(index)["class"] == "IndexIVFFlat"
+
+        records.clear()
+        assert AnnIndexFactory.resolve_params("hnsw", 2000, 32, VECTOR_INDEX_PARAMS)["index_type"] == "hnsw"
+        assert not records
+    finally:
+        logger.removeHandler(handler)
+
+
+if __name__ == "__main__":
+    test_chunked_texts_match_whole_file()
+    test_publish_stream_matches_publish()
+    test_republish_reuses_version()
+    test_same_second_versions_do_not_collide()
+    test_compact_docstore_metadata()
+    test_index_downgrade_is_logged()
+    print("✅ 스트리밍 색인 테스트 통과")
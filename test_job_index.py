@@ -0,0 +1,48 @@
+"""
+직업명 자동완성·교정 인덱스 테스트
+"""
+
+from job_index import JobNameIndex, choseong, decompose
+
+NAMES = ["소프트웨어 개발자", "시스템소프트웨어개발자", "사회복지사", "데이터 과학자", "의사", "교사", "변호사"]
+
+
+def test_jamo_decomposition():
+    """음절을 자모와 초성으로 분해하고 공백·구두점은 무시하는지 확인"""
+    assert decompose("교사") == "ㄱㅛㅅㅏ"
+    assert decompose("데이터 과학자") == decompose("데이터과학자")
+    assert choseong("사회복지사") == "ㅅㅎㅂㅈㅅ"
+
+
+def test_complete_and_resolve():
+    """접두어·초성·조합 중 입력 자동완성과 오타 교정을 확인"""
+    index = JobNameIndex(NAMES + ["의사"])
+    assert len(index) == len(NAMES)
+
+    assert index.complete("사회")[0] == "사회복지사"
+    assert index.complete("ㅅㅎㅂ")[0] == "사회복지사"
+    assert index.complete("변호ㅅ")[0] == "변호사"
+    assert set(index.complete("개발자")[:2]) == {"소프트웨어 개발자", "시스템소프트웨어개발자"}
+
+    assert index.resolve("데이터과학자") == ("데이터 과학자", 1.0)
+    assert index.resolve("사회복지새")[0] == "사회복지사"
+    assert index.resolve("데이타 과학자")[0] == "데이터 과학자"
+
+    # 부분 문자열이나 전혀 다른 직업은 임의로 교정하지 않습니다
+    assert index.resolve("개발자") is None
+    assert index.resolve("요리사") is None
+
+    # 두 글자 직업명은 한 자모 차이도 다른 직업이므로 교정하지 않고 제안만 합니다
+    assert index.resolve("교수") is None
+    assert "교사" in index.suggest("교수")
+    assert index.resolve("으사") is None
+    assert "의사" in index.suggest("으사")
+
+    # 세 글자 이상이라도 자모가 두 개 이상 다르면 교정하지 않습니다
+    assert index.resolve("사회복재새") is None
+
+
+if __name__ == "__main__":
+    test_jamo_decomposition()
+    test_complete_and_resolve()
+    print("✅ 직업명 인덱스 테스트 통과")
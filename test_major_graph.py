@@ -0,0 +1,34 @@
+"""
+학과 유사도 그래프 테스트
+"""
+
+import numpy as np
+
+from major_graph import MajorGraph, major_tokens
+
+MAJORS = ["컴퓨터공학과", "컴퓨터공학부", "컴퓨터과학과", "사회복지학과", "사회복지상담과", "체육교육과"]
+
+
+def test_major_tokens():
+    """학과 단위 명칭을 빼고 음절 바이그램으로 나누는지 확인"""
+    assert major_tokens("컴퓨터공학과") == {"컴퓨", "퓨터", "터공", "공학"}
+    assert major_tokens("컴퓨터공학부") == major_tokens("컴퓨터공학과")
+
+
+def test_blocked_compute_matches_full():
+    """블록 계산 결과가 한 번에 계산한 결과와 같고, 토큰이 겹치는 학과가 이웃이 되는지 확인"""
+    embeddings = np.random.default_rng(0).standard_normal((len(MAJORS), 16)).astype(np.float32)
+
+    full = MajorGraph.compute(MAJORS, embeddings, top_k=2, embedding_weight=0.0, min_score=0.1, block_size=len(MAJORS))
+    blocked = MajorGraph.compute(MAJORS, embeddings, top_k=2, embedding_weight=0.0, min_score=0.1, block_size=2)
+
+    assert full.neighbors == blocked.neighbors
+    assert full.similar("컴퓨터공학과", 1) == ["컴퓨터공학부"]
+    assert set(full.similar("사회복지학과")) == {"사회복지상담과"}
+    assert full.similar("없는학과") == []
+
+
+if __name__ == "__main__":
+    test_major_tokens()
+    test_blocked_compute_matches_full()
+    print("✅ 학과 유사도 그래프 테스트 통과")
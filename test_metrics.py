@@ -0,0 +1,87 @@
+"""
+메트릭 엔드포인트 테스트
+
+사이드카 HTTP 서버를 임의 포트로 띄우고 /metrics를 직접 스크랩하여 확인합니다.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import urllib.request
+
+from prometheus_client import REGISTRY
+
+from metrics import _bind_server, record_llm_call, record_script_run, start_metrics_server
+from utils import TableParser
+
+
+def test_metrics_scrape():
+    """기록한 메트릭이 Prometheus 텍스트 형식으로 노출되는지 확인"""
+    port = start_metrics_server(port=0, addr="127.0.0.1")
+    assert port is not None
+
+    # 같은 프로세스의 다른 테스트가 남긴 값과 무관하도록 기록 전 값을 기준으로 비교합니다
+    labels = {"kind": "prompt", "prompt_type": "curriculum"}
+    tokens_before = REGISTRY.get_sample_value("dreamcourse_llm_tokens_total", labels) or 0.0
+
+    record_script_run("test-session", "Home")
+    record_llm_call("curriculum", "stub", 0.3, prompt_tokens=120, completion_tokens=40)
+    TableParser.parse_table_response("표가 없는 응답", ["a", "b"])
+    TableParser.parse_table_response("| a | b |\n|---|---|\n| 1 | 2 | 3 |", ["a", "b"])
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+        body = response.read().decode("utf-8")
+
+    assert 'dreamcourse_script_runs_total{page="Home"}' in body
+    assert "dreamcourse_active_sessions" in body
+    assert 'dreamcourse_llm_latency_seconds_count{model="stub",prompt_type="curriculum"}' in body
+    assert f'dreamcourse_llm_tokens_total{{kind="prompt",prompt_type="curriculum"}} {tokens_before + 120}' in body
+    assert 'dreamcourse_table_parse_failures_total{reason="no_table"}' in body
+    assert 'dreamcourse_table_parse_failures_total{reason="column_mismatch"}' in body
+
+
+def test_busy_port_falls_back():
+    """포트가 사용 중이면 다음 포트에서 노출하는지 확인"""
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+
+        assert _bind_server(port, "127.0.0.1", REGISTRY, span=1) is None
+        server = _bind_server(port, "127.0.0.1", REGISTRY, span=8)
+        assert server is not None
+        try:
+            assert port < server.server_port < port + 8
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_multiprocess_metrics():
+    """PROMETHEUS_MULTIPROC_DIR를 설정하면 여러 프로세스의 값이 한 포트에서 합쳐지는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": directory}
+        worker = "from metrics import record_script_run; record_script_run('s', 'Home')"
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+
+        exporter = (
+            "import urllib.request\n"
+            "from metrics import start_metrics_server\n"
+            "port = start_metrics_server(port=0, addr='127.0.0.1')\n"
+            "print(urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5).read().decode())\n"
+        )
+        body = subprocess.run(
+            [sys.executable, "-c", exporter], env=env, check=True, capture_output=True, text=True
+        ).stdout
+
+    assert 'dreamcourse_script_runs_total{page="Home"} 2.0' in body
+
+
+if __name__ == "__main__":
+    test_metrics_scrape()
+    test_busy_port_falls_back()
+    test_multiprocess_metrics()
+    print("✅ 메트릭 스크랩 테스트 통과")
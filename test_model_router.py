@@ -0,0 +1,138 @@
+"""
+모델 라우팅 테스트
+
+응답을 max_tokens에서 잘라 내는 스텁 모델로 테이블 검증 실패 시 상위 모델 재호출과 경로별 집계를,
+호출마다 지연 시간을 정해 둔 스텁 모델로 마감 시간과 헤지 요청을 확인합니다.
+"""
+
+import os
+import time
+from typing import List
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+from langchain.vectorstores import FAISS
+
+from config import LLM_HEDGE_MIN_SAMPLES, TABLE_COLUMNS
+from model_router import HedgeBudget, ModelRouter
+from rag_service import RAGService
+from stub_backends import StubChatModel, StubEmbeddings
+from utils import TableParser
+
+ROUTES = {
+    "major_selection": {"model": "small", "max_tokens": 512, "timeout": 10, "table": "job"},
+    # 커리큘럼 테이블이 잘리도록 최대 토큰 수를 작게 설정
+    "curriculum": {"model": "small", "max_tokens": 60, "timeout": 10, "table": "curriculum"},
+}
+ESCALATION = {"model": "large", "max_tokens": 2048, "timeout": 30}
+PRICES = {"small": (1.0, 2.0), "large": (10.0, 20.0)}
+
+
+def test_route_and_escalation_rules():
+    """경로 조회, 상위 경로 생성, 비용 계산 규칙 확인"""
+    router = ModelRouter(ROUTES, ESCALATION, PRICES)
+
+    route = router.route("curriculum")
+    assert (route.model, route.max_tokens, route.table) == ("small", 60, "curriculum")
+    assert router.route("unknown").table is None
+
+    escalation = router.escalate(route)
+    assert (escalation.model, escalation.max_tokens, escalation.table) == ("large", 2048, "curriculum")
+    assert router.escalate(escalation) is None  # 한 번만 재호출
+    assert ModelRouter(ROUTES, {"model": ""}, PRICES).escalate(route) is None
+
+    assert router.cost("small", 1_000_000, 500_000) == 2.0
+    assert router.cost("unpriced", 1000, 1000) == 0.0
+
+
+def test_validate_table():
+    """빈 응답과 열 수가 다른 응답을 구분하는지 확인"""
+    columns = ["a", "b"]
+    assert TableParser.validate_table("| a | b |\n|---|---|\n| 1 | 2 |", columns) is None
+    assert TableParser.validate_table("표가 없는 응답", columns) == "no_table"
+    assert TableParser.validate_table("| a | b |\n|---|---|\n| 1 | 2 | 3 |", columns) == "column_mismatch"
+
+
+def test_escalates_only_on_invalid_table():
+    """잘린 커리큘럼 응답만 상위 모델로 재호출하고, 경로별 지연 시간·비용이 집계되는지 확인"""
+    router = ModelRouter(ROUTES, ESCALATION, PRICES)
+    service = RAGService(
+        llm_factory=lambda api_key, route: StubChatModel(model_name=route.model, max_tokens=route.max_tokens),
+        semantic_cache=None,
+        router=router
+    )
+    embeddings = StubEmbeddings(dimension=32)
+    vectorstore = FAISS.from_texts(["컴퓨터공학과 커리큘럼", "소프트웨어 개발자 직업 정보"], embeddings)
+
+    curriculum = service.submit(service.aquery(vectorstore, "curriculum", "컴퓨터공학과 커리큘럼", "stub")).result()
+    job = service.submit(service.aquery(vectorstore, "major_selection", "소프트웨어 개발자", "stub")).result()
+    assert TableParser.validate_table(curriculum, TABLE_COLUMNS["curriculum"]) is None
+    assert TableParser.validate_table(job, TABLE_COLUMNS["job"]) is None
+
+    stats = {(row["prompt_type"], row["model"]): row for row in router.stats.snapshot()}
+    assert stats[("curriculum", "small")]["escalations"] == 1
+    assert stats[("curriculum", "large")]["calls"] == 1
+    assert stats[("major_selection", "small")]["escalations"] == 0
+    assert ("major_selection", "large") not in stats
+    assert stats[("curriculum", "large")]["cost_usd"] > stats[("curriculum", "small")]["cost_usd"] > 0
+    assert stats[("curriculum", "small")]["p95_seconds"] >= stats[("curriculum", "small")]["p50_seconds"] >= 0
+
+
+class ScriptedChatModel(StubChatModel):
+    """호출 순서대로 정해 둔 지연 시간(초)으로 응답하는 스텁 모델"""
+
+    latencies: List[float] = []
+    calls: int = 0
+
+    def _sample_latency(self) -> float:
+        self.calls += 1
+        return self.latencies[min(self.calls, len(self.latencies)) - 1]
+
+
+def _hedging_router(timeout: float, balance: float) -> ModelRouter:
+    """p95가 약 10ms로 관측된 curriculum 경로와 balance만큼 적립된 헤지 예산을 가진 라우터"""
+    routes = {"curriculum": {"model": "small", "timeout": timeout, "table": "curriculum", "hedge": True}}
+    router = ModelRouter(routes, {"model": ""}, PRICES, hedging=True, hedge_budget=HedgeBudget(ratio=0.0, burst=10))
+    router.hedge_budget.balance = balance
+    for _ in range(LLM_HEDGE_MIN_SAMPLES):
+        router.stats.record_call(router.route("curriculum"), 0.01, 10, 10, 0.0)
+    return router
+
+
+def test_hedged_request_and_deadline():
+    """p95를 넘긴 요청은 헤지 응답으로 끝나고, 예산이 없으면 헤지하지 않으며, 마감 시간을 넘기면 TimeoutError"""
+    vectorstore = FAISS.from_texts(["컴퓨터공학과 커리큘럼"], StubEmbeddings(dimension=32))
+
+    def run(router: ModelRouter, latencies: List[float]) -> float:
+        llm = ScriptedChatModel(latencies=latencies)
+        service = RAGService(llm_factory=lambda api_key, route: llm, semantic_cache=None, router=router)
+        start = time.perf_counter()
+        service.submit(service.aquery(vectorstore, "curriculum", "컴퓨터공학과 커리큘럼", "stub")).result()
+        return time.perf_counter() - start
+
+    # 원래 요청은 1초, 헤지 요청은 즉시 응답
+    router = _hedging_router(timeout=5, balance=1)
+    assert run(router, [1.0, 0.0]) < 0.5
+    stats = router.stats.snapshot()[0]
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+    # 예산이 없으면 원래 요청을 끝까지 기다립니다
+    router = _hedging_router(timeout=5, balance=0)
+    assert run(router, [0.3, 0.0]) >= 0.3
+    assert router.stats.snapshot()[0]["hedges"] == 0
+
+    router = _hedging_router(timeout=0.1, balance=0)
+    try:
+        run(router, [1.0])
+        raise AssertionError("마감 시간을 넘긴 호출이 TimeoutError 없이 끝났습니다")
+    except TimeoutError:
+        pass
+    assert router.stats.snapshot()[0]["timeouts"] == 1
+
+
+if __name__ == "__main__":
+    test_route_and_escalation_rules()
+    test_validate_table()
+    test_escalates_only_on_invalid_table()
+    test_hedged_request_and_deadline()
+    print("✅ 모델 라우팅 테스트 통과")
@@ -0,0 +1,77 @@
+"""
+학생별 진로 설계 저장소 테스트
+
+입력값 복원과, 입력 지문·인덱스 버전이 모두 같을 때만 테이블을 복원하는지 확인합니다.
+"""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import streamlit as st
+
+import utils
+from config import STUDENT_TOKEN_PARAM, TABLE_COLUMNS
+from plan_store import PlanStore
+from utils import SessionStateManager
+
+
+def test_profile_roundtrip():
+    """입력값을 토큰별로 저장하고 교체하는지 확인"""
+    store = PlanStore(None)
+    assert store.load_profile("token") is None
+
+    store.save_profile("token", {"page": "major_selection", "name": "김학생", "job": "의사"})
+    store.save_profile("token", {"page": "curriculum", "name": "김학생", "job": "의사", "selected_major": "의예과"})
+    assert store.load_profile("token") == {"page": "curriculum", "name": "김학생", "job": "의사", "selected_major": "의예과"}
+    assert store.load_profile("other") is None
+
+
+def test_table_requires_same_inputs_and_version():
+    """입력 지문이나 인덱스 버전이 바뀌면 저장된 테이블을 복원하지 않는지 확인"""
+    store = PlanStore(None)
+    df = pd.DataFrame({"학기정보": ["1학년 1학기", "1학년 2학기"], "모집인원": ["010", "12"]})
+    fingerprint = PlanStore.fingerprint("curriculum", "의예과 커리큘럼", "경기고등학교+_shared")
+    store.save_table("token", "curriculum_table", fingerprint, "v1", df)
+
+    restored = store.load_table("token", "curriculum_table", fingerprint, "v1")
+    assert restored is not None
+    assert list(restored.columns) == list(df.columns)
+    assert restored.equals(df)  # "010" 같은 문자열 셀도 형 변환 없이 복원
+
+    changed = PlanStore.fingerprint("curriculum", "컴퓨터공학과 커리큘럼", "경기고등학교+_shared")
+    assert store.load_table("token", "curriculum_table", changed, "v1") is None
+    assert store.load_table("token", "curriculum_table", fingerprint, "v2") is None
+    assert store.load_table("other", "curriculum_table", fingerprint, "v1") is None
+
+
+def test_only_valid_fresh_tables_are_saved():
+    """검증에 실패했거나 장애 시 대신 받은 응답의 테이블은 저장하지 않는지 확인"""
+    store = PlanStore(None)
+    get_plan_store = utils.get_plan_store
+    utils.get_plan_store = lambda: store
+    try:
+        st.query_params[STUDENT_TOKEN_PARAM] = "token"
+        st.session_state["job_table"] = pd.DataFrame(columns=TABLE_COLUMNS["job"])
+        fingerprint = PlanStore.fingerprint("job", "의사", "경기고등학교")
+        valid = "| 관련 직업명 | 직업 설명 | 추천 학과 |\n|---|---|---|\n| 의사 | 환자를 진료합니다 | 의예과 |"
+
+        invalid = SimpleNamespace(text="죄송합니다. 답변을 생성할 수 없습니다.", cached=False)
+        assert not SessionStateManager.save_table("job_table", fingerprint, "v1", invalid, TABLE_COLUMNS["job"])
+        stale = SimpleNamespace(text=valid, cached=True)
+        assert not SessionStateManager.save_table("job_table", fingerprint, "v1", stale, TABLE_COLUMNS["job"])
+        assert store.load_table("token", "job_table", fingerprint, "v1") is None
+
+        fresh = SimpleNamespace(text=valid, cached=False)
+        assert SessionStateManager.save_table("job_table", fingerprint, "v1", fresh, TABLE_COLUMNS["job"])
+        assert store.load_table("token", "job_table", fingerprint, "v1") is not None
+    finally:
+        utils.get_plan_store = get_plan_store
+        st.query_params.clear()
+        st.session_state.clear()
+
+
+if __name__ == "__main__":
+    test_profile_roundtrip()
+    test_table_requires_same_inputs_and_version()
+    test_only_valid_fresh_tables_are_saved()
+    print("✅ 진로 설계 저장소 테스트 통과")
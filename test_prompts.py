@@ -0,0 +1,148 @@
+"""
+프롬프트 레지스트리 테스트
+
+고정 부분이 앞에 오는 메시지 배열과 내용 해시 버전을 확인하고, 제공자 측 프롬프트 캐시를 흉내 내는
+스텁 모델로 기본 최소 길이(1,024토큰)에서 두 번째 호출부터 캐시된 토큰이 집계되는지 확인합니다.
+공유 고정 부분은 프롬프트 캐시를 지원하는 모델로 라우팅된 타입에만 쓰이는지도 확인합니다.
+"""
+
+import os
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+from langchain.schema import HumanMessage, SystemMessage
+from langchain.vectorstores import FAISS
+
+from model_router import ModelRouter
+from prompts import PromptRegistry, PromptTemplates
+from rag_service import RAGService
+from stub_backends import STUB_PROMPT_CACHE, StubChatModel, StubEmbeddings, estimate_tokens
+
+ROUTES = {
+    "curriculum": {"model": "small", "timeout": 10, "table": "curriculum"},
+    "admission_table": {"model": "small", "timeout": 10, "table": "admission"},
+}
+PRICES = {"small": (1.0, 2.0)}
+
+
+def test_registry_compiles_once():
+    """같은 타입은 같은 객체를 돌려주고, 버전은 타입마다 다르며, 알 수 없는 타입은 ValueError인지 확인"""
+    assert PromptRegistry.get("curriculum") is PromptRegistry.get("curriculum")
+
+    versions = PromptRegistry.versions()
+    assert set(versions) == set(PromptTemplates.TASKS)
+    assert len(set(versions.values())) == len(versions)
+    assert all(len(version) == 12 for version in versions.values())
+
+    try:
+        PromptRegistry.get("unknown")
+        raise AssertionError("알 수 없는 프롬프트 타입인데 ValueError가 발생하지 않았습니다")
+    except ValueError:
+        pass
+
+
+def test_static_prefix_comes_first():
+    """문맥과 질문은 사용자 메시지에만 들어가고, 시스템 메시지는 호출마다 같은지 확인"""
+    prompt = PromptRegistry.get("admission_table")
+    first = prompt.format_messages(context="문맥 A", question="질문 A")
+    second = prompt.format_messages(context="문맥 B", question="질문 B")
+
+    assert isinstance(first[0], SystemMessage) and isinstance(first[1], HumanMessage)
+    assert first[0].content == second[0].content == prompt.system
+    assert "문맥 A" not in first[0].content and "질문 A" not in first[0].content
+    assert "문맥 A" in first[1].content and "질문 A" in first[1].content
+
+    # 단일 문자열 템플릿도 고정 부분으로 시작합니다
+    assert prompt.template.format(context="문맥 A", question="질문 A").startswith(prompt.system)
+
+    # 기본 고정 부분은 자기 작업만 담습니다
+    assert "[대학별 입결 정보]" in prompt.system and "[학과별 이수 과목]" not in prompt.system
+
+    # 공유 고정 부분을 쓰면 프롬프트 타입이 달라도 시스템 메시지는 캐시 최소 길이를 넘는 같은 고정 부분으로 시작합니다
+    shared = PromptTemplates.shared_prefix()
+    assert estimate_tokens(shared) >= 1024
+    assert all(PromptRegistry.get(prompt_type, True).system.startswith(shared) for prompt_type in PromptTemplates.TASKS)
+    assert all(
+        estimate_tokens(PromptRegistry.get(prompt_type).system) < estimate_tokens(PromptRegistry.get(prompt_type, True).system)
+        for prompt_type in PromptTemplates.TASKS
+    )
+    assert PromptRegistry.versions(["curriculum"])["curriculum"] == PromptRegistry.get("curriculum", True).version
+    assert PromptRegistry.versions()["curriculum"] == PromptRegistry.get("curriculum").version
+
+
+def test_shared_prefix_only_for_cache_models():
+    """프롬프트 캐시를 지원하는 모델(날짜 스냅숏 포함)만 공유 고정 부분을 쓰는지 확인"""
+    router = ModelRouter(
+        {"curriculum": {"model": "gpt-3.5-turbo"}, "admission_table": {"model": "gpt-4o-2024-08-06"}}, {"model": ""}, PRICES
+    )
+    assert not router.prompt_cache(router.route("curriculum"))
+    assert router.prompt_cache(router.route("admission_table"))
+    assert not router.prompt_cache(router.route("major_selection"))  # 기본 OPENAI_MODEL
+
+    # 캐시가 없는 모델에서는 자기 작업만 담은 짧은 고정 부분으로 호출하며, 다른 타입의 호출과 캐시를 공유하지 않습니다
+    STUB_PROMPT_CACHE.reset()
+    router = ModelRouter(ROUTES, {"model": ""}, PRICES, prompt_cache_models=())
+    service = RAGService(
+        llm_factory=lambda api_key, route: StubChatModel(model_name=route.model),
+        cache_size=0,
+        semantic_cache=None,
+        router=router
+    )
+    vectorstore = FAISS.from_texts(["컴퓨터공학과 커리큘럼", "간호학과 커리큘럼"], StubEmbeddings(dimension=32))
+    service.submit(service.aquery(vectorstore, "curriculum", "컴퓨터공학과 커리큘럼", "stub")).result()
+    service.submit(service.aquery(vectorstore, "admission_table", "간호학과 입결", "stub")).result()
+    stats = {row["prompt_type"]: row for row in router.stats.snapshot()}
+    assert stats["admission_table"]["cached_prompt_tokens"] == 0
+    assert stats["admission_table"]["prompt_tokens"] < 1024
+
+
+def test_few_shot_answer_uses_context():
+    """학과 추천 예시 답변의 직업과 학과가 모두 예시 문맥에 나오는지 확인"""
+    _, body = PromptTemplates.TASKS["major_selection"]
+    context = body.split("문맥:")[1].split("질문:")[0]
+    answer = body.split("답변:")[1]
+    rows = [line.strip("| ").split(" | ") for line in answer.strip().splitlines()[2:]]
+    assert rows
+    for job, _, majors in rows:
+        assert job in context
+        assert all(major.strip() in context for major in majors.split(","))
+
+
+def test_cached_prompt_tokens_are_reported():
+    """기본 최소 길이에서 두 번째 호출부터(다른 프롬프트 타입이어도) 캐시된 토큰이 경로별로 집계되고 비용이 줄어드는지 확인"""
+    STUB_PROMPT_CACHE.reset()
+    router = ModelRouter(ROUTES, {"model": ""}, PRICES, prompt_cache_models=("small",))
+    service = RAGService(
+        llm_factory=lambda api_key, route: StubChatModel(model_name=route.model),
+        cache_size=0,
+        semantic_cache=None,
+        router=router
+    )
+    vectorstore = FAISS.from_texts(["컴퓨터공학과 커리큘럼", "간호학과 커리큘럼"], StubEmbeddings(dimension=32))
+
+    service.submit(service.aquery(vectorstore, "curriculum", "컴퓨터공학과 커리큘럼", "stub")).result()
+    first = router.stats.snapshot()[0]
+    assert first["cached_prompt_tokens"] == 0
+
+    service.submit(service.aquery(vectorstore, "curriculum", "간호학과 커리큘럼", "stub")).result()
+    second = router.stats.snapshot()[0]
+    assert second["calls"] == 2
+    assert 0 < second["cached_prompt_tokens"] < second["prompt_tokens"]
+    assert 0 < second["prompt_cache_rate"] < 1
+    assert second["cached_prompt_tokens"] >= 1024
+
+    # 다른 프롬프트 타입도 공유 고정 부분만큼 캐시됩니다
+    service.submit(service.aquery(vectorstore, "admission_table", "간호학과 입결", "stub")).result()
+    admission = next(row for row in router.stats.snapshot() if row["prompt_type"] == "admission_table")
+    assert admission["cached_prompt_tokens"] >= 1024
+
+    assert router.cost("small", 10_000, 1_000, cached_tokens=8_000) < router.cost("small", 10_000, 1_000)
+
+
+if __name__ == "__main__":
+    test_registry_compiles_once()
+    test_static_prefix_comes_first()
+    test_shared_prefix_only_for_cache_models()
+    test_few_shot_answer_uses_context()
+    test_cached_prompt_tokens_are_reported()
+    print("✅ 프롬프트 레지스트리 테스트 통과")
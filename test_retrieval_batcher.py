@@ -0,0 +1,91 @@
+"""
+검색 마이크로 배치 테스트
+
+동시에 도착한 질문이 임베딩 요청 한 번과 검색 한 번으로 묶이고, 배치 검색 결과가 질문별 검색 결과와 같은지 확인합니다.
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+import numpy as np
+from langchain.vectorstores import FAISS
+
+from rag_service import RAGService
+from retrieval_batcher import MicroBatcher, RetrievalBatcher, search_with_score
+from shard_store import ShardedVectorStore
+from stub_backends import STUB_USAGE, StubEmbeddings
+
+TEXTS = [
+    "컴퓨터공학과 커리큘럼", "간호학과 커리큘럼", "경영학과 커리큘럼", "소프트웨어 개발자 직업 정보",
+    "간호사 직업 정보", "회계사 직업 정보", "서울대학교 간호학과 입결", "연세대학교 경영학과 입결",
+]
+QUESTIONS = ["컴퓨터공학과", "간호학과 입결", "회계사", "경영학과 커리큘럼", "소프트웨어"]
+
+
+def test_batched_search_matches_single_search():
+    """배치 검색이 단일 인덱스와 샤드 벡터 스토어 모두에서 질문별 검색과 같은 문서를 같은 순서로 돌려주는지 확인"""
+    embeddings = StubEmbeddings(dimension=32)
+    single = FAISS.from_texts(TEXTS, embeddings)
+    sharded = ShardedVectorStore([
+        ("a", FAISS.from_texts(TEXTS[:4], embeddings)),
+        ("b", FAISS.from_texts(TEXTS[4:], embeddings)),
+    ])
+    vectors = np.asarray(embeddings.embed_documents(QUESTIONS), dtype=np.float32)
+
+    for vectorstore in (single, sharded):
+        batch = search_with_score(vectorstore, vectors, k=3)
+        for vector, results in zip(vectors, batch):
+            expected = vectorstore.similarity_search_by_vector(vector.tolist(), k=3)
+            assert [document.page_content for document, _ in results] == [document.page_content for document in expected]
+
+
+def test_concurrent_queries_share_one_request():
+    """동시에 도착한 질문이 임베딩 요청 한 번으로 묶이고, 결과는 배치 없이 검색한 것과 같은지 확인"""
+    vectorstore = FAISS.from_texts(TEXTS, StubEmbeddings(dimension=32))
+    batched = RAGService(cache_size=0, semantic_cache=None, retrieval_batcher=RetrievalBatcher(window_ms=20))
+    unbatched = RAGService(cache_size=0, semantic_cache=None)
+    unbatched.retrieval_batcher = None
+
+    async def retrieve_all(service: RAGService):
+        return await asyncio.gather(*(service.aretrieve(vectorstore, question) for question in QUESTIONS))
+
+    before = STUB_USAGE.snapshot()["embedding_calls"]
+    results = batched.submit(retrieve_all(batched)).result()
+    assert STUB_USAGE.snapshot()["embedding_calls"] - before == 1
+
+    expected = unbatched.submit(retrieve_all(unbatched)).result()
+    assert [[d.page_content for d in docs] for docs in results] == [[d.page_content for d in docs] for docs in expected]
+
+
+def test_batch_errors_and_max_size():
+    """배치 실패는 모든 호출자에게 전달되고, 최대 크기에 이르면 창이 끝나기 전에 실행되는지 확인"""
+    batches = []
+
+    async def run(target, items):
+        batches.append(list(items))
+        if "fail" in items:
+            raise ConnectionError("upstream unavailable")
+        return [item.upper() for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher("test", run, window_seconds=60, max_size=3)
+        # 창이 60초여도 세 번째 요청에서 바로 실행됩니다
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit("key", None, item) for item in "abc")), 5)
+        assert results == ["A", "B", "C"]
+
+        batcher.window_seconds = 0.01
+        outcomes = await asyncio.gather(batcher.submit("key", None, "x"), batcher.submit("key", None, "fail"),
+                                        return_exceptions=True)
+        assert all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+
+    asyncio.run(scenario())
+    assert batches == [["a", "b", "c"], ["x", "fail"]]
+
+
+if __name__ == "__main__":
+    test_batched_search_matches_single_search()
+    test_concurrent_queries_share_one_request()
+    test_batch_errors_and_max_size()
+    print("✅ 검색 마이크로 배치 테스트 통과")
@@ -0,0 +1,101 @@
+"""
+학급 일괄 진로 설계 테스트
+
+여러 학생이 직업·학과·학년을 공유하고 한 학생은 희망학과가 비어 있는 명단을 스텁 백엔드로 실행하여,
+고유 (프롬프트 타입, 학교, 질문) 조합만 한 번씩 실행하고 학생마다 결과를 한 번만 내보내며
+실패한 질의는 해당 학생들의 오류로 기록되는지 확인합니다.
+"""
+
+import os
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+from io import StringIO
+
+from langchain.vectorstores import FAISS
+
+from answer_store import AnswerStore
+from prompts import QuestionBuilder
+from rag_service import RAGService
+from roster import BatchPlanner, RosterLoader
+from stub_backends import StubChatModel, StubEmbeddings
+
+ROSTER = """이름,학년,희망직업,희망학과,학교
+김학생,2,의사,의예과,
+이학생,고2,의사,의예과,
+박학생,2학년,의사,의예과,
+최학생,1,교사,,
+정학생,1,교사,컴퓨터공학과,
+"""
+
+FAILING_QUESTION = QuestionBuilder.admission_question("의예과")
+
+
+class CountingService(RAGService):
+    """질의 횟수를 세고 지정한 입결 질의는 실패시키는 스텁 서비스"""
+
+    def __init__(self):
+        super().__init__(
+            llm_factory=lambda api_key, route: StubChatModel(model_name=route.model),
+            cache_size=0,
+            semantic_cache=None,
+            answer_store=AnswerStore(None)
+        )
+        self.calls = []
+
+    async def aanswer(self, vectorstore, prompt_type, question, api_key):
+        self.calls.append((prompt_type, question.strip()))
+        if question == FAILING_QUESTION:
+            raise RuntimeError("업스트림 오류")
+        return await super().aanswer(vectorstore, prompt_type, question, api_key)
+
+
+class StubPlanner(BatchPlanner):
+    """게시된 인덱스 대신 작은 스텁 벡터 스토어를 쓰는 일괄 생성기"""
+
+    VECTORSTORE = FAISS.from_texts(["의예과 커리큘럼", "컴퓨터공학과 입결"], StubEmbeddings(dimension=32))
+
+    def _get_vectorstore(self, school, prompt_type="major_selection"):
+        return self.VECTORSTORE
+
+
+def test_batch_runs_each_unique_query_once():
+    """고유 질의 수만큼만 실행하고, 학생마다 한 번씩 내보내며, 실패한 질의는 오류로 기록하는지 확인"""
+    roster = RosterLoader.load(StringIO(ROSTER))
+    service = CountingService()
+    results = list(StubPlanner("stub", concurrency=2, service=service).run(roster))
+    plans = [plan for plan, _ in results]
+    progress = results[-1][1]
+
+    # 학생마다 정확히 한 번 내보냅니다
+    assert sorted(plan.index for plan in plans) == list(range(1, len(roster) + 1))
+    assert progress.done_students == len(roster)
+
+    # 희망학과가 없는 학생은 추천 학과 중 첫 번째 학과로 이어서 설계합니다
+    empty = next(plan for plan in plans if plan.name == "최학생")
+    assert empty.major
+    assert set(empty.tables) == {"major_selection", "curriculum", "admission_table"}
+
+    # 실행한 질의 수 = 학생들이 필요로 한 서로 다른 (프롬프트 타입, 학교, 질문) 수
+    distinct = set()
+    for plan in plans:
+        distinct.add(("major_selection", plan.school, QuestionBuilder.job_question(plan.job).strip()))
+        distinct.add(("curriculum", plan.school, QuestionBuilder.curriculum_question(plan.major, plan.grade).strip()))
+        distinct.add(("admission_table", plan.school, QuestionBuilder.admission_question(plan.major).strip()))
+    assert len(service.calls) == len(set(service.calls)) == len(distinct) == progress.total_queries
+    assert progress.done_queries == progress.total_queries
+    assert len(distinct) < 3 * len(roster)
+
+    # 실패한 질의는 그 질의를 기다린 학생들의 오류로 기록되고 빈 테이블이 붙습니다
+    for plan in plans:
+        if plan.major == "의예과":
+            assert len(plan.errors) == 1 and "생성 실패" in plan.errors[0]
+            assert plan.tables["admission_table"].empty
+            assert not plan.tables["curriculum"].empty
+        else:
+            assert plan.errors == []
+
+
+if __name__ == "__main__":
+    test_batch_runs_each_unique_query_once()
+    print("✅ 학급 일괄 진로 설계 테스트 통과")
@@ -0,0 +1,134 @@
+"""
+의미 기반 응답 캐시 테스트
+
+임의의 단위 벡터로 임계값 적중, 파티션 분리, LRU 해제, 오적중 감사를 확인하고, 스텁 임베딩으로 보정한 임계값이
+같은 뜻의 표현은 적중시키고 서로 다른 학과는 적중시키지 않는지, 검증에 실패한 답변은 캐시되지 않는지 확인합니다.
+"""
+
+import json
+import os
+
+os.environ.setdefault("DREAMCOURSE_BACKEND", "stub")
+
+import numpy as np
+from langchain.vectorstores import FAISS
+
+from answer_store import AnswerStore
+from config import SEMANTIC_CACHE_THRESHOLDS_PATH
+from model_router import ModelRouter
+from prompts import QuestionBuilder
+from rag_service import RAGService
+from semantic_cache import SemanticCache, answer_agreement, calibrate, load_thresholds
+from stub_backends import StubChatModel, StubEmbeddings
+
+TABLE = "| 대학명 | 학과명 |\n|---|---|\n| 서울대학교 | 컴퓨터공학과 |"
+
+
+def _vector(seed: int, noise: float = 0.0, base: int = 0) -> np.ndarray:
+    """base 벡터에 noise만큼 다른 방향을 섞은 단위 벡터"""
+    rng = np.random.default_rng(base)
+    vector = rng.standard_normal(64)
+    if noise:
+        vector = vector + noise * np.random.default_rng(seed + 1000).standard_normal(64)
+    return vector / np.linalg.norm(vector)
+
+
+def test_semantic_cache_lookup():
+    """임계값 이상만 적중하고, 학년이 다르거나 버전이 다르면 비교하지 않는지 확인"""
+    cache = SemanticCache(thresholds={"curriculum": 0.95}, audit_path=None)
+
+    partition, text = SemanticCache.key("v1", "curriculum", QuestionBuilder.curriculum_question("컴퓨터공학과", "고2"))
+    assert text == "컴퓨터공학과"
+    cache.add(partition, "curriculum", text, _vector(0), TABLE)
+
+    near = cache.lookup(partition, "curriculum", _vector(1, noise=0.1))
+    assert near is not None and near.answer == TABLE and near.similarity >= 0.95
+    assert cache.lookup(partition, "curriculum", _vector(2, base=7)) is None
+
+    other_grade, _ = SemanticCache.key("v1", "curriculum", QuestionBuilder.curriculum_question("컴퓨터공학과", "고1"))
+    other_version, _ = SemanticCache.key("v2", "curriculum", QuestionBuilder.curriculum_question("컴퓨터공학과", "고2"))
+    assert cache.lookup(other_grade, "curriculum", _vector(0)) is None
+    assert cache.lookup(other_version, "curriculum", _vector(0)) is None
+
+    # 임계값이 없는 프롬프트 타입은 캐시하지 않습니다
+    assert cache.add(partition, "admission_table", text, _vector(0), TABLE) is None
+
+
+def test_semantic_cache_eviction_and_audit():
+    """최대 항목 수를 넘으면 LRU로 해제하고, 오적중 감사 시 항목을 무효화하는지 확인"""
+    cache = SemanticCache(max_entries=2, thresholds={"major_selection": 0.9}, audit_path=None)
+    partition = ("v1", "major_selection", "job", ())
+
+    for base in (1, 2):
+        cache.add(partition, "major_selection", f"직업{base}", _vector(0, base=base), TABLE)
+    assert cache.lookup(partition, "major_selection", _vector(0, base=1)) is not None  # 1이 최근 사용
+    cache.add(partition, "major_selection", "직업3", _vector(0, base=3), TABLE)
+
+    assert len(cache) == 2
+    assert cache.lookup(partition, "major_selection", _vector(0, base=2)) is None
+    hit = cache.lookup(partition, "major_selection", _vector(0, base=1))
+    assert hit is not None
+
+    assert cache.record_audit("major_selection", "직업1", hit, TABLE)
+    assert not cache.record_audit("major_selection", "직업1", hit, "| 대학명 | 학과명 |\n|---|---|\n| 연세대학교 | 경영학과 |")
+    assert cache.lookup(partition, "major_selection", _vector(0, base=1)) is None
+    assert answer_agreement(TABLE, TABLE) == 1.0
+
+
+def test_calibrated_thresholds():
+    """저장된 스텁 임계값이 현재 측정값과 같고, 표현만 다른 직업은 적중하며 서로 다른 직업·학과는 적중하지 않는지 확인"""
+    embeddings = StubEmbeddings()
+    with open(SEMANTIC_CACHE_THRESHOLDS_PATH, encoding="utf-8") as f:
+        assert json.load(f)["stub"] == calibrate(embeddings)
+    assert load_thresholds("unknown-backend") == {}  # 측정값이 없으면 의미 기반 캐시를 쓰지 않습니다
+
+    cache = SemanticCache(thresholds=load_thresholds("stub"), audit_path=None)
+
+    def lookup(prompt_type: str, cached: str, asked: str):
+        build = QuestionBuilder.job_question if prompt_type == "major_selection" else \
+            lambda major: QuestionBuilder.curriculum_question(major, "고2")
+        partition, text = SemanticCache.key("v1", prompt_type, build(cached))
+        cache.add(partition, prompt_type, text, embeddings.embed_query(text), TABLE)
+        partition, text = SemanticCache.key("v1", prompt_type, build(asked))
+        return cache.lookup(partition, prompt_type, embeddings.embed_query(text))
+
+    assert lookup("major_selection", "데이터 과학자", "데이터과학자") is not None
+    assert lookup("major_selection", "소프트웨어 개발자", "하드웨어 개발자") is None
+    assert lookup("curriculum", "컴퓨터공학과", "컴퓨터교육과") is None
+    assert lookup("curriculum", "화학과", "화학공학과") is None
+
+
+def test_invalid_tables_are_not_cached():
+    """테이블 검증에 실패한 답변은 정확 일치·의미 기반 캐시 어디에도 저장되지 않고 다음 요청에서 다시 생성되는지 확인"""
+    routes = {
+        # 커리큘럼 테이블이 잘리도록 최대 토큰 수를 작게 설정 (상위 모델 재호출 없음)
+        "curriculum": {"model": "small", "max_tokens": 60, "timeout": 10, "table": "curriculum"},
+        "major_selection": {"model": "small", "max_tokens": 512, "timeout": 10, "table": "job"},
+    }
+    router = ModelRouter(routes, {"model": ""}, {"small": (1.0, 2.0)})
+    semantic_cache = SemanticCache(thresholds={"curriculum": 0.5, "major_selection": 0.5}, audit_path=None)
+    service = RAGService(
+        llm_factory=lambda api_key, route: StubChatModel(model_name=route.model, max_tokens=route.max_tokens),
+        semantic_cache=semantic_cache,
+        router=router,
+        answer_store=AnswerStore(None),
+        retrieval_batcher=None
+    )
+    vectorstore = FAISS.from_texts(["컴퓨터공학과 커리큘럼", "소프트웨어 개발자 직업 정보"], StubEmbeddings(dimension=32))
+
+    question = QuestionBuilder.curriculum_question("컴퓨터공학과", "고2")
+    for _ in range(2):
+        service.submit(service.aquery(vectorstore, "curriculum", question, "stub")).result()
+    assert router.stats.snapshot()[0]["calls"] == 2
+    assert len(service.cache) == 0 and len(semantic_cache) == 0
+
+    service.submit(service.aquery(vectorstore, "major_selection", QuestionBuilder.job_question("간호사"), "stub")).result()
+    assert len(service.cache) == 1 and len(semantic_cache) == 1
+
+
+if __name__ == "__main__":
+    test_semantic_cache_lookup()
+    test_semantic_cache_eviction_and_audit()
+    test_calibrated_thresholds()
+    test_invalid_tables_are_not_cached()
+    print("✅ 의미 기반 캐시 테스트 통과")
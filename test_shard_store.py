@@ -0,0 +1,82 @@
+"""
+샤드 캐시 테스트
+
+같은 샤드를 동시에 요청해도 한 번만 열고, 한 샤드를 여는 동안에도 다른 샤드의 적중은 기다리지 않는지 확인합니다.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from shard_store import ShardCache
+
+
+def test_concurrent_misses_load_once():
+    """같은 (샤드, 버전)을 동시에 요청하면 loader를 한 번만 실행하고 모두 같은 결과를 받는지 확인"""
+    cache = ShardCache(max_shards=4, idle_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get("school", "v1", loader), range(8)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+    # 새 버전은 다시 엽니다
+    assert cache.get("school", "v2", loader) is not results[0]
+    assert len(calls) == 2
+
+
+def test_loading_does_not_block_other_shards():
+    """한 샤드를 여는 동안 이미 열린 다른 샤드는 바로 반환되는지 확인"""
+    cache = ShardCache(max_shards=4, idle_seconds=60)
+    shared = cache.get("_shared", "v1", object)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        loading = pool.submit(cache.get, "school", "v1", slow_loader)
+        assert started.wait(5)
+
+        start = time.perf_counter()
+        assert cache.get("_shared", "v1", object) is shared
+        assert time.perf_counter() - start < 1
+
+        release.set()
+        assert loading.result() is not None
+    assert "school" in cache and len(cache) == 2
+
+
+def test_failed_load_is_not_cached():
+    """loader가 None을 반환하거나 예외를 내면 캐시하지 않고 다음 요청이 다시 여는지 확인"""
+    cache = ShardCache(max_shards=4, idle_seconds=60)
+    assert cache.get("school", "v1", lambda: None) is None
+    assert "school" not in cache
+
+    def broken():
+        raise OSError("샤드 파일 없음")
+
+    try:
+        cache.get("school", "v1", broken)
+        raise AssertionError("loader 예외가 전달되지 않았습니다")
+    except OSError:
+        pass
+
+    store = object()
+    assert cache.get("school", "v1", lambda: store) is store
+
+
+if __name__ == "__main__":
+    test_concurrent_misses_load_once()
+    test_loading_does_not_block_other_shards()
+    test_failed_load_is_not_cached()
+    print("✅ 샤드 캐시 테스트 통과")
@@ -0,0 +1,261 @@
+"""
+DreamCourse 구간 추적(tracing) 모듈
+
+RAG 핫패스의 각 단계를 span으로 측정하고, 세션과 페이지 뷰 단위로 연결합니다.
+완료된 span은 OpenTelemetry(OTLP JSON) 형식과 호환되는 JSONL 파일로 내보내며,
+개발자 패널에서 워터폴로 볼 수 있도록 세션별 마지막 페이지 뷰를 메모리에 보관합니다.
+"""
+
+import functools
+import inspect
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config import TRACING_ENABLED, TRACE_EXPORT_PATH, TRACE_MAX_SESSIONS
+
+
+@dataclass
+class Span:
+    """측정 구간 하나를 나타내는 데이터 클래스"""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    session_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        """구간 소요 시간(ms)"""
+        if self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        """
+        구간 속성을 설정합니다.
+
+        Args:
+            key (str): 속성 이름
+            value (Any): 속성 값 (str, int, float, bool)
+        """
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        OTLP JSON 형식의 span 딕셔너리로 변환합니다.
+
+        Returns:
+            Dict[str, Any]: OTLP 호환 span
+        """
+        attributes = dict(self.attributes)
+        if self.session_id:
+            attributes["session.id"] = self.session_id
+
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """속성 값을 OTLP AnyValue 형식으로 변환합니다."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class _NoopSpan:
+    """추적이 꺼져 있을 때 사용하는 빈 span"""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("dreamcourse_current_span", default=None)
+_current_session: ContextVar[Optional[str]] = ContextVar("dreamcourse_current_session", default=None)
+
+
+class Tracer:
+    """span 생성, 내보내기, 세션별 보관을 담당하는 클래스"""
+
+    def __init__(
+        self,
+        enabled: bool = TRACING_ENABLED,
+        export_path: Optional[Path] = TRACE_EXPORT_PATH,
+        max_sessions: int = TRACE_MAX_SESSIONS
+    ):
+        """
+        Args:
+            enabled (bool): 추적 활성화 여부
+            export_path (Optional[Path]): JSONL 내보내기 경로 (None이면 파일로 내보내지 않음)
+            max_sessions (int): 마지막 페이지 뷰를 보관할 최대 세션 수
+        """
+        self.enabled = enabled
+        self.export_path = export_path
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._open_traces: Dict[str, List[Span]] = {}
+        self._last_views: "OrderedDict[str, List[Span]]" = OrderedDict()
+
+    @contextmanager
+    def page_view(self, session_id: str, page: str) -> Iterator[Any]:
+        """
+        페이지 뷰 하나를 새 trace의 루트 span으로 측정합니다.
+
+        Args:
+            session_id (str): 세션 식별자
+            page (str): 페이지 이름
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        session_token = _current_session.set(session_id)
+        parent_token = _current_span.set(None)
+        try:
+            with self.span("page_view", page=page) as root:
+                yield root
+        finally:
+            _current_span.reset(parent_token)
+            _current_session.reset(session_token)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """
+        현재 컨텍스트의 자식 span을 측정합니다.
+
+        Args:
+            name (str): span 이름
+            **attributes: span 속성
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            session_id=_current_session.get(),
+            start_ns=time.time_ns(),
+            attributes=dict(attributes)
+        )
+        if parent is None:
+            with self._lock:
+                self._open_traces[span.trace_id] = []
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self._finish(span, is_root=parent is None)
+
+    def traced(self, name: str) -> Callable:
+        """
+        함수 호출 전체를 span으로 측정하는 데코레이터를 반환합니다. (동기/비동기 함수 모두 지원)
+
+        Args:
+            name (str): span 이름
+
+        Returns:
+            Callable: 데코레이터
+        """
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+    def _finish(self, span: Span, is_root: bool):
+        """완료된 span을 trace에 모으고, 루트 span이면 trace 전체를 내보냅니다."""
+        with self._lock:
+            spans = self._open_traces.get(span.trace_id)
+            if spans is None:
+                # 루트가 이미 끝난 뒤 완료된 span (예: 취소된 백그라운드 작업)
+                spans = []
+            spans.append(span)
+
+            if not is_root:
+                return
+
+            self._open_traces.pop(span.trace_id, None)
+            if span.session_id:
+                self._last_views[span.session_id] = spans
+                self._last_views.move_to_end(span.session_id)
+                while len(self._last_views) > self.max_sessions:
+                    self._last_views.popitem(last=False)
+
+        self._export(spans)
+
+    def _export(self, spans: List[Span]):
+        """trace의 span들을 JSONL 파일에 한 줄씩 기록합니다."""
+        if self.export_path is None:
+            return
+
+        lines = "".join(json.dumps(span.to_otlp(), ensure_ascii=False) + "\n" for span in spans)
+        with self._lock:
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def get_last_page_view(self, session_id: str) -> List[Span]:
+        """
+        세션의 마지막 페이지 뷰에 속한 span들을 시작 시각 순으로 반환합니다.
+
+        Args:
+            session_id (str): 세션 식별자
+
+        Returns:
+            List[Span]: span 리스트 (없으면 빈 리스트)
+        """
+        with self._lock:
+            spans = list(self._last_views.get(session_id, []))
+        return sorted(spans, key=lambda span: span.start_ns)
+
+
+# 프로세스 공용 tracer
+tracer = Tracer()
+traced = tracer.traced
@@ -4,25 +4,59 @@ DreamCourse 유틸리티 함수 모음
 벡터DB 구축, 데이터 로딩, RAG 체인 생성 등의 핵심 기능을 제공합니다.
 """
 
+import secrets
+import time
+import uuid
+from itertools import chain
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 
 from langchain.vectorstores import FAISS
 from langchain.embeddings import OpenAIEmbeddings
-from langchain.chains import RetrievalQA
+from langchain.embeddings.base import Embeddings
 from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
+from langchain.chat_models.base import BaseChatModel
 from langchain.docstore.document import Document
 
 from config import (
     MAJOR_INFO_CSV,
     CURRICULUM_CSV,
-    ADMISSION_CSV,
     ENCODINGS,
-    OPENAI_TEMPERATURE
+    MESSAGES,
+    OPENAI_TEMPERATURE,
+    LLM_BACKEND,
+    CASSETTE_MODE,
+    STUB_LLM_LATENCY,
+    STUB_LLM_PROMPT_CACHE_MIN_TOKENS,
+    STUB_LLM_DISTRIBUTION,
+    STUB_LLM_JITTER,
+    STUB_LLM_TAIL_PROBABILITY,
+    STUB_LLM_TAIL_LATENCY,
+    STUB_EMBEDDING_LATENCY,
+    SCHOOL_CURRICULUM_CSVS,
+    DEFAULT_SCHOOL,
+    SHARED_SHARD,
+    ADMISSION_PROMPT_TYPES,
+    INGEST_CHUNK_ROWS,
+    CORPUS_COMPACTION_ENABLED,
+    PLAN_PROFILE_KEYS,
+    STUDENT_TOKEN_PARAM
 )
+from admission_store import admission_shard, get_admission_store, shard_year
+from ann_index import AnnIndexFactory
+from cassette import openai_clients
+from corpus_compactor import CorpusCompactor, merge_metadata
+from stub_backends import StubChatModel, StubEmbeddings
+from index_store import CompactDocstore, IndexStore, RowIdMapping
+from shard_store import SHARD_CACHE, ShardedVectorStore
+from metrics import CACHE_REQUESTS, INDEX_BUILDS, INDEX_BUILD_SECONDS, TABLE_PARSE_FAILURES
+from model_router import ModelRoute
+from plan_store import get_plan_store
+from tracing import traced
 
 
 class DataLoader:
@@ -50,24 +84,57 @@ class DataLoader:
             return None
 
     @staticmethod
+    def iter_csv_chunks(
+        file_path: Path,
+        encoding: str,
+        chunk_rows: int = INGEST_CHUNK_ROWS
+    ) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        CSV 파일을 chunk_rows 행씩 나누어 읽는 반복자를 엽니다.
+
+        Args:
+            file_path (Path): 파일 경로
+            encoding (str): 파일 인코딩
+            chunk_rows (int): 청크당 행 수
+
+        Returns:
+            Optional[Iterator[pd.DataFrame]]: 데이터프레임 청크 반복자 또는 None (실패 시)
+        """
+        try:
+            return pd.read_csv(file_path, encoding=encoding, chunksize=chunk_rows)
+        except FileNotFoundError:
+            st.error(f"파일을 찾을 수 없습니다: {file_path}")
+            return None
+        except Exception as e:
+            st.error(f"파일 로딩 중 오류 발생: {file_path}\n{str(e)}")
+            return None
+
+    @staticmethod
+    @traced("data.load_all")
     def load_all_data() -> tuple:
         """
-        모든 CSV 데이터를 로드합니다.
+        모든 데이터를 로드합니다. (입결 정보는 저장소의 전체 학년도)
 
         Returns:
             tuple: (major_df, curriculum_df, admission_df)
         """
         major_df = DataLoader.load_csv_safely(MAJOR_INFO_CSV, ENCODINGS["major_info"])
         curriculum_df = DataLoader.load_csv_safely(CURRICULUM_CSV, ENCODINGS["curriculum"])
-        admission_df = DataLoader.load_csv_safely(ADMISSION_CSV, ENCODINGS["admission"])
+        admission_df = get_admission_store().query()
 
         return major_df, curriculum_df, admission_df
 
 
 class DocumentProcessor:
-    """문서 처리 및 텍스트 생성을 담당하는 클래스"""
+    """문서 처리 및 텍스트 생성을 담당하는 클래스
+
+    iter_* 함수는 CSV 청크를 차례로 받아 문서 텍스트를 하나씩 생성하므로 파일 전체를 메모리에 올리지 않고,
+    create_* 함수는 같은 로직으로 데이터프레임 하나를 변환해 리스트로 반환합니다.
+    iter_*_documents 함수는 같은 텍스트에 메타데이터(type, 직업, 학과, 대학, school, year)를 붙인 Document를 생성합니다.
+    """
 
     @staticmethod
+    @traced("documents.create_major_texts")
     def create_major_texts(df_major: pd.DataFrame) -> List[str]:
         """
         학과 정보를 텍스트로 변환합니다.
@@ -78,16 +145,10 @@ class DocumentProcessor:
         Returns:
             List[str]: 변환된 텍스트 리스트
         """
-        texts = []
-        for _, row in df_major.iterrows():
-            text = (
-                f"{row['직업명']}은(는) {row['영역']} 분야에 속하는 직업이며, "
-                f"취업을 위해 추천하는 학과는 {row['추천학과']}입니다."
-            )
-            texts.append(text)
-        return texts
+        return list(DocumentProcessor.iter_major_texts([df_major]))
 
     @staticmethod
+    @traced("documents.create_curriculum_texts")
     def create_curriculum_texts(df_curriculum: pd.DataFrame) -> List[str]:
         """
         커리큘럼 정보를 텍스트로 변환합니다.
@@ -98,13 +159,112 @@ class DocumentProcessor:
         Returns:
             List[str]: 변환된 텍스트 리스트
         """
-        texts = []
-        for major in df_curriculum["학과"].unique():
-            major_data = df_curriculum[df_curriculum["학과"] == major]
+        return list(DocumentProcessor.iter_curriculum_texts([df_curriculum]))
+
+    @staticmethod
+    @traced("documents.create_admission_texts")
+    def create_admission_texts(df_admission: pd.DataFrame) -> List[str]:
+        """
+        입결 정보를 텍스트로 변환합니다.
+
+        Args:
+            df_admission (pd.DataFrame): 입결 정보 데이터프레임
+
+        Returns:
+            List[str]: 변환된 텍스트 리스트
+        """
+        return list(DocumentProcessor.iter_admission_texts([df_admission]))
+
+    @staticmethod
+    def iter_major_texts(chunks: Iterable[pd.DataFrame]) -> Iterator[str]:
+        """
+        학과 정보 청크를 행마다 텍스트로 변환합니다.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): 학과 정보 데이터프레임 청크
+
+        Yields:
+            str: 변환된 텍스트
+        """
+        for document in DocumentProcessor.iter_major_documents(chunks):
+            yield document.page_content
+
+    @staticmethod
+    def iter_major_documents(chunks: Iterable[pd.DataFrame]) -> Iterator[Document]:
+        """
+        학과 정보 청크를 행마다 문서로 변환합니다.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): 학과 정보 데이터프레임 청크
+
+        Yields:
+            Document: 직업 하나의 분야·추천 학과 문서 (metadata: type="job", 직업=직업명, 영역, 학과=추천학과)
+        """
+        for chunk in chunks:
+            for row in chunk.to_dict("records"):
+                yield DocumentProcessor.job_document(row["직업명"], row["영역"], row["추천학과"])
+
+    @staticmethod
+    def job_document(job: str, field: str, majors: str) -> Document:
+        """
+        직업 하나의 분야·추천 학과 문서를 만듭니다.
+
+        Args:
+            job (str): 직업명
+            field (str): 영역
+            majors (str): 추천 학과 (여러 개면 쉼표로 구분)
+
+        Returns:
+            Document: 직업 문서
+        """
+        text = f"{job}은(는) {field} 분야에 속하는 직업이며, 취업을 위해 추천하는 학과는 {majors}입니다."
+        return Document(page_content=text, metadata={"type": "job", "직업": job, "영역": field, "학과": majors})
+
+    @staticmethod
+    def merge_job_documents(documents: List[Document]) -> Document:
+        """
+        추천 학과만 다른 같은 직업의 문서를 하나로 합칩니다. (CorpusCompactor의 job 합치기 함수)
+
+        Args:
+            documents (List[Document]): 같은 직업의 문서 (예: 스포츠해설가 → 체육학과, 스포츠해설가 → 체육교육과)
+
+        Returns:
+            Document: 추천 학과를 모두 나열한 문서 (스포츠해설가 → 체육학과, 체육교육과)
+        """
+        metadata = merge_metadata(documents)
+        return DocumentProcessor.job_document(metadata["직업"], metadata["영역"], metadata["학과"])
+
+    @staticmethod
+    def iter_curriculum_texts(chunks: Iterable[pd.DataFrame]) -> Iterator[str]:
+        """
+        커리큘럼 청크를 학과별 텍스트로 변환합니다.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): 커리큘럼 데이터프레임 청크
+
+        Yields:
+            str: 학과 하나의 학년·학기별 이수 과목 텍스트
+        """
+        for document in DocumentProcessor.iter_curriculum_documents(chunks):
+            yield document.page_content
+
+    @staticmethod
+    def iter_curriculum_documents(chunks: Iterable[pd.DataFrame], school: Optional[str] = None) -> Iterator[Document]:
+        """
+        커리큘럼 청크를 학과별 문서로 변환합니다.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): 커리큘럼 데이터프레임 청크
+            school (Optional[str]): 커리큘럼을 편성한 학교 이름
+
+        Yields:
+            Document: 학과 하나의 학년·학기별 이수 과목 문서 (metadata: type="curriculum", 학과, school)
+        """
+        for major, major_data in DocumentProcessor._iter_groups(chunks, "학과"):
             text = f"{major}에 입학하기 위해 고등학교 재학 중 다음과 같은 과목을 이수해야 합니다."
             major_data = major_data.sort_values(by=["학년", "학기"])
 
-            for _, row in major_data.iterrows():
+            for row in major_data.to_dict("records"):
                 semester_info = f"{int(row['학년'])}학년 {int(row['학기'])}학기"
                 common = row["공통과목"] if pd.notna(row["공통과목"]) else "없음"
                 basic = row["기본선택과목"] if pd.notna(row["기본선택과목"]) else "없음"
@@ -117,24 +277,36 @@ class DocumentProcessor:
                     f"일반선택 {general}, 진로선택 {career}, 융합선택 {convergence}. "
                 )
 
-            texts.append(text)
-        return texts
+            yield Document(page_content=text, metadata={"type": "curriculum", "학과": major, "school": school})
 
     @staticmethod
-    def create_admission_texts(df_admission: pd.DataFrame) -> List[str]:
+    def iter_admission_texts(chunks: Iterable[pd.DataFrame]) -> Iterator[str]:
         """
-        입결 정보를 텍스트로 변환합니다.
+        입결 정보 청크를 학과별 텍스트로 변환합니다. (학년도 열이 있으면 문서 앞에 학년도를 붙임)
 
         Args:
-            df_admission (pd.DataFrame): 입결 정보 데이터프레임
+            chunks (Iterable[pd.DataFrame]): 입결 정보 데이터프레임 청크
 
-        Returns:
-            List[str]: 변환된 텍스트 리스트
+        Yields:
+            str: 학과 하나의 대학·전형별 입결 텍스트
         """
-        texts = []
-        for major, group in df_admission.groupby("학과"):
+        for document in DocumentProcessor.iter_admission_documents(chunks):
+            yield document.page_content
+
+    @staticmethod
+    def iter_admission_documents(chunks: Iterable[pd.DataFrame]) -> Iterator[Document]:
+        """
+        입결 정보 청크를 학과별 문서로 변환합니다. (학년도 열이 있으면 문서 앞에 학년도를 붙임)
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): 입결 정보 데이터프레임 청크
+
+        Yields:
+            Document: 학과 하나의 대학·전형별 입결 문서 (metadata: type="admission", 학과, 대학, year)
+        """
+        for major, group in DocumentProcessor._iter_groups(chunks, "학과"):
             info_parts = []
-            for _, row in group.iterrows():
+            for row in group.to_dict("records"):
                 part = (
                     f"{row['대학명']} {row['학과']}는 {row['전형명']}으로 "
                     f"{row['인원']}명을 선발했고, 경쟁률은 {row['경쟁률']}입니다. "
@@ -142,95 +314,401 @@ class DocumentProcessor:
                 )
                 info_parts.append(part)
 
-            text = f"{major}의 입결정보는 다음과 같습니다. " + " ".join(info_parts)
-            texts.append(text)
+            year = int(group["학년도"].iloc[0]) if "학년도" in group else None
+            prefix = f"{year}학년도 " if year is not None else ""
+            yield Document(
+                page_content=f"{prefix}{major}의 입결정보는 다음과 같습니다. " + " ".join(info_parts),
+                metadata={
+                    "type": "admission",
+                    "학과": major,
+                    "대학": ", ".join(dict.fromkeys(str(name) for name in group["대학명"].dropna())),
+                    "year": year
+                }
+            )
 
-        return texts
+    @staticmethod
+    def _iter_groups(chunks: Iterable[pd.DataFrame], key: str) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        청크를 key 열 값으로 묶어 (값, 행) 쌍을 생성합니다. (key가 빈 행은 제외)
+
+        청크의 마지막 값은 다음 청크에서 이어질 수 있으므로 다음 청크와 합친 뒤 내보냅니다.
+        같은 값의 행이 파일에서 연속해 있으면 청크 크기와 무관하게 한 묶음이 되고,
+        멀리 떨어진 청크에 흩어져 있으면 청크마다 별도의 묶음이 됩니다.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): 데이터프레임 청크
+            key (str): 묶을 열 이름
+
+        Yields:
+            Tuple[str, pd.DataFrame]: (key 값, 해당 행)
+        """
+        carry = None
+        for chunk in chunks:
+            chunk = chunk[chunk[key].notna()]
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+            if chunk.empty:
+                continue
+
+            is_last = chunk[key] == chunk[key].iloc[-1]
+            carry = chunk[is_last]
+            yield from chunk[~is_last].groupby(key, sort=False)
+
+        if carry is not None and not carry.empty:
+            yield carry[key].iloc[0], carry
 
 
 class VectorStoreManager:
     """벡터 스토어 구축 및 관리를 담당하는 클래스"""
 
     @staticmethod
-    def build_vectorstore(api_key: str) -> Optional[FAISS]:
+    def create_embeddings(api_key: str) -> Embeddings:
+        """
+        설정된 백엔드에 맞는 임베딩 인스턴스를 생성합니다.
+
+        Args:
+            api_key (str): OpenAI API 키
+
+        Returns:
+            Embeddings: 생성된 임베딩 백엔드
+        """
+        if LLM_BACKEND == "stub":
+            return StubEmbeddings(latency=STUB_EMBEDDING_LATENCY)
+        if CASSETTE_MODE != "off":
+            client, async_client = openai_clients(api_key)
+            # 토큰 단위 분할은 tiktoken 인코딩 파일을 내려받아야 하므로 카세트 사용 시에는 문자열 그대로 요청합니다
+            return OpenAIEmbeddings(
+                openai_api_key=api_key,
+                client=client.embeddings,
+                async_client=async_client.embeddings,
+                check_embedding_ctx_length=False
+            )
+        return OpenAIEmbeddings(openai_api_key=api_key)
+
+    @staticmethod
+    def iter_texts(shard: Optional[str] = None, chunk_rows: int = INGEST_CHUNK_ROWS) -> Optional[Iterator[str]]:
+        """
+        샤드에 들어갈 문서 텍스트를 청크 단위로 생성하는 반복자를 엽니다.
+
+        Args:
+            shard (Optional[str]): 학교 이름(커리큘럼), SHARED_SHARD(학과 정보),
+                admission_shard(학년도)(해당 학년도 입결) 또는 None(전체)
+            chunk_rows (int): 청크당 행 수
+
+        Returns:
+            Optional[Iterator[str]]: 문서 텍스트 반복자 또는 None (로드 실패 시)
+        """
+        documents = VectorStoreManager.iter_documents(shard, chunk_rows)
+        return None if documents is None else (document.page_content for document in documents)
+
+    @staticmethod
+    def iter_documents(shard: Optional[str] = None, chunk_rows: int = INGEST_CHUNK_ROWS) -> Optional[Iterator[Document]]:
+        """
+        샤드에 들어갈 문서(본문과 메타데이터)를 청크 단위로 생성하는 반복자를 엽니다.
+
+        Args:
+            shard (Optional[str]): 학교 이름(커리큘럼), SHARED_SHARD(학과 정보),
+                admission_shard(학년도)(해당 학년도 입결) 또는 None(전체)
+            chunk_rows (int): 청크당 행 수
+
+        Returns:
+            Optional[Iterator[Document]]: 문서 반복자 또는 None (로드 실패 시) — CORPUS_COMPACTION_ENABLED이면
+                같은 엔터티 문서를 합치고 거의 같은 문서를 뺀 압축 코퍼스
+        """
+        year = None if shard is None else shard_year(shard)
+        admission_store = get_admission_store()
+        if year is not None and year not in admission_store.years():
+            st.error(f"입결 정보가 없는 학년도입니다: {year}")
+            return None
+        if shard is not None and shard != SHARED_SHARD and year is None and shard not in SCHOOL_CURRICULUM_CSVS:
+            st.error(f"등록되지 않은 학교입니다: {shard}")
+            return None
+
+        sources = []
+        if shard is None or shard == SHARED_SHARD:
+            sources.append((MAJOR_INFO_CSV, ENCODINGS["major_info"], DocumentProcessor.iter_major_documents))
+        if shard is None:
+            sources.append((
+                CURRICULUM_CSV, ENCODINGS["curriculum"],
+                lambda chunks: DocumentProcessor.iter_curriculum_documents(chunks, DEFAULT_SCHOOL)
+            ))
+        elif shard != SHARED_SHARD and year is None:
+            sources.append((
+                SCHOOL_CURRICULUM_CSVS[shard], ENCODINGS["curriculum"],
+                lambda chunks: DocumentProcessor.iter_curriculum_documents(chunks, shard)
+            ))
+
+        # 파일을 모두 먼저 열어 두어 경로 오류는 구축을 시작하기 전에 드러나게 합니다
+        readers = []
+        for file_path, encoding, to_documents in sources:
+            chunks = DataLoader.iter_csv_chunks(file_path, encoding, chunk_rows)
+            if chunks is None:
+                return None
+            readers.append(to_documents(chunks))
+
+        # 입결 정보는 학년도 파티션을 차례로 읽습니다 (학년도가 섞인 문서가 생기지 않도록 학년도별로 묶음)
+        years = admission_store.years() if shard is None else [year] if year is not None else []
+        readers += [DocumentProcessor.iter_admission_documents(admission_store.iter_chunks(y, chunk_rows)) for y in years]
+        documents = chain.from_iterable(readers)
+        if not CORPUS_COMPACTION_ENABLED:
+            return documents
+        return CorpusCompactor(mergers={"job": DocumentProcessor.merge_job_documents}).compact(documents)
+
+    @staticmethod
+    def load_texts(shard: Optional[str] = None) -> Optional[List[str]]:
+        """
+        샤드에 들어갈 문서 텍스트를 생성합니다.
+
+        Args:
+            shard (Optional[str]): 학교 이름(커리큘럼), SHARED_SHARD(학과 정보),
+                admission_shard(학년도)(해당 학년도 입결) 또는 None(전체)
+
+        Returns:
+            Optional[List[str]]: 문서 텍스트 리스트 또는 None (로드 실패 시)
+        """
+        texts = VectorStoreManager.iter_texts(shard)
+        return None if texts is None else list(texts)
+
+    @staticmethod
+    @traced("vectorstore.build")
+    def build_vectorstore(
+        api_key: str,
+        embeddings: Optional[Embeddings] = None,
+        shard: Optional[str] = None
+    ) -> Optional[FAISS]:
         """
         벡터 스토어를 구축합니다.
 
         Args:
             api_key (str): OpenAI API 키
+            embeddings (Optional[Embeddings]): 사용할 임베딩 백엔드 (기본값: 설정된 백엔드)
+            shard (Optional[str]): 구축할 샤드 (학교 이름 또는 SHARED_SHARD, 기본값: 전체 코퍼스)
 
         Returns:
             Optional[FAISS]: 구축된 벡터 스토어 또는 None (실패 시)
         """
+        start = time.perf_counter()
         try:
-            # 데이터 로드
-            df_major, df_curriculum, df_admission = DataLoader.load_all_data()
+            # 데이터 로드 및 문서 생성
+            documents = VectorStoreManager.iter_documents(shard)
+            documents = None if documents is None else list(documents)
 
-            if df_major is None or df_curriculum is None or df_admission is None:
+            if documents is None:
                 st.error("데이터 로드에 실패했습니다.")
+                INDEX_BUILDS.labels(status="failure").inc()
                 return None
 
-            # 텍스트 생성
-            texts_major = DocumentProcessor.create_major_texts(df_major)
-            texts_curriculum = DocumentProcessor.create_curriculum_texts(df_curriculum)
-            texts_admission = DocumentProcessor.create_admission_texts(df_admission)
+            # 벡터DB 구축 (인덱스 종류는 config.VECTOR_INDEX_TYPE)
+            if embeddings is None:
+                embeddings = VectorStoreManager.create_embeddings(api_key)
+            vectors = np.array(embeddings.embed_documents([doc.page_content for doc in documents]), dtype=np.float32)
+            # 문서마다 Document 객체를 유지하지 않고 본문 바이트열·오프셋·메타데이터 열로 보관합니다
+            vectorstore = FAISS(
+                embedding_function=embeddings,
+                index=AnnIndexFactory.build(vectors),
+                docstore=CompactDocstore.from_documents(documents),
+                index_to_docstore_id=RowIdMapping(len(documents))
+            )
 
-            # 모든 텍스트 합치기
-            all_texts = texts_major + texts_curriculum + texts_admission
-            documents = [Document(page_content=text) for text in all_texts]
+            INDEX_BUILDS.labels(status="success").inc()
+            INDEX_BUILD_SECONDS.observe(time.perf_counter() - start)
+            return vectorstore
 
-            # 벡터DB 구축
-            embeddings = OpenAIEmbeddings(openai_api_key=api_key)
-            vectorstore = FAISS.from_documents(documents, embeddings)
+        except Exception as e:
+            st.error(f"벡터 스토어 구축 중 오류 발생: {str(e)}")
+            INDEX_BUILDS.labels(status="failure").inc()
+            return None
 
-            return vectorstore
+    @staticmethod
+    @traced("vectorstore.publish_stream")
+    def publish_shard(api_key: str, shard: str, embeddings: Optional[Embeddings] = None) -> Optional[str]:
+        """
+        원본 CSV를 청크 단위로 읽으며 샤드 인덱스를 스트리밍으로 구축·게시합니다.
+
+        텍스트 생성, 임베딩, 인덱스 추가가 INGEST_EMBED_BATCH_SIZE개 문서 단위로 이어지므로
+        구축 중 메모리는 CSV 크기가 아니라 청크·배치 크기에 비례합니다. (호출자가 build_lock을 잡은 상태)
+
+        Args:
+            api_key (str): OpenAI API 키
+            shard (str): 학교 이름, SHARED_SHARD 또는 입결 학년도 샤드
+            embeddings (Optional[Embeddings]): 사용할 임베딩 백엔드 (기본값: 설정된 백엔드)
+
+        Returns:
+            Optional[str]: 게시된 버전 이름 또는 None (실패 시)
+        """
+        start = time.perf_counter()
+        try:
+            documents = VectorStoreManager.iter_documents(shard)
+            if documents is None:
+                st.error("데이터 로드에 실패했습니다.")
+                INDEX_BUILDS.labels(status="failure").inc()
+                return None
+
+            if embeddings is None:
+                embeddings = VectorStoreManager.create_embeddings(api_key)
+            version = IndexStore.for_shard(shard).publish_stream(documents, embeddings)
+
+            INDEX_BUILDS.labels(status="success").inc()
+            INDEX_BUILD_SECONDS.observe(time.perf_counter() - start)
+            return version
 
         except Exception as e:
             st.error(f"벡터 스토어 구축 중 오류 발생: {str(e)}")
+            INDEX_BUILDS.labels(status="failure").inc()
             return None
 
+    @staticmethod
+    def get_shard_vectorstore(api_key: str, shard: str) -> Optional[FAISS]:
+        """
+        디스크에 게시된 샤드를 mmap으로 불러옵니다.
+
+        게시된 버전이 없으면 한 워커만 스트리밍으로 구축·게시하고 나머지는 파일 락에서 기다린 뒤 같은 버전을 엽니다.
+        current 링크가 새 버전으로 바뀌면 다음 실행부터 새 버전을 사용합니다.
+
+        Args:
+            api_key (str): OpenAI API 키
+            shard (str): 학교 이름, SHARED_SHARD 또는 입결 학년도 샤드
+
+        Returns:
+            Optional[FAISS]: 샤드 벡터 스토어 또는 None (실패 시)
+        """
+        store = IndexStore.for_shard(shard)
+        version = store.current_version()
+
+        if version is None:
+            with st.spinner(MESSAGES["loading_vectordb"]), store.build_lock():
+                version = store.current_version()
+                if version is None:
+                    version = VectorStoreManager.publish_shard(api_key, shard)
+                    if version is None:
+                        return None
+
+        return SHARD_CACHE.get(
+            shard, version,
+            lambda: store.load(VectorStoreManager.create_embeddings(api_key), version)
+        )
+
+    @staticmethod
+    def get_school_vectorstore(
+        api_key: str,
+        school: str,
+        years: Optional[Sequence[int]] = None,
+        prompt_type: Optional[str] = None
+    ) -> Optional[ShardedVectorStore]:
+        """
+        학생의 학교 샤드와 공통 샤드를 함께 검색하는 벡터 스토어를 반환합니다.
+
+        입결 학년도 샤드는 ADMISSION_PROMPT_TYPES 질문에만 붙이므로, 학과 추천·커리큘럼 질문은 2개 샤드만 검색합니다.
+
+        Args:
+            api_key (str): OpenAI API 키
+            school (str): 학교 이름
+            years (Optional[Sequence[int]]): 검색할 입결 학년도 (기본값: 최근 ADMISSION_TREND_YEARS개 학년도)
+            prompt_type (Optional[str]): 질문의 프롬프트 타입 (ADMISSION_PROMPT_TYPES이면 입결 학년도 샤드 포함)
+
+        Returns:
+            Optional[ShardedVectorStore]: 샤드 벡터 스토어 또는 None (실패 시)
+        """
+        if school not in SCHOOL_CURRICULUM_CSVS:
+            st.error(f"등록되지 않은 학교입니다: {school}")
+            return None
+
+        admission_shards = []
+        if prompt_type in ADMISSION_PROMPT_TYPES:
+            if years is None:
+                years = get_admission_store().recent_years()
+            admission_shards = [admission_shard(year) for year in years]
+        shards = []
+        for shard in (school, SHARED_SHARD, *admission_shards):
+            vectorstore = VectorStoreManager.get_shard_vectorstore(api_key, shard)
+            if vectorstore is None:
+                return None
+            shards.append((shard, vectorstore))
+        return ShardedVectorStore(shards)
+
 
 class RAGChainManager:
     """RAG 체인 생성 및 관리를 담당하는 클래스"""
 
     @staticmethod
-    def create_qa_chain(
-        vectorstore: FAISS,
-        prompt_template: PromptTemplate,
+    def create_llm(
         api_key: str,
+        route: Optional[ModelRoute] = None,
         temperature: float = OPENAI_TEMPERATURE
-    ) -> Optional[RetrievalQA]:
+    ) -> BaseChatModel:
         """
-        QA 체인을 생성합니다.
+        설정된 백엔드에 맞는 채팅 LLM 인스턴스를 생성합니다.
 
         Args:
-            vectorstore (FAISS): 벡터 스토어
-            prompt_template (PromptTemplate): 프롬프트 템플릿
             api_key (str): OpenAI API 키
+            route (Optional[ModelRoute]): 모델, 최대 응답 토큰 수, 요청 타임아웃 (기본값: OPENAI_MODEL 기본 설정)
             temperature (float): LLM 온도 설정
 
         Returns:
-            Optional[RetrievalQA]: 생성된 QA 체인 또는 None (실패 시)
+            BaseChatModel: 생성된 채팅 모델
         """
-        try:
-            llm = ChatOpenAI(temperature=temperature, openai_api_key=api_key)
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=llm,
-                chain_type="stuff",
-                retriever=vectorstore.as_retriever(),
-                chain_type_kwargs={"prompt": prompt_template}
+        route = route or ModelRoute("default")
+        if LLM_BACKEND == "stub":
+            return StubChatModel(
+                latency=STUB_LLM_LATENCY,
+                jitter=STUB_LLM_JITTER,
+                distribution=STUB_LLM_DISTRIBUTION,
+                tail_probability=STUB_LLM_TAIL_PROBABILITY,
+                tail_latency=STUB_LLM_TAIL_LATENCY,
+                prompt_cache_min_tokens=STUB_LLM_PROMPT_CACHE_MIN_TOKENS,
+                model_name=route.model,
+                max_tokens=route.max_tokens
             )
-            return qa_chain
-
-        except Exception as e:
-            st.error(f"QA 체인 생성 중 오류 발생: {str(e)}")
-            return None
+        if CASSETTE_MODE != "off":
+            client, async_client = openai_clients(api_key, timeout=route.timeout)
+            return ChatOpenAI(
+                model_name=route.model,
+                temperature=temperature,
+                max_tokens=route.max_tokens,
+                openai_api_key=api_key,
+                client=client.chat.completions,
+                async_client=async_client.chat.completions
+            )
+        return ChatOpenAI(
+            model_name=route.model,
+            temperature=temperature,
+            max_tokens=route.max_tokens,
+            request_timeout=route.timeout,
+            openai_api_key=api_key
+        )
 
 
 class TableParser:
     """AI 응답을 테이블로 파싱하는 클래스"""
 
     @staticmethod
+    def _table_rows(response: str) -> List[List[str]]:
+        """응답에서 구분선을 제외한 마크다운 테이블 행의 셀 목록을 반환합니다. (첫 행은 헤더)"""
+        lines = response.strip().split("\n")
+        table_lines = [line for line in lines if "|" in line and "---" not in line]
+        return [list(map(str.strip, line.strip().split("|")[1:-1])) for line in table_lines]
+
+    @staticmethod
+    def validate_table(response: str, columns: List[str]) -> Optional[str]:
+        """
+        응답이 columns 형식의 테이블로 파싱되는지 확인합니다. (메트릭·오류 표시 없음)
+
+        Args:
+            response (str): AI 응답 텍스트
+            columns (List[str]): 테이블 컬럼 이름 리스트
+
+        Returns:
+            Optional[str]: 실패 사유 ('no_table', 'column_mismatch') 또는 None (정상)
+        """
+        rows = TableParser._table_rows(response)
+        if len(rows) < 2:  # 헤더 + 최소 1개 데이터 행
+            return "no_table"
+        if any(len(row) != len(columns) for row in rows[1:]):
+            return "column_mismatch"
+        return None
+
+    @staticmethod
+    @traced("table.parse")
     def parse_table_response(response: str, columns: List[str]) -> pd.DataFrame:
         """
         AI의 테이블 형식 응답을 파싱합니다.
@@ -243,21 +721,21 @@ class TableParser:
             pd.DataFrame: 파싱된 데이터프레임
         """
         try:
-            lines = response.strip().split("\n")
-            table_lines = [line for line in lines if "|" in line and "---" not in line]
-
-            if len(table_lines) < 2:  # 헤더 + 최소 1개 데이터 행
+            failure = TableParser.validate_table(response, columns)
+            if failure is not None:
+                TABLE_PARSE_FAILURES.labels(reason=failure).inc()
+                if failure == "column_mismatch":
+                    st.error(f"테이블 파싱 중 오류 발생: 응답 테이블의 컬럼 수가 {len(columns)}개가 아닙니다.")
                 return pd.DataFrame(columns=columns)
 
-            rows = [line.strip().split("|")[1:-1] for line in table_lines]
-            cleaned_rows = [list(map(str.strip, row)) for row in rows]
-
+            cleaned_rows = TableParser._table_rows(response)
             # 첫 번째 행은 헤더이므로 제외
             df = pd.DataFrame(cleaned_rows[1:], columns=columns)
             return df
 
         except Exception as e:
             st.error(f"테이블 파싱 중 오류 발생: {str(e)}")
+            TABLE_PARSE_FAILURES.labels(reason="error").inc()
             return pd.DataFrame(columns=columns)
 
 
@@ -266,9 +744,94 @@ class SessionStateManager:
 
     @staticmethod
     def initialize_session_state():
-        """세션 상태를 초기화합니다."""
+        """세션 상태를 초기화합니다. 새로 고침·재접속이면 URL의 학생 토큰으로 저장된 입력값과 페이지를 복원합니다."""
         if "page" not in st.session_state:
             st.session_state.page = "Home"
+            token = SessionStateManager.get_student_token()
+            if token is not None:
+                st.session_state.update(get_plan_store().load_profile(token) or {})
+
+    @staticmethod
+    def get_student_token(create: bool = False) -> Optional[str]:
+        """
+        URL 쿼리 파라미터의 학생 토큰을 반환합니다.
+
+        Args:
+            create (bool): 토큰이 없으면 새로 만들어 URL에 추가할지 여부
+
+        Returns:
+            Optional[str]: 학생 토큰 또는 None
+        """
+        token = st.query_params.get(STUDENT_TOKEN_PARAM)
+        if token is None and create:
+            token = secrets.token_urlsafe(16)
+            st.query_params[STUDENT_TOKEN_PARAM] = token
+        return token
+
+    @staticmethod
+    def save_profile():
+        """학생 토큰이 있으면 현재 입력값과 페이지를 저장합니다."""
+        token = SessionStateManager.get_student_token()
+        if token is not None:
+            profile = {key: st.session_state[key] for key in PLAN_PROFILE_KEYS if key in st.session_state}
+            get_plan_store().save_profile(token, profile)
+
+    @staticmethod
+    def restore_table(key: str, fingerprint: str, version: Optional[str]) -> bool:
+        """
+        입력 지문과 인덱스 버전이 같은 저장된 테이블을 세션에 복원합니다.
+
+        Args:
+            key (str): 세션 키 ('job_table', 'curriculum_table', 'admission_table')
+            fingerprint (str): PlanStore.fingerprint()로 계산한 입력 지문
+            version (Optional[str]): 현재 인덱스 버전
+
+        Returns:
+            bool: 복원했으면 True
+        """
+        token = SessionStateManager.get_student_token()
+        df = None if token is None else get_plan_store().load_table(token, key, fingerprint, version)
+        CACHE_REQUESTS.labels(cache="plan", result="miss" if df is None else "hit").inc()
+        if df is None:
+            return False
+        st.session_state[key] = df
+        return True
+
+    @staticmethod
+    def save_table(key: str, fingerprint: str, version: Optional[str], answer, columns: List[str]) -> bool:
+        """
+        세션의 테이블을 학생 토큰으로 저장합니다.
+
+        장애 시 대신 받은 저장된 결과와 테이블 검증(RAGService 캐시와 같은 TableParser.validate_table)에 실패한 응답은
+        저장하지 않으므로, 다음 방문 때 빈 테이블을 복원하지 않고 다시 생성합니다.
+
+        Args:
+            key (str): 세션 키
+            fingerprint (str): 입력 지문
+            version (Optional[str]): 테이블을 생성한 인덱스 버전
+            answer: 테이블을 파싱한 RAGAnswer
+            columns (List[str]): 테이블 컬럼 이름 리스트
+
+        Returns:
+            bool: 저장했으면 True
+        """
+        token = SessionStateManager.get_student_token()
+        if token is None or answer.cached or TableParser.validate_table(answer.text, columns) is not None:
+            return False
+        get_plan_store().save_table(token, key, fingerprint, version, st.session_state[key])
+        return True
+
+    @staticmethod
+    def get_session_id() -> str:
+        """
+        세션 식별자를 반환합니다. (최초 호출 시 생성)
+
+        Returns:
+            str: 세션 식별자
+        """
+        if "session_id" not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex
+        return st.session_state.session_id
 
     @staticmethod
     def clear_session_keys(keys: List[str]):
@@ -290,4 +853,5 @@ class SessionStateManager:
             page_name (str): 이동할 페이지 이름
         """
         st.session_state.page = page_name
+        SessionStateManager.save_profile()
         st.rerun()